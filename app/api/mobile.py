@@ -3,7 +3,7 @@ Mobile API Blueprint for RouteForce Routing
 Provides mobile-optimized endpoints for mobile app integration
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, session
 from flask_limiter.util import get_remote_address
 import uuid
 import time
@@ -14,6 +14,7 @@ from typing import Dict, Any, Optional, List
 # Import services
 from app.services.routing_service import RoutingService
 from app.services.traffic_service import TrafficService
+from app.services.store_locator_service import get_store_locator
 from app.models.database import db
 from app.security import require_api_key, validate_request
 
@@ -461,6 +462,15 @@ def update_driver_location():
             "received_at": datetime.utcnow().isoformat(),
         }
 
+        # Resolve the store the driver is at or nearest to, among the stores
+        # of the logged-in user only
+        tenant_id = session.get("user_id")
+        if tenant_id:
+            try:
+                location_update.update(get_store_locator().locate(lat, lng, tenant_id))
+            except Exception as e:
+                logger.warning(f"Store lookup failed for driver {driver_id}: {e}")
+
         # Broadcast to WebSocket clients if available
         try:
             from app import socketio
@@ -472,7 +482,14 @@ def update_driver_location():
             pass  # WebSocket not available
 
         return (
-            jsonify({"success": True, "received_at": location_update["received_at"]}),
+            jsonify(
+                {
+                    "success": True,
+                    "received_at": location_update["received_at"],
+                    "nearest_store": location_update.get("nearest_store"),
+                    "at_store": location_update.get("at_store", False),
+                }
+            ),
             200,
         )
 
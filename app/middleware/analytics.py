@@ -6,6 +6,7 @@ import time
 import logging
 from flask import request, g
 from typing import Optional
+from app.performance_monitor import get_performance_monitor
 from app.services.analytics_service import AnalyticsService
 
 logger = logging.getLogger(__name__)
@@ -36,6 +37,15 @@ class AnalyticsMiddleware:
             if hasattr(g, "start_time") and hasattr(g, "analytics_data"):
                 response_time = time.time() - g.start_time
 
+                # Feed real latencies to the percentile sketches
+                get_performance_monitor().record_request(
+                    endpoint=g.analytics_data.get("endpoint")
+                    or g.analytics_data.get("path"),
+                    method=g.analytics_data["method"],
+                    duration_seconds=response_time,
+                    status_code=response.status_code,
+                )
+
                 # Track API usage
                 self.analytics_service.track_api_usage(
                     endpoint=g.analytics_data.get("endpoint")
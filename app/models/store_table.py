@@ -0,0 +1,189 @@
+"""
+Columnar store representation for the optimization hot path
+"""
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Numeric columns and the store keys they are read from, in lookup order
+NUMERIC_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "priority": ("priority",),
+    "demand": ("demand",),
+    "service_time": ("service_time",),
+    "window_start": ("earliest_time", "window_start"),
+    "window_end": ("latest_time", "window_end"),
+}
+
+
+def _to_float(value: Any) -> float:
+    """Parse a numeric store field, NaN when missing or malformed"""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class StoreTable(list):
+    """
+    List of store dictionaries with structure-of-arrays columns
+
+    A StoreTable is the list of the original store dicts, so it can be
+    returned in responses or passed to any code expecting a list, while
+    optimizers read coordinates and attributes from columns extracted in a
+    single pass. Missing or malformed values are NaN (chain_id is -1).
+    Columns are read-only and rebuilt lazily after the list itself is
+    modified; edits to the dictionaries are not tracked.
+    """
+
+    def __init__(self, stores: Iterable[Dict[str, Any]] = ()):
+        super().__init__(stores)
+        self._columns: Optional[Dict[str, np.ndarray]] = None
+        self._chains: Tuple[str, ...] = ()
+
+    @classmethod
+    def ensure(cls, stores: Iterable[Dict[str, Any]]) -> "StoreTable":
+        """Return stores unchanged if already a StoreTable, else wrap them"""
+        return stores if isinstance(stores, cls) else cls(stores)
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """(n, 2) array of (lat, lon); NaN rows lack usable coordinates"""
+        return self._column("coordinates")
+
+    @property
+    def lat(self) -> np.ndarray:
+        return self.coordinates[:, 0]
+
+    @property
+    def lon(self) -> np.ndarray:
+        return self.coordinates[:, 1]
+
+    @property
+    def chain_id(self) -> np.ndarray:
+        """Index into ``chains`` per store, -1 for stores without a chain"""
+        return self._column("chain_id")
+
+    @property
+    def chains(self) -> Tuple[str, ...]:
+        """Distinct chain names in order of first appearance"""
+        self._column("chain_id")
+        return self._chains
+
+    def column(self, name: str, default: Optional[float] = None) -> np.ndarray:
+        """
+        Numeric attribute column
+
+        Args:
+            name: One of NUMERIC_FIELDS
+            default: Value substituted for missing entries (NaN if None)
+
+        Returns:
+            Float64 array of length n
+        """
+        values = self._column(name)
+        if default is None:
+            return values
+        return np.where(np.isnan(values), float(default), values)
+
+    def copy(self) -> "StoreTable":
+        """Shallow copy that shares the already extracted columns"""
+        table = StoreTable(self)
+        table._columns, table._chains = self._columns, self._chains
+        return table
+
+    def take(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        """Original store dicts in the given order, e.g. a route"""
+        return [self[int(i)] for i in indices]
+
+    def _column(self, name: str) -> np.ndarray:
+        if self._columns is None:
+            self._build()
+        return self._columns[name]
+
+    def _build(self) -> None:
+        """Extract every column in one pass over the stores"""
+        from app.services.distance_service import CoordinateExtractor
+
+        n = len(self)
+        coords = np.full((n, 2), np.nan)
+        numeric = {name: np.full(n, np.nan) for name in NUMERIC_FIELDS}
+        chain_id = np.full(n, -1, dtype=np.int32)
+        chains: Dict[str, int] = {}
+
+        for i, store in enumerate(self):
+            coord = CoordinateExtractor.extract_coordinates(store)
+            if coord is not None:
+                coords[i] = coord.latitude, coord.longitude
+            for name, keys in NUMERIC_FIELDS.items():
+                for key in keys:
+                    if key in store:
+                        numeric[name][i] = _to_float(store[key])
+                        break
+            chain = store.get("chain")
+            if chain:
+                chain_id[i] = chains.setdefault(str(chain), len(chains))
+
+        columns = {"coordinates": coords, "chain_id": chain_id, **numeric}
+        for array in columns.values():
+            array.setflags(write=False)
+        self._columns = columns
+        self._chains = tuple(chains)
+
+    def _invalidate(self) -> None:
+        self._columns = None
+
+    # Any change to the list itself invalidates the columns
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._invalidate()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._invalidate()
+
+    def __iadd__(self, other):
+        result = super().__iadd__(other)
+        self._invalidate()
+        return result
+
+    def __imul__(self, count):
+        result = super().__imul__(count)
+        self._invalidate()
+        return result
+
+    def append(self, store):
+        super().append(store)
+        self._invalidate()
+
+    def extend(self, stores):
+        super().extend(stores)
+        self._invalidate()
+
+    def insert(self, index, store):
+        super().insert(index, store)
+        self._invalidate()
+
+    def pop(self, index=-1):
+        store = super().pop(index)
+        self._invalidate()
+        return store
+
+    def remove(self, store):
+        super().remove(store)
+        self._invalidate()
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate()
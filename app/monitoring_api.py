@@ -39,6 +39,7 @@ def get_current_metrics():
             {
                 "success": True,
                 "metrics": metrics,
+                "latency": monitor.get_latency_percentiles(),
                 "timestamp": datetime.now().isoformat(),
             }
         )
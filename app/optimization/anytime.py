@@ -0,0 +1,90 @@
+"""
+Time budgets and progress reporting for anytime optimizers
+
+An anytime optimizer can be stopped at any point and still return the best
+solution it has found so far. Optimizers check a Deadline between
+generations or temperature steps and report each improving solution to an
+optional progress callback.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Receives one progress dict per improving solution
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class Deadline:
+    """Wall-clock budget started when the deadline is created"""
+
+    def __init__(self, budget_seconds: Optional[float] = None):
+        """
+        Start a budget
+
+        Args:
+            budget_seconds: Seconds available, or None for no limit
+        """
+        if budget_seconds is not None and budget_seconds <= 0:
+            raise ValueError("Time budget must be positive")
+        self.budget_seconds = budget_seconds
+        # time.monotonic is system-wide, so pool workers can check it too
+        self.started = time.monotonic()
+        self.expires = math.inf if budget_seconds is None else self.started + budget_seconds
+
+    @classmethod
+    def from_ms(cls, deadline_ms: Optional[float]) -> "Deadline":
+        """Budget given in milliseconds (None for no limit)"""
+        return cls(None if deadline_ms is None else deadline_ms / 1000.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires
+
+    def remaining(self) -> float:
+        """Seconds left, inf without a limit"""
+        return max(self.expires - time.monotonic(), 0.0)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+
+def report_progress(
+    callback: Optional[ProgressCallback],
+    algorithm: str,
+    iteration: int,
+    best_distance: float,
+    route: List[int],
+    deadline: Deadline,
+) -> None:
+    """
+    Send an improving solution to a progress callback
+
+    Errors raised by the callback are logged and never interrupt the
+    optimizer.
+
+    Args:
+        callback: Progress callback, or None
+        algorithm: Name of the reporting algorithm
+        iteration: Generation or iteration that found the solution
+        best_distance: Distance of the solution
+        route: Solution as store indices
+        deadline: Budget of the run, for the elapsed time
+    """
+    if callback is None:
+        return
+    try:
+        callback(
+            {
+                "algorithm": algorithm,
+                "iteration": iteration,
+                "best_distance": float(best_distance),
+                "route": [int(i) for i in route],
+                "elapsed_seconds": round(deadline.elapsed, 3),
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Progress callback failed: {e}")
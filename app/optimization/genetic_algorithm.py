@@ -3,13 +3,22 @@ Genetic Algorithm for Route Optimization
 Advanced TSP (Traveling Salesman Problem) solver using evolutionary algorithms
 """
 
-import random
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
 from dataclasses import dataclass
-from geopy.distance import geodesic
 import logging
+import math
+import os
+import time
 from collections import deque
-from functools import lru_cache
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.models.store_table import StoreTable
+from app.optimization.anytime import Deadline, ProgressCallback, report_progress
+from app.optimization.shared_matrix import shared_matrix_executor, worker_matrix
+from app.services.distance_service import build_distance_matrix
 
 try:
     # Best-effort deterministic seeding if RFR_SEED is set
@@ -57,44 +66,43 @@ class GeneticConfig:
     crossover_rate: float = 0.8
     elite_size: int = 20
     tournament_size: int = 3
+    islands: int = 1  # Independent populations, each of population_size
+    migration_interval: int = 25  # Generations between elite exchanges
+    migration_size: int = 2  # Elites sent to the next island per exchange
+    time_budget_seconds: Optional[float] = None  # Stop early, keeping the best
+
+    def __post_init__(self):
+        """Validate configuration parameters"""
+        if self.population_size < 2:
+            raise ValueError("Population size must be at least 2")
+        if self.generations < 1:
+            raise ValueError("Generations must be positive")
+        if not 0 <= self.mutation_rate <= 1:
+            raise ValueError("Mutation rate must be between 0 and 1")
+        if not 0 <= self.crossover_rate <= 1:
+            raise ValueError("Crossover rate must be between 0 and 1")
+        if self.elite_size < 0:
+            raise ValueError("Elite size cannot be negative")
+        if self.tournament_size < 1:
+            raise ValueError("Tournament size must be positive")
+        if self.islands < 1:
+            raise ValueError("Islands must be at least 1")
+        if self.migration_interval < 1:
+            raise ValueError("Migration interval must be positive")
+        if self.migration_size < 0:
+            raise ValueError("Migration size cannot be negative")
+        if self.time_budget_seconds is not None and self.time_budget_seconds <= 0:
+            raise ValueError("Time budget must be positive")
 
 
 class Individual:
     """Represents a single route solution"""
 
-    def __init__(self, route: List[int], stores: List[Dict[str, Any]]):
+    def __init__(self, route: List[int], distance: float):
         self.route = route
-        self.stores = stores
-        self.fitness = 0.0
-        self.distance = 0.0
-        self.calculate_fitness()
-
-    def calculate_fitness(self):
-        """Calculate fitness based on total route distance"""
-        total_distance = 0.0
-
-        for i in range(len(self.route)):
-            current_store = self.stores[self.route[i]]
-            next_store = self.stores[self.route[(i + 1) % len(self.route)]]
-
-            # Handle both 'lat'/'lon' and 'latitude'/'longitude' formats
-            lat1 = current_store.get("latitude", current_store.get("lat", 0))
-            lon1 = current_store.get("longitude", current_store.get("lon", 0))
-            lat2 = next_store.get("latitude", next_store.get("lat", 0))
-            lon2 = next_store.get("longitude", next_store.get("lon", 0))
-
-            if (lat1, lon1) != (0, 0) and (lat2, lon2) != (0, 0):
-                # Round to stabilize cache keys
-                total_distance += _geodesic_km(
-                    round(float(lat1), 6),
-                    round(float(lon1), 6),
-                    round(float(lat2), 6),
-                    round(float(lon2), 6),
-                )
-
-        self.distance = total_distance
+        self.distance = distance
         # Fitness is inverse of distance (higher fitness = shorter distance)
-        self.fitness = 1 / (total_distance + 1)  # +1 to avoid division by zero
+        self.fitness = 1 / (distance + 1)  # +1 to avoid division by zero
 
     def __lt__(self, other):
         return self.fitness > other.fitness  # Higher fitness is better
@@ -109,58 +117,133 @@ class GeneticAlgorithm:
     - Crossover: Order crossover (OX) preserving route validity
     - Mutation: Swap mutation for local improvements
     - Elitism: Keep best solutions across generations
+
+    The population is a (population_size, n_stores) int32 array and every
+    generation is evaluated in one gathered pass over a precomputed
+    distance matrix.
     """
 
     def __init__(self, config: GeneticConfig = None):
         self.config = config or GeneticConfig()
-        self.population = []
-        self.best_individual = None
+        self.population: Optional[np.ndarray] = None
+        self.distances: Optional[np.ndarray] = None
+        self.distance_matrix: Optional[np.ndarray] = None
+        self.best_individual: Optional[Individual] = None
         self.generation_stats = []
+        self.migrations = 0
+        self.stopped_by_deadline = False
+        self._deadline = Deadline()
+        self._progress: Optional[ProgressCallback] = None
+        self._rng = np.random.default_rng()
 
     def optimize(
-        self, stores: List[Dict[str, Any]], constraints: Dict[str, Any] = None
+        self,
+        stores: List[Dict[str, Any]],
+        constraints: Dict[str, Any] = None,
+        distance_matrix: Optional[np.ndarray] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Optimize route using genetic algorithm
 
+        Evolution stops after ``config.time_budget_seconds`` if set,
+        returning the best route found so far.
+
         Args:
             stores: List of store dictionaries with lat/lon coordinates
             constraints: Optional constraints for optimization
+            distance_matrix: Precomputed distance matrix for ``stores``
+            progress_callback: Called with each improving solution
 
         Returns:
             Tuple of (optimized_route, optimization_metrics)
         """
         # Apply deterministic seeding if configured
-        seed_all_from_env()
+        seed = seed_all_from_env()
+        self._rng = np.random.default_rng(seed)
+        self._deadline = Deadline(self.config.time_budget_seconds)
+        self._progress = progress_callback
+        self.stopped_by_deadline = False
 
         logger.info(f"Starting genetic algorithm optimization for {len(stores)} stores")
 
         if len(stores) < 2:
             return stores, {"algorithm": "genetic", "generations": 0, "improvement": 0}
 
-        # Initialize population
-        self._initialize_population(stores)
+        stores = StoreTable.ensure(stores)
+        if distance_matrix is None:
+            distance_matrix = self._create_distance_matrix(stores)
+        self.distance_matrix = distance_matrix
+        self.best_individual = None
+        self.generation_stats = []
+        self.migrations = 0
+
+        if self.config.islands > 1:
+            initial_best = self._evolve_islands(len(stores), seed)
+        else:
+            initial_best = self._evolve_single(len(stores))
+
+        if self.best_individual is None:  # generations == 0
+            self.best_individual = initial_best
+
+        # Convert best route back to store format
+        optimized_route = [stores[i] for i in self.best_individual.route]
+
+        # Calculate improvement
+        improvement = (
+            (
+                (initial_best.distance - self.best_individual.distance)
+                / initial_best.distance
+            )
+            * 100
+            if initial_best.distance > 0
+            else 0.0
+        )
+
+        metrics = {
+            "algorithm": "genetic",
+            "generations": len(self.generation_stats),
+            "initial_distance": initial_best.distance,
+            "final_distance": self.best_individual.distance,
+            "improvement_percent": improvement,
+            "population_size": self.config.population_size,
+            "best_fitness": self.best_individual.fitness,
+            "stopped_by_deadline": self.stopped_by_deadline,
+        }
+        if self.config.islands > 1:
+            metrics["islands"] = self.config.islands
+            metrics["migrations"] = self.migrations
+
+        logger.info(f"Genetic algorithm completed: {improvement:.1f}% improvement")
+        return optimized_route, metrics
 
-        initial_best = min(self.population)
-        best_distances = []
+    def _evolve_single(self, n_stores: int) -> Individual:
+        """Evolve one population; returns the initial best individual"""
+        self._initialize_population(n_stores)
+
+        initial_best = self._best_of_population()
 
         # Evolution loop with enhanced convergence detection
         convergence_tracker = ConvergenceTracker(window_size=20, threshold=0.001)
 
         for generation in range(self.config.generations):
+            if self._deadline.expired():
+                self.stopped_by_deadline = True
+                break
+
             # Selection and reproduction
-            new_population = self._evolve_population()
-            self.population = new_population
+            self._evolve_population()
 
             # Track best solution
-            current_best = min(self.population)
-            best_distances.append(current_best.distance)
+            current_best = self._best_of_population()
+            self.generation_stats.append(current_best.distance)
 
             if (
                 not self.best_individual
                 or current_best.fitness > self.best_individual.fitness
             ):
                 self.best_individual = current_best
+                self._report(generation)
 
             # AUTO-PILOT: Enhanced convergence detection (O(1) instead of O(n))
             if generation > 50 and convergence_tracker.check_convergence(
@@ -177,143 +260,262 @@ class GeneticAlgorithm:
                     f"Generation {generation}: Best distance = {current_best.distance:.2f}km"
                 )
 
-        # Convert best route back to store format
-        optimized_route = [stores[i] for i in self.best_individual.route]
+        return initial_best
 
-        # Calculate improvement
-        improvement = (
-            (initial_best.distance - self.best_individual.distance)
-            / initial_best.distance
-        ) * 100
+    def _evolve_islands(self, n_stores: int, seed: Optional[int]) -> Individual:
+        """
+        Island model: independent populations with periodic elite migration
+
+        Islands evolve in parallel for ``migration_interval`` generations at
+        a time, then each island's best ``migration_size`` routes replace
+        the worst routes of the next island (ring topology). Every island
+        has its own generator spawned from the seed, and epochs always
+        complete for all islands before migrating, so results do not depend
+        on process scheduling.
+        """
+        config = self.config
+        islands = []
+        for child_seed in np.random.SeedSequence(seed).spawn(config.islands):
+            self._rng = np.random.default_rng(child_seed)
+            self._initialize_population(n_stores)
+            islands.append((self.population, self.distances, self._rng))
+
+        initial = int(np.argmin([distances[0] for _, distances, _ in islands]))
+        initial_best = Individual(
+            islands[initial][0][0].tolist(), float(islands[initial][1][0])
+        )
 
-        metrics = {
-            "algorithm": "genetic",
-            "generations": generation + 1,
-            "initial_distance": initial_best.distance,
-            "final_distance": self.best_individual.distance,
-            "improvement_percent": improvement,
-            "population_size": self.config.population_size,
-            "best_fitness": self.best_individual.fitness,
-        }
+        convergence_tracker = ConvergenceTracker(window_size=20, threshold=0.001)
+        generation = 0
+
+        with self._island_runner() as run_epoch:
+            while generation < config.generations:
+                if self._deadline.expired():
+                    self.stopped_by_deadline = True
+                    break
+                planned = min(config.migration_interval, config.generations - generation)
+                results = run_epoch(islands, planned)
+                islands = [result[:3] for result in results]
+
+                # Islands stop early at the deadline; compare the generations
+                # every island completed
+                steps = min(len(result[3]) for result in results)
+                self.stopped_by_deadline = steps < planned
+
+                # Best distance per generation across all islands
+                per_generation = np.min(
+                    [result[3][:steps] for result in results], axis=0
+                )
+                converged = False
+                for offset, best_distance in enumerate(per_generation.tolist()):
+                    self.generation_stats.append(best_distance)
+                    if generation + offset > 50 and (
+                        convergence_tracker.check_convergence(best_distance)
+                    ):
+                        converged = True
+                generation += steps
+
+                previous_best = self.best_individual
+                for population, distances, _ in islands:
+                    if (
+                        not self.best_individual
+                        or distances[0] < self.best_individual.distance
+                    ):
+                        self.best_individual = Individual(
+                            population[0].tolist(), float(distances[0])
+                        )
+                if self.best_individual is not previous_best:
+                    self._report(generation)
 
-        logger.info(f"Genetic algorithm completed: {improvement:.1f}% improvement")
-        return optimized_route, metrics
+                logger.info(
+                    f"Generation {generation}: Best distance = "
+                    f"{self.best_individual.distance:.2f}km across {len(islands)} islands"
+                )
+                if self.stopped_by_deadline:
+                    break
+                if converged:
+                    logger.info(
+                        f"Early stopping at generation {generation} - convergence detected"
+                    )
+                    break
+                if generation < config.generations:
+                    self._migrate(islands)
+
+        self.population, self.distances, self._rng = islands[0]
+        return initial_best
+
+    def _report(self, generation: int) -> None:
+        """Send the current best individual to the progress callback"""
+        report_progress(
+            self._progress,
+            "genetic",
+            generation,
+            self.best_individual.distance,
+            self.best_individual.route,
+            self._deadline,
+        )
+
+    def _migrate(self, islands: List[Tuple[np.ndarray, np.ndarray, Any]]):
+        """Send each island's elites to replace the next island's worst routes"""
+        size = self.config.population_size
+        count = min(self.config.migration_size, size - 1)
+        if count <= 0:
+            return
+
+        emigrants = [
+            (population[:count].copy(), distances[:count].copy())
+            for population, distances, _ in islands
+        ]
+        for index, (population, distances, _) in enumerate(islands):
+            routes, route_distances = emigrants[index - 1]
+            population[size - count :] = routes
+            distances[size - count :] = route_distances
+            order = np.argsort(distances, kind="stable")
+            population[:] = population[order]
+            distances[:] = distances[order]
+        self.migrations += 1
+
+    @contextmanager
+    def _island_runner(self):
+        """
+        Yield a function running one epoch on every island
 
-    def _initialize_population(self, stores: List[Dict[str, Any]]):
+        Islands run in a process pool that reads the distance matrix from
+        shared memory. With a single worker available, or if the pool
+        cannot start or breaks, islands run one after another in this
+        process with identical results.
+        """
+        workers = min(self.config.islands, os.cpu_count() or 1)
+
+        def run_in_process(islands, steps):
+            return [
+                _evolve_island(
+                    self.config,
+                    self.distance_matrix,
+                    *island,
+                    steps,
+                    self._deadline.expires,
+                )
+                for island in islands
+            ]
+
+        with shared_matrix_executor(self.distance_matrix, workers) as executor:
+            if executor is None:
+                yield run_in_process
+                return
+
+            pool_broken = False
+
+            def run_in_pool(islands, steps):
+                nonlocal pool_broken
+                if pool_broken:
+                    return run_in_process(islands, steps)
+                try:
+                    futures = [
+                        executor.submit(
+                            _evolve_island_in_worker,
+                            self.config,
+                            *island,
+                            steps,
+                            self._deadline.expires,
+                        )
+                        for island in islands
+                    ]
+                    return [future.result() for future in futures]
+                except (BrokenProcessPool, OSError) as e:
+                    # Workers only received copies, so the islands are intact
+                    logger.warning(f"Island process pool failed, running serially: {e}")
+                    pool_broken = True
+                    return run_in_process(islands, steps)
+
+            yield run_in_pool
+
+    def _create_distance_matrix(self, stores: List[Dict[str, Any]]) -> np.ndarray:
+        """Build the distance matrix used for every fitness evaluation"""
+        matrix = build_distance_matrix(stores, "fast_geodesic")
+        # Edges to stores without coordinates do not count towards distance
+        matrix[~np.isfinite(matrix)] = 0.0
+        return matrix
+
+    def _route_distances(self, routes: np.ndarray) -> np.ndarray:
+        """Closed-tour length of every row of a (k, n) route array"""
+        return self.distance_matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
+
+    def _best_of_population(self) -> Individual:
+        """Snapshot the best individual of the current population"""
+        best = int(np.argmin(self.distances))
+        return Individual(
+            self.population[best].tolist(), float(self.distances[best])
+        )
+
+    def _initialize_population(self, n_stores: int):
         """Initialize population with random routes"""
-        self.population = []
-        store_indices = list(range(len(stores)))
-
-        for _ in range(self.config.population_size):
-            # Create random route
-            route = store_indices.copy()
-            random.shuffle(route)
-
-            individual = Individual(route, stores)
-            self.population.append(individual)
+        size = self.config.population_size
+        keys = self._rng.random((size, n_stores))
+        self.population = np.argsort(keys, axis=1).astype(np.int32)
+        self.distances = self._route_distances(self.population)
 
         # Sort by fitness
-        self.population.sort()
+        self._sort_population()
+
+    def _sort_population(self):
+        """Order population from shortest to longest route"""
+        order = np.argsort(self.distances, kind="stable")
+        self.population = self.population[order]
+        self.distances = self.distances[order]
 
-    def _evolve_population(self) -> List[Individual]:
+    def _evolve_population(self):
         """Evolve population through selection, crossover, and mutation"""
-        new_population = []
+        size = self.config.population_size
 
-        # Elitism: Keep best individuals
-        elite_count = min(self.config.elite_size, len(self.population))
-        new_population.extend(self.population[:elite_count])
+        # Elitism: Keep best individuals (population is kept sorted)
+        elite_count = min(self.config.elite_size, size)
+        offspring_count = size - elite_count
 
-        # Generate offspring
-        while len(new_population) < self.config.population_size:
-            # Selection
-            parent1 = self._tournament_selection()
-            parent2 = self._tournament_selection()
+        if offspring_count > 0:
+            # Selection: one tournament per parent slot, pairs of parents
+            pairs = (offspring_count + 1) // 2
+            parents1 = self.population[self._tournament_selection(pairs)]
+            parents2 = self.population[self._tournament_selection(pairs)]
 
             # Crossover
-            if random.random() < self.config.crossover_rate:
-                child1, child2 = self._order_crossover(parent1, parent2)
-            else:
-                child1, child2 = parent1, parent2
-
-            # Mutation
-            if random.random() < self.config.mutation_rate:
-                child1 = self._mutate(child1)
-            if random.random() < self.config.mutation_rate:
-                child2 = self._mutate(child2)
+            crossover = self._rng.random(pairs) < self.config.crossover_rate
+            children1, children2 = parents1.copy(), parents2.copy()
+            if crossover.any():
+                p1, p2 = parents1[crossover], parents2[crossover]
+                children1[crossover] = self._order_crossover(p1, p2)
+                children2[crossover] = self._order_crossover(p2, p1)
 
             # AUTO-PILOT: Ensure exact population size bounds
-            remaining_slots = self.config.population_size - len(new_population)
-            if remaining_slots >= 2:
-                new_population.extend([child1, child2])
-            elif remaining_slots == 1:
-                new_population.append(child1)
-                break
+            children = np.concatenate([children1, children2])[:offspring_count]
+
+            # Mutation
+            self._mutate(children)
 
-        # AUTO-PILOT: Ensure exact population size
-        new_population = new_population[: self.config.population_size]
-        new_population.sort()
-
-        return new_population
-
-    def _tournament_selection(self) -> Individual:
-        """Select individual using tournament selection"""
-        tournament = random.sample(self.population, self.config.tournament_size)
-        return min(tournament)  # Best fitness (lowest distance)
-
-    def _order_crossover(
-        self, parent1: Individual, parent2: Individual
-    ) -> Tuple[Individual, Individual]:
-        """Order crossover (OX) preserving route validity"""
-        size = len(parent1.route)
-
-        # Select crossover points
-        start, end = sorted(random.sample(range(size), 2))
-
-        # Create children
-        child1_route = [-1] * size
-        child2_route = [-1] * size
-
-        # Copy segments
-        child1_route[start:end] = parent1.route[start:end]
-        child2_route[start:end] = parent2.route[start:end]
-
-        # Fill remaining positions
-        self._fill_remaining(child1_route, parent2.route, end)
-        self._fill_remaining(child2_route, parent1.route, end)
-
-        child1 = Individual(child1_route, parent1.stores)
-        child2 = Individual(child2_route, parent2.stores)
-
-        return child1, child2
-
-    def _fill_remaining(
-        self, child_route: List[int], parent_route: List[int], start_pos: int
-    ):
-        """Fill remaining positions in crossover"""
-        size = len(child_route)
-        parent_idx = start_pos
-        child_idx = start_pos
-
-        while -1 in child_route:
-            if parent_route[parent_idx % size] not in child_route:
-                while child_route[child_idx % size] != -1:
-                    child_idx += 1
-                child_route[child_idx % size] = parent_route[parent_idx % size]
-            parent_idx += 1
-
-    def _mutate(self, individual: Individual) -> Individual:
-        """Swap mutation"""
-        mutated_route = individual.route.copy()
-
-        # Swap two random positions
-        if len(mutated_route) > 1:
-            idx1, idx2 = random.sample(range(len(mutated_route)), 2)
-            mutated_route[idx1], mutated_route[idx2] = (
-                mutated_route[idx2],
-                mutated_route[idx1],
+            self.population = np.concatenate([self.population[:elite_count], children])
+            self.distances = np.concatenate(
+                [self.distances[:elite_count], self._route_distances(children)]
             )
 
-        return Individual(mutated_route, individual.stores)
+        self._sort_population()
+
+    def _tournament_selection(self, count: int) -> np.ndarray:
+        """Select ``count`` population indices using tournament selection"""
+        size = len(self.population)
+        candidates = self._rng.integers(
+            0, size, size=(count, self.config.tournament_size)
+        )
+        # Best fitness (lowest distance) wins each tournament
+        winners = np.argmin(self.distances[candidates], axis=1)
+        return candidates[np.arange(count), winners]
+
+    def _order_crossover(self, parent1: np.ndarray, parent2: np.ndarray) -> np.ndarray:
+        """Order crossover (OX) for a batch of parent pairs"""
+        return order_crossover(parent1, parent2, self._rng)
+
+    def _mutate(self, routes: np.ndarray):
+        """Swap mutation, applied in place to each route with mutation_rate"""
+        swap_mutation(routes, self.config.mutation_rate, self._rng)
 
     def get_optimization_stats(self) -> Dict[str, Any]:
         """Get detailed optimization statistics"""
@@ -335,7 +537,99 @@ class GeneticAlgorithm:
         }
 
 
-@lru_cache(maxsize=200_000)
-def _geodesic_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Cached geodesic distance in kilometers between two lat/lon points."""
-    return geodesic((lat1, lon1), (lat2, lon2)).kilometers
+def order_crossover(
+    parent1: np.ndarray, parent2: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Order crossover (OX) for a batch of parent pairs
+
+    Each child keeps a random slice of parent1 and takes the remaining
+    genes in parent2's order, starting after the slice. Genes already
+    used are tracked with a boolean mask instead of list membership.
+
+    Args:
+        parent1: (k, n) array of permutations donating the slice
+        parent2: (k, n) array of permutations donating the gene order
+        rng: Generator drawing the slice bounds
+
+    Returns:
+        (k, n) int32 array of child permutations
+    """
+    count, size = parent1.shape
+    rows = np.arange(count)[:, None]
+    positions = np.arange(size)[None, :]
+
+    # Select crossover points (start < end)
+    start = rng.integers(0, size - 1, size=count)
+    end = rng.integers(start + 1, size)
+    in_segment = (positions >= start[:, None]) & (positions < end[:, None])
+
+    # used[r, gene] is True when the gene sits in parent1's slice
+    used = np.zeros((count, size), dtype=bool)
+    np.put_along_axis(used, parent1, in_segment, axis=1)
+
+    # Walk parent2 and the child's open slots from the end of the slice
+    rotated = (positions + end[:, None]) % size
+    donor = np.take_along_axis(parent2, rotated, axis=1)
+    donor_keep = ~np.take_along_axis(used, donor, axis=1)
+    slot_open = ~np.take_along_axis(in_segment, rotated, axis=1)
+
+    child = np.where(in_segment, parent1, 0).astype(np.int32)
+    child[np.broadcast_to(rows, slot_open.shape)[slot_open], rotated[slot_open]] = (
+        donor[donor_keep]
+    )
+    return child
+
+
+def swap_mutation(routes: np.ndarray, rate: float, rng: np.random.Generator):
+    """Swap two random positions, in place, in each route with probability rate"""
+    count, size = routes.shape
+    mutate = np.flatnonzero(rng.random(count) < rate)
+    if not mutate.size or size < 2:
+        return
+
+    # Swap two distinct random positions
+    idx1 = rng.integers(0, size, size=mutate.size)
+    idx2 = (idx1 + rng.integers(1, size, size=mutate.size)) % size
+    genes1 = routes[mutate, idx1]
+    routes[mutate, idx1] = routes[mutate, idx2]
+    routes[mutate, idx2] = genes1
+
+
+def _evolve_island(
+    config: GeneticConfig,
+    distance_matrix: np.ndarray,
+    population: np.ndarray,
+    distances: np.ndarray,
+    rng: np.random.Generator,
+    generations: int,
+    expires: float = math.inf,
+) -> Tuple[np.ndarray, np.ndarray, np.random.Generator, List[float]]:
+    """Evolve one island for a number of generations or until ``expires``"""
+    ga = GeneticAlgorithm(config)
+    ga.distance_matrix = distance_matrix
+    ga.population = population
+    ga.distances = distances
+    ga._rng = rng
+
+    best_distances = []
+    for _ in range(generations):
+        if time.monotonic() >= expires:
+            break
+        ga._evolve_population()
+        best_distances.append(float(ga.distances[0]))
+    return ga.population, ga.distances, ga._rng, best_distances
+
+
+def _evolve_island_in_worker(
+    config: GeneticConfig,
+    population: np.ndarray,
+    distances: np.ndarray,
+    rng: np.random.Generator,
+    generations: int,
+    expires: float = math.inf,
+) -> Tuple[np.ndarray, np.ndarray, np.random.Generator, List[float]]:
+    """Process pool entry point using the shared distance matrix"""
+    return _evolve_island(
+        config, worker_matrix(), population, distances, rng, generations, expires
+    )
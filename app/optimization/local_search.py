@@ -0,0 +1,398 @@
+"""
+Local Search Engine for Route Optimization
+Neighbor-list driven 2-opt and Or-opt improvement with don't-look bits
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LocalSearchConfig:
+    """Configuration for the local search engine"""
+
+    neighbor_count: int = 10  # K nearest candidates examined per city
+    use_two_opt: bool = True
+    use_or_opt: bool = True
+    or_opt_max_segment: int = 3  # Longest segment moved by Or-opt
+    max_moves: int = 100_000  # Safety cap on applied improvements
+    min_gain: float = 1e-9
+
+    def __post_init__(self):
+        """Validate configuration parameters"""
+        if self.neighbor_count <= 0:
+            raise ValueError("Neighbor count must be positive")
+        if self.or_opt_max_segment <= 0:
+            raise ValueError("Or-opt segment length must be positive")
+        if self.max_moves <= 0:
+            raise ValueError("Max moves must be positive")
+
+
+def build_neighbor_lists(distance_matrix: np.ndarray, k: int) -> List[List[int]]:
+    """
+    Build K-nearest neighbor candidate lists from a distance matrix
+
+    Args:
+        distance_matrix: Square matrix of pairwise distances
+        k: Number of neighbors kept per city
+
+    Returns:
+        For each city, the indices of its k nearest other cities, closest first
+    """
+    n = distance_matrix.shape[0]
+    if n < 2:
+        return [[] for _ in range(n)]
+
+    k = min(k, n - 1)
+    masked = np.array(distance_matrix, dtype=float, copy=True)
+    np.fill_diagonal(masked, np.inf)
+
+    if k < n - 1:
+        candidates = np.argpartition(masked, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(n), (n, 1))
+        candidates = candidates[~np.eye(n, dtype=bool)].reshape(n, n - 1)
+
+    rows = np.arange(n)[:, None]
+    order = np.argsort(masked[rows, candidates], axis=1, kind="stable")
+    return candidates[rows, order].tolist()
+
+
+class LocalSearchOptimizer:
+    """
+    First-improvement local search over closed tours
+
+    Each city with its don't-look bit cleared is examined in turn; only its
+    K nearest neighbors are considered as partners for 2-opt and Or-opt
+    moves. Or-opt relocates a segment of up to ``or_opt_max_segment`` cities
+    between two adjacent cities in either orientation, which is the
+    segment-insertion subset of 3-opt. Cities touched by an applied move get
+    their don't-look bits cleared and are queued again.
+    """
+
+    def __init__(self, config: Optional[LocalSearchConfig] = None):
+        """Initialize local search with configuration"""
+        self.config = config or LocalSearchConfig()
+        self.moves_applied: Dict[str, int] = {"two_opt": 0, "or_opt": 0}
+
+    def improve(
+        self, tour: Sequence[int], distance_matrix: np.ndarray
+    ) -> Tuple[List[int], Dict[str, Any]]:
+        """
+        Improve a closed tour
+
+        Args:
+            tour: Permutation of all matrix indices, returning to the start
+            distance_matrix: Symmetric matrix of pairwise distances
+
+        Returns:
+            Tuple of (improved tour, search metrics)
+        """
+        start_time = time.time()
+        tour = [int(city) for city in tour]
+        n = len(tour)
+        self.moves_applied = {"two_opt": 0, "or_opt": 0}
+
+        d = np.asarray(distance_matrix, dtype=float).tolist()
+        initial_length = _tour_length(tour, d)
+
+        if n >= 4:
+            self._d = d
+            self._neighbors = build_neighbor_lists(
+                np.asarray(distance_matrix, dtype=float), self.config.neighbor_count
+            )
+            self._tour = tour
+            self._pos = [0] * n
+            for index, city in enumerate(tour):
+                self._pos[city] = index
+            self._run()
+            tour = self._tour
+
+        final_length = _tour_length(tour, d)
+        metrics = {
+            "algorithm": "local_search",
+            "initial_distance": initial_length,
+            "final_distance": final_length,
+            "improvement_percent": (
+                (initial_length - final_length) / initial_length * 100
+                if initial_length > 0
+                else 0.0
+            ),
+            "two_opt_moves": self.moves_applied["two_opt"],
+            "or_opt_moves": self.moves_applied["or_opt"],
+            "optimization_time": time.time() - start_time,
+        }
+        return tour, metrics
+
+    def improve_path(
+        self,
+        route: Sequence[int],
+        distance_matrix: np.ndarray,
+        fixed_start: bool = False,
+        fixed_end: bool = False,
+    ) -> Tuple[List[int], Dict[str, Any]]:
+        """
+        Improve an open path by searching over a tour with a dummy city
+
+        The dummy city is free to reach every real city, so the closed tour
+        through it has the same length as the open path. Pinned endpoints are
+        enforced by making every other dummy edge expensive.
+
+        Args:
+            route: Permutation of all matrix indices in visiting order
+            distance_matrix: Symmetric matrix of pairwise distances
+            fixed_start: Keep ``route[0]`` as the first city
+            fixed_end: Keep ``route[-1]`` as the last city
+
+        Returns:
+            Tuple of (improved path, search metrics)
+        """
+        route = [int(city) for city in route]
+        matrix = np.asarray(distance_matrix, dtype=float)
+        n = matrix.shape[0]
+        dummy = n
+
+        extended = np.zeros((n + 1, n + 1), dtype=float)
+        extended[:n, :n] = matrix
+        if fixed_start or fixed_end:
+            penalty = float(matrix.max()) * (n + 1) + 1.0
+            extended[dummy, :n] = penalty
+            if fixed_start:
+                extended[dummy, route[0]] = 0.0
+            if fixed_end:
+                extended[dummy, route[-1]] = 0.0
+            extended[:n, dummy] = extended[dummy, :n]
+
+        tour, metrics = self.improve(route + [dummy], extended)
+
+        split = tour.index(dummy)
+        path = tour[split + 1 :] + tour[:split]
+        if (fixed_start and path[0] != route[0]) or (fixed_end and path[-1] != route[-1]):
+            path.reverse()
+
+        metrics["initial_distance"] = _path_length(route, matrix)
+        metrics["final_distance"] = _path_length(path, matrix)
+        metrics["improvement_percent"] = (
+            (metrics["initial_distance"] - metrics["final_distance"])
+            / metrics["initial_distance"]
+            * 100
+            if metrics["initial_distance"] > 0
+            else 0.0
+        )
+        return path, metrics
+
+    # Search loop
+
+    def _run(self) -> None:
+        """Process the don't-look queue until no city yields an improvement"""
+        n = len(self._tour)
+        queue = deque(self._tour)
+        self._queued = [True] * n
+        self._queue = queue
+        moves = 0
+
+        while queue and moves < self.config.max_moves:
+            city = queue.popleft()
+            self._queued[city] = False
+
+            if self.config.use_two_opt and self._try_two_opt(city):
+                moves += 1
+                continue
+            if self.config.use_or_opt and self._try_or_opt(city):
+                moves += 1
+
+    def _wake(self, *cities: int) -> None:
+        """Clear the don't-look bits of the given cities"""
+        for city in cities:
+            if not self._queued[city]:
+                self._queued[city] = True
+                self._queue.append(city)
+
+    def _next(self, city: int) -> int:
+        tour = self._tour
+        return tour[(self._pos[city] + 1) % len(tour)]
+
+    def _prev(self, city: int) -> int:
+        tour = self._tour
+        return tour[self._pos[city] - 1]
+
+    # 2-opt
+
+    def _try_two_opt(self, a: int) -> bool:
+        """Apply the first improving 2-opt move that adds an edge at ``a``"""
+        d = self._d
+        min_gain = self.config.min_gain
+
+        for forward in (True, False):
+            a_adj = self._next(a) if forward else self._prev(a)
+            d_removed = d[a][a_adj]
+
+            for c in self._neighbors[a]:
+                g1 = d_removed - d[a][c]
+                if g1 <= min_gain:
+                    break  # Neighbors are sorted, no later candidate helps
+                c_adj = self._next(c) if forward else self._prev(c)
+                if c == a_adj or c_adj == a:
+                    continue
+
+                gain = g1 + d[c][c_adj] - d[a_adj][c_adj]
+                if gain > min_gain:
+                    if forward:
+                        self._reverse(a_adj, c)
+                    else:
+                        self._reverse(c, a_adj)
+                    self.moves_applied["two_opt"] += 1
+                    self._wake(a, a_adj, c, c_adj)
+                    return True
+        return False
+
+    def _reverse(self, first: int, last: int) -> None:
+        """Reverse the tour segment running forward from ``first`` to ``last``"""
+        tour = self._tour
+        pos = self._pos
+        n = len(tour)
+
+        i = pos[first]
+        j = pos[last]
+        length = (j - i) % n + 1
+        if length * 2 > n:
+            # Reversing the complement yields the same tour, with fewer swaps
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+
+        for _ in range(length // 2):
+            ci, cj = tour[i], tour[j]
+            tour[i], tour[j] = cj, ci
+            pos[cj], pos[ci] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    # Or-opt
+
+    def _try_or_opt(self, a: int) -> bool:
+        """Apply the first improving relocation of a segment starting at ``a``"""
+        d = self._d
+        min_gain = self.config.min_gain
+        max_length = min(self.config.or_opt_max_segment, len(self._tour) - 3)
+
+        for forward in (True, False):
+            step = self._next if forward else self._prev
+            back = self._prev if forward else self._next
+            segment = [a]
+            while True:
+                # Single cities are identical in both directions, try them once
+                if forward or len(segment) > 1:
+                    first, last = segment[0], segment[-1]
+                    before, after = back(first), step(last)
+                    removal_gain = d[before][first] + d[last][after] - d[before][after]
+                    if removal_gain > min_gain:
+                        move = self._find_insertion(segment, removal_gain)
+                        if move is not None:
+                            u, v, head = move
+                            self._relocate(segment, u, head)
+                            self.moves_applied["or_opt"] += 1
+                            self._wake(before, after, first, last, u, v)
+                            return True
+                if len(segment) >= max_length:
+                    break
+                segment.append(step(segment[-1]))
+        return False
+
+    def _find_insertion(
+        self, segment: List[int], removal_gain: float
+    ) -> Optional[Tuple[int, int, int]]:
+        """Find an edge (u, v) where inserting ``segment`` saves distance"""
+        d = self._d
+        min_gain = self.config.min_gain
+        members = set(segment)
+        ends = (segment[0], segment[-1])
+
+        for end in ends:
+            other = ends[1] if end == ends[0] else ends[0]
+            for c in self._neighbors[end]:
+                if d[c][end] >= removal_gain:
+                    break
+                if c in members:
+                    continue
+                # Attach ``end`` to ``c`` on either side of it
+                for u, v in ((c, self._next(c)), (self._prev(c), c)):
+                    if u in members or v in members:
+                        continue
+                    if u == c:
+                        added = d[u][end] + d[other][v] - d[u][v]
+                        head = end
+                    else:
+                        added = d[u][other] + d[end][v] - d[u][v]
+                        head = other
+                    if removal_gain - added > min_gain:
+                        return u, v, head
+        return None
+
+    def _relocate(self, segment: List[int], u: int, head: int) -> None:
+        """Move ``segment`` to follow city u, with ``head`` adjacent to u"""
+        members = set(segment)
+        rest = [city for city in self._tour if city not in members]
+        ordered = segment if head == segment[0] else segment[::-1]
+
+        index = rest.index(u) + 1
+        rest[index:index] = ordered
+
+        self._tour[:] = rest
+        for position, city in enumerate(rest):
+            self._pos[city] = position
+
+
+def _tour_length(tour: Sequence[int], d: List[List[float]]) -> float:
+    """Length of a closed tour using a nested-list distance matrix"""
+    if len(tour) < 2:
+        return 0.0
+    return float(sum(d[tour[i - 1]][tour[i]] for i in range(len(tour))))
+
+
+def _path_length(path: Sequence[int], matrix: np.ndarray) -> float:
+    """Length of an open path using a distance matrix"""
+    if len(path) < 2:
+        return 0.0
+    order = np.asarray(path, dtype=np.intp)
+    return float(matrix[order[:-1], order[1:]].sum())
+
+
+def create_local_search_optimizer(
+    neighbor_count: int = 10, or_opt_max_segment: int = 3
+) -> LocalSearchOptimizer:
+    """Create a local search optimizer with the given candidate settings"""
+    return LocalSearchOptimizer(
+        LocalSearchConfig(neighbor_count=neighbor_count, or_opt_max_segment=or_opt_max_segment)
+    )
+
+
+def polish_route(
+    stores: List[Dict[str, Any]],
+    distance_matrix: np.ndarray,
+    fixed_start: bool = False,
+    optimizer: Optional[LocalSearchOptimizer] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Polish an ordered list of stores as an open path
+
+    Args:
+        stores: Stores in visiting order
+        distance_matrix: Pairwise distances aligned with ``stores``
+        fixed_start: Keep the first store in place
+        optimizer: Optional pre-configured optimizer
+
+    Returns:
+        Tuple of (reordered stores, search metrics)
+    """
+    optimizer = optimizer or LocalSearchOptimizer()
+    order, metrics = optimizer.improve_path(
+        list(range(len(stores))), distance_matrix, fixed_start=fixed_start
+    )
+    return [stores[i] for i in order], metrics
@@ -15,6 +15,9 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import mean_squared_error, accuracy_score
 import os
 
+from app.models.store_table import StoreTable
+from app.services.distance_service import haversine_matrix
+
 logger = logging.getLogger(__name__)
 
 
@@ -142,95 +145,41 @@ class MLRoutePredictor:
             # Basic route features
             features.num_stores = len(stores)
 
-            # Geographic features with error handling
-            lats = []
-            lons = []
-
-            for i, store in enumerate(stores):
-                try:
-                    lat = store.get("lat", store.get("latitude"))
-                    lon = store.get("lon", store.get("longitude"))
-
-                    # Validate coordinates
-                    if lat is not None and lon is not None:
-                        lat_float = float(lat)
-                        lon_float = float(lon)
-
-                        # Check if coordinates are within valid range
-                        if -90 <= lat_float <= 90 and -180 <= lon_float <= 180:
-                            lats.append(lat_float)
-                            lons.append(lon_float)
-                        else:
-                            logger.warning(
-                                f"Invalid coordinates for store {i}: lat={lat}, lon={lon}"
-                            )
-                    else:
-                        logger.warning(f"Missing coordinates for store {i}")
-
-                except (ValueError, TypeError) as e:
-                    logger.warning(f"Error parsing coordinates for store {i}: {e}")
-                    continue
-
-            # Calculate geographic spread safely
-            if len(lats) >= 2 and len(lons) >= 2:
-                try:
-                    features.geographic_spread = np.std(lats) + np.std(lons)
-                except Exception as e:
-                    logger.error(f"Error calculating geographic spread: {e}")
-                    features.geographic_spread = 0.0
-
-            # Distance calculations with error handling
-            distances = []
-            for i in range(len(lats)):
-                for j in range(i + 1, len(lats)):
-                    try:
-                        dist = self._calculate_distance(
-                            lats[i], lons[i], lats[j], lons[j]
-                        )
-                        if dist is not None and dist > 0:
-                            distances.append(dist)
-                    except Exception as e:
-                        logger.warning(
-                            f"Error calculating distance between stores {i} and {j}: {e}"
-                        )
-                        continue
-
-            # Calculate distance-based features safely
-            if distances:
-                try:
-                    features.total_distance = sum(distances)
-                    features.avg_distance_between_stores = np.mean(distances)
-                except Exception as e:
-                    logger.error(f"Error calculating distance features: {e}")
-                    features.total_distance = 0.0
-                    features.avg_distance_between_stores = 0.0
-
-            # Priority and demand features with error handling
-            try:
-                priorities = []
-                demands = []
-
-                for store in stores:
-                    try:
-                        priority = float(store.get("priority", 1))
-                        demand = float(store.get("demand", 0))
-                        priorities.append(priority)
-                        demands.append(demand)
-                    except (ValueError, TypeError):
-                        priorities.append(1.0)  # Default priority
-                        demands.append(0.0)  # Default demand
-
-                features.priority_score = sum(
-                    p * (len(stores) - i) for i, p in enumerate(priorities)
+            # Geographic features from the columnar store view
+            table = StoreTable.ensure(stores)
+            coords = table.coordinates
+            valid = (
+                np.isfinite(coords).all(axis=1)
+                & (np.abs(coords[:, 0]) <= 90)
+                & (np.abs(coords[:, 1]) <= 180)
+            )
+            if not valid.all():
+                logger.warning(
+                    f"Missing or invalid coordinates for {int((~valid).sum())} stores"
                 )
-                features.demand_total = sum(demands)
-                features.demand_variance = np.var(demands) if demands else 0.0
+            lats, lons = coords[valid, 0], coords[valid, 1]
 
-            except Exception as e:
-                logger.error(f"Error calculating priority/demand features: {e}")
-                features.priority_score = len(stores)  # Default
-                features.demand_total = 0.0
-                features.demand_variance = 0.0
+            # Calculate geographic spread safely
+            if len(lats) >= 2:
+                features.geographic_spread = np.std(lats) + np.std(lons)
+
+            # Pairwise distances in one vectorized pass
+            if len(lats) >= 2:
+                upper = np.triu_indices(len(lats), k=1)
+                distances = haversine_matrix(coords[valid])[upper]
+                distances = distances[distances > 0]
+                if distances.size:
+                    features.total_distance = float(distances.sum())
+                    features.avg_distance_between_stores = float(distances.mean())
+
+            # Priority and demand features
+            priorities = table.column("priority", 1.0)
+            demands = table.column("demand", 0.0)
+            features.priority_score = float(
+                np.dot(priorities, np.arange(len(stores), 0, -1))
+            )
+            features.demand_total = float(demands.sum())
+            features.demand_variance = float(np.var(demands))
 
             # Temporal features with error handling
             try:
@@ -273,26 +222,6 @@ class MLRoutePredictor:
 
         return features
 
-    def _calculate_distance(
-        self, lat1: float, lon1: float, lat2: float, lon2: float
-    ) -> float:
-        """Calculate Haversine distance between two points"""
-        import math
-
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        )
-        c = 2 * math.asin(math.sqrt(a))
-
-        return c * 6371  # Earth's radius in km
-
     def add_training_data(
         self,
         stores: List[Dict[str, Any]],
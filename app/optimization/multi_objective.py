@@ -3,17 +3,39 @@ Multi-Objective Optimization for Route Planning
 Implements NSGA-II (Non-dominated Sorting Genetic Algorithm II) for Pareto-optimal solutions
 """
 
-import random
 import math
 import time
 import logging
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
-from collections import defaultdict
 import numpy as np
 
+from app.models.store_table import StoreTable
+from app.optimization.anytime import Deadline, ProgressCallback, report_progress
+from app.optimization.genetic_algorithm import order_crossover, swap_mutation
+from app.services.distance_service import CoordinateExtractor, build_distance_matrix
+
+try:
+    # Best-effort deterministic seeding if RFR_SEED is set
+    from app.utils.random_seed import seed_all_from_env
+except Exception:  # pragma: no cover - utility optional
+
+    def seed_all_from_env(default=None):  # type: ignore
+        return None
+
+
 logger = logging.getLogger(__name__)
 
+# Objectives the optimizer knows how to evaluate
+OBJECTIVE_NAMES = (
+    "distance",
+    "time",
+    "priority",
+    "fuel_cost",
+    "delivery_windows",
+    "vehicle_capacity",
+)
+
 
 @dataclass
 class MultiObjectiveConfig:
@@ -25,6 +47,8 @@ class MultiObjectiveConfig:
     crossover_rate: float = 0.9
     tournament_size: int = 2
     objectives: List[str] = None  # ['distance', 'time', 'priority', 'fuel_cost']
+    archive_size: int = 100  # Non-dominated routes kept across generations
+    time_budget_seconds: Optional[float] = None  # Stop early, keeping the front
 
     def __post_init__(self):
         if self.objectives is None:
@@ -36,6 +60,10 @@ class MultiObjectiveConfig:
             raise ValueError("Mutation rate must be between 0 and 1")
         if not 0 < self.crossover_rate < 1:
             raise ValueError("Crossover rate must be between 0 and 1")
+        if self.archive_size < 1:
+            raise ValueError("Archive size must be at least 1")
+        if self.time_budget_seconds is not None and self.time_budget_seconds <= 0:
+            raise ValueError("Time budget must be positive")
 
 
 @dataclass
@@ -54,6 +82,168 @@ class MultiObjectiveMetrics:
     best_compromise_solution: Dict[str, Any] = None
 
 
+def non_dominated_sort(values: np.ndarray) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Sort objective vectors into non-dominated fronts (minimization)
+
+    Dominance between every pair is decided in one broadcast comparison;
+    fronts are then peeled off by decrementing domination counts with
+    whole-row sums.
+
+    Args:
+        values: (m, k) array of objective vectors
+
+    Returns:
+        Tuple of (fronts as index arrays, front rank of each vector)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+
+    # dominates[i, j]: i is no worse everywhere and better somewhere than j
+    left, right = values[:, None, :], values[None, :, :]
+    dominates = (left <= right).all(axis=2) & (left < right).any(axis=2)
+    dominated_count = dominates.sum(axis=0)
+
+    ranks = np.empty(n, dtype=np.intp)
+    fronts = []
+    current = np.flatnonzero(dominated_count == 0)
+    while current.size:
+        ranks[current] = len(fronts)
+        fronts.append(current)
+        dominated_count = dominated_count - dominates[current].sum(axis=0)
+        # Members of assigned fronts can never reach zero again
+        dominated_count[current] = -1
+        current = np.flatnonzero(dominated_count == 0)
+
+    return fronts, ranks
+
+
+def crowding_distance(fronts: List[np.ndarray], values: np.ndarray) -> np.ndarray:
+    """NSGA-II crowding distance of every vector within its front"""
+    distances = np.zeros(len(values))
+
+    for front in fronts:
+        if len(front) <= 2:
+            distances[front] = np.inf
+            continue
+
+        # For each objective
+        for column in range(values.shape[1]):
+            # Sort by objective value
+            order = front[np.argsort(values[front, column], kind="stable")]
+            sorted_values = values[order, column]
+
+            # Set boundary points to infinity
+            distances[order[[0, -1]]] = np.inf
+
+            # Calculate range
+            obj_range = sorted_values[-1] - sorted_values[0]
+            if obj_range == 0:
+                continue
+
+            distances[order[1:-1]] += (
+                sorted_values[2:] - sorted_values[:-2]
+            ) / obj_range
+
+    return distances
+
+
+def hypervolume(points: np.ndarray, reference: np.ndarray) -> float:
+    """
+    Exact hypervolume dominated by a point set (minimization)
+
+    Uses the WFG algorithm: the volume is the sum of each point's exclusive
+    contribution, computed as its own box minus the hypervolume of the
+    remaining points clipped to that box. Two objectives reduce to a sorted
+    sweep, which also serves as the recursion's base case.
+
+    Args:
+        points: (m, k) array of objective vectors
+        reference: Length-k reference point, worse than every point of interest
+
+    Returns:
+        Volume of the region dominated by the points and bounded by the reference
+    """
+    reference = np.asarray(reference, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(reference))
+    # Points not strictly better than the reference contribute nothing
+    points = points[(points < reference).all(axis=1)]
+    if not len(points):
+        return 0.0
+    return float(_wfg(_non_dominated(points), reference))
+
+
+def _non_dominated(points: np.ndarray) -> np.ndarray:
+    """Distinct non-dominated rows of a point set"""
+    points = np.unique(points, axis=0)
+    fronts, _ = non_dominated_sort(points)
+    return points[fronts[0]]
+
+
+def _wfg(points: np.ndarray, reference: np.ndarray) -> float:
+    """Hypervolume of a non-dominated point set"""
+    if points.shape[1] == 1:
+        return reference[0] - points[:, 0].min()
+    if points.shape[1] == 2:
+        # Sweep along the first objective, tracking the best second objective
+        order = np.argsort(points[:, 0], kind="stable")
+        xs, ys = points[order, 0], np.minimum.accumulate(points[order, 1])
+        widths = np.diff(np.append(xs, reference[0]))
+        return float((widths * (reference[1] - ys)).sum())
+
+    # Visiting points worst-first in one objective keeps limit sets small
+    points = points[np.argsort(-points[:, -1], kind="stable")]
+    total = 0.0
+    for i, point in enumerate(points):
+        box = np.prod(reference - point)
+        rest = points[i + 1 :]
+        if len(rest):
+            box -= _wfg(_non_dominated(np.maximum(rest, point)), reference)
+        total += box
+    return total
+
+
+class ParetoArchive:
+    """
+    Bounded set of mutually non-dominated routes kept across generations
+
+    Each update merges new routes into the archive, drops duplicates and
+    dominated routes, and when over capacity keeps the least crowded ones.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.routes: Optional[np.ndarray] = None
+        self.objectives: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return 0 if self.routes is None else len(self.routes)
+
+    def update(self, routes: np.ndarray, objectives: np.ndarray):
+        """
+        Merge a batch of evaluated routes into the archive
+
+        Args:
+            routes: (m, n) array of route permutations
+            objectives: (m, k) array of their objective vectors
+        """
+        if self.routes is not None:
+            routes = np.concatenate([self.routes, routes])
+            objectives = np.concatenate([self.objectives, objectives])
+
+        _, unique = np.unique(routes, axis=0, return_index=True)
+        unique.sort()
+        routes, objectives = routes[unique], objectives[unique]
+
+        fronts, _ = non_dominated_sort(objectives)
+        keep = fronts[0]
+        if len(keep) > self.max_size:
+            crowding = crowding_distance([np.arange(len(keep))], objectives[keep])
+            keep = np.sort(keep[np.argsort(-crowding, kind="stable")[: self.max_size]])
+
+        self.routes, self.objectives = routes[keep], objectives[keep]
+
+
 class MultiObjectiveOptimizer:
     """
     Multi-Objective optimizer using NSGA-II algorithm
@@ -73,6 +263,11 @@ class MultiObjectiveOptimizer:
         self.metrics = MultiObjectiveMetrics()
         self.distance_matrix = None
         self.stores = None
+        self.archive = ParetoArchive(config.archive_size)
+        self._best_compromise = 0
+        self._rng = np.random.default_rng()
+        self._generations_run = 0
+        self.stopped_by_deadline = False
 
         # Objective functions
         self.objective_functions = {
@@ -89,69 +284,110 @@ class MultiObjectiveOptimizer:
         )
 
     def optimize(
-        self, stores: List[Dict[str, Any]], constraints: Optional[Dict[str, Any]] = None
+        self,
+        stores: List[Dict[str, Any]],
+        constraints: Optional[Dict[str, Any]] = None,
+        distance_matrix: Optional[np.ndarray] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Optimize route using multi-objective approach
 
+        Evolution stops after ``config.time_budget_seconds`` if set, and the
+        best compromise is chosen from the Pareto front found so far.
+
         Args:
             stores: List of store dictionaries
             constraints: Optional constraints dictionary
+            distance_matrix: Precomputed distance matrix for ``stores``
+            progress_callback: Called whenever the shortest route in the
+                Pareto archive improves
 
         Returns:
             Tuple of (best_compromise_route, metrics_dict)
         """
+        # Apply deterministic seeding if configured
+        self._rng = np.random.default_rng(seed_all_from_env())
+        deadline = Deadline(self.config.time_budget_seconds)
+        self.stopped_by_deadline = False
+
         start_time = time.time()
 
         try:
             if len(stores) < 2:
                 raise ValueError("At least 2 stores required for optimization")
 
+            stores = StoreTable.ensure(stores)
             self.stores = stores
-            self.distance_matrix = self._create_distance_matrix(stores)
+            if distance_matrix is None:
+                distance_matrix = self._create_distance_matrix(stores)
+            self.distance_matrix = distance_matrix
+            self._load_store_attributes(stores)
+            self.archive = ParetoArchive(self.config.archive_size)
 
             # Initialize population
             population = self._initialize_population()
 
             # Evolutionary loop
+            reported_distance = math.inf
+            self._generations_run = 0
             for generation in range(self.config.generations):
+                if deadline.expired():
+                    self.stopped_by_deadline = True
+                    break
+
                 # Evaluate objectives for all individuals
                 objective_values = self._evaluate_population(population)
+                self.archive.update(population, objective_values)
+                self._generations_run = generation + 1
+
+                if progress_callback is not None:
+                    distances = self._calculate_total_distance(self.archive.routes)
+                    shortest = int(np.argmin(distances))
+                    if distances[shortest] < reported_distance:
+                        reported_distance = float(distances[shortest])
+                        report_progress(
+                            progress_callback,
+                            "multi_objective",
+                            generation,
+                            reported_distance,
+                            self.archive.routes[shortest],
+                            deadline,
+                        )
 
                 # Non-dominated sorting and crowding distance
-                fronts = self._non_dominated_sort(objective_values)
+                fronts, ranks = self._non_dominated_sort(objective_values)
                 crowding_distances = self._calculate_crowding_distance(
                     fronts, objective_values
                 )
 
                 # Selection, crossover, and mutation
-                new_population = self._evolutionary_operators(
-                    population, fronts, crowding_distances
+                population = self._evolutionary_operators(
+                    population, ranks, crowding_distances
                 )
-                population = new_population
 
                 # Log progress
                 if generation % 20 == 0:
                     logger.debug(
-                        f"Generation {generation}: Pareto front size = {len(fronts[0])}"
+                        f"Generation {generation}: Pareto front size = "
+                        f"{len(fronts[0])}, archive size = {len(self.archive)}"
                     )
 
-            # Final evaluation and Pareto front extraction
-            final_objectives = self._evaluate_population(population)
-            final_fronts = self._non_dominated_sort(final_objectives)
-            pareto_front = final_fronts[0]
+            # Final evaluation; the archive holds the Pareto front found so far
+            self.archive.update(population, self._evaluate_population(population))
+            archive_objectives = self.archive.objectives
+            pareto_front = np.arange(len(self.archive))
 
             # Select best compromise solution
-            best_compromise_idx = self._select_best_compromise(
-                pareto_front, final_objectives
+            self._best_compromise = self._select_best_compromise(
+                pareto_front, archive_objectives
             )
-            best_route_indices = population[best_compromise_idx]
-            best_route = [stores[i] for i in best_route_indices]
+            best_route = [stores[i] for i in self.archive.routes[self._best_compromise]]
 
             # Calculate metrics
             processing_time = time.time() - start_time
             metrics_dict = self._calculate_metrics(
-                pareto_front, final_objectives, processing_time, best_compromise_idx
+                pareto_front, archive_objectives, processing_time, self._best_compromise
             )
 
             logger.info(
@@ -170,293 +406,109 @@ class MultiObjectiveOptimizer:
                 "processing_time": processing_time,
             }
 
-    def _initialize_population(self) -> List[List[int]]:
-        """Initialize random population of route permutations"""
-        population = []
-        n_stores = len(self.stores)
-
-        for _ in range(self.config.population_size):
-            route = list(range(n_stores))
-            random.shuffle(route)
-            population.append(route)
-
-        return population
-
-    def _evaluate_population(self, population: List[List[int]]) -> List[List[float]]:
-        """Evaluate all objectives for each individual in population"""
-        objective_values = []
-
-        for individual in population:
-            values = []
-            for objective in self.config.objectives:
-                if objective in self.objective_functions:
-                    value = self.objective_functions[objective](individual)
-                    values.append(value)
-                else:
-                    logger.warning(f"Unknown objective: {objective}")
-                    values.append(0.0)
-            objective_values.append(values)
+    def _load_store_attributes(self, stores: List[Dict[str, Any]]):
+        """Gather per-store objective inputs into arrays indexed by store"""
+
+        table = StoreTable.ensure(stores)
+        self._priorities = table.column("priority", 1)
+        self._earliest = table.column("window_start", 8.0)
+        self._latest = table.column("window_end", 18.0)
+        self._service_times = table.column("service_time", 0.5)
+        self._demands = table.column("demand", 10.0)
+
+    def _initialize_population(self) -> np.ndarray:
+        """Initialize a (population_size, n) array of random route permutations"""
+        keys = self._rng.random((self.config.population_size, len(self.stores)))
+        return np.argsort(keys, axis=1).astype(np.int32)
+
+    def _evaluate_population(self, population: np.ndarray) -> np.ndarray:
+        """Evaluate every objective for the whole population as a (pop, k) matrix"""
+        objective_values = np.zeros((len(population), len(self.config.objectives)))
+
+        for column, objective in enumerate(self.config.objectives):
+            if objective in self.objective_functions:
+                objective_values[:, column] = self.objective_functions[objective](
+                    population
+                )
+            else:
+                logger.warning(f"Unknown objective: {objective}")
 
         return objective_values
 
     def _non_dominated_sort(
-        self, objective_values: List[List[float]]
-    ) -> List[List[int]]:
+        self, objective_values: np.ndarray
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
         """Perform non-dominated sorting (NSGA-II)"""
-        n = len(objective_values)
-        dominated_count = [0] * n
-        dominates = [[] for _ in range(n)]
-        fronts = [[] for _ in range(n)]
-
-        # Find domination relationships
-        for i in range(n):
-            for j in range(n):
-                if i != j:
-                    if self._dominates(objective_values[i], objective_values[j]):
-                        dominates[i].append(j)
-                    elif self._dominates(objective_values[j], objective_values[i]):
-                        dominated_count[i] += 1
-
-        # First front (non-dominated solutions)
-        current_front = 0
-        for i in range(n):
-            if dominated_count[i] == 0:
-                fronts[current_front].append(i)
-
-        # Subsequent fronts
-        while fronts[current_front]:
-            next_front = []
-            for i in fronts[current_front]:
-                for j in dominates[i]:
-                    dominated_count[j] -= 1
-                    if dominated_count[j] == 0:
-                        next_front.append(j)
-            current_front += 1
-            fronts[current_front] = next_front
-
-        # Return only non-empty fronts
-        return [front for front in fronts if front]
-
-    def _dominates(self, obj1: List[float], obj2: List[float]) -> bool:
-        """Check if obj1 dominates obj2 (minimization assumed)"""
-        better_in_at_least_one = False
-        for i in range(len(obj1)):
-            if obj1[i] > obj2[i]:  # obj1 is worse in this objective
-                return False
-            if obj1[i] < obj2[i]:  # obj1 is better in this objective
-                better_in_at_least_one = True
-        return better_in_at_least_one
+        return non_dominated_sort(objective_values)
 
     def _calculate_crowding_distance(
-        self, fronts: List[List[int]], objective_values: List[List[float]]
-    ) -> List[float]:
+        self, fronts: List[np.ndarray], objective_values: np.ndarray
+    ) -> np.ndarray:
         """Calculate crowding distance for diversity preservation"""
-        n = len(objective_values)
-        distances = [0.0] * n
-
-        for front in fronts:
-            if len(front) <= 2:
-                for idx in front:
-                    distances[idx] = float("inf")
-                continue
-
-            # For each objective
-            for obj_idx in range(len(self.config.objectives)):
-                # Sort by objective value
-                front_sorted = sorted(front, key=lambda x: objective_values[x][obj_idx])
-
-                # Set boundary points to infinity
-                distances[front_sorted[0]] = float("inf")
-                distances[front_sorted[-1]] = float("inf")
-
-                # Calculate range
-                obj_range = (
-                    objective_values[front_sorted[-1]][obj_idx]
-                    - objective_values[front_sorted[0]][obj_idx]
-                )
-                if obj_range == 0:
-                    continue
-
-                # Calculate crowding distance
-                for i in range(1, len(front_sorted) - 1):
-                    distances[front_sorted[i]] += (
-                        objective_values[front_sorted[i + 1]][obj_idx]
-                        - objective_values[front_sorted[i - 1]][obj_idx]
-                    ) / obj_range
-
-        return distances
+        return crowding_distance(fronts, objective_values)
 
     def _evolutionary_operators(
         self,
-        population: List[List[int]],
-        fronts: List[List[int]],
-        crowding_distances: List[float],
-    ) -> List[List[int]]:
+        population: np.ndarray,
+        ranks: np.ndarray,
+        crowding_distances: np.ndarray,
+    ) -> np.ndarray:
         """Apply selection, crossover, and mutation"""
-        new_population = []
+        size = self.config.population_size
+
+        # Standing of each individual: by front rank, then wider crowding first
+        order = np.lexsort((-crowding_distances, ranks))
+        standing = np.empty(len(population), dtype=np.intp)
+        standing[order] = np.arange(len(population))
 
         # Elitism: keep the best solutions
-        elite_size = self.config.population_size // 4
-        elite_indices = self._select_elite(fronts, crowding_distances, elite_size)
-        for idx in elite_indices:
-            new_population.append(population[idx][:])
+        elite = population[order[: size // 4]]
 
         # Generate offspring through crossover and mutation
-        while len(new_population) < self.config.population_size:
-            # Tournament selection
-            parent1_idx = self._tournament_selection(
-                population, fronts, crowding_distances
-            )
-            parent2_idx = self._tournament_selection(
-                population, fronts, crowding_distances
-            )
-
-            # Crossover
-            if random.random() < self.config.crossover_rate:
-                child1, child2 = self._crossover(
-                    population[parent1_idx], population[parent2_idx]
-                )
-            else:
-                child1, child2 = population[parent1_idx][:], population[parent2_idx][:]
-
-            # Mutation
-            if random.random() < self.config.mutation_rate:
-                child1 = self._mutate(child1)
-            if random.random() < self.config.mutation_rate:
-                child2 = self._mutate(child2)
-
-            new_population.extend([child1, child2])
-
-        return new_population[: self.config.population_size]
-
-    def _select_elite(
-        self, fronts: List[List[int]], crowding_distances: List[float], elite_size: int
-    ) -> List[int]:
-        """Select elite solutions based on front rank and crowding distance"""
-        elite = []
-
-        for front in fronts:
-            if len(elite) >= elite_size:
-                break
-
-            # Sort by crowding distance (descending)
-            front_sorted = sorted(
-                front, key=lambda x: crowding_distances[x], reverse=True
-            )
-
-            remaining = elite_size - len(elite)
-            elite.extend(front_sorted[:remaining])
-
-        return elite
-
-    def _tournament_selection(
-        self,
-        population: List[List[int]],
-        fronts: List[List[int]],
-        crowding_distances: List[float],
-    ) -> int:
-        """Tournament selection based on dominance and crowding distance"""
-        candidates = random.sample(
-            range(len(population)), min(self.config.tournament_size, len(population))
+        pairs = (size - len(elite) + 1) // 2
+        parents1 = population[self._tournament_selection(standing, pairs)]
+        parents2 = population[self._tournament_selection(standing, pairs)]
+
+        # Crossover
+        crossover = self._rng.random(pairs) < self.config.crossover_rate
+        children1, children2 = parents1.copy(), parents2.copy()
+        if crossover.any():
+            p1, p2 = parents1[crossover], parents2[crossover]
+            children1[crossover] = order_crossover(p1, p2, self._rng)
+            children2[crossover] = order_crossover(p2, p1, self._rng)
+
+        # Mutation
+        children = np.concatenate([children1, children2])
+        swap_mutation(children, self.config.mutation_rate, self._rng)
+
+        return np.concatenate([elite, children])[:size]
+
+    def _tournament_selection(self, standing: np.ndarray, count: int) -> np.ndarray:
+        """Select ``count`` indices; the best-standing candidate wins each tournament"""
+        size = len(standing)
+        candidates = self._rng.integers(
+            0, size, size=(count, min(self.config.tournament_size, size))
         )
-
-        best_candidate = candidates[0]
-        best_front = self._get_front_rank(best_candidate, fronts)
-
-        for candidate in candidates[1:]:
-            candidate_front = self._get_front_rank(candidate, fronts)
-
-            if candidate_front < best_front or (
-                candidate_front == best_front
-                and crowding_distances[candidate] > crowding_distances[best_candidate]
-            ):
-                best_candidate = candidate
-                best_front = candidate_front
-
-        return best_candidate
-
-    def _get_front_rank(self, individual_idx: int, fronts: List[List[int]]) -> int:
-        """Get the front rank of an individual"""
-        for rank, front in enumerate(fronts):
-            if individual_idx in front:
-                return rank
-        return len(fronts)
-
-    def _crossover(
-        self, parent1: List[int], parent2: List[int]
-    ) -> Tuple[List[int], List[int]]:
-        """Order crossover (OX) for permutation representation"""
-        n = len(parent1)
-
-        # Choose crossover points
-        start, end = sorted(random.sample(range(n), 2))
-
-        # Create offspring
-        child1 = [-1] * n
-        child2 = [-1] * n
-
-        # Copy segments
-        child1[start:end] = parent1[start:end]
-        child2[start:end] = parent2[start:end]
-
-        # Fill remaining positions
-        self._fill_remaining(child1, parent2, start, end)
-        self._fill_remaining(child2, parent1, start, end)
-
-        return child1, child2
-
-    def _fill_remaining(
-        self, child: List[int], parent: List[int], start: int, end: int
-    ):
-        """Fill remaining positions in order crossover"""
-        child_set = set(child[start:end])
-        parent_filtered = [x for x in parent if x not in child_set]
-
-        idx = 0
-        for i in range(len(child)):
-            if child[i] == -1:
-                child[i] = parent_filtered[idx]
-                idx += 1
-
-    def _mutate(self, individual: List[int]) -> List[int]:
-        """Swap mutation for permutation representation"""
-        mutated = individual[:]
-        if len(mutated) >= 2:
-            i, j = random.sample(range(len(mutated)), 2)
-            mutated[i], mutated[j] = mutated[j], mutated[i]
-        return mutated
+        winners = np.argmin(standing[candidates], axis=1)
+        return candidates[np.arange(count), winners]
 
     def _select_best_compromise(
-        self, pareto_front: List[int], objective_values: List[List[float]]
+        self, pareto_front: np.ndarray, objective_values: np.ndarray
     ) -> int:
         """Select best compromise solution from Pareto front"""
-        if not pareto_front:
+        if len(pareto_front) == 0:
             return 0
 
         # Simple approach: select solution closest to ideal point
-        ideal_point = []
-        for obj_idx in range(len(self.config.objectives)):
-            min_val = min(objective_values[idx][obj_idx] for idx in pareto_front)
-            ideal_point.append(min_val)
-
-        best_distance = float("inf")
-        best_idx = pareto_front[0]
-
-        for idx in pareto_front:
-            distance = sum(
-                (objective_values[idx][i] - ideal_point[i]) ** 2
-                for i in range(len(ideal_point))
-            )
-            if distance < best_distance:
-                best_distance = distance
-                best_idx = idx
-
-        return best_idx
+        front_values = objective_values[pareto_front]
+        ideal_point = front_values.min(axis=0)
+        distances = ((front_values - ideal_point) ** 2).sum(axis=1)
+        return int(pareto_front[np.argmin(distances)])
 
     def _calculate_metrics(
         self,
-        pareto_front: List[int],
-        objective_values: List[List[float]],
+        pareto_front: np.ndarray,
+        objective_values: np.ndarray,
         processing_time: float,
         best_compromise_idx: int,
     ) -> Dict[str, Any]:
@@ -465,11 +517,12 @@ class MultiObjectiveOptimizer:
             "algorithm": "multi_objective",
             "pareto_front_size": len(pareto_front),
             "processing_time": processing_time,
-            "total_generations": self.config.generations,
+            "total_generations": self._generations_run,
+            "stopped_by_deadline": self.stopped_by_deadline,
             "objectives_optimized": self.config.objectives,
             "best_compromise_solution": {
                 "objectives": {
-                    obj: objective_values[best_compromise_idx][i]
+                    obj: float(objective_values[best_compromise_idx, i])
                     for i, obj in enumerate(self.config.objectives)
                 }
             },
@@ -481,160 +534,124 @@ class MultiObjectiveOptimizer:
                 metrics["hypervolume"] = self._calculate_hypervolume(
                     pareto_front, objective_values
                 )
+                metrics["hypervolume_reference"] = self._reference_point(
+                    objective_values[pareto_front]
+                ).tolist()
             except:
                 metrics["hypervolume"] = 0.0
 
         return metrics
 
     def _calculate_hypervolume(
-        self, pareto_front: List[int], objective_values: List[List[float]]
+        self, pareto_front: np.ndarray, objective_values: np.ndarray
     ) -> float:
-        """Calculate hypervolume metric (simplified version)"""
+        """Calculate the exact hypervolume of the front against a nadir-based reference"""
         if len(pareto_front) == 0:
             return 0.0
 
-        # Reference point (nadir point)
-        ref_point = []
-        for obj_idx in range(len(self.config.objectives)):
-            max_val = max(objective_values[idx][obj_idx] for idx in pareto_front)
-            ref_point.append(max_val * 1.1)  # 10% worse than worst
-
-        # Simplified hypervolume calculation
-        total_volume = 0.0
-        for idx in pareto_front:
-            volume = 1.0
-            for i, obj_val in enumerate(objective_values[idx]):
-                volume *= ref_point[i] - obj_val
-            total_volume += volume
-
-        return total_volume
-
-    def _create_distance_matrix(
-        self, stores: List[Dict[str, Any]]
-    ) -> List[List[float]]:
-        """Create distance matrix between stores"""
-        n = len(stores)
-        matrix = [[0.0] * n for _ in range(n)]
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                distance = self._calculate_distance(stores[i], stores[j])
-                matrix[i][j] = distance
-                matrix[j][i] = distance
-
-        return matrix
-
-    def _calculate_distance(
-        self, store1: Dict[str, Any], store2: Dict[str, Any]
-    ) -> float:
-        """Calculate Haversine distance between two stores"""
-        lat1 = store1.get("lat", store1.get("latitude", 0))
-        lon1 = store1.get("lon", store1.get("longitude", 0))
-        lat2 = store2.get("lat", store2.get("latitude", 0))
-        lon2 = store2.get("lon", store2.get("longitude", 0))
-
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        return hypervolume(
+            objective_values[pareto_front],
+            self._reference_point(objective_values[pareto_front]),
         )
-        c = 2 * math.asin(math.sqrt(a))
 
-        return c * 6371  # Earth's radius in km
-
-    # Objective functions
-    def _calculate_total_distance(self, route: List[int]) -> float:
-        """Calculate total distance of route"""
-        if len(route) < 2:
-            return 0.0
+    @staticmethod
+    def _reference_point(front_values: np.ndarray) -> np.ndarray:
+        """Nadir point pushed 10% of each objective's range past the worst value"""
+        nadir = front_values.max(axis=0)
+        span = nadir - front_values.min(axis=0)
+        # Objectives with a single value fall back to 10% of their magnitude
+        return nadir + 0.1 * np.where(span > 0, span, np.maximum(np.abs(nadir), 1.0))
 
-        total = 0.0
-        for i in range(len(route) - 1):
-            total += self.distance_matrix[route[i]][route[i + 1]]
+    def _create_distance_matrix(self, stores: List[Dict[str, Any]]) -> np.ndarray:
+        """Create distance matrix between stores"""
+        coords = CoordinateExtractor.extract_coordinate_array(stores)
+        # Stores without coordinates are treated as (0, 0), as before
+        return build_distance_matrix(np.nan_to_num(coords, nan=0.0), "haversine")
 
-        # Return to start
-        total += self.distance_matrix[route[-1]][route[0]]
-        return total
+    # Objective functions: each maps a (pop, n) route array to a (pop,) vector
+    def _calculate_total_distance(self, routes: np.ndarray) -> np.ndarray:
+        """Calculate total distance of each route"""
+        # All edges including the return to start, in one gathered lookup
+        return self.distance_matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
 
-    def _calculate_total_time(self, route: List[int]) -> float:
+    def _calculate_total_time(self, routes: np.ndarray) -> np.ndarray:
         """Calculate total time (distance + service time)"""
-        distance = self._calculate_total_distance(route)
-        service_time = len(route) * 0.5  # 30 minutes per stop
+        distance = self._calculate_total_distance(routes)
+        service_time = routes.shape[1] * 0.5  # 30 minutes per stop
         travel_time = distance / 50  # 50 km/h average speed
         return travel_time + service_time
 
-    def _calculate_priority_score(self, route: List[int]) -> float:
+    def _calculate_priority_score(self, routes: np.ndarray) -> np.ndarray:
         """Calculate priority score (lower is better)"""
-        total_priority = 0.0
-        for i, store_idx in enumerate(route):
-            store = self.stores[store_idx]
-            priority = store.get("priority", 1)  # Default priority = 1
-            # Earlier positions get higher weight
-            position_weight = len(route) - i
-            total_priority += priority * position_weight
+        # Earlier positions get higher weight
+        position_weight = np.arange(routes.shape[1], 0, -1)
+        total_priority = (self._priorities[routes] * position_weight).sum(axis=1)
         return -total_priority  # Negative for minimization
 
-    def _calculate_fuel_cost(self, route: List[int]) -> float:
+    def _calculate_fuel_cost(self, routes: np.ndarray) -> np.ndarray:
         """Calculate fuel cost based on distance"""
-        distance = self._calculate_total_distance(route)
+        distance = self._calculate_total_distance(routes)
         fuel_rate = 0.12  # $0.12 per km
         return distance * fuel_rate
 
-    def _calculate_time_window_violations(self, route: List[int]) -> float:
-        """Calculate time window violations"""
-        violations = 0.0
-        current_time = 9.0  # Start at 9 AM
-
-        for store_idx in route:
-            store = self.stores[store_idx]
+    def _calculate_time_window_violations(self, routes: np.ndarray) -> np.ndarray:
+        """Calculate time window violations, stepping all routes one stop at a time"""
+        count, size = routes.shape
+        violations = np.zeros(count)
+        current_time = np.full(count, 9.0)  # Start at 9 AM
 
-            # Add travel time
-            if store_idx > 0:
-                prev_store_idx = route[route.index(store_idx) - 1]
-                travel_time = (
-                    self.distance_matrix[prev_store_idx][store_idx] / 50
-                )  # 50 km/h
-                current_time += travel_time
+        # Travel time into each position from the stop before it, 50 km/h
+        travel_times = self.distance_matrix[routes[:, :-1], routes[:, 1:]] / 50
 
-            # Check time window
-            earliest = store.get("earliest_time", 8.0)
-            latest = store.get("latest_time", 18.0)
+        for position in range(size):
+            stops = routes[:, position]
+            if position > 0:
+                current_time += travel_times[:, position - 1]
 
-            if current_time < earliest:
-                violations += earliest - current_time
-                current_time = earliest
-            elif current_time > latest:
-                violations += current_time - latest
+            # Check time window: wait for early arrivals, count late ones
+            earliest = self._earliest[stops]
+            wait = earliest - current_time
+            late = current_time - self._latest[stops]
+            violations += np.where(wait > 0, wait, np.maximum(late, 0.0))
+            current_time = np.maximum(current_time, earliest)
 
             # Add service time
-            service_time = store.get("service_time", 0.5)
-            current_time += service_time
+            current_time += self._service_times[stops]
 
         return violations
 
-    def _calculate_capacity_violations(self, route: List[int]) -> float:
+    def _calculate_capacity_violations(self, routes: np.ndarray) -> np.ndarray:
         """Calculate vehicle capacity violations"""
-        total_load = 0.0
         capacity = 1000.0  # Default capacity
-
-        for store_idx in route:
-            store = self.stores[store_idx]
-            demand = store.get("demand", 10.0)  # Default demand
-            total_load += demand
-
-        if total_load > capacity:
-            return total_load - capacity
-        return 0.0
+        # Every route visits every store, so the load is the same for all
+        total_load = self._demands[routes[0]].sum() if len(routes) else 0.0
+        return np.full(len(routes), max(total_load - capacity, 0.0))
 
     def get_pareto_front(self) -> List[Dict[str, Any]]:
-        """Get the Pareto front solutions"""
-        # This would return all non-dominated solutions
-        pass
+        """
+        Get the archived Pareto front from the last optimization
+
+        Returns:
+            One dict per non-dominated solution, ordered by the first
+            objective, with the store route, its objective values and
+            whether it is the best compromise returned by optimize()
+        """
+        if not len(self.archive):
+            return []
+
+        objectives = self.archive.objectives
+        order = np.argsort(objectives[:, 0], kind="stable")
+        return [
+            {
+                "route": [self.stores[i] for i in self.archive.routes[index]],
+                "objectives": {
+                    name: float(objectives[index, column])
+                    for column, name in enumerate(self.config.objectives)
+                },
+                "best_compromise": bool(index == self._best_compromise),
+            }
+            for index in order
+        ]
 
     def get_metrics(self) -> MultiObjectiveMetrics:
         """Get optimization metrics"""
@@ -0,0 +1,366 @@
+"""
+Clarke-Wright Savings Solver for Multi-Vehicle Routing
+Neighbor-limited savings list, heap-ordered merges, union-find routes and
+cheapest-insertion repair down to the fleet size
+"""
+
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.spatial_index import chord_to_km, unit_sphere_coordinates
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is a core dependency
+    cKDTree = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SavingsConfig:
+    """Configuration for the Clarke-Wright savings solver"""
+
+    neighbor_count: int = 40  # Savings computed to this many nearest stops
+    speed_kmh: float = 60.0  # Driving speed used for the duration limit
+    service_time_factor: float = 0.4  # Share of service time counted
+    duration_buffer: float = 1.1  # Multiplier for traffic, breaks, etc.
+
+    def __post_init__(self):
+        """Validate configuration parameters"""
+        if self.neighbor_count <= 0:
+            raise ValueError("Neighbor count must be positive")
+        if self.speed_kmh <= 0:
+            raise ValueError("Speed must be positive")
+        if self.duration_buffer <= 0:
+            raise ValueError("Duration buffer must be positive")
+
+
+@dataclass
+class RouteLimits:
+    """Per-route limits a merged route must respect"""
+
+    capacity_kg: float = math.inf
+    max_packages: float = math.inf
+    max_driving_hours: float = math.inf
+
+
+class ClarkeWrightSolver:
+    """
+    Parallel Clarke-Wright savings heuristic
+
+    Every stop starts on its own depot-stop-depot route. Joining two routes
+    at stops i and j saves d(0, i) + d(0, j) - d(i, j), so candidate joins
+    are popped from a max-heap of savings and applied when i and j are ends
+    of different routes and the merged route stays within the weight,
+    package and duration limits. Savings are computed in one vectorized pass
+    over each stop's nearest neighbors from a KD-tree, which keeps the list
+    O(n * k) instead of O(n^2); with k >= n - 1 this is the classic
+    algorithm. Routes are tracked with union-find over their end stops, so a
+    merge is O(1) and routes are only walked once at the end.
+
+    Savings merges stop when no join fits the limits, which may leave more
+    routes than there are vehicles. With a route limit the smallest routes
+    are then dissolved and their stops moved to the cheapest position on a
+    remaining route that still has spare capacity, packages and hours.
+    """
+
+    def __init__(self, config: Optional[SavingsConfig] = None):
+        """Initialize the solver with configuration"""
+        self.config = config or SavingsConfig()
+        self.metrics: Dict[str, Any] = {}
+        self._candidate_count = 0
+        # Stop and depot points, weights, packages and service minutes of the
+        # last solved problem, for insert_stops
+        self._points: Optional[np.ndarray] = None
+        self._demand: Tuple[np.ndarray, np.ndarray, np.ndarray] = (
+            np.empty(0),
+            np.empty(0),
+            np.empty(0),
+        )
+
+    def route_hours(self, distance_km: float, service_minutes: float) -> float:
+        """Estimated duration of a route, matching RouteOptimizer metrics"""
+        config = self.config
+        service_hours = service_minutes / 60.0 * config.service_time_factor
+        return (distance_km / config.speed_kmh + service_hours) * config.duration_buffer
+
+    def solve(
+        self,
+        coordinates: np.ndarray,
+        depot: Sequence[float],
+        weights: Sequence[float],
+        packages: Sequence[float],
+        service_minutes: Sequence[float],
+        limits: RouteLimits,
+        max_routes: Optional[int] = None,
+    ) -> Tuple[List[List[int]], List[int]]:
+        """
+        Build depot-based routes by savings merges
+
+        Args:
+            coordinates: (n, 2) array of stop latitude, longitude
+            depot: Depot (lat, lon)
+            weights: Weight of each stop in kg
+            packages: Package count of each stop
+            service_minutes: Service time of each stop in minutes
+            limits: Limits every route must respect
+            max_routes: Most routes to return, e.g. the number of vehicles
+
+        Returns:
+            Tuple of (routes as stop index lists in visiting order, indices of
+            stops that cannot be served within the limits, either on their
+            own or on any of the max_routes routes)
+        """
+        if max_routes is not None and max_routes < 1:
+            raise ValueError("At least one route is required")
+        start_time = time.time()
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        weights = np.asarray(weights, dtype=float)
+        packages = np.asarray(packages, dtype=float)
+        service = np.asarray(service_minutes, dtype=float)
+        n = len(coordinates)
+
+        points = unit_sphere_coordinates(coordinates)
+        depot_point = unit_sphere_coordinates(np.asarray(depot, dtype=float))[0]
+        self._points = np.vstack((points, depot_point))
+        self._demand = (weights, packages, service)
+        depot_km = chord_to_km(np.linalg.norm(points - depot_point, axis=1))
+
+        # Stops that fit on a route of their own
+        route_km = 2.0 * depot_km
+        valid = (
+            np.isfinite(coordinates).all(axis=1)
+            & (weights <= limits.capacity_kg)
+            & (packages <= limits.max_packages)
+        )
+        valid[valid] &= np.array(
+            [
+                self.route_hours(d, s) <= limits.max_driving_hours
+                for d, s in zip(route_km[valid], service[valid])
+            ],
+            dtype=bool,
+        )
+        stops = np.flatnonzero(valid)
+        unassigned = np.flatnonzero(~valid).tolist()
+
+        heap = self._savings_heap(points, depot_km, stops)
+
+        # Union-find over stops; per-root route state
+        parent = list(range(n))
+        size = [1] * n
+        head = list(range(n))
+        tail = list(range(n))
+        degree = [0] * n
+        links: List[List[int]] = [[] for _ in range(n)]
+        load = weights.tolist()
+        count = packages.tolist()
+        minutes = service.tolist()
+        length = route_km.tolist()
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        merges = 0
+        while heap:
+            negative_saving, i, j = heapq.heappop(heap)
+            if degree[i] > 1 or degree[j] > 1:
+                continue
+            ri, rj = find(i), find(j)
+            if ri == rj:
+                continue
+
+            merged_load = load[ri] + load[rj]
+            merged_count = count[ri] + count[rj]
+            merged_minutes = minutes[ri] + minutes[rj]
+            merged_length = length[ri] + length[rj] + negative_saving
+            if (
+                merged_load > limits.capacity_kg
+                or merged_count > limits.max_packages
+                or self.route_hours(merged_length, merged_minutes) > limits.max_driving_hours
+            ):
+                continue
+
+            # The merged route runs from the far end of one to the far end
+            # of the other
+            end_i = tail[ri] if head[ri] == i else head[ri]
+            end_j = tail[rj] if head[rj] == j else head[rj]
+            if size[ri] < size[rj]:
+                ri, rj = rj, ri
+            parent[rj] = ri
+            size[ri] += size[rj]
+            head[ri], tail[ri] = end_i, end_j
+            load[ri], count[ri] = merged_load, merged_count
+            minutes[ri], length[ri] = merged_minutes, merged_length
+            links[i].append(j)
+            links[j].append(i)
+            degree[i] += 1
+            degree[j] += 1
+            merges += 1
+
+        routes = []
+        for stop in stops.tolist():
+            if find(stop) != stop:
+                continue
+            routes.append(self._walk(head[stop], links))
+
+        dissolved = 0
+        if max_routes is not None and len(routes) > max_routes:
+            # Dissolve the routes with the fewest stops and repair the rest
+            routes.sort(key=len, reverse=True)
+            dissolved = len(routes) - max_routes
+            moved = [stop for route in routes[max_routes:] for stop in route]
+            routes = routes[:max_routes]
+            left_over = self.insert_stops(routes, moved, [limits] * max_routes)
+            unassigned = sorted(unassigned + left_over)
+
+        self.metrics = {
+            "algorithm": "clarke_wright",
+            "stops": int(len(stops)),
+            "candidate_savings": self._candidate_count,
+            "merges": merges,
+            "dissolved_routes": dissolved,
+            "routes": len(routes),
+            "unassigned_stops": len(unassigned),
+            "total_distance": float(sum(self._route_km(route) for route in routes)),
+            "processing_time": time.time() - start_time,
+        }
+        return routes, unassigned
+
+    def insert_stops(
+        self,
+        routes: List[List[int]],
+        stops: Sequence[int],
+        route_limits: Sequence[RouteLimits],
+    ) -> List[int]:
+        """
+        Insert stops of the last solved problem into existing routes
+
+        Each stop goes to the position that adds the least distance on any
+        route whose limits it still fits. Routes are updated in place.
+
+        Args:
+            routes: Routes as stop index lists in visiting order
+            stops: Stops to insert, in insertion order
+            route_limits: Limits of each route
+
+        Returns:
+            Stops that fit on no route
+        """
+        if self._points is None:
+            raise ValueError("Solve a problem before inserting stops")
+        weights, packages, service = self._demand
+        config = self.config
+        state = [
+            [weights[r].sum(), packages[r].sum(), service[r].sum(), self._route_km(r)]
+            for r in routes
+        ]
+
+        left_over = []
+        for stop in stops:
+            best = None  # (added km, route, position)
+            for r, (route, limits) in enumerate(zip(routes, route_limits)):
+                load, count, minutes, length = state[r]
+                if (
+                    load + weights[stop] > limits.capacity_kg
+                    or count + packages[stop] > limits.max_packages
+                ):
+                    continue
+                # Distance the route may still grow within its driving hours
+                spare_km = (
+                    limits.max_driving_hours / config.duration_buffer
+                    - (minutes + service[stop]) / 60.0 * config.service_time_factor
+                ) * config.speed_kmh - length
+                added = self._insertion_km(route, stop)
+                position = int(np.argmin(added))
+                if added[position] <= spare_km and (best is None or added[position] < best[0]):
+                    best = (float(added[position]), r, position)
+
+            if best is None:
+                left_over.append(int(stop))
+                continue
+            added_km, r, position = best
+            routes[r].insert(position, int(stop))
+            state[r][0] += weights[stop]
+            state[r][1] += packages[stop]
+            state[r][2] += service[stop]
+            state[r][3] += added_km
+
+        return left_over
+
+    def _insertion_km(self, route: List[int], stop: int) -> np.ndarray:
+        """Added distance of inserting a stop before each position of a route"""
+        points = self._points
+        depot = len(points) - 1
+        path = points[[depot] + route + [depot]]
+        before = chord_to_km(np.linalg.norm(path[:-1] - points[stop], axis=1))
+        after = chord_to_km(np.linalg.norm(path[1:] - points[stop], axis=1))
+        current = chord_to_km(np.linalg.norm(path[1:] - path[:-1], axis=1))
+        return before + after - current
+
+    def _route_km(self, route: List[int]) -> float:
+        """Depot-to-depot length of a route"""
+        points = self._points
+        depot = len(points) - 1
+        path = points[[depot] + list(route) + [depot]]
+        return float(chord_to_km(np.linalg.norm(path[1:] - path[:-1], axis=1)).sum())
+
+    def _savings_heap(
+        self, points: np.ndarray, depot_km: np.ndarray, stops: np.ndarray
+    ) -> List[Tuple[float, int, int]]:
+        """Positive savings between each stop and its nearest neighbors"""
+        self._candidate_count = 0
+        m = len(stops)
+        if m < 2:
+            return []
+
+        k = min(self.config.neighbor_count, m - 1)
+        if cKDTree is not None:
+            chords, neighbors = cKDTree(points[stops]).query(points[stops], k + 1)
+        else:
+            # Without scipy fall back to the full pairwise comparison
+            diff = points[stops][:, None, :] - points[stops][None, :, :]
+            all_chords = np.linalg.norm(diff, axis=2)
+            neighbors = np.argsort(all_chords, axis=1)[:, : k + 1]
+            chords = np.take_along_axis(all_chords, neighbors, axis=1)
+
+        rows = np.repeat(np.arange(m), k + 1)
+        neighbors = neighbors.ravel()
+        keep = neighbors != rows  # Drop self matches (duplicates may reorder)
+        a = np.minimum(rows, neighbors)[keep]
+        b = np.maximum(rows, neighbors)[keep]
+        _, first = np.unique(a * m + b, return_index=True)
+        a, b = stops[a[first]], stops[b[first]]
+
+        savings = depot_km[a] + depot_km[b] - chord_to_km(chords.ravel()[keep][first])
+        positive = savings > 0
+        self._candidate_count = int(positive.sum())
+
+        heap = list(zip((-savings[positive]).tolist(), a[positive].tolist(), b[positive].tolist()))
+        heapq.heapify(heap)
+        return heap
+
+    @staticmethod
+    def _walk(start: int, links: List[List[int]]) -> List[int]:
+        """Follow the links of a route from one end to the other"""
+        route, previous, current = [start], -1, start
+        while True:
+            following = [s for s in links[current] if s != previous]
+            if not following:
+                return route
+            previous, current = current, following[0]
+            route.append(current)
+
+
+def create_savings_solver(neighbor_count: int = 40) -> ClarkeWrightSolver:
+    """Create a savings solver with the given candidate list size"""
+    return ClarkeWrightSolver(SavingsConfig(neighbor_count=neighbor_count))
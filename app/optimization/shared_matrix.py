@@ -0,0 +1,97 @@
+"""
+Process pools that share one distance matrix through shared memory
+
+Workers map the matrix once when they start instead of receiving a pickled
+copy with every task.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Set in each worker process by the pool initializer
+_worker_matrix: Optional[np.ndarray] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_rows: Optional[List[List[float]]] = None
+
+
+@contextmanager
+def shared_matrix_executor(
+    matrix: np.ndarray, workers: int
+) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """
+    Yield a process pool whose workers can read a distance matrix
+
+    Args:
+        matrix: Distance matrix to share with the workers
+        workers: Number of worker processes
+
+    Yields:
+        The executor, or None when a single worker is requested or shared
+        memory is unavailable; callers then run their tasks in process.
+    """
+    if workers <= 1:
+        yield None
+        return
+
+    matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+    try:
+        shm = shared_memory.SharedMemory(create=True, size=max(matrix.nbytes, 1))
+    except OSError as e:
+        logger.warning(f"Shared memory unavailable, running serially: {e}")
+        yield None
+        return
+
+    try:
+        np.ndarray(matrix.shape, dtype=matrix.dtype, buffer=shm.buf)[:] = matrix
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_shared_matrix,
+            initargs=(shm.name, matrix.shape),
+        ) as executor:
+            yield executor
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def worker_matrix() -> np.ndarray:
+    """Distance matrix mapped into the current worker process"""
+    if _worker_matrix is None:
+        raise RuntimeError("No shared distance matrix attached to this process")
+    return _worker_matrix
+
+
+def worker_matrix_rows() -> List[List[float]]:
+    """
+    Shared distance matrix as nested Python lists, built once per worker
+
+    Scalar lookups on lists are much cheaper than on an ndarray, so callers
+    doing many single-element reads use this view; every task running in
+    the same worker reuses it instead of converting the matrix again.
+    """
+    global _worker_rows
+    if _worker_rows is None:
+        _worker_rows = worker_matrix().tolist()
+    return _worker_rows
+
+
+def _attach_shared_matrix(name: str, shape: Tuple[int, int]):
+    """Process pool initializer: map the shared distance matrix"""
+    global _worker_matrix, _worker_shm, _worker_rows
+    try:
+        _worker_shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        # Pool workers report to the parent's resource tracker whatever the
+        # start method, so this registration duplicates the parent's own and
+        # must not be unregistered here: that would make the parent's unlink
+        # fail inside the tracker
+        _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_matrix = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    _worker_rows = None
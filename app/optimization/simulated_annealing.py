@@ -5,11 +5,22 @@ Implements classical simulated annealing with various cooling schedules and neig
 
 import random
 import math
+import os
 import time
 import logging
 from typing import List, Dict, Any, Tuple, Optional, Callable
-from dataclasses import dataclass
-from functools import lru_cache
+from dataclasses import asdict, dataclass, replace
+
+import numpy as np
+
+from app.models.store_table import StoreTable
+from app.optimization.anytime import Deadline, ProgressCallback, report_progress
+from app.optimization.shared_matrix import (
+    shared_matrix_executor,
+    worker_matrix,
+    worker_matrix_rows,
+)
+from app.services.distance_service import CoordinateExtractor, build_distance_matrix
 
 try:
     # Best-effort deterministic seeding if RFR_SEED is set
@@ -20,26 +31,6 @@ except Exception:  # pragma: no cover - utility optional
 logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=200_000)
-def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """Haversine distance between two lat/lon points in km (cached)."""
-    # Convert to radians
-    lat1r, lon1r, lat2r, lon2r = map(math.radians, [lat1, lon1, lat2, lon2])
-
-    # Haversine formula
-    dlat = lat2r - lat1r
-    dlon = lon2r - lon1r
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1r) * math.cos(lat2r) * math.sin(dlon / 2) ** 2
-    )
-    c = 2 * math.asin(math.sqrt(a))
-
-    # Earth's radius in kilometers
-    r = 6371.0
-    return c * r
-
-
 @dataclass
 class SimulatedAnnealingConfig:
     """Configuration for Simulated Annealing algorithm"""
@@ -54,6 +45,9 @@ class SimulatedAnnealingConfig:
     reheat_threshold: int = 1000  # Iterations without improvement before reheating
     reheat_factor: float = 1.5
     min_improvement_threshold: float = 0.001
+    restarts: int = 1  # Independent chains; the best tour wins
+    workers: int = 1  # Processes running chains in parallel
+    time_budget_seconds: Optional[float] = None  # Stop early, keeping the best
 
     def __post_init__(self):
         """Validate configuration parameters"""
@@ -67,6 +61,12 @@ class SimulatedAnnealingConfig:
             raise ValueError("Max iterations must be positive")
         if self.iterations_per_temp <= 0:
             raise ValueError("Iterations per temperature must be positive")
+        if self.restarts < 1:
+            raise ValueError("Restarts must be at least 1")
+        if self.workers < 1:
+            raise ValueError("Workers must be at least 1")
+        if self.time_budget_seconds is not None and self.time_budget_seconds <= 0:
+            raise ValueError("Time budget must be positive")
 
 
 @dataclass
@@ -88,6 +88,7 @@ class SimulatedAnnealingMetrics:
     acceptance_rate: float = 0.0
     cooling_schedule: str = "exponential"
     neighborhood_operator: str = "swap"
+    stopped_by_deadline: bool = False
 
 
 class SimulatedAnnealingOptimizer:
@@ -108,6 +109,11 @@ class SimulatedAnnealingOptimizer:
         self.config = config
         self.distance_matrix = None
         self.metrics = SimulatedAnnealingMetrics()
+        self.chain_metrics: List[SimulatedAnnealingMetrics] = []
+        # Random source for the running chain (the module unless restarting)
+        self._random = random
+        self._deadline = Deadline()
+        self._progress: Optional[ProgressCallback] = None
 
         # Choose cooling schedule function
         self.cooling_schedules = {
@@ -116,12 +122,12 @@ class SimulatedAnnealingOptimizer:
             "logarithmic": self._logarithmic_cooling,
         }
 
-        # Choose neighborhood operation function
+        # Choose neighborhood move generator; each returns (cost_delta, move)
         self.neighborhood_operators = {
-            "swap": self._swap_two_nodes,
-            "insert": self._insert_node,
-            "reverse": self._reverse_segment,
-            "mixed": self._mixed_neighborhood,
+            "swap": self._propose_swap,
+            "insert": self._propose_insert,
+            "reverse": self._propose_reverse,
+            "mixed": self._propose_mixed,
         }
 
         self.cooling_function = self.cooling_schedules.get(
@@ -129,7 +135,7 @@ class SimulatedAnnealingOptimizer:
         )
 
         self.neighborhood_function = self.neighborhood_operators.get(
-            config.neighborhood_operator, self._swap_two_nodes
+            config.neighborhood_operator, self._propose_swap
         )
 
         logger.info(
@@ -137,168 +143,97 @@ class SimulatedAnnealingOptimizer:
         )
 
     def optimize(
-        self, stores: List[Dict[str, Any]], constraints: Optional[Dict[str, Any]] = None
+        self,
+        stores: List[Dict[str, Any]],
+        constraints: Optional[Dict[str, Any]] = None,
+        distance_matrix: Optional[np.ndarray] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """
         Optimize route using simulated annealing
 
+        Annealing stops after ``config.time_budget_seconds`` if set,
+        returning the best tour found so far.
+
         Args:
             stores: List of store dictionaries with lat/lon coordinates
             constraints: Optional constraints (not used in current implementation)
+            distance_matrix: Precomputed distance matrix for ``stores``
+            progress_callback: Called with each improving solution; chains
+                running in worker processes do not report progress
 
         Returns:
             Tuple of (optimized_route, metrics_dict)
         """
         # Apply deterministic seeding if configured
-        seed_all_from_env()
+        seed = seed_all_from_env()
+        self._deadline = Deadline(self.config.time_budget_seconds)
+        self._progress = progress_callback
 
         start_time = time.time()
 
         try:
             if len(stores) < 2:
                 raise ValueError("At least 2 stores required for optimization")
+            stores = StoreTable.ensure(stores)
 
-            # Initialize metrics
-            self.metrics.cooling_schedule = self.config.cooling_schedule
-            self.metrics.neighborhood_operator = self.config.neighborhood_operator
-
-            # Create distance matrix
-            self.distance_matrix = self._create_distance_matrix(stores)
-
-            # Create initial solution (random permutation)
-            current_route = list(range(len(stores)))
-            random.shuffle(current_route)
-
-            # Calculate initial distance
-            current_distance = self._calculate_route_distance(current_route)
-            self.metrics.initial_distance = current_distance
-
-            # Initialize best solution
-            best_route = current_route.copy()
-            best_distance = current_distance
-
-            # Initialize temperature
-            temperature = self.config.initial_temperature
-
-            # Initialize tracking variables
-            iterations = 0
-            temperature_reductions = 0
-            accepted_moves = 0
-            rejected_moves = 0
-            reheats = 0
-            iterations_without_improvement = 0
-
-            logger.info(f"Starting SA optimization with {len(stores)} stores")
-            logger.info(f"Initial distance: {current_distance:.4f}")
-
-            # Main simulated annealing loop
-            while (
-                temperature > self.config.final_temperature
-                and iterations < self.config.max_iterations
-            ):
-
-                # Perform iterations at current temperature
-                for _ in range(self.config.iterations_per_temp):
-                    if iterations >= self.config.max_iterations:
-                        break
-
-                    # Generate neighbor solution
-                    neighbor_route = self.neighborhood_function(current_route.copy())
-                    neighbor_distance = self._calculate_route_distance(neighbor_route)
-
-                    # Calculate change in objective function
-                    delta = neighbor_distance - current_distance
-
-                    # Accept or reject the neighbor
-                    if delta < 0 or random.random() < math.exp(-delta / temperature):
-                        # Accept the neighbor
-                        current_route = neighbor_route
-                        current_distance = neighbor_distance
-                        accepted_moves += 1
-
-                        # Update best solution if better
-                        if current_distance < best_distance:
-                            best_route = current_route.copy()
-                            best_distance = current_distance
-                            iterations_without_improvement = 0
-                            self.metrics.convergence_iteration = iterations
-                        else:
-                            iterations_without_improvement += 1
-                    else:
-                        # Reject the neighbor
-                        rejected_moves += 1
-                        iterations_without_improvement += 1
-
-                    iterations += 1
+            # Create distance matrix (plus nested lists for fast scalar lookups)
+            if distance_matrix is None:
+                distance_matrix = self._create_distance_matrix(stores)
+            self.distance_matrix = distance_matrix
+            self._distance_rows = self.distance_matrix.tolist()
 
-                # Check for reheating
-                if iterations_without_improvement >= self.config.reheat_threshold:
-                    temperature *= self.config.reheat_factor
-                    reheats += 1
-                    iterations_without_improvement = 0
-                    logger.debug(f"Reheated to temperature {temperature:.4f}")
+            logger.info(
+                f"Starting SA optimization with {len(stores)} stores "
+                f"and {self.config.restarts} chain(s)"
+            )
 
-                # Cool down the temperature
-                temperature = self.cooling_function(temperature, temperature_reductions)
-                temperature_reductions += 1
+            if self.config.restarts == 1:
+                chains = [self._anneal(random)]
+            else:
+                chains = self._run_chains(seed)
 
-                # Log progress periodically
-                if temperature_reductions % 10 == 0:
-                    logger.debug(
-                        f"Temperature: {temperature:.4f}, Best distance: {best_distance:.4f}"
-                    )
+            best_route, best_metrics = min(chains, key=lambda c: c[1].final_distance)
+            self.chain_metrics = [metrics for _, metrics in chains]
 
             # Create the optimized route with store data
             optimized_route = [stores[i] for i in best_route]
 
-            # Calculate metrics
+            # Report the best chain, timed over the whole run
             processing_time = time.time() - start_time
-            improvement_percent = (
-                (self.metrics.initial_distance - best_distance)
-                / self.metrics.initial_distance
-            ) * 100
-
-            # Update metrics
-            self.metrics.final_distance = best_distance
-            self.metrics.improvement_percentage = improvement_percent
-            self.metrics.total_iterations = iterations
-            self.metrics.temperature_reductions = temperature_reductions
-            self.metrics.accepted_moves = accepted_moves
-            self.metrics.rejected_moves = rejected_moves
-            self.metrics.reheats = reheats
-            self.metrics.processing_time = processing_time
-            self.metrics.final_temperature = temperature
-
-            # Calculate acceptance rate
-            total_moves = accepted_moves + rejected_moves
-            self.metrics.acceptance_rate = (
-                accepted_moves / total_moves if total_moves > 0 else 0
-            )
+            self.metrics = replace(best_metrics, processing_time=processing_time)
+            total_moves = self.metrics.accepted_moves + self.metrics.rejected_moves
 
             # Create metrics dictionary for API compatibility
             metrics_dict = {
                 "algorithm": "simulated_annealing",
                 "initial_distance": self.metrics.initial_distance,
                 "final_distance": self.metrics.final_distance,
-                "improvement_percent": improvement_percent,
-                "total_iterations": iterations,
-                "temperature_reductions": temperature_reductions,
-                "accepted_moves": accepted_moves,
-                "rejected_moves": rejected_moves,
+                "improvement_percent": self.metrics.improvement_percentage,
+                "total_iterations": self.metrics.total_iterations,
+                "temperature_reductions": self.metrics.temperature_reductions,
+                "accepted_moves": self.metrics.accepted_moves,
+                "rejected_moves": self.metrics.rejected_moves,
                 "acceptance_rate": self.metrics.acceptance_rate,
-                "reheats": reheats,
+                "reheats": self.metrics.reheats,
                 "processing_time": processing_time,
                 "convergence_iteration": self.metrics.convergence_iteration,
-                "final_temperature": temperature,
+                "final_temperature": self.metrics.final_temperature,
                 "cooling_schedule": self.config.cooling_schedule,
                 "neighborhood_operator": self.config.neighborhood_operator,
+                "restarts": self.config.restarts,
+                "stopped_by_deadline": any(
+                    metrics.stopped_by_deadline for metrics in self.chain_metrics
+                ),
+                "chains": [asdict(metrics) for metrics in self.chain_metrics],
             }
 
             logger.info(f"SA optimization completed in {processing_time:.4f}s")
-            logger.info(f"Final distance: {best_distance:.4f}")
-            logger.info(f"Improvement: {improvement_percent:.2f}%")
+            logger.info(f"Final distance: {self.metrics.final_distance:.4f}")
+            logger.info(f"Improvement: {self.metrics.improvement_percentage:.2f}%")
             logger.info(
-                f"Accepted moves: {accepted_moves}/{total_moves} ({self.metrics.acceptance_rate:.1%})"
+                f"Accepted moves: {self.metrics.accepted_moves}/{total_moves} "
+                f"({self.metrics.acceptance_rate:.1%})"
             )
 
             return optimized_route, metrics_dict
@@ -312,58 +247,193 @@ class SimulatedAnnealingOptimizer:
                 "processing_time": processing_time,
             }
 
-    def _create_distance_matrix(
-        self, stores: List[Dict[str, Any]]
-    ) -> List[List[float]]:
-        """Create distance matrix between all stores"""
-        n = len(stores)
-        matrix = [[0.0] * n for _ in range(n)]
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                distance = self._calculate_distance(stores[i], stores[j])
-                matrix[i][j] = distance
-                matrix[j][i] = distance
-
-        return matrix
-
-    def _calculate_distance(
-        self, store1: Dict[str, Any], store2: Dict[str, Any]
-    ) -> float:
-        """Calculate Haversine distance between two stores (cached by coords)."""
-        # Handle both 'lat'/'lon' and 'latitude'/'longitude' formats
-        lat1 = store1.get("lat", store1.get("latitude"))
-        lon1 = store1.get("lon", store1.get("longitude"))
-        lat2 = store2.get("lat", store2.get("latitude"))
-        lon2 = store2.get("lon", store2.get("longitude"))
-
-        if any(coord is None for coord in [lat1, lon1, lat2, lon2]):
-            raise ValueError("Missing latitude/longitude coordinates")
+    def _run_chains(
+        self, seed: Optional[int]
+    ) -> List[Tuple[List[int], SimulatedAnnealingMetrics]]:
+        """
+        Run independent annealing chains, in parallel when workers allow
+
+        Each chain draws from its own generator seeded from a SeedSequence
+        child of the run seed, so results do not depend on how chains are
+        spread over processes. Pooled workers read the distance matrix from
+        shared memory.
+
+        Args:
+            seed: Run seed, or None for fresh entropy
+
+        Returns:
+            List of (best_route, metrics) per chain, in chain order
+        """
+        chain_seeds = [
+            int(child.generate_state(1)[0])
+            for child in np.random.SeedSequence(seed).spawn(self.config.restarts)
+        ]
+        workers = min(self.config.workers, len(chain_seeds), os.cpu_count() or 1)
+
+        with shared_matrix_executor(self.distance_matrix, workers) as executor:
+            if executor is None:
+                return [
+                    self._anneal(random.Random(chain_seed))
+                    for chain_seed in chain_seeds
+                ]
+
+            futures = [
+                executor.submit(
+                    _anneal_in_worker, self.config, chain_seed, self._deadline
+                )
+                for chain_seed in chain_seeds
+            ]
+            return [future.result() for future in futures]
+
+    def _anneal(self, rng) -> Tuple[List[int], SimulatedAnnealingMetrics]:
+        """
+        Run one annealing chain over the current distance matrix
 
-        # Round to 6 decimals to stabilize cache keys and avoid FP noise
-        lat1r = round(float(lat1), 6)
-        lon1r = round(float(lon1), 6)
-        lat2r = round(float(lat2), 6)
-        lon2r = round(float(lon2), 6)
+        Args:
+            rng: random.Random instance (or the random module) driving the chain
 
-        return _haversine_km(lat1r, lon1r, lat2r, lon2r)
+        Returns:
+            Tuple of (best_route as store indices, chain metrics)
+        """
+        self._random = rng
+        start_time = time.time()
+        metrics = SimulatedAnnealingMetrics(
+            cooling_schedule=self.config.cooling_schedule,
+            neighborhood_operator=self.config.neighborhood_operator,
+        )
 
+        # Create initial solution (random permutation)
+        current_route = list(range(len(self.distance_matrix)))
+        rng.shuffle(current_route)
+
+        # Calculate initial distance
+        current_distance = self._calculate_route_distance(current_route)
+        metrics.initial_distance = current_distance
+
+        # Initialize best solution
+        best_route = current_route.copy()
+        best_distance = current_distance
+
+        # Initialize temperature
+        temperature = self.config.initial_temperature
+
+        # Initialize tracking variables
+        iterations = 0
+        temperature_reductions = 0
+        accepted_moves = 0
+        rejected_moves = 0
+        reheats = 0
+        iterations_without_improvement = 0
+
+        logger.debug(f"Initial distance: {current_distance:.4f}")
+
+        reported_distance = math.inf
+
+        # Main simulated annealing loop
+        while (
+            temperature > self.config.final_temperature
+            and iterations < self.config.max_iterations
+        ):
+            if self._deadline.expired():
+                metrics.stopped_by_deadline = True
+                break
+
+            # Perform iterations at current temperature
+            for _ in range(self.config.iterations_per_temp):
+                if iterations >= self.config.max_iterations:
+                    break
+
+                # Evaluate a neighbor move in O(1) from the edges it touches
+                delta, move = self.neighborhood_function(current_route)
+
+                # Accept or reject the neighbor
+                if delta < 0 or rng.random() < math.exp(-delta / temperature):
+                    # Accept the neighbor: only now mutate the route
+                    self._apply_move(current_route, move)
+                    current_distance += delta
+                    accepted_moves += 1
+
+                    # Update best solution if better
+                    if current_distance < best_distance:
+                        best_route = current_route.copy()
+                        best_distance = current_distance
+                        iterations_without_improvement = 0
+                        metrics.convergence_iteration = iterations
+                    else:
+                        iterations_without_improvement += 1
+                else:
+                    # Reject the neighbor
+                    rejected_moves += 1
+                    iterations_without_improvement += 1
+
+                iterations += 1
+
+            # Check for reheating
+            if iterations_without_improvement >= self.config.reheat_threshold:
+                temperature *= self.config.reheat_factor
+                reheats += 1
+                iterations_without_improvement = 0
+                logger.debug(f"Reheated to temperature {temperature:.4f}")
+
+            # Cool down the temperature
+            temperature = self.cooling_function(temperature, temperature_reductions)
+            temperature_reductions += 1
+
+            if best_distance < reported_distance:
+                reported_distance = best_distance
+                report_progress(
+                    self._progress,
+                    "simulated_annealing",
+                    iterations,
+                    best_distance,
+                    best_route,
+                    self._deadline,
+                )
+
+            # Log progress periodically
+            if temperature_reductions % 10 == 0:
+                logger.debug(
+                    f"Temperature: {temperature:.4f}, Best distance: {best_distance:.4f}"
+                )
+
+        # Re-sum the best tour once to drop accumulated floating-point drift
+        best_distance = self._calculate_route_distance(best_route)
+
+        # Update metrics
+        metrics.final_distance = best_distance
+        metrics.improvement_percentage = (
+            (metrics.initial_distance - best_distance) / metrics.initial_distance
+        ) * 100
+        metrics.total_iterations = iterations
+        metrics.temperature_reductions = temperature_reductions
+        metrics.accepted_moves = accepted_moves
+        metrics.rejected_moves = rejected_moves
+        metrics.reheats = reheats
+        metrics.processing_time = time.time() - start_time
+        metrics.final_temperature = temperature
+
+        # Calculate acceptance rate
+        total_moves = accepted_moves + rejected_moves
+        metrics.acceptance_rate = accepted_moves / total_moves if total_moves > 0 else 0
+
+        return best_route, metrics
+
+    def _create_distance_matrix(self, stores: List[Dict[str, Any]]) -> np.ndarray:
+        """Create distance matrix between all stores"""
+        coords = CoordinateExtractor.extract_coordinate_array(stores)
+        if np.isnan(coords).any():
+            raise ValueError("Missing latitude/longitude coordinates")
 
-    
+        return build_distance_matrix(coords, "haversine")
 
     def _calculate_route_distance(self, route: List[int]) -> float:
         """Calculate total distance of a route"""
         if not route or len(route) < 2:
             return 0.0
 
-        total_distance = 0.0
-        for i in range(len(route) - 1):
-            total_distance += self.distance_matrix[route[i]][route[i + 1]]
-
-        # Add distance from last to first (complete the tour)
-        total_distance += self.distance_matrix[route[-1]][route[0]]
-
-        return total_distance
+        # Gather every edge (including last -> first) in one vectorized lookup
+        order = np.asarray(route)
+        return float(self.distance_matrix[order, np.roll(order, -1)].sum())
 
     # Cooling schedule functions
     def _exponential_cooling(self, temperature: float, iteration: int) -> float:
@@ -382,50 +452,99 @@ class SimulatedAnnealingOptimizer:
         """Logarithmic cooling schedule"""
         return self.config.initial_temperature / (1 + math.log(1 + iteration))
 
-    # Neighborhood operation functions
-    def _swap_two_nodes(self, route: List[int]) -> List[int]:
-        """Swap two random nodes in the route"""
-        if len(route) < 2:
-            return route
-
-        i, j = random.sample(range(len(route)), 2)
-        route[i], route[j] = route[j], route[i]
-        return route
-
-    def _insert_node(self, route: List[int]) -> List[int]:
-        """Remove a node and insert it at a different position"""
-        if len(route) < 3:
-            return route
-
-        # Remove node from random position
-        i = random.randint(0, len(route) - 1)
-        node = route.pop(i)
-
-        # Insert at different random position
-        j = random.randint(0, len(route))
-        route.insert(j, node)
-
-        return route
-
-    def _reverse_segment(self, route: List[int]) -> List[int]:
-        """Reverse a random segment of the route"""
-        if len(route) < 3:
-            return route
-
-        # Choose two random points
-        i, j = sorted(random.sample(range(len(route)), 2))
-
-        # Reverse the segment between i and j
-        route[i : j + 1] = route[i : j + 1][::-1]
-
-        return route
-
-    def _mixed_neighborhood(self, route: List[int]) -> List[int]:
+    # Neighborhood moves: propose with a cost delta, apply only when accepted
+    def _propose_swap(self, route: List[int]) -> Tuple[float, Optional[tuple]]:
+        """Swap two random nodes; delta from the (at most four) touched edges"""
+        n = len(route)
+        if n < 2:
+            return 0.0, None
+
+        i, j = self._random.sample(range(n), 2)
+        d = self._distance_rows
+        a, b = route[i], route[j]
+
+        def node_after(k: int) -> int:
+            k %= n
+            return b if k == i else a if k == j else route[k]
+
+        # Edges are keyed by their starting position; a set handles adjacency
+        edges = {(i - 1) % n, i, (j - 1) % n, j}
+        old = sum(d[route[k]][route[(k + 1) % n]] for k in edges)
+        new = sum(d[node_after(k)][node_after(k + 1)] for k in edges)
+        return new - old, ("swap", i, j)
+
+    def _propose_insert(self, route: List[int]) -> Tuple[float, Optional[tuple]]:
+        """Move one random node to a different position"""
+        n = len(route)
+        if n < 3:
+            return 0.0, None
+
+        # Remove node from random position, re-insert at a random position
+        i = self._random.randint(0, n - 1)
+        j = self._random.randint(0, n - 1)
+        d = self._distance_rows
+        node = route[i]
+
+        # Closing the gap left by the node
+        prev_node, next_node = route[i - 1], route[(i + 1) % n]
+        delta = d[prev_node][next_node] - d[prev_node][node] - d[node][next_node]
+
+        # Opening the gap in the (n-1)-node tour between positions j-1 and j
+        def remaining(k: int) -> int:
+            k %= n - 1
+            return route[k] if k < i else route[k + 1]
+
+        u, v = remaining(j - 1), remaining(j)
+        delta += d[u][node] + d[node][v] - d[u][v]
+        return delta, ("insert", i, j)
+
+    def _propose_reverse(self, route: List[int]) -> Tuple[float, Optional[tuple]]:
+        """Reverse a random segment (2-opt); only its two boundary edges change"""
+        n = len(route)
+        if n < 3:
+            return 0.0, None
+
+        i, j = sorted(self._random.sample(range(n), 2))
+        if j - i == n - 1:
+            # Reversing the whole tour leaves a symmetric tour unchanged
+            return 0.0, ("reverse", i, j)
+
+        d = self._distance_rows
+        a, b = route[i - 1], route[i]
+        c, e = route[j], route[(j + 1) % n]
+        return d[a][c] + d[b][e] - d[a][b] - d[c][e], ("reverse", i, j)
+
+    def _propose_mixed(self, route: List[int]) -> Tuple[float, Optional[tuple]]:
         """Randomly choose between different neighborhood operations"""
-        operations = [self._swap_two_nodes, self._insert_node, self._reverse_segment]
-        operation = random.choice(operations)
+        operations = [self._propose_swap, self._propose_insert, self._propose_reverse]
+        operation = self._random.choice(operations)
         return operation(route)
 
+    @staticmethod
+    def _apply_move(route: List[int], move: Optional[tuple]) -> None:
+        """Apply a proposed move to the route in place"""
+        if move is None:
+            return
+
+        kind, i, j = move
+        if kind == "swap":
+            route[i], route[j] = route[j], route[i]
+        elif kind == "insert":
+            route.insert(j, route.pop(i))
+        elif kind == "reverse":
+            route[i : j + 1] = route[i : j + 1][::-1]
+
     def get_metrics(self) -> SimulatedAnnealingMetrics:
         """Get optimization metrics"""
         return self.metrics
+
+
+def _anneal_in_worker(
+    config: SimulatedAnnealingConfig, seed: int, deadline: Deadline
+) -> Tuple[List[int], SimulatedAnnealingMetrics]:
+    """Process pool entry point running one chain on the shared matrix"""
+    optimizer = SimulatedAnnealingOptimizer(config)
+    optimizer._deadline = deadline
+    optimizer.distance_matrix = worker_matrix()
+    optimizer._distance_rows = worker_matrix_rows()
+    return optimizer._anneal(random.Random(seed))
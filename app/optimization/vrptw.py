@@ -0,0 +1,398 @@
+"""
+Vehicle Routing with Time Windows (VRPTW)
+Slack-based insertion construction and relocate local search
+"""
+
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models.store_table import StoreTable
+from app.services.distance_service import build_distance_matrix
+
+logger = logging.getLogger(__name__)
+
+_CLOCK_TIME = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*$")
+
+
+def parse_hours(value: Any) -> float:
+    """
+    Parse a time of day into hours
+
+    Args:
+        value: Hours as a number, or a "HH:MM" / "HH" string
+
+    Returns:
+        Hours since midnight, NaN if the value cannot be parsed
+    """
+    if value is None or isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _CLOCK_TIME.match(str(value))
+    if not match:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return math.nan
+    return int(match.group(1)) + int(match.group(2) or 0) / 60.0
+
+
+def parse_time_window(value: Any) -> Optional[Tuple[float, float]]:
+    """
+    Parse a time window in any of the forms used across the codebase
+
+    Args:
+        value: "HH:MM-HH:MM" string, {"start": ..., "end": ...} dict, or a
+            (start, end) pair
+
+    Returns:
+        (start, end) in hours, or None if the value is not a window
+    """
+    if isinstance(value, dict):
+        start, end = value.get("start"), value.get("end")
+    elif isinstance(value, str) and "-" in value:
+        start, end = value.split("-", 1)
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        start, end = value
+    else:
+        return None
+
+    start, end = parse_hours(start), parse_hours(end)
+    if math.isnan(start) or math.isnan(end):
+        return None
+    return start, end
+
+
+@dataclass
+class VRPTWConfig:
+    """Configuration for the VRPTW engine"""
+
+    speed_kmh: float = 50.0
+    start_time: float = 9.0  # Hour at which every route starts
+    service_time: float = 0.5  # Hours per stop unless the store sets one
+    earliest_time: float = 0.0  # Window used for stores without one
+    latest_time: float = 24.0
+    max_routes: Optional[int] = None  # None opens as many routes as needed
+    vehicle_cost: float = 1000.0  # Distance-equivalent cost of each route
+    local_search: bool = True
+    max_passes: int = 50  # Safety cap on relocate passes
+
+    def __post_init__(self):
+        """Validate configuration parameters"""
+        if self.speed_kmh <= 0:
+            raise ValueError("Speed must be positive")
+        if self.service_time < 0:
+            raise ValueError("Service time must be non-negative")
+        if self.max_routes is not None and self.max_routes < 1:
+            raise ValueError("Max routes must be at least 1")
+        if self.max_passes < 0:
+            raise ValueError("Max passes must be non-negative")
+
+
+class VRPTWOptimizer:
+    """
+    Time-window-aware route construction and improvement
+
+    Every route is an open path that starts at ``start_time`` at its first
+    stop. For each route the engine keeps the service start time of every
+    stop (forward) and the latest service start that keeps all later stops
+    on time (backward slack), so whether a stop can be inserted between two
+    neighbours is an O(1) check. Routes are built by sequential cheapest
+    feasible insertion and improved by relocating stops within and between
+    routes; emptying a route saves ``vehicle_cost``. Stores that cannot be
+    served within their window on any route are reported as unscheduled.
+    """
+
+    def __init__(self, config: Optional[VRPTWConfig] = None):
+        """Initialize the engine with configuration"""
+        self.config = config or VRPTWConfig()
+        self.routes: List[List[int]] = []
+        self.unscheduled: List[int] = []
+        self.relocations = 0
+
+    def optimize(
+        self, stores: List[Dict[str, Any]], constraints: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Build time-window-feasible routes
+
+        Args:
+            stores: Store dictionaries with coordinates and optional
+                earliest_time/latest_time (hours or "HH:MM"), delivery_window
+                ("HH:MM-HH:MM") and service_time (hours)
+            constraints: Optional constraints; ``time_windows`` maps chain
+                names to {"start": "HH:MM", "end": "HH:MM"} windows used for
+                stores without their own
+
+        Returns:
+            Tuple of (scheduled stops, metrics). Stops are copies of the
+            store dictionaries in route order with ``route_index``,
+            ``arrival_time`` and ``service_start`` added.
+        """
+        start_time = time.time()
+        table = StoreTable.ensure(stores)
+        chain_windows = (constraints or {}).get("time_windows") or {}
+
+        self._load(table, chain_windows)
+        schedulable = self._schedulable()
+        self.unscheduled = sorted(set(range(len(table))) - set(schedulable))
+        self.relocations = 0
+
+        self.routes = self._construct(schedulable)
+        initial_distance = self._total_distance()
+        if self.config.local_search:
+            self._relocate_search()
+
+        route, total_wait = [], 0.0
+        for route_index, stops in enumerate(self.routes):
+            begin, arrival = self._forward(stops)
+            total_wait += float((begin - arrival).sum())
+            for stop, arrive, service in zip(stops, arrival, begin):
+                route.append(
+                    {
+                        **table[stop],
+                        "route_index": route_index,
+                        "arrival_time": round(float(arrive), 4),
+                        "service_start": round(float(service), 4),
+                    }
+                )
+
+        if self.unscheduled:
+            logger.warning(
+                f"VRPTW left {len(self.unscheduled)} stores unscheduled "
+                "(time windows cannot be met)"
+            )
+
+        metrics = {
+            "algorithm": "vrptw",
+            "routes": len(self.routes),
+            "scheduled_stops": len(route),
+            "unscheduled_stops": len(self.unscheduled),
+            "unscheduled_stores": [table[i].get("name", str(i)) for i in self.unscheduled],
+            "initial_distance": initial_distance,
+            "total_distance": self._total_distance(),
+            "total_wait_time": total_wait,
+            "relocations": self.relocations,
+            "processing_time": time.time() - start_time,
+        }
+        return route, metrics
+
+    # Problem data
+
+    def _load(self, table: StoreTable, chain_windows: Dict[str, Any]) -> None:
+        """Gather distances, travel times, windows and service times"""
+        config = self.config
+        self._distance = build_distance_matrix(table, "haversine")
+        self._travel = self._distance / config.speed_kmh
+        self._service = table.column("service_time", config.service_time)
+
+        earliest = np.array(table.column("window_start"))
+        latest = np.array(table.column("window_end"))
+        for i in np.flatnonzero(np.isnan(earliest) | np.isnan(latest)):
+            store = table[i]
+            window = parse_time_window(
+                store.get("delivery_window") or store.get("time_window")
+            ) or parse_time_window(chain_windows.get(store.get("chain")))
+            start = parse_hours(store.get("earliest_time"))
+            end = parse_hours(store.get("latest_time"))
+            if window:
+                start = window[0] if math.isnan(start) else start
+                end = window[1] if math.isnan(end) else end
+            earliest[i] = config.earliest_time if math.isnan(start) else start
+            latest[i] = config.latest_time if math.isnan(end) else end
+        self._earliest = earliest
+        self._latest = latest
+        self._coordinates_ok = np.isfinite(table.coordinates).all(axis=1)
+
+    def _schedulable(self) -> List[int]:
+        """Stops that can be served on their own route"""
+        begin = np.maximum(self.config.start_time, self._earliest)
+        ok = self._coordinates_ok & (begin <= self._latest)
+        return np.flatnonzero(ok).tolist()
+
+    # Route schedules
+
+    def _forward(self, route: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Service start and arrival time of every stop on a route"""
+        begin = np.empty(len(route))
+        arrival = np.empty(len(route))
+        clock, previous = self.config.start_time, None
+        for k, stop in enumerate(route):
+            if previous is not None:
+                clock += self._travel[previous, stop]
+            arrival[k] = clock
+            clock = max(clock, self._earliest[stop])
+            begin[k] = clock
+            clock += self._service[stop]
+            previous = stop
+        return begin, arrival
+
+    def _backward(self, route: Sequence[int]) -> np.ndarray:
+        """Latest service start at each stop that keeps later stops on time"""
+        latest = np.empty(len(route))
+        bound = math.inf
+        for k in range(len(route) - 1, -1, -1):
+            stop = route[k]
+            bound = min(self._latest[stop], bound)
+            latest[k] = bound
+            if k:
+                bound -= self._service[route[k - 1]] + self._travel[route[k - 1], stop]
+        return latest
+
+    def _schedule(self, route: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Forward service starts and backward slack of a route"""
+        return self._forward(route)[0], self._backward(route)
+
+    def _insertion_costs(
+        self,
+        route: Sequence[int],
+        candidates: np.ndarray,
+        schedule: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Added distance of inserting each candidate before each position
+
+        Args:
+            route: Current stops
+            candidates: Stops not on the route
+            schedule: The route's (service starts, slack) if already known
+
+        Returns:
+            (len(candidates), len(route) + 1) array; infeasible insertions
+            are inf
+        """
+        route = np.asarray(route, dtype=np.intp)
+        begin, slack = schedule or self._schedule(route)
+        config = self.config
+
+        # Departure from the stop before each gap; the first gap has none
+        departure = np.concatenate(([-np.inf], begin + self._service[route]))
+        before = np.concatenate(([0], route))
+        arrival = departure[None, :] + self._travel[before[None, :], candidates[:, None]]
+        arrival[:, 0] = config.start_time
+        start = np.maximum(arrival, self._earliest[candidates, None])
+        feasible = start <= self._latest[candidates, None]
+
+        # The stop after each gap must still start before its backward slack
+        after = route
+        leave = start[:, :-1] + self._service[candidates, None]
+        next_arrival = leave + self._travel[candidates[:, None], after[None, :]]
+        next_start = np.maximum(next_arrival, self._earliest[after][None, :])
+        feasible[:, :-1] &= next_start <= slack[None, :]
+
+        d = self._distance
+        cost = np.empty(feasible.shape)
+        cost[:, 0] = d[candidates, route[0]]
+        cost[:, -1] = d[route[-1], candidates]
+        if len(route) > 1:
+            cost[:, 1:-1] = (
+                d[route[:-1][None, :], candidates[:, None]]
+                + d[candidates[:, None], route[1:][None, :]]
+                - d[route[:-1], route[1:]][None, :]
+            )
+        cost[~feasible] = np.inf
+        return cost
+
+    # Construction
+
+    def _construct(self, schedulable: List[int]) -> List[List[int]]:
+        """Sequential cheapest feasible insertion, one route at a time"""
+        unrouted = set(schedulable)
+        routes: List[List[int]] = []
+        max_routes = self.config.max_routes
+
+        while unrouted and (max_routes is None or len(routes) < max_routes):
+            # Seed with the most urgent stop
+            seed = min(unrouted, key=lambda s: (self._latest[s], self._earliest[s], s))
+            route = [seed]
+            unrouted.discard(seed)
+
+            while unrouted:
+                candidates = np.fromiter(sorted(unrouted), dtype=np.intp)
+                cost = self._insertion_costs(route, candidates)
+                best = int(np.argmin(cost))
+                row, position = divmod(best, cost.shape[1])
+                if not np.isfinite(cost[row, position]):
+                    break
+                stop = int(candidates[row])
+                route.insert(position, stop)
+                unrouted.discard(stop)
+
+            routes.append(route)
+
+        self.unscheduled = sorted(set(self.unscheduled) | unrouted)
+        return routes
+
+    # Local search
+
+    def _relocate_search(self) -> None:
+        """Move single stops to their cheapest feasible position anywhere"""
+        min_gain = 1e-9
+        schedules = [self._schedule(route) for route in self.routes]
+        for _ in range(self.config.max_passes):
+            improved = False
+            for stop in [s for route in self.routes for s in route]:
+                source = next(i for i, r in enumerate(self.routes) if stop in r)
+                route = self.routes[source]
+                position = route.index(stop)
+                reduced = route[:position] + route[position + 1 :]
+                reduced_schedule = self._schedule(reduced) if reduced else None
+                gain = self._removal_gain(route, position)
+
+                best = (gain - min_gain, None, None)
+                candidate = np.array([stop], dtype=np.intp)
+                for target, other in enumerate(self.routes):
+                    if target == source:
+                        base, schedule = reduced, reduced_schedule
+                    else:
+                        base, schedule = other, schedules[target]
+                    if not base:
+                        continue
+                    cost = self._insertion_costs(base, candidate, schedule)[0]
+                    index = int(np.argmin(cost))
+                    if cost[index] < best[0]:
+                        best = (cost[index], target, index)
+
+                _, target, index = best
+                if target is None:
+                    continue
+
+                self.routes[source] = reduced
+                schedules[source] = reduced_schedule
+                self.routes[target].insert(index, stop)
+                schedules[target] = self._schedule(self.routes[target])
+                if not reduced:
+                    del self.routes[source], schedules[source]
+                self.relocations += 1
+                improved = True
+
+            if not improved:
+                break
+
+    def _removal_gain(self, route: List[int], position: int) -> float:
+        """Distance (plus vehicle cost for a lone stop) saved by removing it"""
+        d = self._distance
+        stop = route[position]
+        if len(route) == 1:
+            return self.config.vehicle_cost
+        if position == 0:
+            return d[stop, route[1]]
+        if position == len(route) - 1:
+            return d[route[-2], stop]
+        prev, nxt = route[position - 1], route[position + 1]
+        return d[prev, stop] + d[stop, nxt] - d[prev, nxt]
+
+    def _total_distance(self) -> float:
+        """Sum of route path lengths"""
+        return float(sum(self._distance[r[:-1], r[1:]].sum() for r in self.routes if len(r) > 1))
+
+
+def create_vrptw_optimizer(config: Optional[VRPTWConfig] = None) -> VRPTWOptimizer:
+    """Create a VRPTW optimizer with optional custom configuration"""
+    return VRPTWOptimizer(config)
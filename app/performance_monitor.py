@@ -7,12 +7,14 @@ import time
 import psutil
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, asdict
 from collections import deque
 import json
 import logging
 
+from app.utils.quantile_sketch import QuantileSketch
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,8 +50,14 @@ class SystemAlert:
 class PerformanceMonitor:
     """Advanced performance monitoring system"""
 
-    def __init__(self, metrics_retention_hours: int = 24):
+    def __init__(
+        self,
+        metrics_retention_hours: int = 24,
+        latency_window_minutes: int = 15,
+        clock: Callable[[], float] = time.time,
+    ):
         self.metrics_retention_hours = metrics_retention_hours
+        self._clock = clock
         self.metrics_history: Dict[str, deque] = {}
         self.active_alerts: List[SystemAlert] = []
         self.alert_id_counter = 0
@@ -69,9 +77,18 @@ class PerformanceMonitor:
             "error_rate": {"warning": 5.0, "critical": 10.0},  # percentage
         }
 
+        # Request latencies: sketches for the current wall-clock minute plus
+        # the closed minutes of the last latency_window_minutes
+        self._latency_lock = threading.Lock()
+        self._interval = self._new_interval()
+        self._latency_windows: deque = deque(maxlen=max(1, latency_window_minutes))
+
         # Initialize metrics storage
         self._initialize_metrics_storage()
 
+        # Prime the CPU counter so later non-blocking reads are meaningful
+        psutil.cpu_percent(interval=None)
+
     def _initialize_metrics_storage(self):
         """Initialize metrics storage with deques for each metric type"""
         metric_types = [
@@ -136,8 +153,8 @@ class PerformanceMonitor:
         """Collect system-level performance metrics"""
         timestamp = datetime.now().isoformat()
 
-        # CPU Usage
-        cpu_usage = psutil.cpu_percent(interval=1)
+        # CPU usage since the previous sample; never blocks
+        cpu_usage = psutil.cpu_percent(interval=None)
         self._add_metric("cpu_usage", cpu_usage, "percent", timestamp)
 
         # Memory Usage
@@ -156,28 +173,134 @@ class PerformanceMonitor:
         self._add_metric("network_io", network_io, "bytes", timestamp)
 
     def _collect_application_metrics(self):
-        """Collect application-specific metrics"""
+        """Collect application metrics from the requests of the last minute"""
         timestamp = datetime.now().isoformat()
 
-        # Simulate application metrics (in real implementation, these would come from app)
-        # API Response Time (would be measured from actual requests)
-        import random
+        with self._latency_lock:
+            self._roll_interval()
+            last_minute = self._interval["minute"] - 1
+            interval = next(
+                (i for i in self._latency_windows if i["minute"] == last_minute),
+                None,
+            )
 
-        api_response_time = random.uniform(50, 300)  # Simulated response time in ms
-        self._add_metric("api_response_time", api_response_time, "ms", timestamp)
+        if interval is None or not interval["requests"]:
+            return
 
-        # Active Routes (would come from route tracking system)
-        active_routes = random.randint(5, 15)
-        self._add_metric("active_routes", active_routes, "count", timestamp)
+        # p95 latency of all requests in the minute
+        api_response_time = interval["overall"].quantile(0.95) * 1000
+        self._add_metric("api_response_time", api_response_time, "ms", timestamp)
 
-        # Analytics Requests (would come from analytics engine)
-        analytics_requests = random.randint(10, 50)
+        analytics_requests = sum(
+            sketch.count
+            for key, sketch in interval["endpoints"].items()
+            if "analytics" in key
+        )
         self._add_metric("analytics_requests", analytics_requests, "count", timestamp)
 
-        # Error Rate (would come from error tracking)
-        error_rate = random.uniform(0.1, 2.0)
+        error_rate = interval["errors"] / interval["requests"] * 100
         self._add_metric("error_rate", error_rate, "percent", timestamp)
 
+    def _new_interval(self, minute: Optional[int] = None) -> Dict[str, Any]:
+        """Empty latency aggregates for one wall-clock minute"""
+        return {
+            "minute": int(self._clock() // 60) if minute is None else minute,
+            "requests": 0,
+            "errors": 0,
+            "overall": QuantileSketch(),
+            "endpoints": {},
+            "algorithms": {},
+        }
+
+    def _roll_interval(self) -> None:
+        """Close the current interval once its minute has passed (lock held)"""
+        minute = int(self._clock() // 60)
+        if self._interval["minute"] != minute:
+            self._latency_windows.append(self._interval)
+            self._interval = self._new_interval(minute)
+
+    def record_request(
+        self,
+        endpoint: str,
+        method: str,
+        duration_seconds: float,
+        status_code: int = 200,
+    ) -> None:
+        """
+        Record the latency of a handled request
+
+        Args:
+            endpoint: Flask endpoint name or path
+            method: HTTP method
+            duration_seconds: Time spent handling the request
+            status_code: Response status; 5xx responses count as errors
+        """
+        key = f"{method} {endpoint}"
+        with self._latency_lock:
+            self._roll_interval()
+            interval = self._interval
+            interval["requests"] += 1
+            if status_code >= 500:
+                interval["errors"] += 1
+            interval["overall"].add(duration_seconds)
+            sketch = interval["endpoints"].get(key)
+            if sketch is None:
+                sketch = interval["endpoints"][key] = QuantileSketch()
+            sketch.add(duration_seconds)
+
+    def record_algorithm_run(self, algorithm: str, duration_seconds: float) -> None:
+        """Record the run time of a route optimization algorithm"""
+        with self._latency_lock:
+            self._roll_interval()
+            sketches = self._interval["algorithms"]
+            sketch = sketches.get(algorithm)
+            if sketch is None:
+                sketch = sketches[algorithm] = QuantileSketch()
+            sketch.add(duration_seconds)
+
+    def get_latency_percentiles(self) -> Dict[str, Any]:
+        """
+        Latency percentiles over the recent window
+
+        Returns:
+            Dict with "window_minutes", "overall", and per-key "endpoints"
+            and "algorithms" summaries (count, mean, min, max, p50, p95,
+            p99) in milliseconds
+        """
+        window = self._latency_windows.maxlen
+        with self._latency_lock:
+            self._roll_interval()
+            first_minute = self._interval["minute"] - window
+            intervals = [
+                i for i in self._latency_windows if i["minute"] >= first_minute
+            ]
+            intervals.append(self._interval)
+
+            overall = QuantileSketch.merged(i["overall"] for i in intervals)
+            grouped: Dict[str, Dict[str, QuantileSketch]] = {
+                "endpoints": {},
+                "algorithms": {},
+            }
+            for interval in intervals:
+                for group, merged in grouped.items():
+                    for key, sketch in interval[group].items():
+                        if key not in merged:
+                            merged[key] = QuantileSketch()
+                        merged[key].merge(sketch)
+
+        return {
+            "window_minutes": window,
+            "overall": overall.summary(scale=1000),
+            "endpoints": {
+                key: sketch.summary(scale=1000)
+                for key, sketch in sorted(grouped["endpoints"].items())
+            },
+            "algorithms": {
+                key: sketch.summary(scale=1000)
+                for key, sketch in sorted(grouped["algorithms"].items())
+            },
+        }
+
     def _add_metric(self, metric_type: str, value: float, unit: str, timestamp: str):
         """Add a metric to the history"""
         thresholds = self.thresholds.get(metric_type, {})
@@ -11,8 +11,10 @@ from typing import Dict, Any
 
 from app.services.routing_service import RoutingService
 from app.services.database_service import DatabaseService
+from app.services.store_locator_service import get_store_locator
 from app import cache, limiter
 from app.monitoring import metrics_collector
+from app.utils.clustering import CLUSTER_MODES
 
 # AUTO-PILOT: Enhanced validation and error handling
 from app.utils.validation import (
@@ -36,6 +38,41 @@ def get_current_user_id():
     return session.get("user_id")  # Will be updated when auth is implemented
 
 
+def _progress_broadcaster(route_id):
+    """Progress callback sending improving routes to the route_{id} room"""
+    manager = getattr(current_app, "websocket_manager", None)
+    if not route_id or manager is None:
+        return None
+
+    def broadcast(progress):
+        manager.broadcast_optimization_progress(str(route_id), progress)
+
+    return broadcast
+
+
+def _validate_config_bounds(config, prefix, field, skip=()):
+    """
+    Check an optimizer config payload against the bounds of the matching
+    /api/v1/routes options, e.g. genetic_config.islands as ga_islands
+
+    Returns:
+        The validated options, with numbers converted
+
+    Raises:
+        ValidationError: If the config is not an object, or a setting is
+            not a number or out of bounds
+    """
+    if not isinstance(config, dict):
+        raise ValidationError(f"{field} must be an object", field=field)
+    return validate_algorithm_options(
+        {
+            name if name.startswith(prefix) or name == "deadline_ms" else f"{prefix}{name}": value
+            for name, value in config.items()
+            if name not in skip
+        }
+    )
+
+
 @api_bp.route("/v1/routes", methods=["POST"])
 @limiter.limit("100 per minute")  # Increased for production load
 @api_error_handler
@@ -113,6 +150,20 @@ def create_route():
                   type: string
                   enum: ["time", "distance", "fuel"]
                   example: "time"
+                deadline_ms:
+                  type: number
+                  description: >
+                    Time budget; the genetic, simulated_annealing and
+                    multi_objective searches return the best route found so far
+                    when it runs out. The other algorithms finish at once and
+                    ignore it
+                  example: 2000
+                progress_route_id:
+                  type: string
+                  description: >
+                    Stream improving routes to WebSocket subscribers of route_{id},
+                    followed by a final "completed" report with the returned route
+                  example: "r-42"
     responses:
       200:
         description: Route created successfully
@@ -195,6 +246,9 @@ def create_route():
             "ga_crossover_rate": options.get("ga_crossover_rate", 0.8),
             "ga_elite_size": options.get("ga_elite_size", 20),
             "ga_tournament_size": options.get("ga_tournament_size", 3),
+            "ga_islands": options.get("ga_islands", 1),
+            "ga_migration_interval": options.get("ga_migration_interval", 25),
+            "ga_migration_size": options.get("ga_migration_size", 2),
         }
     elif algorithm == "simulated_annealing":
         algorithm_params = {
@@ -207,6 +261,8 @@ def create_route():
             "sa_min_improvement_threshold": options.get(
                 "sa_min_improvement_threshold", 0.001
             ),
+            "sa_restarts": options.get("sa_restarts", 1),
+            "sa_workers": options.get("sa_workers", 1),
         }
     elif algorithm == "multi_objective":
         algorithm_params = {
@@ -217,6 +273,19 @@ def create_route():
             "mo_crossover_rate": options.get("mo_crossover_rate", 0.9),
             "mo_tournament_size": options.get("mo_tournament_size", 2),
         }
+    elif algorithm == "vrptw":
+        algorithm_params = {
+            key: options[key]
+            for key in (
+                "vrptw_speed_kmh",
+                "vrptw_start_time",
+                "vrptw_service_time",
+                "vrptw_max_routes",
+                "vrptw_vehicle_cost",
+                "vrptw_local_search",
+            )
+            if key in options
+        }
 
     # Use the generate_route_from_stores method with algorithm support for all cases
     route = routing_service.generate_route_from_stores(
@@ -225,6 +294,8 @@ def create_route():
         save_to_db=True,
         algorithm=algorithm,
         algorithm_params=algorithm_params,
+        deadline_ms=options.get("deadline_ms"),
+        progress_callback=_progress_broadcaster(options.get("progress_route_id")),
     )
 
     if route is None:
@@ -340,6 +411,42 @@ def get_stores():
     )
 
 
+@api_bp.route("/v1/stores/nearest", methods=["GET"])
+@limiter.limit("600 per minute")
+@api_error_handler
+def get_nearest_stores():
+    """Find the current user's stores nearest to a location, optionally within a radius"""
+    user_id = get_current_user_id()
+    if not user_id:
+        raise APIError("Authentication required", status_code=401, code="AUTH_REQUIRED")
+
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    if lat is None or lon is None:
+        raise ValidationError("lat and lon query parameters are required", field="lat")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValidationError("Coordinates out of range", field="lat")
+
+    k = request.args.get("k", 5, type=int)
+    if not 1 <= k <= 100:
+        raise ValidationError("k must be between 1 and 100", field="k")
+    radius_km = request.args.get("radius_km", type=float)
+    if radius_km is not None and radius_km <= 0:
+        raise ValidationError("radius_km must be positive", field="radius_km")
+
+    locator = get_store_locator()
+    if radius_km is None:
+        stores = locator.nearest_stores(lat, lon, k, user_id=user_id)
+    else:
+        stores = locator.stores_within(lat, lon, radius_km, limit=k, user_id=user_id)
+
+    return create_success_response(
+        data=stores,
+        message="Nearest stores retrieved successfully",
+        metadata={"count": len(stores), "indexed_stores": locator.indexed_stores(user_id)},
+    )
+
+
 @api_bp.route("/v1/stores/<int:store_id>", methods=["GET"])
 @limiter.limit("100 per minute")
 def get_store(store_id: int):
@@ -426,6 +533,7 @@ def api_health():
                 "get_route": "/api/v1/routes/<id>",
                 "get_stores": "/api/v1/stores",
                 "get_store": "/api/v1/stores/<id>",
+                "nearest_stores": "/api/v1/stores/nearest",
                 "generate_route": "/api/v1/routes/generate",
                 "optimize_genetic": "/api/v1/routes/optimize/genetic",
                 "optimize_simulated_annealing": "/api/v1/routes/optimize/simulated_annealing",
@@ -444,6 +552,7 @@ def api_health():
                     "genetic",
                     "simulated_annealing",
                     "multi_objective",
+                    "vrptw",
                 ],
                 "default": "default",
             },
@@ -460,7 +569,8 @@ def create_clusters():
     Expected JSON payload:
     {
         "stores": [...],
-        "radius_km": 2.0
+        "radius_km": 2.0,
+        "mode": "seed" | "single_linkage"
     }
     """
     try:
@@ -471,11 +581,20 @@ def create_clusters():
 
         stores = data["stores"]
         radius_km = data.get("radius_km", 2.0)
+        mode = data.get("mode", "seed")
 
         # Validate radius
         if not isinstance(radius_km, (int, float)) or radius_km <= 0:
             return jsonify({"error": "Invalid radius_km value"}), 400
 
+        if mode not in CLUSTER_MODES:
+            return (
+                jsonify(
+                    {"error": f"Invalid mode, expected one of {list(CLUSTER_MODES)}"}
+                ),
+                400,
+            )
+
         # Validate stores have coordinates
         for store in stores:
             if "latitude" not in store or "longitude" not in store:
@@ -485,7 +604,9 @@ def create_clusters():
                 )
 
         routing_service = RoutingService()
-        clusters = routing_service.cluster_stores_by_proximity(stores, radius_km)
+        clusters = routing_service.cluster_stores_by_proximity(
+            stores, radius_km, mode
+        )
 
         return (
             jsonify(
@@ -494,6 +615,7 @@ def create_clusters():
                     "cluster_count": len(clusters),
                     "total_stores": len(stores),
                     "radius_km": radius_km,
+                    "mode": mode,
                 }
             ),
             200,
@@ -585,7 +707,11 @@ def optimize_route_genetic():
             "mutation_rate": 0.02,
             "crossover_rate": 0.8,
             "elite_size": 20,
-            "tournament_size": 3
+            "tournament_size": 3,
+            "islands": 1,
+            "migration_interval": 25,
+            "migration_size": 2,
+            "deadline_ms": 2000
         }
     }
     """
@@ -610,27 +736,30 @@ def optimize_route_genetic():
                 400,
             )
 
+        # Same bounds as the ga_ options of /api/v1/routes
+        try:
+            bounded = _validate_config_bounds(genetic_config, "ga_", "genetic_config")
+        except ValidationError as e:
+            return jsonify({"error": e.message}), 400
+
         # Get user ID (will be from authentication system later)
         user_id = get_current_user_id()
 
         # Generate route with genetic algorithm
         routing_service = RoutingService(user_id=user_id)
 
-        # Prepare genetic algorithm filters
-        filters = {
-            "algorithm": "genetic",
-            "ga_population_size": genetic_config.get("population_size", 100),
-            "ga_generations": genetic_config.get("generations", 500),
-            "ga_mutation_rate": genetic_config.get("mutation_rate", 0.02),
-            "ga_crossover_rate": genetic_config.get("crossover_rate", 0.8),
-            "ga_elite_size": genetic_config.get("elite_size", 20),
-            "ga_tournament_size": genetic_config.get("tournament_size", 3),
-        }
-
         # Generate optimized route
-        route = routing_service.generate_route_from_stores(
-            stores, constraints, save_to_db=True, algorithm="genetic"
-        )
+        try:
+            route = routing_service.generate_route_from_stores(
+                stores,
+                constraints,
+                save_to_db=True,
+                algorithm="genetic",
+                algorithm_params=genetic_config,
+                deadline_ms=bounded.get("deadline_ms"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         # Get metrics
         metrics = routing_service.get_metrics()
@@ -679,7 +808,10 @@ def optimize_route_simulated_annealing():
             "cooling_rate": 0.99,
             "max_iterations": 10000,
             "max_no_improvement": 1000,
-            "acceptance_threshold": 0.001
+            "acceptance_threshold": 0.001,
+            "restarts": 1,
+            "workers": 1,
+            "deadline_ms": 2000
         }
     }
     """
@@ -706,6 +838,13 @@ def optimize_route_simulated_annealing():
                 400,
             )
 
+        # Same bounds as the sa_ options of /api/v1/routes; every restart is
+        # a full anneal, so the chain count is limited per request
+        try:
+            bounded = _validate_config_bounds(sa_config, "sa_", "sa_config")
+        except ValidationError as e:
+            return jsonify({"error": e.message}), 400
+
         # Get user ID (will be from authentication system later)
         user_id = get_current_user_id()
 
@@ -723,16 +862,22 @@ def optimize_route_simulated_annealing():
             "sa_min_improvement_threshold": sa_config.get(
                 "min_improvement_threshold", 0.001
             ),
+            "sa_restarts": sa_config.get("restarts", 1),
+            "sa_workers": sa_config.get("workers", 1),
         }
 
         # Generate optimized route
-        route = routing_service.generate_route_from_stores(
-            stores,
-            constraints,
-            save_to_db=True,
-            algorithm="simulated_annealing",
-            algorithm_params=algorithm_params,
-        )
+        try:
+            route = routing_service.generate_route_from_stores(
+                stores,
+                constraints,
+                save_to_db=True,
+                algorithm="simulated_annealing",
+                algorithm_params=algorithm_params,
+                deadline_ms=bounded.get("deadline_ms"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         # Get metrics
         metrics = routing_service.get_metrics()
@@ -765,6 +910,79 @@ def optimize_route_simulated_annealing():
         return jsonify({"error": "Internal server error"}), 500
 
 
+@api_bp.route("/v1/routes/optimize/pareto", methods=["POST"])
+@limiter.limit("30 per minute")
+def optimize_route_pareto_front():
+    """
+    Return the whole Pareto front of route tradeoffs in one call
+
+    Expected JSON payload:
+    {
+        "stores": [...],
+        "mo_config": {
+            "objectives": ["distance", "priority"],
+            "population_size": 100,
+            "generations": 200,
+            "mutation_rate": 0.1,
+            "crossover_rate": 0.9,
+            "tournament_size": 2,
+            "archive_size": 100
+        }
+    }
+    """
+    try:
+        data = request.get_json()
+
+        if not data:
+            return jsonify({"error": "No JSON data provided"}), 400
+
+        stores = data.get("stores", [])
+        mo_config = data.get("mo_config", {})
+
+        if len(stores) < 2:
+            return (
+                jsonify({"error": "At least 2 stores required for Pareto optimization"}),
+                400,
+            )
+
+        # Same bounds as the mo_ options of /api/v1/routes: the NSGA-II sort
+        # compares every pair of solutions, so size is limited per request
+        try:
+            _validate_config_bounds(
+                mo_config, "mo_", "mo_config", skip=("objectives", "mo_objectives")
+            )
+        except ValidationError as e:
+            return jsonify({"error": e.message}), 400
+
+        routing_service = RoutingService(user_id=get_current_user_id())
+        try:
+            front, metrics = routing_service.generate_pareto_front(stores, mo_config)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return (
+            jsonify(
+                {
+                    "front": front,
+                    "metadata": {
+                        "total_stores": len(stores),
+                        "pareto_front_size": len(front),
+                        "objectives": metrics.get("objectives_optimized"),
+                        "hypervolume": metrics.get("hypervolume", 0.0),
+                        "hypervolume_reference": metrics.get("hypervolume_reference"),
+                        "processing_time": routing_service.get_last_processing_time(),
+                        "algorithm_used": "multi_objective",
+                    },
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        logger.error(f"API error computing Pareto front: {str(e)}")
+        return jsonify({"error": "Internal server error"}), 500
+
+
 @api_bp.route("/v1/routes/algorithms", methods=["GET"])
 @limiter.limit("100 per minute")
 def get_available_algorithms():
@@ -886,7 +1104,10 @@ def get_available_algorithms():
                     "objectives": {
                         "type": "string",
                         "default": "distance,time",
-                        "description": "Comma-separated list of objectives to optimize (distance,time,priority,fuel_cost)",
+                        "description": (
+                            "Comma-separated list of objectives to optimize (distance,time,"
+                            "priority,fuel_cost,delivery_windows,vehicle_capacity)"
+                        ),
                     },
                     "population_size": {
                         "type": "integer",
@@ -923,6 +1144,13 @@ def get_available_algorithms():
                         "max": 10,
                         "description": "Size of tournament for selection",
                     },
+                    "archive_size": {
+                        "type": "integer",
+                        "default": 100,
+                        "min": 1,
+                        "max": 1000,
+                        "description": "Non-dominated routes kept across generations",
+                    },
                 },
             },
         }
@@ -4,9 +4,11 @@ Advanced analytics and algorithm comparison dashboard
 """
 
 import json
-import time
+import uuid
 from datetime import datetime
-from flask import Blueprint, render_template, request, jsonify, session
+from typing import Optional
+from flask import Blueprint, current_app, render_template, request, jsonify, session
+from app.services.algorithm_comparison import create_algorithm_comparison
 from app.services.routing_service import RoutingService
 from app.services.database_service import DatabaseService
 import logging
@@ -24,9 +26,18 @@ def dashboard():
 
 @dashboard_bp.route("/dashboard/api/algorithms/compare", methods=["POST"])
 def compare_algorithms():
-    """Compare performance of different algorithms"""
+    """
+    Compare performance of different algorithms
+
+    Stores are geocoded and their distance matrix built once, then the
+    algorithms run concurrently within one time budget. Each result is also
+    emitted as an ``algorithm_comparison_result`` Socket.IO event as soon as
+    its algorithm finishes, to the logged-in user's room, or only to the
+    Socket.IO session named by ``socket_id`` when that session belongs to
+    the same user. Anonymous results are only returned in the response.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json() or {}
         stores = data.get("stores", [])
 
         if not stores:
@@ -34,71 +45,34 @@ def compare_algorithms():
 
         # Get current user
         user_id = session.get("user_id")
-
-        # Algorithms to compare
-        algorithms = [
-            {"name": "Default", "algorithm": "default"},
-            {"name": "Genetic Algorithm", "algorithm": "genetic"},
-            {"name": "Simulated Annealing", "algorithm": "simulated_annealing"},
-            {"name": "Multi-Objective", "algorithm": "multi_objective"},
-        ]
-
-        results = []
-
-        for algo in algorithms:
-            try:
-                routing_service = RoutingService(user_id=user_id)
-
-                start_time = time.time()
-                route = routing_service.generate_route(stores, {}, algo["algorithm"])
-                processing_time = time.time() - start_time
-
-                # Get metrics
-                metrics = routing_service.get_metrics()
-
-                result = {
-                    "algorithm": algo["name"],
-                    "algorithm_key": algo["algorithm"],
-                    "success": True,
-                    "processing_time": processing_time,
-                    "route_length": len(route),
-                    "optimization_score": metrics.optimization_score if metrics else 0,
-                    "metrics": metrics.__dict__ if metrics else {},
-                }
-
-                # Extract algorithm-specific metrics
-                if metrics and metrics.algorithm_metrics:
-                    result["improvement_percent"] = metrics.algorithm_metrics.get(
-                        "improvement_percent", 0
-                    )
-                    result["initial_distance"] = metrics.algorithm_metrics.get(
-                        "initial_distance", 0
-                    )
-                    result["final_distance"] = metrics.algorithm_metrics.get(
-                        "final_distance", 0
-                    )
-                else:
-                    result["improvement_percent"] = 0
-                    result["initial_distance"] = 0
-                    result["final_distance"] = 0
-
-                results.append(result)
-
-            except Exception as e:
-                logger.error(f"Error running {algo['name']}: {str(e)}")
-                results.append(
-                    {
-                        "algorithm": algo["name"],
-                        "algorithm_key": algo["algorithm"],
-                        "success": False,
-                        "error": str(e),
-                    }
-                )
+        socket_id = data.get("socket_id")
+        if socket_id is not None and not isinstance(socket_id, str):
+            return jsonify({"error": "socket_id must be a string"}), 400
+
+        try:
+            comparison = create_algorithm_comparison(
+                data.get("algorithms"),
+                float(data.get("time_budget_seconds", 30.0)),
+            )
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        comparison_id = str(uuid.uuid4())
+        geocoded_stores = RoutingService(user_id=user_id).ensure_coordinates(stores)
+        if not geocoded_stores:
+            return jsonify({"error": "No stores with valid coordinates"}), 400
+
+        results = comparison.compare(
+            geocoded_stores,
+            on_result=_result_emitter(comparison_id, _result_room(socket_id, user_id)),
+        )
 
         return jsonify(
             {
                 "success": True,
+                "comparison_id": comparison_id,
                 "results": results,
+                "time_budget_seconds": comparison.config.time_budget_seconds,
                 "timestamp": datetime.now().isoformat(),
             }
         )
@@ -108,6 +82,40 @@ def compare_algorithms():
         return jsonify({"error": "Internal server error"}), 500
 
 
+def _result_room(socket_id: Optional[str], user_id) -> Optional[str]:
+    """Socket.IO room of the requester: its own session, else its user"""
+    if not user_id:
+        # A client-supplied sid cannot be tied to an anonymous requester
+        return None
+    manager = getattr(current_app, "websocket_manager", None)
+    connection = manager.active_connections.get(socket_id) if manager and socket_id else None
+    if connection and connection.get("user_id") == user_id:
+        return socket_id  # Every session is in a room named by its sid
+    return f"user_{user_id}"
+
+
+def _result_emitter(comparison_id: str, room: Optional[str]):
+    """Callback streaming comparison results to one Socket.IO room"""
+    if room is None:
+        # Never broadcast: without a room there is nobody to stream to
+        return None
+
+    from app import socketio
+
+    def emit_result(result):
+        socketio.emit(
+            "algorithm_comparison_result",
+            {
+                "comparison_id": comparison_id,
+                "result": result,
+                "timestamp": datetime.now().isoformat(),
+            },
+            room=room,
+        )
+
+    return emit_result
+
+
 @dashboard_bp.route("/dashboard/api/performance/history", methods=["GET"])
 def get_performance_history():
     """Get historical performance data"""
@@ -42,6 +42,31 @@ def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def ingest_stores_file(file, routing_service: UnifiedRoutingService) -> List[Dict[str, Any]]:
+    """
+    Parse and geocode an uploaded stores file chunk by chunk
+
+    Each chunk is geocoded while the rest of the upload is still being
+    parsed. Uploads are only routed, never saved as the user's stores.
+
+    Args:
+        file: Uploaded stores file
+        routing_service: Service that geocodes the chunks
+
+    Returns:
+        Stores with coordinates, in file order
+
+    Raises:
+        ValueError: If the file cannot be processed
+    """
+    stores = []
+    for chunk in routing_service.ingest_store_chunks(
+        FileService().iter_stores_file(file), save_to_db=False
+    ):
+        stores.extend(chunk)
+    return stores
+
+
 @main_bp.route("/")
 def index():
     """
@@ -153,11 +178,10 @@ def generate_route():
 
         # Initialize services
         routing_service = RoutingService()
-        file_service = FileService()
 
         # Process the uploaded file
         try:
-            stores = file_service.process_stores_file(file)
+            stores = ingest_stores_file(file, routing_service)
             if not stores:
                 return jsonify({"error": "No valid stores found in file"}), 400
         except Exception as e:
@@ -225,7 +249,6 @@ def generate_route_api():
     try:
         # Initialize services
         routing_service = RoutingService()
-        file_service = FileService()
 
         # Parse and validate request
         try:
@@ -256,7 +279,7 @@ def generate_route_api():
         stores = []
         if route_request.file:
             try:
-                stores = file_service.process_stores_file(route_request.file)
+                stores = ingest_stores_file(route_request.file, routing_service)
             except Exception as e:
                 logger.error(f"Error processing stores file: {str(e)}")
                 return (
@@ -554,8 +577,9 @@ def legacy_export():
             stores_file = request.files.get('file')
             if not stores_file:
                 return jsonify({"error": "No stores file provided"}), 400
-                
-            stores = file_service.process_stores_file(stores_file)
+
+            routing_service = UnifiedRoutingService()
+            stores = ingest_stores_file(stores_file, routing_service)
             
             # Process optional playbook file
             playbook = {}
@@ -569,7 +593,6 @@ def legacy_export():
                         playbook[chain] = row
             
             # Generate route using the routing service
-            routing_service = UnifiedRoutingService()
             constraints = {}
             route = routing_service.generate_route_from_stores(stores, constraints)
             
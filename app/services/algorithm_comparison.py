@@ -0,0 +1,254 @@
+"""
+Side-by-side comparison of routing algorithms on one set of stores
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.store_table import StoreTable
+from app.optimization.genetic_algorithm import GeneticAlgorithm, GeneticConfig
+from app.optimization.multi_objective import (
+    MultiObjectiveConfig,
+    MultiObjectiveOptimizer,
+)
+from app.optimization.shared_matrix import shared_matrix_executor, worker_matrix
+from app.optimization.simulated_annealing import (
+    SimulatedAnnealingConfig,
+    SimulatedAnnealingOptimizer,
+)
+from app.services.distance_service import build_distance_matrix
+from app.services.route_core import RouteConstraints, create_route_generator
+
+logger = logging.getLogger(__name__)
+
+# Share of the remaining budget given to each optimizer's own time limit,
+# leaving time to return its result before the comparison stops waiting
+OPTIMIZER_BUDGET_SHARE = 0.8
+
+# Longest time budget a comparison accepts
+MAX_TIME_BUDGET_SECONDS = 600.0
+
+# Algorithm key -> display name, in the order results are listed
+COMPARED_ALGORITHMS = {
+    "default": "Default",
+    "genetic": "Genetic Algorithm",
+    "simulated_annealing": "Simulated Annealing",
+    "multi_objective": "Multi-Objective",
+}
+
+
+@dataclass
+class ComparisonConfig:
+    """Configuration for an algorithm comparison"""
+
+    algorithms: List[str] = field(default_factory=lambda: list(COMPARED_ALGORITHMS))
+    time_budget_seconds: float = 30.0
+    workers: int = 0  # 0 = one process per algorithm, up to the CPU count
+
+    def __post_init__(self):
+        unknown = [a for a in self.algorithms if a not in COMPARED_ALGORITHMS]
+        if unknown:
+            raise ValueError(f"Unknown algorithms: {', '.join(unknown)}")
+        # Each algorithm is compared once, whatever the request repeats
+        self.algorithms = list(dict.fromkeys(self.algorithms))
+        if not self.algorithms:
+            raise ValueError("At least one algorithm is required")
+        # Also rejects NaN and infinity
+        if not 0 < self.time_budget_seconds <= MAX_TIME_BUDGET_SECONDS:
+            raise ValueError(f"Time budget must be between 0 and {MAX_TIME_BUDGET_SECONDS} seconds")
+        if self.workers < 0:
+            raise ValueError("Workers cannot be negative")
+
+
+class AlgorithmComparison:
+    """
+    Run several routing algorithms on the same stores within one time budget
+
+    The stores are geocoded and their distance matrix built once; the
+    algorithms then run concurrently in a process pool whose workers map
+    that matrix from shared memory. Results are reported as each algorithm
+    finishes. The optimizers get most of the budget as their own time limit
+    and return their best route when it runs out; any algorithm still
+    running when the whole budget is spent is stopped and reported as timed
+    out, so the comparison takes about as long as its slowest algorithm
+    rather than the sum of all of them.
+    """
+
+    def __init__(self, config: Optional[ComparisonConfig] = None):
+        self.config = config or ComparisonConfig()
+
+    def compare(
+        self,
+        stores: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare the configured algorithms
+
+        Args:
+            stores: Store dictionaries with coordinates
+            on_result: Called with each algorithm's result as it finishes
+
+        Returns:
+            One result per algorithm, in the configured order
+        """
+        deadline = time.monotonic() + self.config.time_budget_seconds
+        stores = StoreTable(stores)
+        matrix = build_distance_matrix(stores, "haversine")
+        matrix[~np.isfinite(matrix)] = 0.0
+
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def finish(result: Dict[str, Any]) -> None:
+            results[result["algorithm_key"]] = result
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.error(f"Comparison result callback failed: {e}")
+
+        algorithms = self.config.algorithms
+        # The pool is what lets the budget stop an algorithm that overruns
+        # it, but never start more processes than there are cores
+        workers = min(self.config.workers or len(algorithms), len(algorithms), os.cpu_count() or 1)
+        records = list(stores)
+
+        with shared_matrix_executor(matrix, workers) as executor:
+            if executor is None:
+                for algorithm in algorithms:
+                    if deadline <= time.monotonic():
+                        finish(_timed_out(algorithm))
+                    else:
+                        finish(_run_algorithm(algorithm, records, deadline, matrix))
+            else:
+                # Tasks waiting for a free worker measure their budget from
+                # the shared deadline when they start
+                futures = {
+                    executor.submit(_run_algorithm, algorithm, records, deadline): algorithm
+                    for algorithm in algorithms
+                }
+                try:
+                    for future in as_completed(
+                        futures, timeout=max(deadline - time.monotonic(), 0)
+                    ):
+                        try:
+                            finish(future.result())
+                        except Exception as e:
+                            finish(_failed(futures[future], e))
+                except FutureTimeoutError:
+                    for future, algorithm in futures.items():
+                        if not future.done():
+                            finish(_timed_out(algorithm))
+                    _stop_workers(executor)
+
+        return [results[algorithm] for algorithm in algorithms]
+
+
+def create_algorithm_comparison(
+    algorithms: Optional[List[str]] = None, time_budget_seconds: float = 30.0
+) -> AlgorithmComparison:
+    """Create an algorithm comparison with the given algorithms and budget"""
+    if algorithms:
+        config = ComparisonConfig(
+            algorithms=list(algorithms), time_budget_seconds=time_budget_seconds
+        )
+    else:
+        config = ComparisonConfig(time_budget_seconds=time_budget_seconds)
+    return AlgorithmComparison(config)
+
+
+def _run_algorithm(
+    algorithm: str,
+    stores: List[Dict[str, Any]],
+    deadline: float,
+    matrix: Optional[np.ndarray] = None,
+) -> Dict[str, Any]:
+    """
+    Run one algorithm; in a pool worker the matrix is the shared one
+
+    The deadline is a time.monotonic() value, which is system-wide, so the
+    pool workers measure the remaining budget against the same clock.
+    """
+    if matrix is None:
+        matrix = worker_matrix()
+    stores = StoreTable(stores)
+    start_time = time.time()
+    time_budget = max((deadline - time.monotonic()) * OPTIMIZER_BUDGET_SHARE, 0.001)
+
+    try:
+        route, metrics = _optimize(algorithm, stores, matrix, time_budget)
+    except Exception as e:
+        logger.error(f"Error running {algorithm}: {e}")
+        return _failed(algorithm, e)
+
+    processing_time = time.time() - start_time
+    if "error" in metrics:
+        return _failed(algorithm, metrics["error"])
+
+    # Score every algorithm on the same matrix as a closed tour, the way the
+    # optimizers measure their own routes
+    positions = {id(store): i for i, store in enumerate(stores)}
+    order = np.array([positions[id(store)] for store in route if id(store) in positions], int)
+    final_distance = float(matrix[order, np.roll(order, -1)].sum())
+
+    return {
+        "algorithm": COMPARED_ALGORITHMS[algorithm],
+        "algorithm_key": algorithm,
+        "success": True,
+        "processing_time": processing_time,
+        "route_length": len(route),
+        "total_distance": round(final_distance, 3),
+        "optimization_score": (len(route) / max(final_distance, 0.1) if final_distance > 0 else 0),
+        "improvement_percent": metrics.get("improvement_percent", 0),
+        "initial_distance": metrics.get("initial_distance", 0),
+        "final_distance": round(final_distance, 3),
+        "metrics": metrics,
+    }
+
+
+def _optimize(
+    algorithm: str, stores: StoreTable, matrix: np.ndarray, time_budget: float
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Dispatch to the optimizer for an algorithm key"""
+    if algorithm == "default":
+        generator = create_route_generator("default")
+        route, _ = generator.generate_route(stores, RouteConstraints())
+        return route, {"algorithm": "default"}
+    if algorithm == "genetic":
+        optimizer = GeneticAlgorithm(GeneticConfig(time_budget_seconds=time_budget))
+    elif algorithm == "simulated_annealing":
+        optimizer = SimulatedAnnealingOptimizer(
+            SimulatedAnnealingConfig(time_budget_seconds=time_budget)
+        )
+    else:
+        optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig(time_budget_seconds=time_budget))
+    return optimizer.optimize(stores, distance_matrix=matrix)
+
+
+def _failed(algorithm: str, error: Any) -> Dict[str, Any]:
+    return {
+        "algorithm": COMPARED_ALGORITHMS[algorithm],
+        "algorithm_key": algorithm,
+        "success": False,
+        "error": str(error),
+    }
+
+
+def _timed_out(algorithm: str) -> Dict[str, Any]:
+    result = _failed(algorithm, "Time budget exceeded")
+    result["timed_out"] = True
+    return result
+
+
+def _stop_workers(executor) -> None:
+    """Cancel queued tasks and terminate workers still running past the budget"""
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in list((getattr(executor, "_processes", None) or {}).values()):
+        process.terminate()
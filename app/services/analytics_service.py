@@ -4,16 +4,27 @@ Provides comprehensive analytics and monitoring capabilities
 """
 
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import json
 import uuid
-from collections import defaultdict, Counter
-from statistics import mean, median
-import numpy as np
+from collections import Counter, deque
+from statistics import mean
+
+from app.services.analytics_store import TimeBucketStore
 
 logger = logging.getLogger(__name__)
 
+TIMEFRAME_SECONDS = {
+    "1h": 3600,
+    "24h": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+    "30d": 30 * 24 * 3600,
+}
+MAX_MOBILE_SESSIONS = 10000
+MAX_SYSTEM_EVENTS = 1000
+
 
 class AnalyticsService:
     """
@@ -21,14 +32,21 @@ class AnalyticsService:
     Tracks mobile usage, driver performance, route optimization, and system metrics
     """
 
-    def __init__(self):
-        # In production, use Redis or dedicated analytics database
+    def __init__(self, clock: Callable[[], float] = time.time):
+        # In production, use Redis or dedicated analytics database.
+        # Events are aggregated into per-minute buckets with a ring buffer of
+        # raw records, so memory stays bounded however long the process runs.
         self.mobile_sessions = {}
-        self.driver_metrics = defaultdict(list)
-        self.route_analytics = []
-        self.api_metrics = defaultdict(list)
-        self.system_events = []
-        self.performance_data = defaultdict(list)
+        self.driver_metrics = TimeBucketStore(
+            group_by=[("driver_id", "customer_rating")], clock=clock
+        )
+        self.route_analytics = TimeBucketStore(clock=clock)
+        self.api_metrics = TimeBucketStore(clock=clock)
+        self.system_events = deque(maxlen=MAX_SYSTEM_EVENTS)
+        self.performance_data = {
+            "api_response_times": deque(maxlen=1000),
+            "optimization_times": deque(maxlen=100),
+        }
 
     def track_mobile_session(
         self, device_id: str, session_data: Dict[str, Any]
@@ -53,6 +71,9 @@ class AnalyticsService:
             }
 
             self.mobile_sessions[session_id] = session_record
+            if len(self.mobile_sessions) > MAX_MOBILE_SESSIONS:
+                # Dicts keep insertion order: drop the oldest session
+                del self.mobile_sessions[next(iter(self.mobile_sessions))]
             logger.info(f"Mobile session tracked: {device_id}")
 
         except Exception as e:
@@ -78,7 +99,16 @@ class AnalyticsService:
                 "is_mobile": self._is_mobile_request(user_agent),
             }
 
-            self.api_metrics[endpoint].append(api_record)
+            self.api_metrics.record(
+                {"response_time": response_time},
+                {
+                    "endpoint": endpoint,
+                    "status_code": status_code,
+                    "mobile": api_record["is_mobile"],
+                    "error": status_code >= 400,
+                },
+                event=api_record,
+            )
 
             # Track performance metrics
             self.performance_data["api_response_times"].append(response_time)
@@ -101,7 +131,16 @@ class AnalyticsService:
                 "customer_rating": metrics.get("customer_rating"),
             }
 
-            self.driver_metrics[driver_id].append(driver_record)
+            # Falsy readings are skipped, as unset fields are reported as 0
+            self.driver_metrics.record(
+                {
+                    "location_accuracy": driver_record["location_accuracy"] or None,
+                    "speed": driver_record["speed"] or None,
+                    "customer_rating": driver_record["customer_rating"] or None,
+                },
+                {"driver_id": driver_id},
+                event=driver_record,
+            )
             logger.debug(f"Driver performance tracked: {driver_id}")
 
         except Exception as e:
@@ -123,7 +162,19 @@ class AnalyticsService:
                 "traffic_aware": route_data.get("traffic_aware", False),
             }
 
-            self.route_analytics.append(route_record)
+            self.route_analytics.record(
+                {
+                    "optimization_time": route_record["optimization_time"] or None,
+                    "total_distance": route_record["total_distance"] or None,
+                    "improvement": route_record["improvement_percentage"] or None,
+                },
+                {
+                    "algorithm": route_record["algorithm"],
+                    "success": bool(route_record["success"]),
+                    "traffic_aware": bool(route_record["traffic_aware"]),
+                },
+                event=route_record,
+            )
 
             # Track optimization performance
             if route_record["optimization_time"]:
@@ -211,40 +262,21 @@ class AnalyticsService:
     def get_driver_analytics(self, timeframe: str = "24h") -> Dict[str, Any]:
         """Get driver performance analytics"""
         try:
-            cutoff_time = self._get_cutoff_time(timeframe)
+            summary = self.driver_metrics.query(self._timeframe_seconds(timeframe))
 
-            # Aggregate driver metrics
-            recent_metrics = []
-            for driver_id, metrics_list in self.driver_metrics.items():
-                driver_recent = [
-                    metric
-                    for metric in metrics_list
-                    if datetime.fromisoformat(metric["timestamp"]) >= cutoff_time
-                ]
-                recent_metrics.extend(driver_recent)
-
-            if not recent_metrics:
+            if not summary.count:
                 return {"timeframe": timeframe, "total_drivers": 0}
 
-            # Calculate performance statistics
-            location_accuracies = [
-                m["location_accuracy"] for m in recent_metrics if m["location_accuracy"]
-            ]
-            speeds = [m["speed"] for m in recent_metrics if m["speed"]]
-            customer_ratings = [
-                m["customer_rating"] for m in recent_metrics if m["customer_rating"]
-            ]
-
             return {
                 "timeframe": timeframe,
-                "total_drivers": len(set(m["driver_id"] for m in recent_metrics)),
-                "total_location_updates": len(recent_metrics),
-                "avg_location_accuracy": (
-                    round(mean(location_accuracies), 2) if location_accuracies else 0
+                "total_drivers": len(summary.tag("driver_id")),
+                "total_location_updates": summary.count,
+                "avg_location_accuracy": _rounded(
+                    summary.value("location_accuracy").mean, 2
                 ),
-                "avg_speed": round(mean(speeds), 2) if speeds else 0,
-                "avg_customer_rating": (
-                    round(mean(customer_ratings), 2) if customer_ratings else 0
+                "avg_speed": _rounded(summary.value("speed").mean, 2),
+                "avg_customer_rating": _rounded(
+                    summary.value("customer_rating").mean, 2
                 ),
                 "top_performers": self._get_top_performing_drivers(timeframe),
                 "performance_trends": self._get_driver_performance_trends(timeframe),
@@ -257,63 +289,33 @@ class AnalyticsService:
     def get_route_analytics(self, timeframe: str = "24h") -> Dict[str, Any]:
         """Get route optimization analytics"""
         try:
-            cutoff_time = self._get_cutoff_time(timeframe)
-
-            # Filter recent routes
-            recent_routes = [
-                route
-                for route in self.route_analytics
-                if datetime.fromisoformat(route["timestamp"]) >= cutoff_time
-            ]
+            summary = self.route_analytics.query(self._timeframe_seconds(timeframe))
 
-            if not recent_routes:
+            if not summary.count:
                 return {"timeframe": timeframe, "total_routes": 0}
 
-            # Calculate route statistics
-            successful_routes = [r for r in recent_routes if r["success"]]
-            optimization_times = [
-                r["optimization_time"] for r in recent_routes if r["optimization_time"]
-            ]
-            total_distances = [
-                r["total_distance"] for r in recent_routes if r["total_distance"]
-            ]
-            improvements = [
-                r["improvement_percentage"]
-                for r in recent_routes
-                if r["improvement_percentage"]
-            ]
-
-            algorithm_usage = Counter(route["algorithm"] for route in recent_routes)
+            successful_routes = summary.tag("success")[True]
+            optimization_times = summary.value("optimization_time")
 
             return {
                 "timeframe": timeframe,
-                "total_routes": len(recent_routes),
-                "successful_routes": len(successful_routes),
-                "success_rate": round(
-                    len(successful_routes) / len(recent_routes) * 100, 2
-                ),
-                "avg_optimization_time": (
-                    round(mean(optimization_times), 3) if optimization_times else 0
-                ),
-                "avg_total_distance": (
-                    round(mean(total_distances), 2) if total_distances else 0
-                ),
-                "avg_improvement": round(mean(improvements), 2) if improvements else 0,
-                "algorithm_usage": dict(algorithm_usage),
-                "traffic_aware_routes": len(
-                    [r for r in recent_routes if r["traffic_aware"]]
-                ),
+                "total_routes": summary.count,
+                "successful_routes": successful_routes,
+                "success_rate": round(successful_routes / summary.count * 100, 2),
+                "avg_optimization_time": _rounded(optimization_times.mean, 3),
+                "avg_total_distance": _rounded(summary.value("total_distance").mean, 2),
+                "avg_improvement": _rounded(summary.value("improvement").mean, 2),
+                "algorithm_usage": dict(summary.tag("algorithm")),
+                "traffic_aware_routes": summary.tag("traffic_aware")[True],
                 "performance_metrics": {
-                    "median_optimization_time": (
-                        round(median(optimization_times), 3)
-                        if optimization_times
-                        else 0
+                    "median_optimization_time": _rounded(
+                        optimization_times.quantile(0.5), 3
                     ),
                     "max_optimization_time": (
-                        max(optimization_times) if optimization_times else 0
+                        optimization_times.max if optimization_times.count else 0
                     ),
                     "min_optimization_time": (
-                        min(optimization_times) if optimization_times else 0
+                        optimization_times.min if optimization_times.count else 0
                     ),
                 },
             }
@@ -325,62 +327,31 @@ class AnalyticsService:
     def get_api_analytics(self, timeframe: str = "24h") -> Dict[str, Any]:
         """Get API usage and performance analytics"""
         try:
-            cutoff_time = self._get_cutoff_time(timeframe)
+            summary = self.api_metrics.query(self._timeframe_seconds(timeframe))
 
-            # Aggregate API metrics
-            recent_api_calls = []
-            for endpoint, calls_list in self.api_metrics.items():
-                endpoint_recent = [
-                    call
-                    for call in calls_list
-                    if datetime.fromisoformat(call["timestamp"]) >= cutoff_time
-                ]
-                recent_api_calls.extend(endpoint_recent)
-
-            if not recent_api_calls:
+            if not summary.count:
                 return {"timeframe": timeframe, "total_requests": 0}
 
-            # Calculate API statistics
-            endpoint_usage = Counter(call["endpoint"] for call in recent_api_calls)
-            status_codes = Counter(call["status_code"] for call in recent_api_calls)
-            response_times = [call["response_time"] for call in recent_api_calls]
-            mobile_requests = len(
-                [call for call in recent_api_calls if call["is_mobile"]]
-            )
-
-            # Error rate calculation
-            error_requests = len(
-                [call for call in recent_api_calls if call["status_code"] >= 400]
-            )
-            error_rate = (
-                (error_requests / len(recent_api_calls)) * 100
-                if recent_api_calls
-                else 0
-            )
+            total_requests = summary.count
+            mobile_requests = summary.tag("mobile")[True]
+            error_rate = summary.tag("error")[True] / total_requests * 100
+            response_times = summary.value("response_time")
 
             return {
                 "timeframe": timeframe,
-                "total_requests": len(recent_api_calls),
+                "total_requests": total_requests,
                 "mobile_requests": mobile_requests,
-                "mobile_percentage": round(
-                    (mobile_requests / len(recent_api_calls)) * 100, 2
-                ),
-                "endpoint_usage": dict(endpoint_usage.most_common(10)),
-                "status_codes": dict(status_codes),
+                "mobile_percentage": round(mobile_requests / total_requests * 100, 2),
+                "endpoint_usage": dict(summary.tag("endpoint").most_common(10)),
+                "status_codes": dict(summary.tag("status_code")),
                 "error_rate": round(error_rate, 2),
                 "performance": {
-                    "avg_response_time": (
-                        round(mean(response_times), 3) if response_times else 0
-                    ),
-                    "median_response_time": (
-                        round(median(response_times), 3) if response_times else 0
+                    "avg_response_time": _rounded(response_times.mean, 3),
+                    "median_response_time": _rounded(response_times.quantile(0.5), 3),
+                    "p95_response_time": _rounded(response_times.quantile(0.95), 3),
+                    "max_response_time": (
+                        response_times.max if response_times.count else 0
                     ),
-                    "p95_response_time": (
-                        round(np.percentile(response_times, 95), 3)
-                        if response_times
-                        else 0
-                    ),
-                    "max_response_time": max(response_times) if response_times else 0,
                 },
             }
 
@@ -392,13 +363,13 @@ class AnalyticsService:
         """Get overall system health metrics"""
         try:
             # Recent performance data
-            recent_response_times = self.performance_data["api_response_times"][-1000:]
-            recent_optimization_times = self.performance_data["optimization_times"][
-                -100:
-            ]
+            recent_response_times = list(self.performance_data["api_response_times"])
+            recent_optimization_times = list(
+                self.performance_data["optimization_times"]
+            )
 
             # Recent system events
-            recent_events = self.system_events[-100:]
+            recent_events = list(self.system_events)[-100:]
             error_events = [
                 e for e in recent_events if e["severity"] in ["error", "critical"]
             ]
@@ -467,6 +438,10 @@ class AnalyticsService:
         else:
             return now - timedelta(hours=24)  # Default to 24h
 
+    def _timeframe_seconds(self, timeframe: str) -> int:
+        """Length of a timeframe in seconds (24h if unknown)"""
+        return TIMEFRAME_SECONDS.get(timeframe, TIMEFRAME_SECONDS["24h"])
+
     def _is_mobile_request(self, user_agent: str) -> bool:
         """Detect if request is from mobile device"""
         if not user_agent:
@@ -491,30 +466,18 @@ class AnalyticsService:
     def _get_top_performing_drivers(self, timeframe: str) -> List[Dict[str, Any]]:
         """Get top performing drivers for timeframe"""
         try:
-            cutoff_time = self._get_cutoff_time(timeframe)
-            driver_scores = {}
+            summary = self.driver_metrics.query(self._timeframe_seconds(timeframe))
+            ratings = summary.grouped.get(("driver_id", "customer_rating"), {})
 
-            for driver_id, metrics_list in self.driver_metrics.items():
-                recent_metrics = [
-                    m
-                    for m in metrics_list
-                    if datetime.fromisoformat(m["timestamp"]) >= cutoff_time
-                ]
-
-                if recent_metrics:
-                    # Simple scoring based on customer ratings and efficiency
-                    ratings = [
-                        m["customer_rating"]
-                        for m in recent_metrics
-                        if m["customer_rating"]
-                    ]
-                    avg_rating = mean(ratings) if ratings else 0
-
-                    driver_scores[driver_id] = {
-                        "driver_id": driver_id,
-                        "avg_rating": round(avg_rating, 2),
-                        "total_updates": len(recent_metrics),
-                    }
+            # Simple scoring based on customer ratings
+            driver_scores = {}
+            for driver_id, updates in summary.tag("driver_id").items():
+                rating = ratings.get(driver_id)
+                driver_scores[driver_id] = {
+                    "driver_id": driver_id,
+                    "avg_rating": _rounded(rating.mean if rating else None, 2),
+                    "total_updates": updates,
+                }
 
             # Return top 5 drivers
             return sorted(
@@ -562,3 +525,8 @@ class AnalyticsService:
             return "fair"
         else:
             return "poor"
+
+
+def _rounded(value: Optional[float], digits: int) -> float:
+    """Round an aggregate, reporting missing values as 0"""
+    return round(value, digits) if value is not None else 0
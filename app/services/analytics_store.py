@@ -0,0 +1,197 @@
+"""
+Bounded, time-bucketed storage for analytics events
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.utils.quantile_sketch import QuantileSketch
+
+MINUTE = 60
+HOUR = 3600
+
+
+class AggregateBucket:
+    """
+    Aggregates of the events in one time bucket (or a merge of buckets)
+
+    ``values`` holds a QuantileSketch (count, sum, min, max, quantiles) per
+    numeric field, ``tags`` a Counter per categorical field, and
+    ``grouped`` a sketch per value of a tag for configured (tag, field)
+    pairs, e.g. the rating of each driver.
+    """
+
+    __slots__ = ("start", "count", "values", "tags", "grouped")
+
+    def __init__(self, start: float = 0.0):
+        self.start = start
+        self.count = 0
+        self.values: Dict[str, QuantileSketch] = {}
+        self.tags: Dict[str, Counter] = {}
+        self.grouped: Dict[Tuple[str, str], Dict[Any, QuantileSketch]] = {}
+
+    def add(
+        self,
+        values: Dict[str, Optional[float]],
+        tags: Dict[str, Any],
+        group_by: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """Add one event; None values and tags are skipped"""
+        self.count += 1
+        for name, value in values.items():
+            if value is not None:
+                self._sketch(self.values, name).add(float(value))
+        for name, tag in tags.items():
+            if tag is not None:
+                self.tags.setdefault(name, Counter())[tag] += 1
+        for tag_name, value_name in group_by:
+            tag, value = tags.get(tag_name), values.get(value_name)
+            if tag is not None and value is not None:
+                groups = self.grouped.setdefault((tag_name, value_name), {})
+                self._sketch(groups, tag).add(float(value))
+
+    def merge(self, other: "AggregateBucket") -> "AggregateBucket":
+        """Add another bucket's aggregates into this one"""
+        self.count += other.count
+        for name, sketch in other.values.items():
+            self._sketch(self.values, name).merge(sketch)
+        for name, counts in other.tags.items():
+            self.tags.setdefault(name, Counter()).update(counts)
+        for key, groups in other.grouped.items():
+            target = self.grouped.setdefault(key, {})
+            for tag, sketch in groups.items():
+                self._sketch(target, tag).merge(sketch)
+        return self
+
+    def value(self, name: str) -> QuantileSketch:
+        """Sketch of a numeric field (empty if never recorded)"""
+        return self.values.get(name) or QuantileSketch()
+
+    def tag(self, name: str) -> Counter:
+        """Tally of a categorical field (empty if never recorded)"""
+        return self.tags.get(name) or Counter()
+
+    @staticmethod
+    def _sketch(sketches: Dict[Any, QuantileSketch], key: Any) -> QuantileSketch:
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch()
+        return sketch
+
+
+class TimeBucketStore:
+    """
+    Rolling per-minute aggregates, hourly roll-ups and a raw event ring buffer
+
+    Events update the bucket of the current minute. Minute buckets older
+    than ``minute_retention`` are folded into hourly buckets, which are
+    dropped after ``hour_retention``, so memory is bounded no matter how
+    much traffic arrives. A query merges only the buckets inside its
+    window: O(buckets), never O(events). Windows longer than the minute
+    retention are answered at hourly resolution at their far end.
+    """
+
+    def __init__(
+        self,
+        minute_retention: int = 24 * 60,
+        hour_retention: int = 30 * 24,
+        raw_events: int = 1000,
+        group_by: Iterable[Tuple[str, str]] = (),
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Create an empty store
+
+        Args:
+            minute_retention: Minutes kept at minute resolution
+            hour_retention: Hours kept at hourly resolution
+            raw_events: Size of the ring buffer of raw events
+            group_by: (tag, value) pairs aggregated per tag value
+            clock: Time source in epoch seconds
+        """
+        self.minute_retention = minute_retention
+        self.hour_retention = hour_retention
+        self.group_by = tuple(group_by)
+        self.events: deque = deque(maxlen=raw_events)
+        self._minutes: deque = deque()
+        self._hours: deque = deque()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        values: Dict[str, Optional[float]],
+        tags: Optional[Dict[str, Any]] = None,
+        event: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Record one event
+
+        Args:
+            values: Numeric fields to aggregate
+            tags: Categorical fields to tally
+            event: Raw record kept in the ring buffer
+        """
+        now = self._clock()
+        with self._lock:
+            self._current(now).add(values, tags or {}, self.group_by)
+            if event is not None:
+                self.events.append(event)
+
+    def query(self, seconds: float) -> AggregateBucket:
+        """
+        Merge the aggregates of the last ``seconds``
+
+        Returns:
+            A new AggregateBucket; the stored buckets are not modified
+        """
+        now = self._clock()
+        cutoff = now - seconds
+        result = AggregateBucket(cutoff)
+        with self._lock:
+            self._expire(now)
+            tiers = [(self._minutes, MINUTE)]
+            if seconds > self.minute_retention * MINUTE:
+                tiers.append((self._hours, HOUR))
+            for buckets, width in tiers:
+                # Buckets overlapping the cutoff are included whole
+                first = cutoff // width * width
+                for bucket in reversed(buckets):
+                    if bucket.start < first:
+                        break
+                    result.merge(bucket)
+        return result
+
+    def recent_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent raw events, oldest first"""
+        with self._lock:
+            events = list(self.events)
+        return events[-limit:] if limit else events
+
+    def bucket_count(self) -> int:
+        """Number of buckets currently held"""
+        return len(self._minutes) + len(self._hours)
+
+    def _current(self, now: float) -> AggregateBucket:
+        """Bucket of the current minute (lock held)"""
+        start = now // MINUTE * MINUTE
+        if not self._minutes or self._minutes[-1].start < start:
+            self._minutes.append(AggregateBucket(start))
+            self._expire(now)
+        return self._minutes[-1]
+
+    def _expire(self, now: float) -> None:
+        """Fold old minutes into hours and drop old hours (lock held)"""
+        minute_cutoff = now - self.minute_retention * MINUTE
+        while self._minutes and self._minutes[0].start < minute_cutoff:
+            bucket = self._minutes.popleft()
+            hour = bucket.start // HOUR * HOUR
+            if not self._hours or self._hours[-1].start < hour:
+                self._hours.append(AggregateBucket(hour))
+            self._hours[-1].merge(bucket)
+
+        hour_cutoff = now - self.hour_retention * HOUR
+        while self._hours and self._hours[0].start < hour_cutoff:
+            self._hours.popleft()
@@ -2,14 +2,61 @@
 Database service for RouteForce Routing
 """
 
+from types import SimpleNamespace
 from typing import List, Dict, Any, Optional
 from flask import current_app
-from sqlalchemy import func, desc
+from sqlalchemy import event, func, desc
 from app.models.database import db, User, Store, Route, RouteOptimization, Analytics
+from app.services.store_locator_service import get_store_locator
 import logging
 
 logger = logging.getLogger(__name__)
 
+_PENDING_STORES = "store_locator_pending"
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_store_changes(session, flush_context):
+    """Remember flushed store changes until the transaction commits"""
+    pending = session.info.setdefault(_PENDING_STORES, {})
+    for store in session.new | session.dirty:
+        if isinstance(store, Store) and store.id is not None:
+            pending[store.id] = SimpleNamespace(
+                id=store.id,
+                user_id=store.user_id,
+                name=store.name,
+                address=store.address,
+                chain=store.chain,
+                latitude=store.latitude,
+                longitude=store.longitude,
+                is_active=store.is_active,
+            )
+    for store in session.deleted:
+        if isinstance(store, Store) and store.id is not None:
+            pending[store.id] = SimpleNamespace(id=store.id, deleted=True)
+
+
+@event.listens_for(db.session, "after_commit")
+def _index_committed_stores(session):
+    """Keep the nearest-store index in step with committed store changes"""
+    pending = session.info.pop(_PENDING_STORES, None)
+    if not pending:
+        return
+    try:
+        locator = get_store_locator()
+        for store in pending.values():
+            if getattr(store, "deleted", False):
+                locator.remove_store(store.id)
+        locator.index_stores(s for s in pending.values() if not getattr(s, "deleted", False))
+    except Exception as e:
+        logger.warning(f"Could not update store locator index: {e}")
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_store_changes(session):
+    """Rolled-back store changes never reach the index"""
+    session.info.pop(_PENDING_STORES, None)
+
 
 class DatabaseService:
     """Service for database operations"""
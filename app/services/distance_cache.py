@@ -0,0 +1,425 @@
+"""
+Distance Matrix Cache - content-addressed reuse of distance matrices
+In-process LRU bounded by bytes with an optional on-disk .npy tier,
+itself bounded by bytes and evicted least recently used first
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Coordinates are rounded to this many decimals (~0.1 m) before hashing
+COORDINATE_PRECISION = 6
+# Matrices smaller than this are cheaper to rebuild than to look up
+MIN_CACHED_SIZE = 16
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+_LAT_OFFSET = 90 * 10**COORDINATE_PRECISION
+_LON_OFFSET = 180 * 10**COORDINATE_PRECISION
+_LON_SPAN = 360 * 10**COORDINATE_PRECISION + 1
+
+MatrixBuilder = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class _CacheEntry:
+    """Matrix for a sorted set of coordinate codes"""
+
+    method: str
+    codes: np.ndarray
+    matrix: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + self.matrix.nbytes)
+
+
+@dataclass
+class DistanceCacheStats:
+    """Hit/miss counters for the distance matrix cache"""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    submatrix_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    disk_evictions: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "submatrix_hits": self.submatrix_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+def coordinate_codes(coords: np.ndarray) -> np.ndarray:
+    """
+    Encode rounded (lat, lon) pairs as sortable int64 codes
+
+    Args:
+        coords: Array of shape (n, 2) with finite latitude/longitude degrees
+
+    Returns:
+        Array of n int64 codes; equal codes mean equal rounded coordinates
+    """
+    scaled = np.rint(np.asarray(coords, dtype=np.float64) * 10**COORDINATE_PRECISION)
+    lat = scaled[:, 0].astype(np.int64) + _LAT_OFFSET
+    lon = scaled[:, 1].astype(np.int64) + _LON_OFFSET
+    return lat * _LON_SPAN + lon
+
+
+def decode_coordinates(codes: np.ndarray) -> np.ndarray:
+    """Inverse of coordinate_codes, returning rounded (lat, lon) pairs"""
+    lat = codes // _LON_SPAN - _LAT_OFFSET
+    lon = codes % _LON_SPAN - _LON_OFFSET
+    return np.column_stack((lat, lon)).astype(np.float64) / 10**COORDINATE_PRECISION
+
+
+def matrix_cache_key(codes: np.ndarray, method: str) -> str:
+    """Content hash of a sorted coordinate-code set and distance method"""
+    digest = hashlib.sha256(method.encode("utf-8"))
+    digest.update(np.ascontiguousarray(codes, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+class DistanceMatrixCache:
+    """
+    Content-addressed cache of distance matrices
+
+    Matrices are stored for the sorted set of unique rounded coordinates,
+    keyed by a hash of that set and the distance method, so the same stores
+    in any order share one entry. A request whose coordinates are a subset
+    of a cached set is served by slicing the cached matrix. Entries live in
+    an in-process LRU bounded by ``max_bytes`` and, when ``cache_dir`` is
+    set, as ``.npy`` files opened with ``np.load(mmap_mode="r")``. The
+    directory is kept under ``max_disk_bytes`` by deleting the matrices
+    with the oldest modification time; disk hits refresh that time.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        cache_dir: Optional[str] = None,
+        min_size: int = MIN_CACHED_SIZE,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Upper bound on matrix bytes held in memory
+            cache_dir: Directory for the on-disk tier (disabled when None)
+            min_size: Smallest store count worth caching
+            max_disk_bytes: Upper bound on bytes kept in ``cache_dir``
+        """
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.min_size = min_size
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = DistanceCacheStats()
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # (method, key) -> codes for files on disk, scanned on first use
+        self._disk_index: Optional[Dict[Tuple[str, str], np.ndarray]] = None
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get_or_build(self, coords: np.ndarray, method: str, builder: MatrixBuilder) -> np.ndarray:
+        """
+        Return the distance matrix for coordinates, building it on a miss
+
+        Args:
+            coords: Array of shape (n, 2); NaN rows mark missing coordinates
+            method: Distance method name, part of the cache key
+            builder: Computes a matrix for an (m, 2) array of finite coordinates
+
+        Returns:
+            Fresh (n, n) float64 matrix owned by the caller. Pairs involving
+            a missing coordinate are ``inf``; the diagonal is 0.
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        n = len(coords)
+        valid = np.isfinite(coords).all(axis=1)
+
+        in_range = (np.abs(coords[valid, 0]) <= 90).all() and (
+            np.abs(coords[valid, 1]) <= 180
+        ).all()
+        if valid.sum() < self.min_size or not in_range:
+            return builder(coords)
+
+        codes, inverse = np.unique(coordinate_codes(coords[valid]), return_inverse=True)
+        entry, positions = self._lookup(codes, method)
+        if entry is None:
+            with self._lock:
+                self.stats.misses += 1
+            matrix = np.ascontiguousarray(builder(decode_coordinates(codes)))
+            entry = _CacheEntry(method, codes, matrix)
+            positions = np.arange(len(codes))
+            self._store(matrix_cache_key(codes, method), entry)
+
+        index = positions[inverse]
+        if valid.all():
+            result = entry.matrix[np.ix_(index, index)]
+        else:
+            result = np.full((n, n), np.inf)
+            rows = np.flatnonzero(valid)
+            result[np.ix_(rows, rows)] = entry.matrix[np.ix_(index, index)]
+        np.fill_diagonal(result, 0.0)
+        return np.ascontiguousarray(result, dtype=np.float64)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry (files on disk are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes currently held by the in-process tier"""
+        return self._bytes
+
+    # Lookup
+
+    def _lookup(
+        self, codes: np.ndarray, method: str
+    ) -> Tuple[Optional[_CacheEntry], Optional[np.ndarray]]:
+        """Find an entry covering ``codes`` and the positions of each code"""
+        key = matrix_cache_key(codes, method)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.memory_hits += 1
+                return entry, np.arange(len(codes))
+
+            # Largest superset first: it is the most likely to be reused
+            candidates = sorted(
+                (
+                    (k, e)
+                    for k, e in self._entries.items()
+                    if e.method == method and len(e.codes) > len(codes)
+                ),
+                key=lambda item: -len(item[1].codes),
+            )
+        for candidate_key, candidate in candidates:
+            positions = _subset_positions(candidate.codes, codes)
+            if positions is not None:
+                with self._lock:
+                    if candidate_key in self._entries:
+                        self._entries.move_to_end(candidate_key)
+                    self.stats.submatrix_hits += 1
+                return candidate, positions
+
+        entry = self._load_from_disk(key, method)
+        if entry is not None:
+            with self._lock:
+                self.stats.disk_hits += 1
+            self._remember(key, entry)
+            return entry, np.arange(len(codes))
+
+        # Supersets persisted by earlier processes
+        for disk_key, disk_codes in self._disk_candidates(codes, method):
+            positions = _subset_positions(disk_codes, codes)
+            if positions is None:
+                continue
+            entry = self._load_from_disk(disk_key, method)
+            if entry is not None:
+                with self._lock:
+                    self.stats.disk_hits += 1
+                    self.stats.submatrix_hits += 1
+                self._remember(disk_key, entry)
+                return entry, positions
+
+        return None, None
+
+    # Storage
+
+    def _store(self, key: str, entry: _CacheEntry) -> None:
+        self._remember(key, entry)
+        self._save_to_disk(key, entry)
+
+    def _remember(self, key: str, entry: _CacheEntry) -> None:
+        """Insert into the in-process LRU, evicting to stay under max_bytes"""
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.stats.evictions += 1
+
+    def _paths(self, key: str, method: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, f"{method}-{key}")
+        return f"{base}.npy", f"{base}.codes.npy"
+
+    def _disk_candidates(self, codes: np.ndarray, method: str):
+        """Yield (key, codes) for on-disk sets larger than ``codes``"""
+        if not self.cache_dir:
+            return
+        with self._lock:
+            if self._disk_index is None:
+                self._disk_index = self._scan_disk()
+            index = [
+                (key, disk_codes)
+                for (disk_method, key), disk_codes in self._disk_index.items()
+                if disk_method == method
+                and key not in self._entries
+                and len(disk_codes) > len(codes)
+            ]
+        index.sort(key=lambda item: -len(item[1]))
+        yield from index
+
+    def _scan_disk(self) -> Dict[Tuple[str, str], np.ndarray]:
+        """Read the coordinate codes of every matrix in the cache directory"""
+        index = {}
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".codes.npy"):
+                continue
+            method, _, key = name[: -len(".codes.npy")].rpartition("-")
+            try:
+                index[(method, key)] = np.load(os.path.join(self.cache_dir, name))
+            except (OSError, ValueError):
+                continue
+        return index
+
+    def _save_to_disk(self, key: str, entry: _CacheEntry) -> None:
+        if not self.cache_dir or entry.nbytes > self.max_disk_bytes:
+            return
+        matrix_path, codes_path = self._paths(key, entry.method)
+        try:
+            for path, array in ((codes_path, entry.codes), (matrix_path, entry.matrix)):
+                # Write then rename so concurrent readers never see partial files
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as handle:
+                    np.save(handle, array)
+                os.replace(tmp_path, path)
+            with self._lock:
+                if self._disk_index is not None:
+                    self._disk_index[(entry.method, key)] = entry.codes
+        except OSError as e:
+            logger.warning(f"Could not persist distance matrix {key[:12]}: {e}")
+            return
+        self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Delete least recently used matrices until the directory fits max_disk_bytes"""
+        files = []
+        total = 0
+        # Re-read the directory: other processes may share it
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".codes.npy"):
+                continue
+            method, _, key = name[: -len(".codes.npy")].rpartition("-")
+            matrix_path, codes_path = self._paths(key, method)
+            try:
+                matrix_stat = os.stat(matrix_path)
+                size = matrix_stat.st_size + os.stat(codes_path).st_size
+            except OSError:
+                continue
+            files.append((matrix_stat.st_mtime, method, key, size))
+            total += size
+
+        files.sort()
+        for _, method, key, size in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                for path in self._paths(key, method):
+                    if os.path.exists(path):
+                        os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not evict cached matrix {key[:12]}: {e}")
+                continue
+            total -= size
+            with self._lock:
+                if self._disk_index is not None:
+                    self._disk_index.pop((method, key), None)
+                self.stats.disk_evictions += 1
+
+    def _load_from_disk(self, key: str, method: str) -> Optional[_CacheEntry]:
+        if not self.cache_dir:
+            return None
+        matrix_path, codes_path = self._paths(key, method)
+        if not (os.path.exists(matrix_path) and os.path.exists(codes_path)):
+            return None
+        try:
+            codes = np.load(codes_path)
+            matrix = np.load(matrix_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached matrix {key[:12]}: {e}")
+            return None
+        if matrix.shape != (len(codes), len(codes)):
+            return None
+        try:
+            # The matrix file's mtime is the recency used by _trim_disk
+            os.utime(matrix_path)
+        except OSError:
+            pass
+        return _CacheEntry(method, codes, matrix)
+
+
+def _subset_positions(superset: np.ndarray, codes: np.ndarray) -> Optional[np.ndarray]:
+    """Positions of sorted ``codes`` inside sorted ``superset``, or None"""
+    positions = np.searchsorted(superset, codes)
+    if positions[-1] >= len(superset):
+        return None
+    if not np.array_equal(superset[positions], codes):
+        return None
+    return positions
+
+
+def _megabytes_from_env(name: str, default: int) -> int:
+    """Read a byte budget given in megabytes from the environment"""
+    value = os.getenv(name)
+    try:
+        return int(float(value) * 1024 * 1024) if value else default
+    except ValueError:
+        logger.warning(f"Invalid {name} value '{value}', using default")
+        return default
+
+
+_default_cache: Optional[DistanceMatrixCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_distance_matrix_cache() -> DistanceMatrixCache:
+    """
+    Process-wide distance matrix cache
+
+    Configured from RFR_DISTANCE_CACHE_MAX_MB (in-process budget, default
+    256), RFR_DISTANCE_CACHE_DIR (enables the on-disk tier) and
+    RFR_DISTANCE_CACHE_DISK_MAX_MB (on-disk budget, default 2048).
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = DistanceMatrixCache(
+                    max_bytes=_megabytes_from_env("RFR_DISTANCE_CACHE_MAX_MB", DEFAULT_MAX_BYTES),
+                    cache_dir=os.getenv("RFR_DISTANCE_CACHE_DIR") or None,
+                    max_disk_bytes=_megabytes_from_env(
+                        "RFR_DISTANCE_CACHE_DISK_MAX_MB", DEFAULT_MAX_DISK_BYTES
+                    ),
+                )
+    return _default_cache
@@ -4,15 +4,31 @@ Modern Distance Calculation Utilities - Clean, testable, performant
 
 import logging
 import math
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from geopy.distance import geodesic
 
-from app.services.metrics_service import track_distance_calculation
+from app.models.store_table import StoreTable
+from app.services.distance_cache import DistanceMatrixCache, get_distance_matrix_cache
+from app.services.metrics_service import (
+    record_distance_matrix,
+    track_distance_calculation,
+)
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+# WGS-84 ellipsoid (same as geopy's default) for the fast geodesic mode
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B_KM = (1 - WGS84_F) * WGS84_A_KM
+_VINCENTY_TOLERANCE = 1e-12
+_VINCENTY_MAX_ITERATIONS = 200
+
 
 @dataclass
 class Coordinates:
@@ -81,6 +97,26 @@ class DistanceCalculator:
         """
         return geodesic(coord1.to_tuple(), coord2.to_tuple()).km
 
+    @staticmethod
+    @track_distance_calculation
+    def fast_geodesic_distance(coord1: Coordinates, coord2: Coordinates) -> float:
+        """
+        Calculate ellipsoidal distance with Vincenty's inverse formula
+
+        Agrees with geodesic_distance to well under a metre but avoids building
+        a geopy object per pair, so it is the default for hot paths.
+
+        Args:
+            coord1: First coordinate point
+            coord2: Second coordinate point
+
+        Returns:
+            Distance in kilometers
+        """
+        return fast_geodesic_km(
+            coord1.latitude, coord1.longitude, coord2.latitude, coord2.longitude
+        )
+
     @staticmethod
     def manhattan_distance(coord1: Coordinates, coord2: Coordinates) -> float:
         """
@@ -143,16 +179,320 @@ class CoordinateExtractor:
 
         return None
 
+    @staticmethod
+    def extract_coordinate_array(stores: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """
+        Extract coordinates for a store collection in a single pass
+
+        Args:
+            stores: List of store dictionaries
+
+        Returns:
+            Contiguous (n, 2) float64 array of (lat, lon); rows for stores
+            without usable coordinates are NaN. For a StoreTable this is
+            its read-only coordinate column.
+        """
+        if isinstance(stores, StoreTable):
+            return stores.coordinates
+
+        coords = np.full((len(stores), 2), np.nan, dtype=np.float64)
+        for i, store in enumerate(stores):
+            coord = CoordinateExtractor.extract_coordinates(store)
+            if coord is not None:
+                coords[i, 0] = coord.latitude
+                coords[i, 1] = coord.longitude
+        return coords
+
+
+class DistanceMatrixEngine:
+    """Vectorized distance matrix construction shared by all optimizers"""
+
+    METHODS = (
+        "haversine",
+        "equirectangular",
+        "manhattan",
+        "fast_geodesic",
+        "geodesic",
+    )
+
+    def __init__(
+        self, method: str = "haversine", cache: Optional[DistanceMatrixCache] = None
+    ):
+        """
+        Initialize the engine with a distance method
+
+        Args:
+            method: "haversine", "equirectangular", "manhattan",
+                "fast_geodesic" or "geodesic"
+            cache: Optional matrix cache consulted before computing
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported distance method: {method}")
+        self.method = method
+        self.cache = cache
+
+    def build(
+        self, stores: Union[Sequence[Dict[str, Any]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Build a symmetric distance matrix for stores or a coordinate array
+
+        Args:
+            stores: List of store dictionaries, or an (n, 2) array of (lat, lon)
+
+        Returns:
+            Contiguous (n, n) float64 matrix in kilometers. Pairs involving a
+            store without coordinates are ``inf``; the diagonal is always 0.
+        """
+        if isinstance(stores, np.ndarray):
+            coords = np.asarray(stores, dtype=np.float64).reshape(-1, 2)
+        else:
+            coords = CoordinateExtractor.extract_coordinate_array(stores)
+
+        n = coords.shape[0]
+        if n == 0:
+            return np.zeros((0, 0), dtype=np.float64)
+
+        start_time = time.perf_counter()
+        if self.cache is not None:
+            matrix = self.cache.get_or_build(coords, self.method, self._compute)
+        else:
+            matrix = self._compute(coords)
+        record_distance_matrix(self.method, n, time.perf_counter() - start_time)
+
+        missing = np.isnan(coords).any(axis=1)
+        if missing.any():
+            matrix[missing, :] = np.inf
+            matrix[:, missing] = np.inf
+        np.fill_diagonal(matrix, 0.0)
+
+        return np.ascontiguousarray(matrix)
+
+    def _compute(self, coords: np.ndarray) -> np.ndarray:
+        """Compute the raw matrix for an (n, 2) coordinate array"""
+        if self.method == "equirectangular":
+            matrix = equirectangular_matrix(coords)
+        elif self.method == "manhattan":
+            matrix = manhattan_matrix(coords)
+        elif self.method == "fast_geodesic":
+            matrix = fast_geodesic_matrix(coords)
+        elif self.method == "geodesic":
+            matrix = _pairwise_geodesic_matrix(coords)
+        else:
+            matrix = haversine_matrix(coords)
+        return matrix
+
+
+def haversine_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances (km) for an (n, 2) lat/lon array"""
+    lat = np.radians(coords[:, 0])
+    lon = np.radians(coords[:, 1])
+    cos_lat = np.cos(lat)
+
+    sin_dlat = np.sin((lat[:, None] - lat[None, :]) * 0.5)
+    sin_dlon = np.sin((lon[:, None] - lon[None, :]) * 0.5)
+    a = sin_dlat * sin_dlat + np.outer(cos_lat, cos_lat) * (sin_dlon * sin_dlon)
+    np.clip(a, 0.0, 1.0, out=a)
+
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def equirectangular_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise equirectangular-projection distances (km), fast for short hops"""
+    lat = np.radians(coords[:, 0])
+    lon = np.radians(coords[:, 1])
+
+    dlon = lon[:, None] - lon[None, :]
+    # Wrap longitude differences across the antimeridian
+    dlon = (dlon + np.pi) % (2.0 * np.pi) - np.pi
+    x = dlon * np.cos((lat[:, None] + lat[None, :]) * 0.5)
+    y = lat[:, None] - lat[None, :]
+
+    return EARTH_RADIUS_KM * np.hypot(x, y)
+
+
+def manhattan_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise Manhattan distances (km), matching DistanceCalculator.manhattan_distance"""
+    lat = coords[:, 0]
+    lon = coords[:, 1]
+
+    lat_diff = np.abs(lat[:, None] - lat[None, :]) * 111
+    mean_lat = np.radians((lat[:, None] + lat[None, :]) * 0.5)
+    lon_diff = np.abs(lon[:, None] - lon[None, :]) * 111 * np.cos(mean_lat)
+
+    return lat_diff + lon_diff
+
+
+def fast_geodesic_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Vincenty inverse distance (km) on WGS-84 for a single pair"""
+    if lat1 == lat2 and lon1 == lon2:
+        return 0.0
+
+    f = WGS84_F
+    big_l = math.radians(lon2 - lon1)
+    u1 = math.atan((1 - f) * math.tan(math.radians(lat1)))
+    u2 = math.atan((1 - f) * math.tan(math.radians(lat2)))
+    sin_u1, cos_u1 = math.sin(u1), math.cos(u1)
+    sin_u2, cos_u2 = math.sin(u2), math.cos(u2)
+
+    lam = big_l
+    for _ in range(_VINCENTY_MAX_ITERATIONS):
+        sin_lam, cos_lam = math.sin(lam), math.cos(lam)
+        sin_sigma = math.hypot(
+            cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam
+        )
+        if sin_sigma == 0.0:
+            return 0.0
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = math.atan2(sin_sigma, cos_sigma)
+        sin_alpha = cos_u1 * cos_u2 * sin_lam / sin_sigma
+        cos2_alpha = 1.0 - sin_alpha * sin_alpha
+        cos_2sm = (
+            cos_sigma - 2.0 * sin_u1 * sin_u2 / cos2_alpha if cos2_alpha else 0.0
+        )
+        c = f / 16.0 * cos2_alpha * (4.0 + f * (4.0 - 3.0 * cos2_alpha))
+        lam_prev = lam
+        lam = big_l + (1.0 - c) * f * sin_alpha * (
+            sigma
+            + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1.0 + 2.0 * cos_2sm**2))
+        )
+        if abs(lam - lam_prev) < _VINCENTY_TOLERANCE:
+            break
+    else:
+        # Nearly antipodal points: Vincenty does not converge, defer to geopy
+        return geodesic((lat1, lon1), (lat2, lon2)).km
+
+    return _vincenty_length(sigma, sin_sigma, cos_sigma, cos2_alpha, cos_2sm)
+
+
+def fast_geodesic_distances(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """Vincenty inverse distances (km) on WGS-84 for arrays of point pairs"""
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (lat1, lon1, lat2, lon2))
+    )
+    shape = lat1.shape
+    lat1, lon1, lat2, lon2 = (a.ravel() for a in (lat1, lon1, lat2, lon2))
+    f = WGS84_F
+    big_l = np.radians(lon2 - lon1)
+    u1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    u2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sin_u1, cos_u1 = np.sin(u1), np.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+
+    valid = ~(np.isnan(lat1) | np.isnan(lon1) | np.isnan(lat2) | np.isnan(lon2))
+    lam = big_l.copy()
+    active = valid.copy()
+    sigma = np.zeros_like(lam)
+    sin_sigma = np.zeros_like(lam)
+    cos_sigma = np.ones_like(lam)
+    cos2_alpha = np.ones_like(lam)
+    cos_2sm = np.zeros_like(lam)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(_VINCENTY_MAX_ITERATIONS):
+            idx = np.flatnonzero(active)
+            if not idx.size:
+                break
+            lam_a = lam[idx]
+            su1, cu1, su2, cu2 = sin_u1[idx], cos_u1[idx], sin_u2[idx], cos_u2[idx]
+            sin_lam, cos_lam = np.sin(lam_a), np.cos(lam_a)
+
+            s_sigma = np.hypot(cu2 * sin_lam, cu1 * su2 - su1 * cu2 * cos_lam)
+            c_sigma = su1 * su2 + cu1 * cu2 * cos_lam
+            sig = np.arctan2(s_sigma, c_sigma)
+            sin_alpha = np.where(s_sigma > 0, cu1 * cu2 * sin_lam / s_sigma, 0.0)
+            c2_alpha = 1.0 - sin_alpha * sin_alpha
+            c_2sm = np.where(c2_alpha > 0, c_sigma - 2.0 * su1 * su2 / c2_alpha, 0.0)
+            c = f / 16.0 * c2_alpha * (4.0 + f * (4.0 - 3.0 * c2_alpha))
+            new_lam = big_l[idx] + (1.0 - c) * f * sin_alpha * (
+                sig
+                + c * s_sigma * (c_2sm + c * c_sigma * (-1.0 + 2.0 * c_2sm * c_2sm))
+            )
+
+            lam[idx] = new_lam
+            sigma[idx] = sig
+            sin_sigma[idx] = s_sigma
+            cos_sigma[idx] = c_sigma
+            cos2_alpha[idx] = c2_alpha
+            cos_2sm[idx] = c_2sm
+            done = (np.abs(new_lam - lam_a) < _VINCENTY_TOLERANCE) | (s_sigma == 0.0)
+            active[idx] = ~done
+
+        distances = _vincenty_length(sigma, sin_sigma, cos_sigma, cos2_alpha, cos_2sm)
+
+    # Coincident points, then the rare non-converging (nearly antipodal) pairs
+    distances = np.where(sin_sigma == 0.0, 0.0, distances)
+    distances[~valid] = np.nan
+    for i in np.flatnonzero(active):
+        distances[i] = geodesic((lat1[i], lon1[i]), (lat2[i], lon2[i])).km
+
+    return distances.reshape(shape)
+
+
+def _vincenty_length(sigma, sin_sigma, cos_sigma, cos2_alpha, cos_2sm):
+    """Final step of Vincenty's inverse formula: arc length in km"""
+    a2, b2 = WGS84_A_KM**2, WGS84_B_KM**2
+    u_sq = cos2_alpha * (a2 - b2) / b2
+    big_a = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+    big_b = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+    delta_sigma = (
+        big_b
+        * sin_sigma
+        * (
+            cos_2sm
+            + big_b
+            / 4
+            * (
+                cos_sigma * (-1 + 2 * cos_2sm**2)
+                - big_b / 6 * cos_2sm * (-3 + 4 * sin_sigma**2) * (-3 + 4 * cos_2sm**2)
+            )
+        )
+    )
+    return WGS84_B_KM * big_a * (sigma - delta_sigma)
+
+
+def fast_geodesic_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise Vincenty distances (km); only the upper triangle is computed"""
+    n = coords.shape[0]
+    matrix = np.zeros((n, n), dtype=np.float64)
+    i, j = np.triu_indices(n, k=1)
+    upper = fast_geodesic_distances(
+        coords[i, 0], coords[i, 1], coords[j, 0], coords[j, 1]
+    )
+    matrix[i, j] = upper
+    matrix[j, i] = upper
+    return matrix
+
+
+def _pairwise_geodesic_matrix(coords: np.ndarray) -> np.ndarray:
+    """Pairwise geopy geodesic distances (km); exact but one call per pair"""
+    n = coords.shape[0]
+    matrix = np.zeros((n, n), dtype=np.float64)
+    valid = ~np.isnan(coords).any(axis=1)
+
+    for i in range(n):
+        if not valid[i]:
+            continue
+        for j in range(i + 1, n):
+            if valid[j]:
+                distance = geodesic(tuple(coords[i]), tuple(coords[j])).km
+                matrix[i, j] = distance
+                matrix[j, i] = distance
+
+    return matrix
+
 
 class RouteDistanceCalculator:
     """Calculate distances for routes and store collections"""
 
-    def __init__(self, distance_method: str = "geodesic"):
+    def __init__(self, distance_method: str = "fast_geodesic"):
         """
         Initialize with preferred distance calculation method
 
         Args:
-            distance_method: "geodesic", "haversine", or "manhattan"
+            distance_method: "fast_geodesic", "geodesic", "haversine", or "manhattan"
         """
         self.distance_method = distance_method
         self._calculator = DistanceCalculator()
@@ -163,6 +503,8 @@ class RouteDistanceCalculator:
             return self._calculator.haversine_distance(coord1, coord2)
         elif self.distance_method == "manhattan":
             return self._calculator.manhattan_distance(coord1, coord2)
+        elif self.distance_method == "fast_geodesic":
+            return self._calculator.fast_geodesic_distance(coord1, coord2)
         else:  # Default to geodesic
             return self._calculator.geodesic_distance(coord1, coord2)
 
@@ -213,9 +555,7 @@ class RouteDistanceCalculator:
 
         return total_distance
 
-    def calculate_distance_matrix(
-        self, stores: List[Dict[str, Any]]
-    ) -> List[List[float]]:
+    def calculate_distance_matrix(self, stores: List[Dict[str, Any]]) -> np.ndarray:
         """
         Calculate distance matrix for all store pairs
 
@@ -223,18 +563,14 @@ class RouteDistanceCalculator:
             stores: List of store dictionaries
 
         Returns:
-            2D list representing distance matrix
+            Contiguous (n, n) ndarray of distances in kilometers
         """
-        n = len(stores)
-        matrix = [[0.0 for _ in range(n)] for _ in range(n)]
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                distance = self.calculate_store_distance(stores[i], stores[j])
-                matrix[i][j] = distance
-                matrix[j][i] = distance  # Symmetric matrix
-
-        return matrix
+        method = self.distance_method
+        if method not in DistanceMatrixEngine.METHODS:
+            method = "geodesic"  # Same fallback as _calculate_distance
+        return DistanceMatrixEngine(method, cache=get_distance_matrix_cache()).build(
+            stores
+        )
 
 
 class ProximityClusterer:
@@ -249,6 +585,9 @@ class ProximityClusterer:
         """
         Cluster stores within a specified radius
 
+        A store joins a cluster when it is within ``radius_km`` of any store
+        already in it (single linkage on a radius-sized grid).
+
         Args:
             stores: List of store dictionaries
             radius_km: Maximum distance for clustering in kilometers
@@ -256,44 +595,40 @@ class ProximityClusterer:
         Returns:
             List of clusters, each containing nearby stores
         """
-        clusters = []
-        remaining_stores = stores.copy()
+        # Imported lazily: the clustering utilities depend on this module
+        from app.utils.clustering import GridClusterer
 
-        while remaining_stores:
-            # Start new cluster with first remaining store
-            seed_store = remaining_stores.pop(0)
-            cluster = [seed_store]
+        return GridClusterer(radius_km, mode="single_linkage").cluster(stores)
 
-            # Find stores within radius of any store in current cluster
-            i = 0
-            while i < len(remaining_stores):
-                store = remaining_stores[i]
-                # Check if store is within radius of any store in cluster
-                within_radius = any(
-                    self.distance_calculator.calculate_store_distance(
-                        store, cluster_store
-                    )
-                    <= radius_km
-                    for cluster_store in cluster
-                )
 
-                if within_radius:
-                    cluster.append(remaining_stores.pop(i))
-                else:
-                    i += 1
+# Factory functions for easy setup
+def create_distance_calculator(method: str = "fast_geodesic") -> RouteDistanceCalculator:
+    """Create a distance calculator with specified method"""
+    return RouteDistanceCalculator(method)
 
-            clusters.append(cluster)
 
-        return clusters
+def create_distance_matrix_engine(method: str = "haversine") -> DistanceMatrixEngine:
+    """Create a distance matrix engine with specified method"""
+    return DistanceMatrixEngine(method)
 
 
-# Factory functions for easy setup
-def create_distance_calculator(method: str = "geodesic") -> RouteDistanceCalculator:
-    """Create a distance calculator with specified method"""
-    return RouteDistanceCalculator(method)
+def build_distance_matrix(
+    stores: Union[Sequence[Dict[str, Any]], np.ndarray],
+    method: str = "haversine",
+    use_cache: bool = True,
+) -> np.ndarray:
+    """
+    Build a distance matrix for stores (or an (n, 2) coordinate array)
+
+    Repeated store sets, in any order or as a subset of an earlier set, are
+    served from the process-wide distance matrix cache unless ``use_cache``
+    is False.
+    """
+    cache = get_distance_matrix_cache() if use_cache else None
+    return DistanceMatrixEngine(method, cache=cache).build(stores)
 
 
-def create_proximity_clusterer(method: str = "geodesic") -> ProximityClusterer:
+def create_proximity_clusterer(method: str = "fast_geodesic") -> ProximityClusterer:
     """Create a proximity clusterer with specified distance method"""
     distance_calc = create_distance_calculator(method)
     return ProximityClusterer(distance_calc)
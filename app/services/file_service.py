@@ -7,13 +7,16 @@ import csv
 import io
 import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from werkzeug.utils import secure_filename
 from werkzeug.datastructures import FileStorage
 from flask import Response, current_app
 
 logger = logging.getLogger(__name__)
 
+# Rows parsed per chunk when streaming an uploaded stores file
+DEFAULT_CHUNK_SIZE = 5000
+
 
 class FileService:
     """Service for handling file operations"""
@@ -236,6 +239,33 @@ class FileService:
         Returns:
             List of store dictionaries
 
+        Raises:
+            ValueError: If file processing fails
+        """
+        stores = []
+        for chunk in self.iter_stores_file(file):
+            stores.extend(chunk)
+
+        logger.info(f"Processed {len(stores)} stores from file {file.filename}")
+        return stores
+
+    def iter_stores_file(
+        self, file: FileStorage, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream cleaned store rows from an uploaded file in chunks
+
+        The upload is parsed straight from its stream, so memory stays
+        bounded by the chunk size and callers can geocode or persist each
+        chunk before the rest of the file is read.
+
+        Args:
+            file: Uploaded file storage object
+            chunk_size: Maximum number of stores per chunk
+
+        Yields:
+            Lists of store dictionaries
+
         Raises:
             ValueError: If file processing fails
         """
@@ -245,31 +275,62 @@ class FileService:
         if not self._is_allowed_file(file.filename):
             raise ValueError(f"Invalid file type. Allowed: {self.allowed_extensions}")
 
+        extension = file.filename.rsplit(".", 1)[1].lower()
         try:
-            # Read file content
-            file_content = file.read().decode("utf-8")
-            file.seek(0)  # Reset file pointer for potential reuse
-
-            # Parse CSV content
-            csv_reader = csv.DictReader(io.StringIO(file_content))
-            stores = []
+            if extension == "csv":
+                rows = self._iter_csv_rows(file.stream)
+            else:
+                rows = self._iter_excel_rows(file.stream, extension)
 
-            for row in csv_reader:
+            chunk = []
+            for row in rows:
                 # Clean up row data
                 clean_row = {}
                 for key, value in row.items():
-                    if key and value:
-                        clean_row[key.strip()] = value.strip()
+                    if key and value is not None:
+                        value = value.strip() if isinstance(value, str) else value
+                        if value != "":
+                            clean_row[str(key).strip()] = value
 
                 if clean_row:  # Only add non-empty rows
-                    stores.append(clean_row)
-
-            logger.info(f"Processed {len(stores)} stores from file {file.filename}")
-            return stores
+                    chunk.append(clean_row)
+                    if len(chunk) >= chunk_size:
+                        yield chunk
+                        chunk = []
+            if chunk:
+                yield chunk
 
         except Exception as e:
             logger.error(f"Error processing stores file: {str(e)}")
             raise ValueError(f"Failed to process stores file: {str(e)}")
+        finally:
+            file.stream.seek(0)  # Reset file pointer for potential reuse
+
+    def _iter_csv_rows(self, stream) -> Iterator[Dict[str, Any]]:
+        """Decode and parse CSV rows incrementally from a binary stream"""
+        text = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+        try:
+            yield from csv.DictReader(text)
+        finally:
+            text.detach()  # Leave the upload stream open
+
+    def _iter_excel_rows(self, stream, extension: str) -> Iterator[Dict[str, Any]]:
+        """Read Excel rows, in read-only streaming mode for .xlsx"""
+        if extension == "xls":
+            for store in self._read_excel_records(stream, "xlrd"):
+                yield store
+            return
+
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, ())
+            for row in rows:
+                yield dict(zip(header, row))
+        finally:
+            workbook.close()
 
     def _is_allowed_file(self, filename: str) -> bool:
         """Check if file extension is allowed"""
@@ -295,19 +356,8 @@ class FileService:
     def _load_excel_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Load data from Excel file"""
         try:
-            import pandas as pd
-
             engine = "openpyxl" if file_path.endswith(".xlsx") else "xlrd"
-            df = pd.read_excel(file_path, engine=engine)
-
-            # Convert to list of dictionaries
-            stores = df.to_dict("records")
-
-            # Clean up NaN values
-            for store in stores:
-                for key, value in store.items():
-                    if pd.isna(value):
-                        store[key] = None
+            stores = self._read_excel_records(file_path, engine)
 
             logger.info(f"Loaded {len(stores)} stores from Excel file")
             return stores
@@ -318,3 +368,20 @@ class FileService:
         except Exception as e:
             logger.error(f"Error reading Excel file: {str(e)}")
             raise
+
+    def _read_excel_records(self, source, engine: str) -> List[Dict[str, Any]]:
+        """Read a whole Excel sheet into records with NaN replaced by None"""
+        import pandas as pd
+
+        df = pd.read_excel(source, engine=engine)
+
+        # Convert to list of dictionaries
+        stores = df.to_dict("records")
+
+        # Clean up NaN values
+        for store in stores:
+            for key, value in store.items():
+                if pd.isna(value):
+                    store[key] = None
+
+        return stores
@@ -1,36 +1,119 @@
 """
 Enhanced Geocoding Cache Service - AUTO-PILOT PERFORMANCE OPTIMIZATION
-Implements Redis-based caching with file fallback for maximum performance
+Implements a two-tier cache: a bounded in-process LRU/TTL tier in front of
+Redis, with SQLite as the persistent fallback
 """
 
 import redis
 import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 from flask import current_app
 
+from app.services.geocoding_service import CacheStorage, SQLiteCache, normalize_address
+from app.services.metrics_service import metrics_collector
+
 logger = logging.getLogger(__name__)
 
+REDIS_KEY_PREFIX = "geocode:"
+REDIS_TTL_SECONDS = 86400 * 30  # 30 days
+# Keys fetched per SCAN step and deleted per pipeline when clearing
+SCAN_BATCH_SIZE = 1000
+
+
+class LRUTTLCache:
+    """Bounded, thread-safe in-process LRU cache whose entries expire"""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the live entries among keys, refreshing their recency"""
+        now = self._clock()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry[0] <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, items: Dict[str, Any]) -> None:
+        """Insert entries, evicting the least recently used beyond capacity"""
+        expires = self._clock() + self.ttl_seconds
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
 
 class GeocodingCache:
-    """High-performance geocoding cache with Redis and file fallback"""
+    """
+    High-performance geocoding cache with memory, Redis and SQLite tiers
+
+    Lookups try the in-process tier first, then fetch every remaining key
+    from Redis with a single MGET, then fall back to SQLite. Writes go to
+    all tiers, with Redis updates batched into one pipeline. Hit, miss and
+    latency counters are exported to the metrics collector.
+
+    Keys are normalized like ModernGeocodingService's, so both services
+    share entries in the same SQLite file. Entries written under the older
+    underscore keys are still read, and rewritten under the current key.
+    """
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
-        self.redis_client = None
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379/0",
+        cache_db: str = "geocoding_cache.sqlite3",
+        memory_size: int = 10_000,
+        memory_ttl: float = 3600.0,
+        redis_client: Optional[Any] = None,
+    ):
+        self.redis_client = redis_client
         self.redis_available = False
-        self.file_cache = {}
         self.cache_file = "geocoding_cache.json"
+        self.memory = LRUTTLCache(memory_size, memory_ttl)
+        self.stats = {"memory_hits": 0, "redis_hits": 0, "file_hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
 
         # Initialize Redis connection
         self._init_redis(redis_url)
 
-        # Load file cache as fallback
-        self._load_file_cache()
+        # Persistent fallback; imports the legacy JSON file on first use
+        self.file_cache = SQLiteCache(cache_db, migrate_from=self.cache_file)
 
     def _init_redis(self, redis_url: str) -> None:
         """Initialize Redis connection with error handling"""
         try:
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
+            if self.redis_client is None:
+                self.redis_client = redis.from_url(redis_url, decode_responses=True)
             # Test connection
             self.redis_client.ping()
             self.redis_available = True
@@ -40,106 +123,246 @@ class GeocodingCache:
             logger.warning(f"⚠️ Redis unavailable, using file cache: {e}")
 
     def get(self, address: str) -> Optional[Dict[str, float]]:
-        """Get coordinates from cache with Redis priority"""
-        cache_key = self._normalize_address(address)
+        """Get coordinates from cache"""
+        return self.get_many([address]).get(address)
 
-        # Try Redis first (fastest)
-        if self.redis_available:
+    def get_many(self, addresses: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Get coordinates for many addresses with at most one Redis round-trip
+
+        Args:
+            addresses: Addresses to look up, duplicates allowed
+
+        Returns:
+            Mapping from each cached input address to {"lat": ..., "lon": ...}
+        """
+        start = time.perf_counter()
+        keys = {address: normalize_address(address) for address in addresses}
+        legacy_keys: Dict[str, str] = {}
+        for address, key in keys.items():
+            legacy_keys.setdefault(key, self._legacy_key(address))
+        pending = list(dict.fromkeys(keys.values()))
+
+        found = self.memory.get_many(pending)
+        memory_hits = len(found)
+        pending = [key for key in pending if key not in found]
+
+        promoted: Dict[str, Dict[str, float]] = {}
+        legacy_hits: Dict[str, Dict[str, float]] = {}
+        redis_hits = 0
+        if pending and self.redis_available:
             try:
-                cached_data = self.redis_client.get(f"geocode:{cache_key}")
-                if cached_data:
-                    logger.debug(f"🎯 Redis cache hit for: {address}")
-                    return json.loads(cached_data)
+                # Current and legacy keys in the same round-trip
+                values = self.redis_client.mget(
+                    [REDIS_KEY_PREFIX + key for key in pending]
+                    + [REDIS_KEY_PREFIX + legacy_keys[key] for key in pending]
+                )
+                for key, raw, legacy_raw in zip(pending, values, values[len(pending) :]):
+                    if raw:
+                        promoted[key] = self._decode(raw)
+                    elif legacy_raw:
+                        promoted[key] = legacy_hits[key] = self._decode(legacy_raw)
+                redis_hits = len(promoted)
             except Exception as e:
                 logger.warning(f"Redis read error: {e}")
                 self.redis_available = False
+            pending = [key for key in pending if key not in promoted]
+
+        file_hits = 0
+        if pending:
+            for key, (lat, lon) in self.file_cache.get_many(pending).items():
+                promoted[key] = {"lat": lat, "lon": lon}
+                file_hits += 1
+            pending = [key for key in pending if key not in promoted]
+        if pending:
+            # Rows imported from the legacy JSON file keep underscore keys
+            by_legacy = {legacy_keys[key]: key for key in pending}
+            for legacy, (lat, lon) in self.file_cache.get_many(by_legacy).items():
+                key = by_legacy[legacy]
+                promoted[key] = legacy_hits[key] = {"lat": lat, "lon": lon}
+                file_hits += 1
+            pending = [key for key in pending if key not in promoted]
 
-        # Fallback to file cache
-        result = self.file_cache.get(cache_key)
-        if result:
-            logger.debug(f"📁 File cache hit for: {address}")
+        if legacy_hits:
+            self.set_many(legacy_hits)
+        if promoted:
+            self.memory.set_many(promoted)
+            found.update(promoted)
 
-        return result
+        self._record_lookup(
+            memory_hits,
+            redis_hits,
+            file_hits,
+            len(pending),
+            time.perf_counter() - start,
+        )
+        return {address: found[key] for address, key in keys.items() if key in found}
 
     def set(self, address: str, coordinates: Dict[str, float]) -> None:
-        """Store coordinates in both Redis and file cache"""
-        cache_key = self._normalize_address(address)
+        """Store coordinates in every tier"""
+        self.set_many({address: coordinates})
+
+    def set_many(self, items: Dict[str, Dict[str, float]]) -> None:
+        """Store coordinates for many addresses, with one Redis pipeline"""
+        entries = {
+            normalize_address(address): {
+                "lat": float(coordinates["lat"]),
+                "lon": float(coordinates["lon"]),
+            }
+            for address, coordinates in items.items()
+        }
+        if not entries:
+            return
+
+        self.memory.set_many(entries)
 
         # Store in Redis (primary)
         if self.redis_available:
             try:
-                self.redis_client.setex(
-                    f"geocode:{cache_key}",
-                    86400 * 30,  # 30 days TTL
-                    json.dumps(coordinates),
-                )
-                logger.debug(f"💾 Stored in Redis: {address}")
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, coordinates in entries.items():
+                    pipe.setex(
+                        REDIS_KEY_PREFIX + key,
+                        REDIS_TTL_SECONDS,
+                        json.dumps(coordinates),
+                    )
+                pipe.execute()
             except Exception as e:
                 logger.warning(f"Redis write error: {e}")
                 self.redis_available = False
 
         # Always update file cache as backup
-        self.file_cache[cache_key] = coordinates
-        self._save_file_cache()
-        logger.debug(f"📁 Stored in file cache: {address}")
+        self.file_cache.set_many({key: (c["lat"], c["lon"]) for key, c in entries.items()})
 
-    def _normalize_address(self, address: str) -> str:
-        """Normalize address for consistent caching"""
+    @staticmethod
+    def _legacy_key(address: str) -> str:
+        """Key the cache used before sharing normalize_address, read only"""
         return address.lower().strip().replace(" ", "_").replace(",", "_")
 
-    def _load_file_cache(self) -> None:
-        """Load file-based cache as fallback"""
-        try:
-            with open(self.cache_file, "r") as f:
-                self.file_cache = json.load(f)
-            logger.info(f"📁 Loaded {len(self.file_cache)} entries from file cache")
-        except FileNotFoundError:
-            self.file_cache = {}
-            logger.info("📁 Creating new file cache")
-        except Exception as e:
-            logger.error(f"Error loading file cache: {e}")
-            self.file_cache = {}
+    @staticmethod
+    def _decode(raw: str) -> Dict[str, float]:
+        """Decode a Redis value stored as {"lat", "lon"} or [lat, lon]"""
+        value = json.loads(raw)
+        if isinstance(value, dict):
+            return {"lat": float(value["lat"]), "lon": float(value["lon"])}
+        return {"lat": float(value[0]), "lon": float(value[1])}
 
-    def _save_file_cache(self) -> None:
-        """Save file-based cache with error handling"""
-        try:
-            with open(self.cache_file, "w") as f:
-                json.dump(self.file_cache, f, indent=2)
-        except Exception as e:
-            logger.error(f"Error saving file cache: {e}")
+    def _record_lookup(
+        self,
+        memory_hits: int,
+        redis_hits: int,
+        file_hits: int,
+        misses: int,
+        duration: float,
+    ) -> None:
+        """Update local counters and export them to the metrics collector"""
+        with self._stats_lock:
+            self.stats["memory_hits"] += memory_hits
+            self.stats["redis_hits"] += redis_hits
+            self.stats["file_hits"] += file_hits
+            self.stats["misses"] += misses
+
+        for tier, hits in (
+            ("memory", memory_hits),
+            ("redis", redis_hits),
+            ("file", file_hits),
+        ):
+            if hits:
+                metrics_collector.increment_counter(
+                    "geocoding_cache_hits_total", hits, labels={"tier": tier}
+                )
+        if misses:
+            metrics_collector.increment_counter("geocoding_cache_misses_total", misses)
+        metrics_collector.observe_histogram("geocoding_cache_lookup_seconds", duration)
+
+    def _scan_keys(self) -> Iterable[List[str]]:
+        """Yield Redis cache keys in batches without blocking the server"""
+        batch = []
+        for key in self.redis_client.scan_iter(match=REDIS_KEY_PREFIX + "*", count=SCAN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         redis_keys = 0
         if self.redis_available:
             try:
-                redis_keys = len(self.redis_client.keys("geocode:*"))
+                redis_keys = sum(len(batch) for batch in self._scan_keys())
             except Exception:
                 pass
 
+        file_entries = self.file_cache.size()
+        with self._stats_lock:
+            counters = dict(self.stats)
+        lookups = sum(counters.values())
+        hits = lookups - counters["misses"]
         return {
             "redis_available": self.redis_available,
+            "memory_entries": len(self.memory),
             "redis_entries": redis_keys,
-            "file_entries": len(self.file_cache),
-            "total_entries": redis_keys + len(self.file_cache),
+            "file_entries": file_entries,
+            "total_entries": redis_keys + file_entries,
+            **counters,
+            "hit_rate": hits / lookups if lookups else 0.0,
         }
 
     def clear_cache(self) -> None:
         """Clear all cache entries"""
+        self.memory.clear()
+
         if self.redis_available:
             try:
-                keys = self.redis_client.keys("geocode:*")
-                if keys:
-                    self.redis_client.delete(*keys)
+                for batch in self._scan_keys():
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    pipe.unlink(*batch)
+                    pipe.execute()
                 logger.info("🗑️ Cleared Redis cache")
             except Exception as e:
                 logger.error(f"Error clearing Redis cache: {e}")
 
         self.file_cache.clear()
-        self._save_file_cache()
         logger.info("🗑️ Cleared file cache")
 
 
+class GeocodingCacheStorage(CacheStorage):
+    """CacheStorage view of GeocodingCache for ModernGeocodingService"""
+
+    def __init__(self, cache: GeocodingCache):
+        self.cache = cache
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """Get coordinates from cache"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """Get coordinates for several keys through every tier"""
+        return {
+            key: (value["lat"], value["lon"]) for key, value in self.cache.get_many(keys).items()
+        }
+
+    def set(self, key: str, value: Tuple[float, float]) -> None:
+        """Set coordinates in cache"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Tuple[float, float]]) -> None:
+        """Set coordinates for several keys"""
+        self.cache.set_many(
+            {key: {"lat": value[0], "lon": value[1]} for key, value in items.items()}
+        )
+
+    def clear(self) -> None:
+        """Clear all cached data"""
+        self.cache.clear_cache()
+
+    def size(self) -> int:
+        """Get cache size (the persistent tier holds every entry)"""
+        return self.cache.file_cache.size()
+
+
 # Global cache instance
 _geocoding_cache = None
 
@@ -4,13 +4,19 @@ Modern Geocoding Service - Clean, testable, dependency-injected design
 
 import json
 import logging
+import os
+import sqlite3
+import threading
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Protocol, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Protocol, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.services.metrics_service import track_geocoding
 
@@ -21,11 +27,22 @@ logger = logging.getLogger(__name__)
 class GeocodingConfig:
     """Configuration for geocoding services"""
 
-    cache_file: str = "geocoding_cache.json"
+    cache_file: str = "geocoding_cache.json"  # Legacy JSON cache, migrated once
+    cache_db: str = "geocoding_cache.sqlite3"
+    cache_backend: str = "sqlite"  # 'sqlite', 'json' or 'redis'
+    redis_url: str = "redis://localhost:6379/0"
     timeout: int = 10
-    delay_seconds: float = 1.0
+    delay_seconds: float = 1.0  # Minimum average spacing between provider calls
     user_agent: str = "RouteForceProBot/1.0"
     max_retries: int = 3
+    base_url: str = "https://nominatim.openstreetmap.org/search"
+    burst: int = 1  # Calls allowed back to back before pacing applies
+    max_concurrency: int = 4  # Provider calls in flight during batch geocoding
+
+
+def normalize_address(address: str) -> str:
+    """Normalize an address for cache keys and de-duplication"""
+    return " ".join(address.lower().split())
 
 
 class GeocodingProvider(Protocol):
@@ -49,6 +66,20 @@ class CacheStorage(ABC):
         """Set coordinates in cache"""
         ...
 
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """Get coordinates for several keys; missing keys are left out"""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Dict[str, Tuple[float, float]]) -> None:
+        """Set coordinates for several keys"""
+        for key, value in items.items():
+            self.set(key, value)
+
     @abstractmethod
     def clear(self) -> None:
         """Clear all cached data"""
@@ -98,6 +129,14 @@ class JSONFileCache(CacheStorage):
         self._cache[key.strip().lower()] = value
         self._save_cache()
 
+    def set_many(self, items: Dict[str, Tuple[float, float]]) -> None:
+        """Set coordinates for several keys with a single file write"""
+        if not items:
+            return
+        for key, value in items.items():
+            self._cache[key.strip().lower()] = value
+        self._save_cache()
+
     def clear(self) -> None:
         """Clear all cached data"""
         self._cache.clear()
@@ -109,27 +148,270 @@ class JSONFileCache(CacheStorage):
         return len(self._cache)
 
 
+class TokenBucket:
+    """
+    Thread-safe token bucket pacing calls to a rate-limited provider
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Each acquire() reserves one token and sleeps until it is due, so any
+    number of threads together stay within the allowed rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = float(max(capacity, 1))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until it is available; returns seconds waited"""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance is a queue of reservations already handed out
+            self._tokens -= 1.0
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+def create_http_session(config: GeocodingConfig) -> requests.Session:
+    """Create a pooled HTTP session sized for concurrent provider calls"""
+    session = requests.Session()
+    retry = Retry(
+        total=config.max_retries,
+        backoff_factor=config.delay_seconds,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=max(config.max_concurrency, 1), max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = config.user_agent
+    return session
+
+
+class SQLiteCache(CacheStorage):
+    """
+    SQLite-backed cache shared safely by several processes
+
+    The database runs in WAL mode so readers never block the single writer,
+    and every insert touches only its own rows instead of rewriting a file.
+    Each thread and each forked worker process opens its own connection.
+    """
+
+    # Stay well under SQLite's limit on bound parameters per statement
+    _BATCH_SIZE = 500
+
+    def __init__(self, db_path: str, migrate_from: Optional[str] = None, timeout: float = 30.0):
+        """
+        Open (and create if needed) the cache database
+
+        Args:
+            db_path: Path of the SQLite database file
+            migrate_from: Legacy JSON cache file imported once, if it exists
+            timeout: Seconds to wait for another process's write lock
+        """
+        self.db_path = Path(db_path)
+        self.timeout = timeout
+        self._local = threading.local()
+        self._initialize()
+        if migrate_from:
+            self.migrate_json(migrate_from)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Connection owned by the calling thread in the current process"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(str(self.db_path), timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _initialize(self) -> None:
+        """Create the tables if they do not exist"""
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS geocodes ("
+            "key TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS cache_meta (name TEXT PRIMARY KEY, value TEXT)")
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        """Get coordinates from cache"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[float, float]]:
+        """Get coordinates for several keys with one query per batch"""
+        wanted: Dict[str, List[str]] = {}
+        for key in keys:
+            wanted.setdefault(normalize_address(key), []).append(key)
+
+        found = {}
+        conn = self._connection()
+        normalized = list(wanted)
+        for start in range(0, len(normalized), self._BATCH_SIZE):
+            batch = normalized[start : start + self._BATCH_SIZE]
+            rows = conn.execute(
+                "SELECT key, lat, lon FROM geocodes WHERE key IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            )
+            for key, lat, lon in rows:
+                for original in wanted[key]:
+                    found[original] = (lat, lon)
+        return found
+
+    def set(self, key: str, value: Tuple[float, float]) -> None:
+        """Set coordinates in cache"""
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Tuple[float, float]]) -> None:
+        """Set coordinates for several keys in a single transaction"""
+        rows = [
+            (normalize_address(key), float(value[0]), float(value[1]))
+            for key, value in items.items()
+        ]
+        if rows:
+            self._write("INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?)", rows)
+
+    def _write(self, statement: str, rows: List[tuple]) -> None:
+        """Run a batched write inside one immediate transaction"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(statement, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def migrate_json(self, json_file: str) -> int:
+        """
+        Import a legacy JSON cache file once
+
+        The import and its completion marker are written in the same
+        transaction, so concurrent workers import the file exactly once.
+        Once the marker exists only a plain read is needed, so later calls
+        do not take the write lock. Existing database entries take
+        precedence over the file.
+
+        Args:
+            json_file: Path of a JSON object mapping addresses to [lat, lon]
+                pairs or {"lat": ..., "lon": ...} objects
+
+        Returns:
+            Number of entries imported by this call
+        """
+        path = Path(json_file)
+        if not path.exists():
+            return 0
+
+        marker = f"migrated:{path.resolve()}"
+        conn = self._connection()
+        if self._has_marker(conn, marker):
+            return 0
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            if self._has_marker(conn, marker):
+                conn.execute("ROLLBACK")
+                return 0
+
+            rows = list(self._legacy_rows(path))
+            conn.executemany("INSERT OR IGNORE INTO geocodes VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT INTO cache_meta VALUES (?, ?)", (marker, str(time.time())))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+        logger.info(f"Migrated {len(rows)} geocoding cache entries from {path}")
+        return len(rows)
+
+    @staticmethod
+    def _has_marker(conn: sqlite3.Connection, marker: str) -> bool:
+        """Whether a completion marker has been recorded"""
+        return (
+            conn.execute("SELECT 1 FROM cache_meta WHERE name = ?", (marker,)).fetchone()
+            is not None
+        )
+
+    @staticmethod
+    def _legacy_rows(path: Path) -> Iterable[Tuple[str, float, float]]:
+        """Parse legacy JSON cache entries, skipping malformed ones"""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, ValueError, OSError) as e:
+            logger.warning(f"Error loading cache file {path}: {e}")
+            return
+
+        for key, value in data.items():
+            try:
+                if isinstance(value, dict):
+                    lat = value.get("lat", value.get("latitude"))
+                    lon = value.get("lon", value.get("longitude"))
+                else:
+                    lat, lon = value
+                yield normalize_address(key), float(lat), float(lon)
+            except (TypeError, ValueError):
+                logger.debug(f"Skipping malformed cache entry for '{key}'")
+
+    def clear(self) -> None:
+        """Clear all cached data"""
+        self._connection().execute("DELETE FROM geocodes")
+
+    def size(self) -> int:
+        """Get cache size"""
+        return self._connection().execute("SELECT COUNT(*) FROM geocodes").fetchone()[0]
+
+
 class NominatimGeocoder:
     """Nominatim (OpenStreetMap) geocoding provider"""
 
-    def __init__(self, config: GeocodingConfig):
+    def __init__(self, config: GeocodingConfig, session: Optional[requests.Session] = None):
         self.config = config
-        self.base_url = "https://nominatim.openstreetmap.org/search"
+        self.base_url = config.base_url
+        self.session = session or create_http_session(config)
+        # Respectful pacing for the free service, shared by all threads
+        self.rate_limiter = (
+            TokenBucket(1.0 / config.delay_seconds, config.burst)
+            if config.delay_seconds > 0
+            else None
+        )
 
     @track_geocoding
     def geocode(self, address: str) -> Optional[Tuple[float, float]]:
         """Geocode address using Nominatim"""
         try:
-            # Respectful delay for free service
-            time.sleep(self.config.delay_seconds)
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
 
             params = {"q": address.strip(), "format": "json", "limit": 1}
-            headers = {"User-Agent": self.config.user_agent}
 
-            response = requests.get(
+            response = self.session.get(
                 self.base_url,
                 params=params,
-                headers=headers,
                 timeout=self.config.timeout,
             )
             response.raise_for_status()
@@ -183,6 +465,56 @@ class ModernGeocodingService:
 
         return None
 
+    @track_geocoding
+    def get_coordinates_many(
+        self, addresses: Iterable[str]
+    ) -> Dict[str, Optional[Tuple[float, float]]]:
+        """
+        Get coordinates for many addresses at once
+
+        Addresses are de-duplicated after normalization and looked up in the
+        cache in bulk. Only the misses go to the provider, concurrently up to
+        ``max_concurrency`` calls; the provider's own rate limit paces them.
+        New results are written to the cache in one batch.
+
+        Args:
+            addresses: Addresses to geocode, duplicates allowed
+
+        Returns:
+            Mapping from each non-blank input address to its coordinates,
+            or None when it could not be geocoded
+        """
+        keys: Dict[str, str] = {}
+        originals: Dict[str, str] = {}
+        for address in addresses:
+            if address and address.strip() and address not in keys:
+                key = normalize_address(address)
+                keys[address] = key
+                originals.setdefault(key, address)
+
+        found = self.cache.get_many(list(originals))
+        misses = [key for key in originals if key not in found]
+        if misses:
+            geocoded = self._geocode_misses([originals[key] for key in misses])
+            new_entries = {key: coords for key, coords in zip(misses, geocoded) if coords}
+            self.cache.set_many(new_entries)
+            found.update(new_entries)
+            logger.info(
+                f"Batch geocoded {len(new_entries)}/{len(misses)} new addresses "
+                f"({len(originals) - len(misses)} cache hits)"
+            )
+
+        return {address: found.get(key) for address, key in keys.items()}
+
+    def _geocode_misses(self, addresses: List[str]) -> List[Optional[Tuple[float, float]]]:
+        """Geocode addresses with the provider, concurrently when allowed"""
+        workers = min(self.config.max_concurrency, len(addresses))
+        if workers <= 1:
+            return [self.provider.geocode(address) for address in addresses]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="geocode") as executor:
+            return list(executor.map(self.provider.geocode, addresses))
+
     def clear_cache(self) -> None:
         """Clear the geocoding cache"""
         self.cache.clear()
@@ -198,7 +530,14 @@ def create_geocoding_service(
 ) -> ModernGeocodingService:
     """Create a properly configured geocoding service"""
     config = config or GeocodingConfig()
-    cache = JSONFileCache(config.cache_file)
+    if config.cache_backend == "json":
+        cache = JSONFileCache(config.cache_file)
+    elif config.cache_backend == "redis":
+        from app.services.geocoding_cache import GeocodingCache, GeocodingCacheStorage
+
+        cache = GeocodingCacheStorage(GeocodingCache(config.redis_url, config.cache_db))
+    else:
+        cache = SQLiteCache(config.cache_db, migrate_from=config.cache_file)
     provider = NominatimGeocoder(config)
     return ModernGeocodingService(cache, provider, config)
 
@@ -4,14 +4,25 @@ Provides logging hooks and metrics collection for routing, geocoding, and distan
 """
 
 import logging
+import threading
 import time
+import weakref
+from bisect import bisect_left
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from threading import Lock
-from typing import Any, Callable, Dict, List, Optional
+from threading import RLock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Prometheus client default buckets (seconds)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0
+)
+
+# Per-pair distance calls are all counted but only one call in this many is timed
+DISTANCE_SAMPLE_EVERY = 1000
+
 
 @dataclass
 class MetricPoint:
@@ -35,69 +46,172 @@ class ServiceMetrics:
     response_times: deque = field(default_factory=lambda: deque(maxlen=1000))
     error_rate: float = 0.0
     last_activity: float = field(default_factory=time.time)
+    # Running sum of response_times, so the rolling average is O(1)
+    window_total: float = 0.0
+
+    def add_response_time(self, duration: float) -> None:
+        """Add a response time to the rolling window"""
+        window = self.response_times
+        if len(window) == window.maxlen:
+            self.window_total -= window[0]
+        window.append(duration)
+        self.window_total += duration
+        self.avg_response_time = self.window_total / len(window)
+
+
+class HistogramState:
+    """Fixed-bucket histogram: per-bucket counts, sum and count"""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: "HistogramState") -> None:
+        for i, bucket_count in enumerate(other.counts):
+            self.counts[i] += bucket_count
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs including +Inf"""
+        bounds = [repr(float(bound)) for bound in self.bounds] + ["+Inf"]
+        total, buckets = 0, []
+        for bound, bucket_count in zip(bounds, self.counts):
+            total += bucket_count
+            buckets.append((bound, total))
+        return buckets
+
+
+class ThreadShards:
+    """
+    Per-thread accumulators merged at read time
+
+    Each thread updates only its own dict, so writers never take a lock;
+    readers merge every shard. Shards of finished threads are folded into
+    a retired total so short-lived threads do not accumulate.
+    """
+
+    def __init__(self, merge: Callable[[Dict, Dict], None]):
+        self._merge = merge
+        self._local = threading.local()
+        self._shards: List[Tuple[weakref.ref, Dict]] = []
+        self._retired: Dict = {}
+        self._lock = threading.Lock()
+
+    def shard(self) -> Dict:
+        """The calling thread's accumulator"""
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict = {}
+            with self._lock:
+                self._shards.append((weakref.ref(threading.current_thread()), shard))
+            self._local.shard = shard
+            return shard
+
+    def merged(self) -> Dict:
+        """Combined view of every shard"""
+        with self._lock:
+            live = []
+            for thread_ref, shard in self._shards:
+                thread = thread_ref()
+                if thread is None or not thread.is_alive():
+                    self._merge(self._retired, dict(shard))
+                else:
+                    live.append((thread_ref, shard))
+            self._shards = live
+            total: Dict = {}
+            self._merge(total, self._retired)
+            for _, shard in live:
+                self._merge(total, dict(shard))
+        return total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._retired = {}
+            for _, shard in self._shards:
+                shard.clear()
+
+
+def _merge_counts(into: Dict, shard: Dict) -> None:
+    for key, value in shard.items():
+        into[key] = into.get(key, 0.0) + value
+
+
+def _merge_histograms(into: Dict, shard: Dict) -> None:
+    for key, state in shard.items():
+        target = into.get(key)
+        if target is None:
+            target = into[key] = HistogramState(state.bounds)
+        target.merge(state)
 
 
 class MetricsCollector:
-    """Central metrics collection system with Prometheus compatibility"""
+    """
+    Central metrics collection system with Prometheus compatibility
+
+    Counters and histograms are accumulated per thread without locking and
+    aggregated when metrics are read; histograms keep fixed bucket counts
+    and are exported as ``_bucket``/``_sum``/``_count`` series.
+    """
 
     def __init__(self, max_metrics: int = 10000):
-        self.metrics: Dict[str, MetricPoint] = {}
         self.service_metrics: Dict[str, ServiceMetrics] = {}
         self.request_durations: Dict[str, deque] = defaultdict(
             lambda: deque(maxlen=1000)
         )
-        self.counters: Dict[str, float] = defaultdict(float)
-        self.gauges: Dict[str, float] = defaultdict(float)
-        self.histograms: Dict[str, List[float]] = defaultdict(list)
+        self.gauges: Dict[str, float] = {}
         self.max_metrics = max_metrics
-        self._lock = Lock()
+        self._counter_shards = ThreadShards(_merge_counts)
+        self._histogram_shards = ThreadShards(_merge_histograms)
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        # Metric key -> (name, labels, type), registered on first use
+        self._series: Dict[str, Tuple[str, Dict[str, str], str]] = {}
+        # Reentrant: record_service_request updates counters under the lock
+        self._lock = RLock()
 
         logger.info("Metrics collector initialized")
 
+    def register_histogram(self, name: str, buckets: Sequence[float]) -> None:
+        """Set the bucket upper bounds of a histogram before its first observation"""
+        self._buckets[name] = tuple(sorted(float(b) for b in buckets))
+
     def increment_counter(
         self, name: str, value: float = 1.0, labels: Optional[Dict[str, str]] = None
     ):
         """Increment a counter metric"""
-        with self._lock:
-            metric_key = self._create_metric_key(name, labels or {})
-            self.counters[metric_key] += value
-
-            # Store as MetricPoint for Prometheus export
-            self.metrics[metric_key] = MetricPoint(
-                name=name,
-                value=self.counters[metric_key],
-                labels=labels or {},
-                metric_type="counter",
-            )
+        metric_key = self._register(name, labels, "counter")
+        shard = self._counter_shards.shard()
+        shard[metric_key] = shard.get(metric_key, 0.0) + value
 
     def set_gauge(
         self, name: str, value: float, labels: Optional[Dict[str, str]] = None
     ):
         """Set a gauge metric value"""
-        with self._lock:
-            metric_key = self._create_metric_key(name, labels or {})
-            self.gauges[metric_key] = value
-
-            self.metrics[metric_key] = MetricPoint(
-                name=name, value=value, labels=labels or {}, metric_type="gauge"
-            )
+        metric_key = self._register(name, labels, "gauge")
+        self.gauges[metric_key] = value
 
     def observe_histogram(
         self, name: str, value: float, labels: Optional[Dict[str, str]] = None
     ):
         """Add observation to histogram metric"""
-        with self._lock:
-            metric_key = self._create_metric_key(name, labels or {})
-            self.histograms[metric_key].append(value)
-
-            # Keep only recent observations
-            if len(self.histograms[metric_key]) > 1000:
-                self.histograms[metric_key] = self.histograms[metric_key][-1000:]
-
-            # Store current value as MetricPoint
-            self.metrics[metric_key] = MetricPoint(
-                name=name, value=value, labels=labels or {}, metric_type="histogram"
+        metric_key = self._register(name, labels, "histogram")
+        shard = self._histogram_shards.shard()
+        state = shard.get(metric_key)
+        if state is None:
+            state = shard[metric_key] = HistogramState(
+                self._buckets.get(name, DEFAULT_BUCKETS)
             )
+        state.observe(value)
 
     def record_service_request(
         self, service_name: str, duration: float, success: bool = True
@@ -111,61 +225,90 @@ class MetricsCollector:
 
             metrics = self.service_metrics[service_name]
             metrics.total_requests += 1
-            metrics.response_times.append(duration)
+            metrics.add_response_time(duration)
             metrics.last_activity = time.time()
 
             if not success:
                 metrics.total_errors += 1
 
-            # Update calculated metrics
-            metrics.avg_response_time = sum(metrics.response_times) / len(
-                metrics.response_times
-            )
-            metrics.error_rate = (
-                metrics.total_errors / metrics.total_requests
-                if metrics.total_requests > 0
-                else 0.0
-            )
+            metrics.error_rate = metrics.total_errors / metrics.total_requests
+            error_rate = metrics.error_rate
 
-            # Record as standard metrics
-            self.increment_counter(
-                f"{service_name}_requests_total",
-                labels={"status": "success" if success else "error"},
+        # Record as standard metrics
+        self.increment_counter(
+            f"{service_name}_requests_total",
+            labels={"status": "success" if success else "error"},
+        )
+        self.observe_histogram(f"{service_name}_duration_seconds", duration)
+        self.set_gauge(f"{service_name}_error_rate", error_rate)
+
+    @property
+    def counters(self) -> Dict[str, float]:
+        """Counter totals across all threads"""
+        return self._counter_shards.merged()
+
+    @property
+    def histograms(self) -> Dict[str, HistogramState]:
+        """Histogram states across all threads"""
+        return self._histogram_shards.merged()
+
+    @property
+    def metrics(self) -> Dict[str, MetricPoint]:
+        """Current value of every series (histograms report their count)"""
+        points = {}
+        values: Dict[str, float] = {**self.counters, **self.gauges}
+        values.update((k, h.count) for k, h in self.histograms.items())
+        for metric_key, value in values.items():
+            if metric_key not in self._series:
+                continue  # Cleared while reading
+            name, labels, metric_type = self._series[metric_key]
+            points[metric_key] = MetricPoint(
+                name=name, value=value, labels=labels, metric_type=metric_type
             )
-            self.observe_histogram(f"{service_name}_duration_seconds", duration)
-            self.set_gauge(f"{service_name}_error_rate", metrics.error_rate)
+        return points
 
     def get_prometheus_metrics(self) -> str:
         """Export metrics in Prometheus format"""
-        with self._lock:
-            lines = []
-
-            # Group metrics by name
-            metrics_by_name = defaultdict(list)
-            for metric in self.metrics.values():
-                metrics_by_name[metric.name].append(metric)
-
-            for metric_name, metric_list in metrics_by_name.items():
-                # Add HELP and TYPE comments
-                lines.append(f"# HELP {metric_name} {metric_name}")
-                lines.append(f"# TYPE {metric_name} {metric_list[0].metric_type}")
-
-                for metric in metric_list:
-                    labels_str = ""
-                    if metric.labels:
-                        label_pairs = [f'{k}="{v}"' for k, v in metric.labels.items()]
-                        labels_str = "{" + ",".join(label_pairs) + "}"
-
-                    lines.append(f"{metric_name}{labels_str} {metric.value}")
-
-            return "\n".join(lines)
+        counters = self.counters
+        histograms = self.histograms
+        gauges = dict(self.gauges)
+
+        # Group series by name
+        series_by_name = defaultdict(list)
+        for metric_key, (name, labels, metric_type) in list(self._series.items()):
+            series_by_name[name].append((metric_key, labels, metric_type))
+
+        lines = []
+        for metric_name, series in series_by_name.items():
+            metric_type = series[0][2]
+            lines.append(f"# HELP {metric_name} {metric_name}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+
+            for metric_key, labels, _ in series:
+                if metric_type == "histogram":
+                    state = histograms.get(metric_key)
+                    if state is None:
+                        continue
+                    for le, total in state.cumulative():
+                        bucket_labels = _format_labels({**labels, "le": le})
+                        lines.append(f"{metric_name}_bucket{bucket_labels} {total}")
+                    labels_str = _format_labels(labels)
+                    lines.append(f"{metric_name}_sum{labels_str} {state.sum}")
+                    lines.append(f"{metric_name}_count{labels_str} {state.count}")
+                else:
+                    source = counters if metric_type == "counter" else gauges
+                    if metric_key in source:
+                        value = source[metric_key]
+                        lines.append(f"{metric_name}{_format_labels(labels)} {value}")
+
+        return "\n".join(lines)
 
     def get_metrics_summary(self) -> Dict[str, Any]:
         """Get summarized metrics for monitoring dashboards"""
         with self._lock:
             summary = {
                 "services": {},
-                "total_metrics": len(self.metrics),
+                "total_metrics": len(self._series),
                 "collection_time": time.time(),
             }
 
@@ -180,6 +323,18 @@ class MetricsCollector:
 
             return summary
 
+    def _register(
+        self, name: str, labels: Optional[Dict[str, str]], metric_type: str
+    ) -> str:
+        """Metric key for a series, recording its name and labels on first use"""
+        metric_key = self._create_metric_key(name, labels or {})
+        if metric_key not in self._series:
+            with self._lock:
+                self._series.setdefault(
+                    metric_key, (name, dict(labels or {}), metric_type)
+                )
+        return metric_key
+
     def _create_metric_key(self, name: str, labels: Dict[str, str]) -> str:
         """Create unique key for metric with labels"""
         if not labels:
@@ -191,16 +346,26 @@ class MetricsCollector:
     def clear_metrics(self):
         """Clear all collected metrics"""
         with self._lock:
-            self.metrics.clear()
+            self._series.clear()
             self.service_metrics.clear()
-            self.counters.clear()
             self.gauges.clear()
-            self.histograms.clear()
+            self._counter_shards.clear()
+            self._histogram_shards.clear()
             logger.info("All metrics cleared")
 
 
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Prometheus label set, empty when there are no labels"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
 # Global metrics collector instance
 metrics_collector = MetricsCollector()
+metrics_collector.register_histogram(
+    "distance_calculation_seconds", (1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 1e-2)
+)
 
 
 def metrics_decorator(service_name: str):
@@ -275,21 +440,49 @@ def track_geocoding(func: Callable) -> Callable:
     return wrapper
 
 
+_distance_calls = threading.local()
+
+
 def track_distance_calculation(func: Callable) -> Callable:
-    """Specific decorator for distance calculation metrics"""
+    """
+    Specific decorator for distance calculation metrics
+
+    Pairwise distances are the innermost loop of route building. Every call
+    and every failure is counted in the calling thread's counter shard,
+    which takes no lock, and only one call in DISTANCE_SAMPLE_EVERY is
+    timed. Matrix builds record one observation each through
+    record_distance_matrix.
+    """
+    name = func.__name__
+    labels = {"method": name}
 
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        metrics_collector.increment_counter("distance_calculations_total", labels=labels)
+        calls = getattr(_distance_calls, name, 0) + 1
+        sampled = calls >= DISTANCE_SAMPLE_EVERY
+        setattr(_distance_calls, name, 0 if sampled else calls)
+        start_time = time.perf_counter() if sampled else 0.0
         try:
-            result = func(*args, **kwargs)
-
-            # Track distance if available in result
-            if isinstance(result, (int, float)):
-                metrics_collector.observe_histogram("distance_calculated", result)
-
-            return result
+            return func(*args, **kwargs)
+        except Exception:
+            metrics_collector.increment_counter("distance_calculation_errors_total", labels=labels)
+            raise
         finally:
-            duration = time.time() - start_time
-            metrics_collector.record_service_request("distance_calculation", duration)
+            if sampled:
+                metrics_collector.observe_histogram(
+                    "distance_calculation_seconds", time.perf_counter() - start_time, labels
+                )
 
     return wrapper
+
+
+def record_distance_matrix(method: str, size: int, duration: float) -> None:
+    """Record one distance matrix build"""
+    labels = {"method": method}
+    metrics_collector.increment_counter("distance_matrix_builds_total", labels=labels)
+    metrics_collector.increment_counter(
+        "distance_matrix_pairs_total", size * (size - 1) / 2, labels
+    )
+    metrics_collector.observe_histogram(
+        "distance_matrix_build_seconds", duration, labels
+    )
@@ -9,9 +9,11 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 from app.services.distance_service import (
+    CoordinateExtractor,
     RouteDistanceCalculator,
     create_distance_calculator,
 )
+from app.utils.spatial_index import nearest_neighbor_order
 
 logger = logging.getLogger(__name__)
 
@@ -189,27 +191,16 @@ class GreedyNearestNeighborOptimizer:
                 return constraints.priority_weights[chain]
             return 0
 
-        route = []
-        remaining = stores.copy()
-
         # Start with highest priority store
-        current = max(remaining, key=priority_score)
-        route.append(current)
-        remaining.remove(current)
-
-        # Greedy nearest neighbor for remaining stores
-        while remaining:
-            next_store = min(
-                remaining,
-                key=lambda s: self.distance_calculator.calculate_store_distance(
-                    current, s
-                ),
-            )
-            route.append(next_store)
-            remaining.remove(next_store)
-            current = next_store
+        start = max(range(len(stores)), key=lambda i: priority_score(stores[i]))
+
+        # Greedy nearest neighbor over a spatial index; the unit-sphere
+        # ordering matches great-circle distance and stores without
+        # coordinates keep their input order at the end
+        coordinates = CoordinateExtractor.extract_coordinate_array(stores)
+        order = nearest_neighbor_order(coordinates, start)
 
-        return route
+        return [stores[i] for i in order]
 
 
 class ModernRouteGenerator:
@@ -8,8 +8,6 @@ import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
-from geopy.distance import geodesic
-
 # Import optimization algorithms
 from app.optimization.genetic_algorithm import GeneticAlgorithm, GeneticConfig
 from app.optimization.multi_objective import (
@@ -20,6 +18,7 @@ from app.optimization.simulated_annealing import (
     SimulatedAnnealingConfig,
     SimulatedAnnealingOptimizer,
 )
+from app.services.distance_service import fast_geodesic_km
 
 # Import the unified routing service
 from app.services.routing_service_unified import (
@@ -98,7 +97,9 @@ def is_within_radius(store1: Dict, store2: Dict, radius_km: float) -> bool:
     coord2 = (store2.get("lat"), store2.get("lon"))
     if None in coord1 or None in coord2:
         return False
-    return geodesic(coord1, coord2).km <= radius_km
+    lat1, lon1 = map(float, coord1)
+    lat2, lon2 = map(float, coord2)
+    return fast_geodesic_km(lat1, lon1, lat2, lon2) <= radius_km
 
 
 @dataclass
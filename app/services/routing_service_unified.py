@@ -6,8 +6,19 @@ Clean, modern, testable design with dependency injection
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
-
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.models.store_table import StoreTable
+from app.performance_monitor import get_performance_monitor
+from app.optimization.anytime import Deadline, ProgressCallback
+from app.optimization.local_search import (
+    create_local_search_optimizer,
+    polish_route,
+)
 from app.services.distance_service import (
     RouteDistanceCalculator,
     create_distance_calculator,
@@ -26,6 +37,7 @@ from app.services.route_core import (
 )
 from app.services.route_scoring_service import RouteScorer
 from app.services.traffic_service import TrafficService, TrafficConfig
+from app.utils.clustering import GridClusterer, cluster_by_proximity
 
 # Import optimization algorithms (with fallback)
 try:
@@ -43,8 +55,28 @@ except ImportError:
     SimulatedAnnealingOptimizer = None
     SimulatedAnnealingConfig = None
 
+try:
+    from app.optimization.vrptw import VRPTWConfig, VRPTWOptimizer
+except ImportError:
+    VRPTWOptimizer = None
+    VRPTWConfig = None
+
+try:
+    from app.optimization.multi_objective import (
+        OBJECTIVE_NAMES,
+        MultiObjectiveConfig,
+        MultiObjectiveOptimizer,
+    )
+except ImportError:
+    MultiObjectiveOptimizer = None
+    MultiObjectiveConfig = None
+    OBJECTIVE_NAMES = ()
+
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between progress reports forwarded to subscribers
+PROGRESS_INTERVAL_SECONDS = 0.25
+
 
 @dataclass
 class UnifiedRoutingMetrics:
@@ -89,6 +121,9 @@ class UnifiedRoutingService:
         self.user_id = user_id
         self.last_processing_time = 0.0
         self.metrics: Optional[UnifiedRoutingMetrics] = None
+        self._algorithm_metrics: Optional[Dict[str, Any]] = None
+        self._deadline = Deadline()
+        self._progress_callback: Optional[ProgressCallback] = None
 
         # Initialize services with defaults if not provided
         self.geocoding_service = geocoding_service or create_geocoding_service()
@@ -152,6 +187,13 @@ class UnifiedRoutingService:
         """
         geocoded_stores = []
 
+        # Geocode every missing address in one batch (fallback to name if no address)
+        coordinates = self._geocode_addresses(
+            store.get("address") or store.get("name", "")
+            for store in stores
+            if not ("lat" in store and "lon" in store)
+        )
+
         for store in stores:
             store_copy = store.copy()
 
@@ -160,10 +202,9 @@ class UnifiedRoutingService:
                 geocoded_stores.append(store_copy)
                 continue
 
-            # Try to geocode from address (fallback to name if no address)
             address = store_copy.get("address") or store_copy.get("name", "")
             if address:
-                coords = self.geocoding_service.get_coordinates(address)
+                coords = coordinates.get(address)
                 if coords:
                     store_copy["lat"], store_copy["lon"] = coords
                     geocoded_stores.append(store_copy)
@@ -178,6 +219,48 @@ class UnifiedRoutingService:
 
         return geocoded_stores
 
+    def _geocode_addresses(self, addresses) -> Dict[str, Any]:
+        """Batch geocode addresses, skipping the geocoder when none are given"""
+        addresses = [address for address in addresses if address]
+        if not addresses:
+            return {}
+        return self.geocoding_service.get_coordinates_many(addresses)
+
+    def ingest_store_chunks(
+        self, chunks: Iterable[List[Dict[str, Any]]], save_to_db: bool = True
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Geocode and persist store chunks as they are parsed
+
+        Each chunk is geocoded in one batch and, for a signed-in user,
+        written to the database before the next chunk is pulled, so work
+        starts before a large file has been fully parsed and only one chunk
+        is held at a time.
+
+        Args:
+            chunks: Store chunks, e.g. from FileService.iter_stores_file
+            save_to_db: Whether to bulk insert each chunk for the user
+
+        Yields:
+            Chunks of stores with coordinates populated
+        """
+        for chunk in chunks:
+            geocoded = self.ensure_coordinates(chunk)
+
+            if save_to_db and self.database_service and self.user_id and geocoded:
+                try:
+                    self.database_service.bulk_create_stores(
+                        [
+                            {**store, "latitude": store["lat"], "longitude": store["lon"]}
+                            for store in geocoded
+                        ],
+                        user_id=self.user_id,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to save store chunk to database: {e}")
+
+            yield geocoded
+
     @track_route_generation
     def generate_route_from_stores(
         self,
@@ -186,6 +269,8 @@ class UnifiedRoutingService:
         save_to_db: bool = True,
         algorithm: str = "nearest_neighbor",
         algorithm_params: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[float] = None,
+        progress_callback: Optional[ProgressCallback] = None,
     ) -> List[Dict[str, Any]]:
         """
         Generate optimized route from stores list
@@ -194,21 +279,33 @@ class UnifiedRoutingService:
             stores: List of store dictionaries
             constraints: Route constraints dictionary
             save_to_db: Whether to save route to database
-            algorithm: Algorithm to use ("nearest_neighbor", "priority", "genetic", "simulated_annealing")
-            algorithm_params: Algorithm-specific parameters
+            algorithm: Algorithm to use ("nearest_neighbor", "priority", "genetic",
+                "simulated_annealing", "multi_objective", "vrptw")
+            algorithm_params: Algorithm-specific parameters; ``local_search``
+                polishes the result with 2-opt/Or-opt moves
+            deadline_ms: Time budget for the whole request; the genetic,
+                simulated annealing and multi-objective searches stop when
+                it runs out and return the best route found so far. The
+                other algorithms finish without searching and ignore it.
+            progress_callback: Called with improving routes while the
+                genetic, simulated annealing or multi-objective search
+                runs, then once with status "completed" and the route that
+                is returned
 
         Returns:
             List of stores representing optimized route
         """
         start_time = time.time()
+        self._deadline = Deadline.from_ms(deadline_ms)
 
         try:
             if not stores:
                 self.last_processing_time = 0.0
                 return []
 
-            # Ensure all stores have coordinates
-            geocoded_stores = self.ensure_coordinates(stores)
+            # Ensure all stores have coordinates; optimizers read the
+            # columnar view, responses keep the original dicts
+            geocoded_stores = StoreTable(self.ensure_coordinates(stores))
             if not geocoded_stores:
                 logger.warning("No stores with valid coordinates")
                 self.last_processing_time = time.time() - start_time
@@ -218,6 +315,10 @@ class UnifiedRoutingService:
             route_constraints = self._convert_constraints(constraints)
 
             # Generate route based on algorithm
+            self._algorithm_metrics = None
+            self._progress_callback = self._progress_reporter(
+                progress_callback, geocoded_stores
+            )
             if algorithm == "genetic" and self.genetic_config:
                 route = self._generate_route_genetic(
                     geocoded_stores, route_constraints, algorithm_params
@@ -226,6 +327,14 @@ class UnifiedRoutingService:
                 route = self._generate_route_simulated_annealing(
                     geocoded_stores, route_constraints, algorithm_params
                 )
+            elif algorithm == "multi_objective" and MultiObjectiveOptimizer:
+                route = self._generate_route_multi_objective(
+                    geocoded_stores, route_constraints, algorithm_params
+                )
+            elif algorithm == "vrptw" and VRPTWOptimizer:
+                route = self._generate_route_vrptw(
+                    geocoded_stores, route_constraints, algorithm_params
+                )
             else:
                 # Use modern route generator for standard algorithms
                 generator = create_route_generator(algorithm)
@@ -233,15 +342,40 @@ class UnifiedRoutingService:
                     geocoded_stores, route_constraints
                 )
 
+            # Optional local search polish, available for every algorithm
+            # except VRPTW, which runs its own window-aware search
+            polish_metrics = None
+            if (
+                algorithm_params
+                and algorithm_params.get("local_search")
+                and algorithm != "vrptw"
+            ):
+                route, polish_metrics = self._polish_route(
+                    route, route_constraints, algorithm_params
+                )
+
             processing_time = time.time() - start_time
             self.last_processing_time = processing_time
+            get_performance_monitor().record_algorithm_run(algorithm, processing_time)
 
             # Calculate metrics
-            total_distance = self.distance_calculator.calculate_route_distance(route)
+            total_distance = self._calculate_total_distance(route)
             optimization_score = (
                 len(route) / max(total_distance, 0.1) if total_distance > 0 else 0
             )
 
+            if progress_callback:
+                self._report_completion(
+                    progress_callback, route, total_distance, algorithm
+                )
+
+            algorithm_metrics = self._algorithm_metrics
+            if polish_metrics:
+                algorithm_metrics = {
+                    **(algorithm_metrics or {}),
+                    "local_search": polish_metrics,
+                }
+
             self.metrics = UnifiedRoutingMetrics(
                 processing_time=processing_time,
                 total_stores=len(stores),
@@ -249,6 +383,7 @@ class UnifiedRoutingService:
                 optimization_score=optimization_score,
                 total_distance=total_distance,
                 algorithm_used=algorithm,
+                algorithm_metrics=algorithm_metrics,
             )
 
             # Save to database if requested
@@ -386,27 +521,75 @@ class UnifiedRoutingService:
             route, _ = generator.generate_route(stores, constraints)
             return route
 
-        # Configure genetic algorithm
-        config = GeneticConfig()
+        # Configure genetic algorithm; accepts both "generations" and the
+        # "ga_generations" spelling used by /api/optimize options. Built
+        # through the constructor so invalid settings raise ValueError
+        settings = {}
         if algorithm_params:
-            config.population_size = algorithm_params.get(
-                "population_size", config.population_size
-            )
-            config.generations = algorithm_params.get("generations", config.generations)
-            config.mutation_rate = algorithm_params.get(
-                "mutation_rate", config.mutation_rate
-            )
-            config.crossover_rate = algorithm_params.get(
-                "crossover_rate", config.crossover_rate
-            )
+            for field_name, cast in (
+                ("population_size", int),
+                ("generations", int),
+                ("mutation_rate", float),
+                ("crossover_rate", float),
+                ("elite_size", int),
+                ("tournament_size", int),
+                ("islands", int),
+                ("migration_interval", int),
+                ("migration_size", int),
+            ):
+                value = algorithm_params.get(
+                    field_name, algorithm_params.get(f"ga_{field_name}")
+                )
+                if value is not None:
+                    settings[field_name] = cast(value)
+        config = GeneticConfig(
+            **settings, time_budget_seconds=self._remaining_budget()
+        )
 
         # Run genetic algorithm
         ga = GeneticAlgorithm(config)
-        route, metrics = ga.optimize(stores, constraints.__dict__)
+        route, metrics = ga.optimize(
+            stores, constraints.__dict__, progress_callback=self._progress_callback
+        )
+
+        # Store algorithm-specific metrics for this run
+        self._algorithm_metrics = metrics
+
+        return route
+
+    def _generate_route_vrptw(
+        self,
+        stores: List[Dict[str, Any]],
+        constraints: RouteConstraints,
+        algorithm_params: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Generate time-window-feasible routes (stops carry route_index)"""
+        # Built through the constructor so invalid settings raise ValueError
+        settings = {}
+        if algorithm_params:
+            for field_name, cast in (
+                ("speed_kmh", float),
+                ("start_time", float),
+                ("service_time", float),
+                ("max_routes", int),
+                ("vehicle_cost", float),
+                ("max_passes", int),
+            ):
+                value = algorithm_params.get(
+                    field_name, algorithm_params.get(f"vrptw_{field_name}")
+                )
+                if value is not None:
+                    settings[field_name] = cast(value)
+            # Plain "local_search" selects the time-window-blind polish
+            if algorithm_params.get("vrptw_local_search") is not None:
+                settings["local_search"] = bool(algorithm_params["vrptw_local_search"])
+        config = VRPTWConfig(**settings)
 
-        # Store algorithm-specific metrics
-        if self.metrics:
-            self.metrics.algorithm_metrics = metrics
+        optimizer = VRPTWOptimizer(config)
+        route, metrics = optimizer.optimize(stores, constraints.__dict__)
+
+        # Store algorithm-specific metrics for this run
+        self._algorithm_metrics = metrics
 
         return route
 
@@ -425,29 +608,249 @@ class UnifiedRoutingService:
             route, _ = generator.generate_route(stores, constraints)
             return route
 
-        # Configure simulated annealing
-        config = SimulatedAnnealingConfig()
+        # Configure simulated annealing; accepts both "restarts" and the
+        # "sa_restarts" spelling used by /api/optimize options. Built
+        # through the constructor so invalid settings raise ValueError
+        settings = {}
         if algorithm_params:
-            config.initial_temperature = algorithm_params.get(
-                "initial_temperature", config.initial_temperature
-            )
-            config.cooling_rate = algorithm_params.get(
-                "cooling_rate", config.cooling_rate
-            )
-            config.min_temperature = algorithm_params.get(
-                "min_temperature", config.min_temperature
-            )
+            # "min_temperature" is the legacy name for the final temperature
+            if algorithm_params.get("min_temperature") is not None:
+                settings["final_temperature"] = float(algorithm_params["min_temperature"])
+            for field_name, cast in (
+                ("initial_temperature", float),
+                ("final_temperature", float),
+                ("cooling_rate", float),
+                ("max_iterations", int),
+                ("iterations_per_temp", int),
+                ("reheat_threshold", int),
+                ("min_improvement_threshold", float),
+                ("restarts", int),
+                ("workers", int),
+            ):
+                value = algorithm_params.get(
+                    field_name, algorithm_params.get(f"sa_{field_name}")
+                )
+                if value is not None:
+                    settings[field_name] = cast(value)
+        config = SimulatedAnnealingConfig(
+            **settings, time_budget_seconds=self._remaining_budget()
+        )
 
         # Run simulated annealing
         sa = SimulatedAnnealingOptimizer(config)
-        route, metrics = sa.optimize(stores, constraints.__dict__)
+        route, metrics = sa.optimize(
+            stores, constraints.__dict__, progress_callback=self._progress_callback
+        )
 
-        # Store algorithm-specific metrics
-        if self.metrics:
-            self.metrics.algorithm_metrics = metrics
+        # Store algorithm-specific metrics for this run
+        self._algorithm_metrics = metrics
 
         return route
 
+    def _generate_route_multi_objective(
+        self,
+        stores: List[Dict[str, Any]],
+        constraints: RouteConstraints,
+        algorithm_params: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Generate the best compromise route of a multi-objective search"""
+        config = self._multi_objective_config(
+            algorithm_params or {}, self._remaining_budget()
+        )
+
+        optimizer = MultiObjectiveOptimizer(config)
+        route, metrics = optimizer.optimize(
+            stores, constraints.__dict__, progress_callback=self._progress_callback
+        )
+
+        # Store algorithm-specific metrics for this run
+        self._algorithm_metrics = metrics
+
+        return route
+
+    def generate_pareto_front(
+        self,
+        stores: List[Dict[str, Any]],
+        algorithm_params: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Find the tradeoff front between several objectives in one run
+
+        Args:
+            stores: List of store dictionaries
+            algorithm_params: Multi-objective settings; ``objectives`` is a
+                list or comma-separated string, ``deadline_ms`` bounds the
+                run, and every field also accepts the ``mo_`` prefix used by
+                /api/optimize options
+
+        Returns:
+            Tuple of (front, metrics) where each front entry holds a route,
+            its objective values and whether it is the best compromise
+
+        Raises:
+            ValueError: If an objective or setting is invalid
+        """
+        if not MultiObjectiveOptimizer:
+            raise RuntimeError("Multi-objective optimization not available")
+
+        start_time = time.time()
+        params = algorithm_params or {}
+        time_budget = None
+        if params.get("deadline_ms") is not None:
+            time_budget = float(params["deadline_ms"]) / 1000.0
+
+        config = self._multi_objective_config(params, time_budget)
+        geocoded_stores = self.ensure_coordinates(stores)
+        if len(geocoded_stores) < 2:
+            raise ValueError("At least 2 stores with coordinates required")
+
+        optimizer = MultiObjectiveOptimizer(config)
+        _, metrics = optimizer.optimize(geocoded_stores)
+        if "error" in metrics:
+            raise RuntimeError(metrics["error"])
+
+        self.last_processing_time = time.time() - start_time
+        return optimizer.get_pareto_front(), metrics
+
+    @staticmethod
+    def _multi_objective_config(
+        params: Dict[str, Any], time_budget_seconds: Optional[float]
+    ) -> "MultiObjectiveConfig":
+        """
+        Build a multi-objective config from request settings
+
+        Every field also accepts the ``mo_`` prefix used by /api/optimize
+        options; ``objectives`` is a list or comma-separated string.
+
+        Raises:
+            ValueError: If an objective or setting is invalid
+        """
+
+        def param(name: str):
+            return params.get(name, params.get(f"mo_{name}"))
+
+        settings = {}
+        objectives = param("objectives")
+        if objectives is not None:
+            if isinstance(objectives, str):
+                objectives = [name.strip() for name in objectives.split(",")]
+            unknown = [name for name in objectives if name not in OBJECTIVE_NAMES]
+            if unknown or len(objectives) < 2:
+                raise ValueError(
+                    f"Objectives must be at least two of: {', '.join(OBJECTIVE_NAMES)}"
+                )
+            settings["objectives"] = list(objectives)
+        for field_name, cast in (
+            ("population_size", int),
+            ("generations", int),
+            ("mutation_rate", float),
+            ("crossover_rate", float),
+            ("tournament_size", int),
+            ("archive_size", int),
+        ):
+            value = param(field_name)
+            if value is not None:
+                settings[field_name] = cast(value)
+
+        return MultiObjectiveConfig(**settings, time_budget_seconds=time_budget_seconds)
+
+    def _remaining_budget(self) -> Optional[float]:
+        """Seconds left of the request deadline, None without one"""
+        if self._deadline.budget_seconds is None:
+            return None
+        # Keep a sliver so an exhausted budget still returns a route
+        return max(self._deadline.remaining(), 0.001)
+
+    def _progress_reporter(
+        self,
+        callback: Optional[ProgressCallback],
+        stores: List[Dict[str, Any]],
+    ) -> Optional[ProgressCallback]:
+        """
+        Wrap a progress callback for subscribers
+
+        Store indices are replaced by store ids (or names), the share of
+        the deadline used is added, and reports are throttled to one per
+        PROGRESS_INTERVAL_SECONDS.
+        """
+        if callback is None:
+            return None
+        deadline = self._deadline
+        last_sent = [-PROGRESS_INTERVAL_SECONDS]
+
+        def report(progress: Dict[str, Any]) -> None:
+            now = time.monotonic()
+            if now - last_sent[0] < PROGRESS_INTERVAL_SECONDS:
+                return
+            last_sent[0] = now
+            route = progress.pop("route")
+            progress["stops"] = [
+                stores[i].get("id", stores[i].get("name")) for i in route
+            ]
+            progress["status"] = "improving"
+            if deadline.budget_seconds:
+                progress["percentage"] = min(
+                    100.0, round(deadline.elapsed / deadline.budget_seconds * 100, 1)
+                )
+            callback(progress)
+
+        return report
+
+    def _report_completion(
+        self,
+        callback: ProgressCallback,
+        route: List[Dict[str, Any]],
+        total_distance: float,
+        algorithm: str,
+    ) -> None:
+        """
+        Send the returned route as the final progress report
+
+        Throttled reports may have skipped the last improvements, and local
+        search may have improved the route since, so subscribers always
+        end on the route that is actually returned.
+        """
+        try:
+            callback(
+                {
+                    "algorithm": algorithm,
+                    "best_distance": float(total_distance),
+                    "stops": [store.get("id", store.get("name")) for store in route],
+                    "elapsed_seconds": round(self._deadline.elapsed, 3),
+                    "status": "completed",
+                    "percentage": 100.0,
+                }
+            )
+        except Exception as e:
+            logger.warning(f"Progress callback failed: {e}")
+
+    def _polish_route(
+        self,
+        route: List[Dict[str, Any]],
+        constraints: RouteConstraints,
+        algorithm_params: Dict[str, Any],
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Improve a generated route with neighbor-list local search"""
+        if len(route) < 3:
+            return route, None
+
+        distance_matrix = self.distance_calculator.calculate_distance_matrix(route)
+        if not np.isfinite(distance_matrix).all():
+            logger.warning("Skipping local search: route has missing coordinates")
+            return route, None
+
+        optimizer = create_local_search_optimizer(
+            neighbor_count=algorithm_params.get("neighbor_count", 10),
+            or_opt_max_segment=algorithm_params.get("or_opt_max_segment", 3),
+        )
+        # Priority ordering picks the first stop deliberately, keep it there
+        return polish_route(
+            route,
+            distance_matrix,
+            fixed_start=bool(constraints.priority_weights),
+            optimizer=optimizer,
+        )
+
     def _save_route_to_db(
         self,
         route: List[Dict[str, Any]],
@@ -561,6 +964,12 @@ class UnifiedRoutingService:
         Returns:
             List of stores with geocoded coordinates
         """
+        coordinates = self._geocode_addresses(
+            store.get("address", "")
+            for store in stores
+            if not (store.get("lat") and store.get("lon"))
+        )
+
         geocoded_stores = []
         for store in stores:
             # Skip if already has coordinates
@@ -571,7 +980,7 @@ class UnifiedRoutingService:
             # Geocode using address
             address = store.get("address", "")
             if address:
-                coords = self.geocoding_service.get_coordinates(address)
+                coords = coordinates.get(address)
                 if coords:
                     store_copy = store.copy()
                     store_copy["lat"], store_copy["lon"] = coords
@@ -588,7 +997,7 @@ class UnifiedRoutingService:
         return geocoded_stores
 
     def cluster_stores_by_proximity(
-        self, stores: List[Dict[str, Any]], radius_km: float = 2.0
+        self, stores: List[Dict[str, Any]], radius_km: float = 2.0, mode: str = "seed"
     ) -> List[List[Dict[str, Any]]]:
         """
         Cluster stores by proximity - backward compatibility method
@@ -596,6 +1005,7 @@ class UnifiedRoutingService:
         Args:
             stores: List of store dictionaries
             radius_km: Clustering radius in kilometers
+            mode: "seed" or "single_linkage" (see GridClusterer)
 
         Returns:
             List of store clusters
@@ -603,39 +1013,13 @@ class UnifiedRoutingService:
         if not stores:
             return []
 
-        try:
-            # Import the clustering function
-            from app.utils.clustering import cluster_by_proximity
-
-            return cluster_by_proximity(stores, radius_km)
-        except ImportError:
-            # Fallback: simple clustering based on distance
-            return self._simple_proximity_clustering(stores, radius_km)
+        return cluster_by_proximity(stores, radius_km, mode)
 
     def _simple_proximity_clustering(
         self, stores: List[Dict[str, Any]], radius_km: float
     ) -> List[List[Dict[str, Any]]]:
-        """Simple fallback clustering implementation"""
-        clusters = []
-        unprocessed = stores.copy()
-
-        while unprocessed:
-            # Start new cluster with first unprocessed store
-            current_store = unprocessed.pop(0)
-            cluster = [current_store]
-
-            # Find nearby stores
-            i = 0
-            while i < len(unprocessed):
-                store = unprocessed[i]
-                if self._stores_within_radius(current_store, store, radius_km):
-                    cluster.append(unprocessed.pop(i))
-                else:
-                    i += 1
-
-            clusters.append(cluster)
-
-        return clusters
+        """Seed-radius clustering, kept for callers of the old fallback"""
+        return GridClusterer(radius_km, mode="seed").cluster(stores)
 
     def _stores_within_radius(
         self, store1: Dict[str, Any], store2: Dict[str, Any], radius_km: float
@@ -649,19 +1033,10 @@ class UnifiedRoutingService:
         if not all([lat1, lon1, lat2, lon2]):
             return False
 
-        try:
-            from geopy.distance import geodesic
-
-            distance = geodesic((lat1, lon1), (lat2, lon2)).kilometers
-            return distance <= radius_km
-        except ImportError:
-            # Simple distance approximation if geopy not available
-            import math
+        from app.services.distance_service import fast_geodesic_km
 
-            lat_diff = lat2 - lat1
-            lon_diff = lon2 - lon1
-            distance = math.sqrt(lat_diff**2 + lon_diff**2) * 111  # Rough km per degree
-            return distance <= radius_km
+        distance = fast_geodesic_km(float(lat1), float(lon1), float(lat2), float(lon2))
+        return distance <= radius_km
 
     def _calculate_total_distance(self, route: List[Dict[str, Any]]) -> float:
         """
@@ -671,9 +1046,15 @@ class UnifiedRoutingService:
             route: List of route stops
 
         Returns:
-            Total distance in kilometers
+            Total distance in kilometers; stops of several vehicles (tagged
+            with ``route_index``) are measured per vehicle
         """
-        return self.distance_calculator.calculate_route_distance(route)
+        if not route or "route_index" not in route[0]:
+            return self.distance_calculator.calculate_route_distance(route)
+        return sum(
+            self.distance_calculator.calculate_route_distance(list(stops))
+            for _, stops in groupby(route, key=itemgetter("route_index"))
+        )
 
     def _calculate_optimization_score(self, route: List[Dict[str, Any]]) -> float:
         """
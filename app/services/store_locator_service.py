@@ -0,0 +1,218 @@
+"""
+Store locator service for RouteForce Routing
+
+Answers "which store is this GPS point at or nearest to" from an in-memory
+spatial index over active store coordinates.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from flask import current_app, has_app_context
+
+from app.utils.spatial_index import GeoPointIndex
+
+logger = logging.getLogger(__name__)
+
+# A driver within this distance of a store is considered to be at it
+AT_STORE_RADIUS_KM = 0.1
+
+
+class StoreLocatorService:
+    """
+    Nearest-store and within-radius lookups over active stores
+
+    Stores are indexed per owner (Store.user_id) and every lookup names the
+    owner whose stores it may see, so one tenant never sees another's stores.
+    """
+
+    def __init__(self, at_store_radius_km: float = AT_STORE_RADIUS_KM):
+        self.at_store_radius_km = at_store_radius_km
+        self._indexes: Dict[Optional[int], GeoPointIndex] = {}
+        self._stores: Dict[int, Dict[str, Any]] = {}
+        self._owners: Dict[int, Optional[int]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        """
+        (Re)build the index from every active store in the database
+
+        Returns:
+            Number of indexed stores
+        """
+        from app.services.database_service import DatabaseService
+
+        try:
+            stores = DatabaseService.get_all_stores()
+        except Exception as e:
+            logger.warning(f"Could not load stores for the locator index: {e}")
+            stores = []
+
+        with self._lock:
+            self._indexes.clear()
+            self._stores.clear()
+            self._owners.clear()
+            self._loaded = True
+        self.index_stores(stores)
+        logger.info(f"Store locator indexed {len(self._stores)} stores")
+        return len(self._stores)
+
+    def ensure_loaded(self) -> None:
+        """Load the index on first use"""
+        if not self._loaded:
+            self.load()
+
+    def indexed_stores(self, user_id: Optional[int]) -> int:
+        """Number of indexed stores owned by a user"""
+        self.ensure_loaded()
+        with self._lock:
+            index = self._indexes.get(user_id)
+            return len(index) if index is not None else 0
+
+    def index_stores(self, stores: Iterable[Any]) -> None:
+        """
+        Add or refresh stores in the index
+
+        Inactive stores and stores without coordinates are removed; stores
+        that changed owner move to the new owner's index.
+
+        Args:
+            stores: Store models (or objects with the same attributes)
+        """
+        points: Dict[Optional[int], list] = {}
+        with self._lock:
+            for store in stores:
+                if store.id is None:
+                    continue
+                self._discard(store.id)
+                lat, lon = store.latitude, store.longitude
+                if store.is_active is False or lat is None or lon is None:
+                    continue
+                self._stores[store.id] = {
+                    "id": store.id,
+                    "name": store.name,
+                    "address": store.address,
+                    "chain": store.chain,
+                    "latitude": lat,
+                    "longitude": lon,
+                }
+                self._owners[store.id] = store.user_id
+                points.setdefault(store.user_id, []).append((store.id, lat, lon))
+            for user_id, owned in points.items():
+                self._indexes.setdefault(user_id, GeoPointIndex()).add_many(owned)
+
+    def remove_store(self, store_id: int) -> None:
+        """Drop a store from the index"""
+        with self._lock:
+            self._discard(store_id)
+
+    def nearest_stores(
+        self,
+        lat: float,
+        lon: float,
+        k: int = 1,
+        max_distance_km: Optional[float] = None,
+        *,
+        user_id: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the k stores of a user closest to a location
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            k: Number of stores to return
+            max_distance_km: Optional cut-off distance
+            user_id: Owner whose stores are searched
+
+        Returns:
+            Store summaries with a distance_km field, closest first
+        """
+        self.ensure_loaded()
+        index = self._indexes.get(user_id)
+        if index is None:
+            return []
+        found = index.nearest(lat, lon, k)
+        if max_distance_km is not None:
+            found = [item for item in found if item[1] <= max_distance_km]
+        return self._describe(found, user_id)
+
+    def stores_within(
+        self,
+        lat: float,
+        lon: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+        *,
+        user_id: Optional[int],
+    ) -> List[Dict[str, Any]]:
+        """
+        Find every store of a user within a radius of a location
+
+        Args:
+            lat: Latitude in degrees
+            lon: Longitude in degrees
+            radius_km: Search radius in kilometres
+            limit: Optional maximum number of stores to return
+            user_id: Owner whose stores are searched
+
+        Returns:
+            Store summaries with a distance_km field, closest first
+        """
+        self.ensure_loaded()
+        index = self._indexes.get(user_id)
+        if index is None:
+            return []
+        return self._describe(index.within_radius(lat, lon, radius_km)[:limit], user_id)
+
+    def locate(self, lat: float, lon: float, user_id: Optional[int]) -> Dict[str, Any]:
+        """
+        Describe where a GPS point is relative to a user's stores
+
+        Returns:
+            Dict with the nearest store (or None) and whether the point is
+            within the at-store radius of it
+        """
+        nearest = self.nearest_stores(lat, lon, 1, user_id=user_id)
+        store = nearest[0] if nearest else None
+        return {
+            "nearest_store": store,
+            "at_store": bool(store and store["distance_km"] <= self.at_store_radius_km),
+        }
+
+    def _discard(self, store_id: int) -> None:
+        """Remove a store from its owner's index; the lock must be held"""
+        self._stores.pop(store_id, None)
+        if store_id in self._owners:
+            index = self._indexes.get(self._owners.pop(store_id))
+            if index is not None:
+                index.remove(store_id)
+
+    def _describe(self, found, user_id: Optional[int]) -> List[Dict[str, Any]]:
+        results = []
+        with self._lock:
+            for store_id, distance in found:
+                store = self._stores.get(store_id)
+                # The store may have changed owner since the index lookup
+                if store is not None and self._owners.get(store_id) == user_id:
+                    results.append({**store, "distance_km": round(distance, 4)})
+        return results
+
+
+# Fallback instance for use outside an application context
+_store_locator = None
+
+
+def get_store_locator() -> StoreLocatorService:
+    """Get the store locator for the current application"""
+    global _store_locator
+    if has_app_context():
+        extensions = current_app.extensions
+        if "store_locator" not in extensions:
+            extensions["store_locator"] = StoreLocatorService()
+        return extensions["store_locator"]
+    if _store_locator is None:
+        _store_locator = StoreLocatorService()
+    return _store_locator
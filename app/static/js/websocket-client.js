@@ -91,6 +91,11 @@ class RouteForceWebSocket {
             this.handleOptimizationProgress(data);
         });
         
+        // Algorithm comparison results, one event per finished algorithm
+        this.socket.on('algorithm_comparison_result', (data) => {
+            this.trigger('algorithm_comparison_result', data);
+        });
+        
         // Route progress from drivers
         this.socket.on('route_progress', (data) => {
             console.log('Route progress update:', data);
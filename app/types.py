@@ -76,6 +76,7 @@ class AlgorithmType(Enum):
     GENETIC = "genetic"
     SIMULATED_ANNEALING = "simulated_annealing"
     MULTI_OBJECTIVE = "multi_objective"
+    VRPTW = "vrptw"
 
 
 class CacheType(Enum):
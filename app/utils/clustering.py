@@ -3,22 +3,230 @@ Proximity clustering utilities for route optimization
 """
 
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
-from geopy.distance import geodesic
+import numpy as np
+
+from app.services.distance_service import (
+    CoordinateExtractor,
+    fast_geodesic_distances,
+    fast_geodesic_km,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Kilometres per degree lower bounds on WGS-84, with a safety margin, used
+# to size grid cells so that stores within radius share or touch a cell
+_MIN_KM_PER_DEG_LAT = 110.0
+_MIN_KM_PER_DEG_LON_EQUATOR = 111.0
+_MIN_COS_LATITUDE = 1e-3
+# Candidate pairs measured per vectorized distance call
+_PAIR_BATCH_SIZE = 1_000_000
+
+CLUSTER_MODES = ("seed", "single_linkage")
+
+
+class GridClusterer:
+    """
+    Radius clustering over a lat/lon grid hash
+
+    Stores are bucketed into cells at least ``radius_km`` wide in both
+    directions, so any pair within the radius lies in the same or an
+    adjacent cell and only those 3x3 neighborhoods are measured.
+
+    Modes:
+        seed: the first unassigned store (in input order) claims every
+            unassigned store within ``radius_km`` of itself
+        single_linkage: stores are linked whenever any pair is within
+            ``radius_km``; clusters are the connected components
+
+    Stores without usable coordinates form single-store clusters.
+    """
+
+    def __init__(self, radius_km: float = 2.0, mode: str = "seed"):
+        if radius_km <= 0:
+            raise ValueError("Clustering radius must be positive")
+        if mode not in CLUSTER_MODES:
+            raise ValueError(
+                f"Unknown clustering mode '{mode}', expected one of {CLUSTER_MODES}"
+            )
+        self.radius_km = radius_km
+        self.mode = mode
+
+    def cluster(self, stores: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        Cluster stores by proximity
+
+        Args:
+            stores: List of store dictionaries with coordinates
+
+        Returns:
+            List of store clusters ordered by their first member, members in
+            input order
+        """
+        coords = CoordinateExtractor.extract_coordinate_array(stores)
+        return [[stores[i] for i in group] for group in self.cluster_indices(coords)]
+
+    def cluster_indices(self, coordinates: np.ndarray) -> List[List[int]]:
+        """
+        Cluster an (n, 2) latitude/longitude array
+
+        Args:
+            coordinates: Array of shape (n, 2); NaN rows mark missing coordinates
+
+        Returns:
+            Lists of row indices, one per cluster
+        """
+        coords = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        n = len(coords)
+        if not n:
+            return []
+
+        first, second = self._radius_pairs(coords)
+        if self.mode == "seed":
+            return self._seed_clusters(n, first, second)
+        return self._linkage_clusters(n, first, second)
+
+    def _grid_cells(self, coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Assign each valid store a (row, column) cell at least radius wide"""
+        row_height = self.radius_km / _MIN_KM_PER_DEG_LAT
+        # Column width comes from the most poleward latitude a short path
+        # can reach, so it is conservative for every row
+        max_lat = min(90.0, float(np.abs(coords[:, 0]).max()) + 2 * row_height)
+        cos_lat = max(np.cos(np.radians(max_lat)), _MIN_COS_LATITUDE)
+        min_width = self.radius_km / (_MIN_KM_PER_DEG_LON_EQUATOR * cos_lat)
+
+        # Equal-width columns that wrap exactly at the antimeridian
+        columns = max(1, int(360.0 // min_width))
+        rows = np.floor(coords[:, 0] / row_height).astype(np.int64)
+        cols = np.floor((coords[:, 1] + 180.0) / (360.0 / columns)).astype(np.int64)
+        return rows, cols % columns, columns
+
+    def _radius_pairs(self, coords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find every pair of stores within the radius
+
+        Only stores in the same or adjacent cells are measured, in a single
+        vectorized pass per neighbor offset.
+
+        Returns:
+            Two index arrays (i < j) of the pairs within ``radius_km``
+        """
+        valid = np.flatnonzero(np.isfinite(coords).all(axis=1))
+        empty = np.zeros(0, dtype=np.int64)
+        if valid.size < 2:
+            return empty, empty
+
+        rows, cols, columns = self._grid_cells(coords[valid])
+        cell_ids = (rows - rows.min()) * columns + cols
+
+        # Group stores by cell
+        order = np.argsort(cell_ids, kind="stable")
+        members = valid[order]
+        cells, starts, counts = np.unique(
+            cell_ids[order], return_index=True, return_counts=True
+        )
+        cell_rows = cells // columns
+        cell_cols = cells % columns
+
+        first_parts, second_parts = [], []
+        # Forward half of the 3x3 neighborhood visits each cell pair once
+        for d_row, d_col in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+            target = (cell_rows + d_row) * columns + (cell_cols + d_col) % columns
+            slot = np.minimum(np.searchsorted(cells, target), len(cells) - 1)
+            found = np.flatnonzero(cells[slot] == target)
+            if not found.size:
+                continue
+            source, dest = found, slot[found]
+
+            # Expand each cell pair into all member combinations
+            sizes = counts[source] * counts[dest]
+            owner = np.repeat(np.arange(len(source)), sizes)
+            local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            width = counts[dest][owner]
+            i = members[starts[source][owner] + local // width]
+            j = members[starts[dest][owner] + local % width]
+
+            keep = i != j
+            i, j = np.minimum(i[keep], j[keep]), np.maximum(i[keep], j[keep])
+            for lo in range(0, len(i), _PAIR_BATCH_SIZE):
+                bi, bj = i[lo : lo + _PAIR_BATCH_SIZE], j[lo : lo + _PAIR_BATCH_SIZE]
+                distances = fast_geodesic_distances(
+                    coords[bi, 0], coords[bi, 1], coords[bj, 0], coords[bj, 1]
+                )
+                near = distances <= self.radius_km
+                first_parts.append(bi[near])
+                second_parts.append(bj[near])
+
+        if not first_parts:
+            return empty, empty
+
+        # Narrow grids (fewer than three columns) can reach a cell pair twice
+        n = len(coords)
+        keys = np.unique(np.concatenate(first_parts) * n + np.concatenate(second_parts))
+        return keys // n, keys % n
+
+    def _seed_clusters(
+        self, n: int, first: np.ndarray, second: np.ndarray
+    ) -> List[List[int]]:
+        """Greedy clusters around each unassigned store in input order"""
+        # Adjacency lists in CSR form
+        sources = np.concatenate((first, second))
+        targets = np.concatenate((second, first))
+        order = np.lexsort((targets, sources))
+        targets = targets[order]
+        offsets = np.searchsorted(sources[order], np.arange(n + 1))
+
+        assigned = np.zeros(n, dtype=bool)
+        clusters = []
+        for seed in range(n):
+            if assigned[seed]:
+                continue
+            assigned[seed] = True
+            near = targets[offsets[seed] : offsets[seed + 1]]
+            near = near[~assigned[near]]
+            assigned[near] = True
+            clusters.append([seed] + near.tolist())
+        return clusters
+
+    def _linkage_clusters(
+        self, n: int, first: np.ndarray, second: np.ndarray
+    ) -> List[List[int]]:
+        """Connected components of the within-radius graph"""
+        parent = list(range(n))
+
+        def find(i: int) -> int:
+            root = i
+            while parent[root] != root:
+                root = parent[root]
+            while parent[i] != root:
+                parent[i], i = root, parent[i]
+            return root
+
+        for i, j in zip(first.tolist(), second.tolist()):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                # Smaller index as root keeps cluster order stable
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(n):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+
+
 def cluster_by_proximity(
-    stores: List[Dict[str, Any]], radius_km: float = 2.0
+    stores: List[Dict[str, Any]], radius_km: float = 2.0, mode: str = "seed"
 ) -> List[List[Dict[str, Any]]]:
     """
-    Cluster stores by proximity using a greedy algorithm
+    Cluster stores by proximity on a radius-sized grid
 
     Args:
         stores: List of store dictionaries with lat/lon coordinates
         radius_km: Clustering radius in kilometers
+        mode: "seed" (radius around the first unassigned store) or
+            "single_linkage" (connected components of the radius graph)
 
     Returns:
         List of store clusters
@@ -26,24 +234,7 @@ def cluster_by_proximity(
     if not stores:
         return []
 
-    clusters = []
-    unprocessed = stores.copy()
-
-    while unprocessed:
-        # Start new cluster with first unprocessed store
-        seed_store = unprocessed.pop(0)
-        cluster = [seed_store]
-
-        # Find all stores within radius of the seed store
-        i = 0
-        while i < len(unprocessed):
-            store = unprocessed[i]
-            if is_within_radius(seed_store, store, radius_km):
-                cluster.append(unprocessed.pop(i))
-            else:
-                i += 1
-
-        clusters.append(cluster)
+    clusters = GridClusterer(radius_km, mode).cluster(stores)
 
     logger.debug(
         f"Clustered {len(stores)} stores into {len(clusters)} clusters with radius {radius_km}km"
@@ -79,8 +270,8 @@ def is_within_radius(
         # Convert to float in case they're strings
         lat1, lon1, lat2, lon2 = float(lat1), float(lon1), float(lat2), float(lon2)
 
-        # Calculate distance using geodesic
-        distance = geodesic((lat1, lon1), (lat2, lon2)).kilometers
+        # Calculate ellipsoidal distance (Vincenty, WGS-84)
+        distance = fast_geodesic_km(lat1, lon1, lat2, lon2)
         return distance <= radius_km
 
     except (ValueError, TypeError) as e:
@@ -152,10 +343,12 @@ def optimize_cluster_order(
         for idx in remaining_indices:
             center = cluster_centers[idx]
             try:
-                distance = geodesic(
-                    (current_center["lat"], current_center["lon"]),
-                    (center["lat"], center["lon"]),
-                ).kilometers
+                distance = fast_geodesic_km(
+                    current_center["lat"],
+                    current_center["lon"],
+                    center["lat"],
+                    center["lon"],
+                )
 
                 if distance < min_distance:
                     min_distance = distance
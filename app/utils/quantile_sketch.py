@@ -0,0 +1,141 @@
+"""
+Streaming quantile sketch for latency percentiles
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+# Values at or below this are counted in the zero bucket
+MIN_TRACKED_VALUE = 1e-9
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram with bounded relative error
+
+    Values are counted in buckets whose bounds grow geometrically by
+    ``(1 + alpha) / (1 - alpha)``, the layout used by HDR histograms and
+    DDSketch, so any quantile is reported within ``alpha`` relative error.
+    Adding a value is O(1), memory grows with the log of the value range
+    rather than the number of values, and sketches with the same accuracy
+    merge exactly by adding bucket counts.
+    """
+
+    __slots__ = (
+        "alpha",
+        "_gamma_log",
+        "buckets",
+        "zero_count",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(self, alpha: float = 0.01):
+        """
+        Create an empty sketch
+
+        Args:
+            alpha: Relative accuracy of reported quantiles (0 < alpha < 1)
+        """
+        if not 0 < alpha < 1:
+            raise ValueError("Alpha must be between 0 and 1")
+        self.alpha = alpha
+        self._gamma_log = math.log((1 + alpha) / (1 - alpha))
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Add a non-negative value (negative values count as zero)"""
+        if value > MIN_TRACKED_VALUE:
+            index = math.ceil(math.log(value) / self._gamma_log)
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+        else:
+            self.zero_count += weight
+        self.count += weight
+        self.sum += value * weight
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's values into this one"""
+        if other.alpha != self.alpha:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, bucket_count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merged(cls, sketches: Iterable["QuantileSketch"], alpha: float = 0.01) -> "QuantileSketch":
+        """New sketch holding the values of all given sketches"""
+        result = cls(alpha)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile in [0, 1], e.g. 0.95
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket in the relative-error sense
+                gamma = math.exp(self._gamma_log)
+                value = 2 * math.exp(index * self._gamma_log) / (gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def summary(self, scale: float = 1.0, digits: int = 3) -> Dict[str, Optional[float]]:
+        """
+        Count, mean, min, max and p50/p95/p99
+
+        Args:
+            scale: Multiplier applied to values, e.g. 1000 for seconds to ms
+            digits: Rounding of reported values
+        """
+
+        def scaled(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * scale, digits)
+
+        empty = not self.count
+        return {
+            "count": self.count,
+            "mean": scaled(self.mean),
+            "min": None if empty else scaled(self.min),
+            "max": None if empty else scaled(self.max),
+            "p50": scaled(self.quantile(0.5)),
+            "p95": scaled(self.quantile(0.95)),
+            "p99": scaled(self.quantile(0.99)),
+        }
@@ -0,0 +1,380 @@
+"""
+Spatial index utilities for nearest-neighbor route construction
+"""
+
+import logging
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - scipy is a core dependency
+    cKDTree = None
+
+logger = logging.getLogger(__name__)
+
+# Below this many remaining points a vectorised scan beats a tree query
+BRUTE_FORCE_SIZE = 64
+# Initial candidate count requested from the tree per query
+INITIAL_QUERY_SIZE = 8
+EARTH_RADIUS_KM = 6371.0
+
+
+def unit_sphere_coordinates(coordinates: np.ndarray) -> np.ndarray:
+    """
+    Project latitude/longitude pairs onto the unit sphere
+
+    Straight-line (chord) distance between the projected points increases
+    monotonically with great-circle distance, so nearest-neighbor order in
+    3-D matches haversine order on the surface.
+
+    Args:
+        coordinates: Array of shape (n, 2) holding latitude, longitude in degrees
+
+    Returns:
+        Array of shape (n, 3) of unit vectors
+    """
+    coords = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    lat = np.radians(coords[:, 0])
+    lon = np.radians(coords[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+class NearestUnvisitedIndex:
+    """
+    Nearest-neighbor index over geographic points that supports deletion
+
+    Points live on the unit sphere in a KD-tree. Removed points are masked
+    out; queries ask the tree for a growing number of candidates until a
+    live one appears, and the tree is rebuilt over the survivors whenever
+    half of its points have been removed. Points without coordinates (NaN)
+    are never returned by queries.
+    """
+
+    def __init__(self, coordinates: np.ndarray):
+        """
+        Build the index
+
+        Args:
+            coordinates: Array of shape (n, 2) with latitude, longitude in degrees
+        """
+        coords = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        self._points = unit_sphere_coordinates(coords)
+        self._alive = np.isfinite(coords).all(axis=1)
+        self._count = int(self._alive.sum())
+        self._rebuild()
+
+    def __len__(self) -> int:
+        """Number of points still available to queries"""
+        return self._count
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self._alive[index])
+
+    def remove(self, index: int) -> None:
+        """Remove a point so later queries skip it"""
+        if not self._alive[index]:
+            return
+        self._alive[index] = False
+        self._count -= 1
+        if self._count * 2 < self._tree_size:
+            self._rebuild()
+
+    def nearest(self, index: int) -> Optional[int]:
+        """
+        Find the nearest remaining point to an indexed point
+
+        Args:
+            index: Position of the query point in the original coordinates
+
+        Returns:
+            Index of the nearest remaining point, or None if none remain
+        """
+        return self.nearest_to(self._points[index])
+
+    def nearest_to(self, point: np.ndarray) -> Optional[int]:
+        """Find the nearest remaining point to a unit-sphere vector"""
+        if self._count == 0 or not np.isfinite(point).all():
+            return None
+
+        if self._count > BRUTE_FORCE_SIZE and self._tree is not None:
+            k = INITIAL_QUERY_SIZE
+            while k <= self._count:
+                _, positions = self._tree.query(point, k=min(k, self._tree_size))
+                candidates = self._tree_ids[np.atleast_1d(positions)]
+                live = candidates[self._alive[candidates]]
+                if live.size:
+                    return int(live[0])
+                k *= 4
+
+        remaining = np.flatnonzero(self._alive)
+        offsets = self._points[remaining] - point
+        return int(remaining[np.argmin(np.einsum("ij,ij->i", offsets, offsets))])
+
+    def pop_nearest(self, index: int) -> Optional[int]:
+        """Find and remove the nearest remaining point to an indexed point"""
+        found = self.nearest(index)
+        if found is not None:
+            self.remove(found)
+        return found
+
+    def _rebuild(self) -> None:
+        """Rebuild the KD-tree over the points that are still alive"""
+        self._tree_ids = np.flatnonzero(self._alive)
+        self._tree_size = len(self._tree_ids)
+        if cKDTree is None or self._tree_size <= BRUTE_FORCE_SIZE:
+            self._tree = None
+        else:
+            self._tree = cKDTree(self._points[self._tree_ids])
+
+
+def chord_to_km(chord: np.ndarray) -> np.ndarray:
+    """Convert unit-sphere chord lengths to great-circle distances in km"""
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.clip(np.asarray(chord) / 2.0, 0.0, 1.0))
+
+
+def km_to_chord(distance_km: float) -> float:
+    """Convert a great-circle distance in km to a unit-sphere chord length"""
+    angle = min(max(distance_km, 0.0) / EARTH_RADIUS_KM, np.pi)
+    return 2.0 * np.sin(angle / 2.0)
+
+
+class GeoPointIndex:
+    """
+    Thread-safe, incrementally updated index of keyed geographic points
+
+    Points are stored as unit-sphere vectors. A KD-tree covers the bulk of
+    the points; new points go to a small buffer that queries scan directly,
+    and the tree is rebuilt once the buffer grows past an eighth of it.
+    Removed or replaced tree points are masked until the next rebuild.
+    Distances are great-circle kilometres.
+    """
+
+    def __init__(self, points: Iterable[Tuple[Hashable, float, float]] = ()):
+        """
+        Build the index
+
+        Args:
+            points: Initial (key, latitude, longitude) triples
+        """
+        self._lock = threading.RLock()
+        self._tree = None
+        self._tree_keys: List[Hashable] = []
+        self._tree_points = np.empty((0, 3))
+        self._tree_alive = np.zeros(0, dtype=bool)
+        self._tree_slots: Dict[Hashable, int] = {}
+        self._dead = 0
+        self._buffer: Dict[Hashable, np.ndarray] = {}
+        self.add_many(points)
+
+    def __len__(self) -> int:
+        """Number of indexed points"""
+        with self._lock:
+            return len(self._tree_slots) + len(self._buffer)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._tree_slots or key in self._buffer
+
+    def add(self, key: Hashable, lat: float, lon: float) -> None:
+        """Insert a point, replacing any point with the same key"""
+        self.add_many([(key, lat, lon)])
+
+    def add_many(self, points: Iterable[Tuple[Hashable, float, float]]) -> None:
+        """
+        Insert points, replacing those with the same keys
+
+        Points without finite coordinates are removed rather than indexed.
+        """
+        points = list(points)
+        if not points:
+            return
+        coords = np.array([(lat, lon) for _, lat, lon in points], dtype=float)
+        vectors = unit_sphere_coordinates(coords)
+        valid = np.isfinite(coords).all(axis=1)
+
+        with self._lock:
+            for (key, _, _), vector, ok in zip(points, vectors, valid):
+                self._discard(key)
+                if ok:
+                    self._buffer[key] = vector
+            self._maybe_rebuild()
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a point if it is indexed"""
+        with self._lock:
+            self._discard(key)
+            self._maybe_rebuild()
+
+    def clear(self) -> None:
+        """Remove every point"""
+        with self._lock:
+            self._buffer.clear()
+            self._tree_slots.clear()
+            self._tree_alive[:] = False
+            self._dead = len(self._tree_keys)
+            self._rebuild()
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[Hashable, float]]:
+        """
+        Find the k points closest to a location
+
+        Args:
+            lat: Query latitude in degrees
+            lon: Query longitude in degrees
+            k: Number of points to return
+
+        Returns:
+            Up to k (key, distance_km) pairs, closest first
+        """
+        point = unit_sphere_coordinates([[lat, lon]])[0]
+        if k <= 0 or not np.isfinite(point).all():
+            return []
+
+        with self._lock:
+            candidates: List[Tuple[float, Hashable]] = []
+            size = len(self._tree_keys)
+            if size:
+                if self._tree is not None:
+                    chords, positions = self._tree.query(point, k=min(k + self._dead, size))
+                    chords = np.atleast_1d(chords)
+                    positions = np.atleast_1d(positions)
+                else:
+                    chords = self._chords(self._tree_points, point)
+                    positions = np.argsort(chords)[: k + self._dead]
+                    chords = chords[positions]
+                live = self._tree_alive[positions]
+                candidates.extend(
+                    (float(chord), self._tree_keys[position])
+                    for chord, position in zip(chords[live][:k], positions[live][:k])
+                )
+            candidates.extend(self._scan_buffer(point))
+
+        candidates.sort(key=lambda item: item[0])
+        return [(key, float(chord_to_km(chord))) for chord, key in candidates[:k]]
+
+    def within_radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Find every point within a great-circle radius of a location
+
+        Args:
+            lat: Query latitude in degrees
+            lon: Query longitude in degrees
+            radius_km: Search radius in kilometres
+
+        Returns:
+            (key, distance_km) pairs, closest first
+        """
+        point = unit_sphere_coordinates([[lat, lon]])[0]
+        if radius_km < 0 or not np.isfinite(point).all():
+            return []
+        limit = km_to_chord(radius_km)
+
+        with self._lock:
+            candidates = [item for item in self._scan_buffer(point) if item[0] <= limit]
+            if self._tree_keys:
+                if self._tree is not None:
+                    positions = np.asarray(self._tree.query_ball_point(point, limit), dtype=np.intp)
+                else:
+                    positions = np.flatnonzero(self._chords(self._tree_points, point) <= limit)
+                positions = positions[self._tree_alive[positions]]
+                chords = self._chords(self._tree_points[positions], point)
+                candidates.extend(
+                    (float(chord), self._tree_keys[position])
+                    for chord, position in zip(chords, positions)
+                )
+
+        candidates.sort(key=lambda item: item[0])
+        return [(key, float(chord_to_km(chord))) for chord, key in candidates]
+
+    @staticmethod
+    def _chords(points: np.ndarray, point: np.ndarray) -> np.ndarray:
+        offsets = points - point
+        return np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+
+    def _scan_buffer(self, point: np.ndarray) -> List[Tuple[float, Hashable]]:
+        """Chord distances from a point to every buffered point"""
+        if not self._buffer:
+            return []
+        chords = self._chords(np.array(list(self._buffer.values())), point)
+        return list(zip(chords.tolist(), self._buffer))
+
+    def _discard(self, key: Hashable) -> None:
+        """Drop a key from the buffer or mask it in the tree"""
+        if self._buffer.pop(key, None) is not None:
+            return
+        slot = self._tree_slots.pop(key, None)
+        if slot is not None:
+            self._tree_alive[slot] = False
+            self._dead += 1
+
+    def _maybe_rebuild(self) -> None:
+        """Fold the buffer into the tree once scanning it gets expensive"""
+        live = len(self._tree_slots)
+        if len(self._buffer) > max(BRUTE_FORCE_SIZE, live // 8) or self._dead > live:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Rebuild the KD-tree over every live point"""
+        keys = [key for key, alive in zip(self._tree_keys, self._tree_alive) if alive]
+        points = [self._tree_points[self._tree_alive]]
+        if self._buffer:
+            keys.extend(self._buffer)
+            points.append(np.array(list(self._buffer.values())))
+        self._tree_keys = keys
+        self._tree_points = np.concatenate(points) if keys else np.empty((0, 3))
+        self._tree_alive = np.ones(len(keys), dtype=bool)
+        self._tree_slots = {key: slot for slot, key in enumerate(keys)}
+        self._dead = 0
+        self._buffer = {}
+        if cKDTree is None or len(keys) <= BRUTE_FORCE_SIZE:
+            self._tree = None
+        else:
+            self._tree = cKDTree(self._tree_points)
+
+
+def nearest_neighbor_order(coordinates: np.ndarray, start: Optional[int] = None) -> np.ndarray:
+    """
+    Greedy nearest-neighbor visiting order over geographic points
+
+    Args:
+        coordinates: Array of shape (n, 2) with latitude, longitude in degrees
+        start: Index of the first point (defaults to 0)
+
+    Returns:
+        Permutation of range(n). Points without coordinates come last, in
+        their original order. A start without coordinates is kept first and
+        the walk continues from the first point that has them.
+    """
+    coords = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+    n = len(coords)
+    if n == 0:
+        return np.zeros(0, dtype=np.intp)
+
+    index = NearestUnvisitedIndex(coords)
+    current = 0 if start is None else int(start)
+    order = [current]
+    index.remove(current)
+
+    finite = np.isfinite(coords).all(axis=1)
+    if not finite[current] and len(index):
+        # Nothing is nearest to a point without coordinates
+        current = int(np.flatnonzero(finite)[0])
+        order.append(current)
+        index.remove(current)
+
+    while len(index):
+        current = index.pop_nearest(current)
+        if current is None:
+            break
+        order.append(current)
+
+    visited = np.zeros(n, dtype=bool)
+    visited[order] = True
+    order.extend(np.flatnonzero(~visited).tolist())
+    return np.asarray(order, dtype=np.intp)
@@ -177,7 +177,13 @@ def validate_algorithm_options(options: Dict) -> Dict:
         raise ValidationError("Options must be an object", field="options")
 
     # Validate algorithm choice
-    valid_algorithms = ["default", "genetic", "simulated_annealing", "multi_objective"]
+    valid_algorithms = [
+        "default",
+        "genetic",
+        "simulated_annealing",
+        "multi_objective",
+        "vrptw",
+    ]
     algorithm = options.get("algorithm", "default")
 
     if algorithm not in valid_algorithms:
@@ -194,6 +200,9 @@ def validate_algorithm_options(options: Dict) -> Dict:
         "ga_crossover_rate": (0.0, 1.0),
         "ga_elite_size": (1, 100),
         "ga_tournament_size": (2, 10),
+        "ga_islands": (1, 64),
+        "ga_migration_interval": (1, 2000),
+        "ga_migration_size": (0, 100),
         "sa_initial_temperature": (1.0, 10000.0),
         "sa_final_temperature": (0.001, 100.0),
         "sa_cooling_rate": (0.8, 0.999),
@@ -201,11 +210,20 @@ def validate_algorithm_options(options: Dict) -> Dict:
         "sa_iterations_per_temp": (10, 1000),
         "sa_reheat_threshold": (100, 10000),
         "sa_min_improvement_threshold": (0.0001, 1.0),
+        "sa_restarts": (1, 64),
+        "sa_workers": (1, 64),
         "mo_population_size": (10, 500),
         "mo_generations": (10, 1000),
         "mo_mutation_rate": (0.0, 1.0),
         "mo_crossover_rate": (0.0, 1.0),
         "mo_tournament_size": (2, 10),
+        "mo_archive_size": (1, 1000),
+        "vrptw_speed_kmh": (1.0, 200.0),
+        "vrptw_start_time": (0.0, 24.0),
+        "vrptw_service_time": (0.0, 12.0),
+        "vrptw_max_routes": (1, 1000),
+        "vrptw_vehicle_cost": (0.0, 1000000.0),
+        "deadline_ms": (1, 600000),
     }
 
     for param, (min_val, max_val) in numeric_params.items():
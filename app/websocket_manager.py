@@ -4,7 +4,7 @@ Handles real-time route updates, driver tracking, and notifications
 """
 
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
-from flask import request, current_app
+from flask import request, current_app, session
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import json
@@ -14,6 +14,8 @@ from threading import Lock
 from typing import Dict, Any
 import uuid
 
+from app.services.store_locator_service import get_store_locator
+
 # Thread-safe storage for active connections and data
 active_connections: Dict[str, Any] = {}
 route_updates: Dict[str, Any] = {}
@@ -59,6 +61,8 @@ class DriverLocation:
     speed: float
     timestamp: str
     route_id: Optional[str] = None
+    nearest_store: Optional[Dict[str, Any]] = None
+    at_store: bool = False
 
 
 def init_websocket(socketio: SocketIO):
@@ -211,6 +215,19 @@ def init_websocket(socketio: SocketIO):
                 route_id=data.get("route_id"),
             )
 
+            # Resolve the store the driver is at or nearest to, among the
+            # stores of the logged-in user only
+            tenant_id = session.get("user_id")
+            if tenant_id:
+                try:
+                    match = get_store_locator().locate(
+                        location.latitude, location.longitude, tenant_id
+                    )
+                    location.nearest_store = match["nearest_store"]
+                    location.at_store = match["at_store"]
+                except Exception as e:
+                    logging.warning(f"Store lookup failed for driver {location.driver_id}: {e}")
+
             # Store location
             driver_locations[location.driver_id] = location
 
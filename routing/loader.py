@@ -11,18 +11,45 @@
 # File: routing/loader.py
 # This script loads store data from a CSV or Excel file and returns a list of stores.
 # The file is expected to have columns 'Store Name' and 'Address'.
+# Large files are parsed in bounded chunks by iter_store_chunks.
 
 import argparse
 import gzip
 import os
 import sys  # noqa: F401
 from io import TextIOWrapper
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import pandas as pd
 
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional, enables row-group streaming
+    pq = None
+
 script_dir = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_STORE_PATH: str = os.path.join(script_dir, "sample_stores.xlsx")
+# Rows parsed and validated per chunk when streaming a store file
+DEFAULT_CHUNK_SIZE: int = 10_000
+REQUIRED_COLUMNS = ["store name", "address"]
+# CSV columns are read as text, since per-chunk type inference would depend
+# on where the chunks happen to split; these known columns are converted back.
+# Coordinates are always numeric (unparseable values become NaN)
+NUMERIC_COLUMNS = ["lat", "lon", "lng", "latitude", "longitude"]
+# Other numeric store fields, converted when every value in the chunk parses
+# (time windows may also be given as "HH:MM" text)
+NUMERIC_STORE_FIELDS = [
+    "priority",
+    "demand",
+    "service_time",
+    "window_start",
+    "window_end",
+    "earliest_time",
+    "latest_time",
+    "sales",
+    "packages",
+    "weight_kg",
+]
 
 
 def _read_store_file(filepath: str) -> pd.DataFrame:
@@ -51,12 +78,117 @@ def _read_store_file(filepath: str) -> pd.DataFrame:
         raise RuntimeError(f"Failed to read file: {e}")
 
 
-def load_stores(filepath: str) -> List[Dict[str, Any]]:
+def _iter_store_frames(filepath: str, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield a store file as DataFrames of at most chunksize rows"""
+    ext = filepath.lower()
+    is_gzip = ext.endswith(".gz")
+    base_ext = ext[:-3] if is_gzip else ext
+    open_fn = gzip.open if is_gzip else open
+
+    if base_ext.endswith(".csv"):
+        with open_fn(filepath, "rb") as f:
+            with pd.read_csv(f, chunksize=chunksize, dtype=str) as reader:
+                yield from reader
+    elif base_ext.endswith(".xlsx"):
+        from openpyxl import load_workbook
+
+        with open_fn(filepath, "rb") as f:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = [str(col) for col in next(rows, ())]
+                chunk = []
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= chunksize:
+                        yield pd.DataFrame(chunk, columns=header)
+                        chunk = []
+                if chunk or not header:
+                    yield pd.DataFrame(chunk, columns=header)
+            finally:
+                workbook.close()
+    elif base_ext.endswith(".parquet") and pq is not None:
+        with open_fn(filepath, "rb") as f:
+            parquet_file = pq.ParquetFile(f)
+            for batch in parquet_file.iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+    else:
+        # .xls and parquet without pyarrow cannot be streamed; read then split
+        df = _read_store_file(filepath)
+        for start in range(0, max(len(df), 1), chunksize):
+            yield df.iloc[start : start + chunksize]
+
+
+def iter_store_chunks(
+    filepath: str, chunksize: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream validated store records from a file in bounded chunks.
+
+    Only one chunk of parsed rows is held at a time, so callers can geocode
+    or persist each chunk before the rest of the file has been read.
+
+    Args:
+        filepath: Path to the store data file
+        chunksize: Maximum number of rows per chunk
+
+    Yields:
+        Lists of store dictionaries with normalized keys
+
+    Raises:
+        ValueError: If required columns are missing or a row is incomplete
+    """
+    frames = _iter_store_frames(filepath, chunksize)
+    offset = 0
+    while True:
+        try:
+            df = next(frames, None)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {filepath}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to read file: {e}")
+        if df is None:
+            return
+
+        if offset == 0:
+            # Check for required columns (case-insensitive)
+            df_columns_lower = [str(col).lower() for col in df.columns]
+            missing_columns = [
+                req_col for req_col in REQUIRED_COLUMNS if req_col not in df_columns_lower
+            ]
+            if missing_columns:
+                raise ValueError(
+                    f"File must contain columns: {', '.join(missing_columns)}. "
+                    f"Found: {', '.join(map(str, df.columns))}"
+                )
+
+        # Normalize column names to lowercase
+        df.columns = [str(col).lower() for col in df.columns]
+        for col in NUMERIC_COLUMNS:
+            if col in df.columns:
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        for col in NUMERIC_STORE_FIELDS:
+            if col in df.columns:
+                try:
+                    df[col] = pd.to_numeric(df[col])
+                except (TypeError, ValueError):
+                    pass
+        stores = df.rename(columns={"store name": "name"}).to_dict(orient="records")
+
+        # Validate that stores have required fields
+        validate_store_rows(stores, start=offset)
+        offset += len(stores)
+        if stores:
+            yield stores
+
+
+def load_stores(filepath: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, Any]]:
     """
     Load stores from file and normalize column names.
 
     Args:
         filepath: Path to the store data file
+        chunksize: Rows parsed per chunk while reading
 
     Returns:
         List of store dictionaries with normalized keys
@@ -64,37 +196,16 @@ def load_stores(filepath: str) -> List[Dict[str, Any]]:
     Raises:
         ValueError: If required columns are missing
     """
-    df = _read_store_file(filepath)
-
-    # Check for required columns (case-insensitive)
-    required_columns = ["store name", "address"]
-    df_columns_lower = [col.lower() for col in df.columns]
-
-    missing_columns = []
-    for req_col in required_columns:
-        if req_col not in df_columns_lower:
-            missing_columns.append(req_col)
-
-    if missing_columns:
-        raise ValueError(
-            f"File must contain columns: {', '.join(missing_columns)}. Found: {', '.join(df.columns)}"
-        )
-
-    # Normalize column names to lowercase
-    df.columns = df.columns.str.lower()
-
-    # Use the highly efficient to_dict method instead of iterrows()
-    stores = df.rename(columns={"store name": "name"}).to_dict(orient="records")
-
-    # Validate that stores have required fields
-    validate_store_rows(stores)
-
+    stores = []
+    for chunk in iter_store_chunks(filepath, chunksize):
+        stores.extend(chunk)
     return stores
 
 
-def validate_store_rows(stores: List[Dict[str, Any]]) -> None:
-    for i, store in enumerate(stores):
-        if not store.get("name") or not store.get("address"):
+def validate_store_rows(stores: List[Dict[str, Any]], start: int = 0) -> None:
+    for i, store in enumerate(stores, start=start):
+        name, address = store.get("name"), store.get("address")
+        if pd.isna(name) or pd.isna(address) or not name or not address:
             raise ValueError(
                 f"Store at row {i + 1} is missing required fields: "
                 f"name={store.get('name')}, address={store.get('address')}"
@@ -1,4 +1,6 @@
-from geopy.distance import geodesic
+import numpy as np
+
+from app.services.distance_service import fast_geodesic_distances
 
 
 def score_route(route):
@@ -14,13 +16,9 @@ def score_route(route):
     if not route or len(route) < 2:
         return 0.0
 
-    total_distance = sum(
-        geodesic(
-            (store["latitude"], store["longitude"]),
-            (next_store["latitude"], next_store["longitude"]),
-        ).km
-        for store, next_store in zip(route[:-1], route[1:])
-    )
+    lat = np.array([store["latitude"] for store in route], dtype=np.float64)
+    lon = np.array([store["longitude"] for store in route], dtype=np.float64)
+    total_distance = float(fast_geodesic_distances(lat[:-1], lon[:-1], lat[1:], lon[1:]).sum())
 
     # Example scoring formula: shorter distance and more stops yield higher scores
     return max(0.0, 1000 / (total_distance + len(route)))
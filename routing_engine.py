@@ -10,6 +10,13 @@ from enum import Enum
 from typing import Any, Dict, List, Optional
 from functools import lru_cache
 
+import numpy as np
+
+from app.optimization.local_search import LocalSearchOptimizer
+from app.optimization.savings import ClarkeWrightSolver, RouteLimits
+from app.services.distance_service import CoordinateExtractor, build_distance_matrix
+from app.utils.spatial_index import nearest_neighbor_order
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,6 +97,8 @@ class RouteOptimizer:
         """Initialize route optimizer with depot location."""
         self.depot_location = depot_location or {"lat": 40.7128, "lng": -74.0060}
         self.optimization_cache = {}
+        # Stores the last distribution could not place on any vehicle
+        self.unassigned_stores: List[Store] = []
 
     def calculate_distance(
         self, point1: Dict[str, float], point2: Dict[str, float]
@@ -101,20 +110,9 @@ class RouteOptimizer:
         lng2 = round(float(point2["lng"]), 6)
         return _haversine_km(lat1, lng1, lat2, lng2)
 
-    def create_distance_matrix(
-        self, locations: List[Dict[str, float]]
-    ) -> List[List[float]]:
+    def create_distance_matrix(self, locations: List[Dict[str, float]]) -> np.ndarray:
         """Create distance matrix for all location pairs."""
-        n = len(locations)
-        matrix = [[0.0] * n for _ in range(n)]
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                distance = self.calculate_distance(locations[i], locations[j])
-                matrix[i][j] = distance
-                matrix[j][i] = distance
-
-        return matrix
+        return build_distance_matrix(locations, "haversine")
 
     def nearest_neighbor_tsp(
         self, stores: List[Store], start_location: Dict[str, float] = None
@@ -127,62 +125,43 @@ class RouteOptimizer:
             return stores
 
         start_loc = start_location or self.depot_location
-        unvisited = stores.copy()
-        route = []
 
-        # Find nearest store to starting location
-        current_location = start_loc
+        # Nearest unvisited store via a spatial index, starting at the depot
+        coordinates = CoordinateExtractor.extract_coordinate_array(
+            [start_loc] + [store.coordinates for store in stores]
+        )
+        order = nearest_neighbor_order(coordinates, start=0)
 
-        while unvisited:
-            nearest_store = min(
-                unvisited,
-                key=lambda s: self.calculate_distance(current_location, s.coordinates),
-            )
-            route.append(nearest_store)
-            unvisited.remove(nearest_store)
-            current_location = nearest_store.coordinates
+        return [stores[i - 1] for i in order[1:]]
 
-        return route
+    def two_opt_improvement(
+        self, route: List[Store], start_location: Dict[str, float] = None
+    ) -> List[Store]:
+        """Improve route using neighbor-list 2-opt and Or-opt local search.
 
-    def two_opt_improvement(self, route: List[Store]) -> List[Store]:
-        """Improve route using 2-opt local search."""
+        With a start location the depot joins the tour, so the search
+        minimises the same closed depot-to-depot distance reported by
+        calculate_route_metrics. Without one the first and last stops stay
+        in place and only the path between them is improved.
+        """
         if len(route) < 4:
             return route
 
-        improved = True
-        best_route = route.copy()
-
-        while improved:
-            improved = False
-            for i in range(1, len(best_route) - 2):
-                for j in range(i + 1, len(best_route)):
-                    if j - i == 1:
-                        continue  # Skip adjacent edges
-
-                    # Calculate current distance
-                    current_dist = self.calculate_distance(
-                        best_route[i - 1].coordinates, best_route[i].coordinates
-                    ) + self.calculate_distance(
-                        best_route[j - 1].coordinates, best_route[j].coordinates
-                    )
-
-                    # Calculate distance after 2-opt swap
-                    new_dist = self.calculate_distance(
-                        best_route[i - 1].coordinates, best_route[j - 1].coordinates
-                    ) + self.calculate_distance(
-                        best_route[i].coordinates, best_route[j].coordinates
-                    )
-
-                    if new_dist < current_dist:
-                        # Perform 2-opt swap
-                        best_route[i:j] = best_route[i:j][::-1]
-                        improved = True
-                        break
-
-                if improved:
-                    break
-
-        return best_route
+        optimizer = LocalSearchOptimizer()
+
+        if start_location is not None:
+            locations = [start_location] + [store.coordinates for store in route]
+            matrix = self.create_distance_matrix(locations)
+            tour, _ = optimizer.improve(list(range(len(locations))), matrix)
+            depot_index = tour.index(0)
+            order = tour[depot_index + 1 :] + tour[:depot_index]
+            return [route[i - 1] for i in order]
+
+        matrix = self.create_distance_matrix([store.coordinates for store in route])
+        order, _ = optimizer.improve_path(
+            list(range(len(route))), matrix, fixed_start=True, fixed_end=True
+        )
+        return [route[i] for i in order]
 
     def distribute_stores_to_vehicles(
         self, stores: List[Store], vehicles: List[Vehicle]
@@ -217,6 +196,7 @@ class RouteOptimizer:
         }
 
         # Assign stores using best-fit decreasing algorithm
+        self.unassigned_stores = []
         for store in sorted_stores:
             best_vehicle = None
             min_capacity_waste = float("inf")
@@ -251,6 +231,7 @@ class RouteOptimizer:
                 vehicle_loads[best_vehicle.vehicle_id]["packages"] += store.packages
             else:
                 # Store doesn't fit in any vehicle - needs special handling
+                self.unassigned_stores.append(store)
                 print(
                     f"Warning: Store {store.store_id} doesn't fit in any available vehicle"
                 )
@@ -258,18 +239,138 @@ class RouteOptimizer:
         # Remove empty assignments
         return {vid: stores for vid, stores in vehicle_assignments.items() if stores}
 
+    def distribute_stores_by_savings(
+        self, stores: List[Store], vehicles: List[Vehicle]
+    ) -> Dict[str, List[Store]]:
+        """Build geographic routes with Clarke-Wright savings, one per vehicle.
+
+        Routes start and end at the optimizer's depot and are merged within
+        the limits of the largest available vehicle (by capacity), at most
+        one route per available vehicle, then handed to vehicles largest
+        load first, each taking the smallest free vehicle whose capacity,
+        package and driving-hour limits the route meets. Stores of a route
+        that no free vehicle can take are inserted where they add the least
+        distance, into an assigned route with room or a still free vehicle.
+        Stores that fit nowhere are skipped and kept in unassigned_stores,
+        as in distribute_stores_to_vehicles. Returned store lists are in
+        visiting order.
+        """
+        available_vehicles = [
+            v for v in vehicles if v.status == VehicleStatus.AVAILABLE
+        ]
+
+        if not available_vehicles:
+            raise ValueError("No available vehicles for route assignment")
+
+        def vehicle_limits(vehicle: Vehicle) -> RouteLimits:
+            return RouteLimits(
+                capacity_kg=vehicle.capacity_kg,
+                max_packages=vehicle.max_packages,
+                max_driving_hours=vehicle.max_driving_hours,
+            )
+
+        largest = max(
+            available_vehicles,
+            key=lambda v: (v.capacity_kg, v.max_packages, v.max_driving_hours),
+        )
+        solver = ClarkeWrightSolver()
+        routes, unassigned = solver.solve(
+            CoordinateExtractor.extract_coordinate_array(
+                [store.coordinates for store in stores]
+            ),
+            (self.depot_location["lat"], self.depot_location["lng"]),
+            [store.weight_kg for store in stores],
+            [store.packages for store in stores],
+            [store.estimated_service_time for store in stores],
+            vehicle_limits(largest),
+            max_routes=len(available_vehicles),
+        )
+        unassigned = list(unassigned)
+
+        def totals(route: List[int]) -> Dict[str, float]:
+            sequence = [stores[i] for i in route]
+            return {
+                "weight": sum(store.weight_kg for store in sequence),
+                "packages": sum(store.packages for store in sequence),
+                "hours": self.calculate_route_metrics(sequence, self.depot_location)[
+                    "estimated_duration"
+                ],
+            }
+
+        free_vehicles = sorted(
+            available_vehicles,
+            key=lambda v: (v.capacity_kg, v.max_packages, v.max_driving_hours),
+        )
+        assigned_routes, assigned_vehicles, left_over = [], [], []
+        route_totals = [(route, totals(route)) for route in routes]
+        route_totals.sort(
+            key=lambda item: (item[1]["weight"], item[1]["packages"]), reverse=True
+        )
+        for route, load in route_totals:
+            vehicle = next(
+                (
+                    v
+                    for v in free_vehicles
+                    if load["weight"] <= v.capacity_kg
+                    and load["packages"] <= v.max_packages
+                    and load["hours"] <= v.max_driving_hours
+                ),
+                None,
+            )
+            if vehicle is None:
+                left_over.extend(route)
+                continue
+            free_vehicles.remove(vehicle)
+            assigned_routes.append(route)
+            assigned_vehicles.append(vehicle)
+
+        if left_over:
+            # Vehicles still free start empty routes for the left-over stores
+            assigned_routes += [[] for _ in free_vehicles]
+            assigned_vehicles += free_vehicles
+            unassigned.extend(
+                solver.insert_stops(
+                    assigned_routes,
+                    left_over,
+                    [vehicle_limits(v) for v in assigned_vehicles],
+                )
+            )
+        vehicle_assignments = {
+            vehicle.vehicle_id: [stores[i] for i in route]
+            for route, vehicle in zip(assigned_routes, assigned_vehicles)
+            if route
+        }
+
+        self.unassigned_stores = [stores[i] for i in sorted(unassigned)]
+        if unassigned:
+            logger.warning(
+                f"{len(unassigned)} stores do not fit the available vehicles' "
+                "capacity, package or driving-hour limits"
+            )
+
+        return vehicle_assignments
+
     def optimize_multi_vehicle_routes(
         self,
         stores: List[Store],
         vehicles: List[Vehicle],
         method: OptimizationMethod = OptimizationMethod.NEAREST_NEIGHBOR,
     ) -> List[Route]:
-        """Optimize routes for multiple vehicles."""
+        """Optimize routes for multiple vehicles.
+
+        Stores that fit on no vehicle are left out of the routes and listed
+        in unassigned_stores afterwards.
+        """
+        self.unassigned_stores = []
         if not stores:
             return []
 
-        # Distribute stores across vehicles
-        vehicle_assignments = self.distribute_stores_to_vehicles(stores, vehicles)
+        # Distribute stores across vehicles; savings routes are built
+        # geographically from the depot and arrive already sequenced
+        if method == OptimizationMethod.CLARKE_WRIGHT:
+            vehicle_assignments = self.distribute_stores_by_savings(stores, vehicles)
+        else:
+            vehicle_assignments = self.distribute_stores_to_vehicles(stores, vehicles)
 
         if not vehicle_assignments:
             raise ValueError("No feasible vehicle assignments found")
@@ -283,7 +384,13 @@ class RouteOptimizer:
             vehicle = next(v for v in vehicles if v.vehicle_id == vehicle_id)
 
             # Optimize route for this vehicle
-            if method == OptimizationMethod.NEAREST_NEIGHBOR:
+            start_location = vehicle.current_location
+            if method == OptimizationMethod.CLARKE_WRIGHT:
+                start_location = self.depot_location
+                optimized_sequence = self.two_opt_improvement(
+                    assigned_stores, start_location
+                )
+            elif method == OptimizationMethod.NEAREST_NEIGHBOR:
                 optimized_sequence = self.nearest_neighbor_tsp(
                     assigned_stores, vehicle.current_location
                 )
@@ -291,7 +398,9 @@ class RouteOptimizer:
                 initial_route = self.nearest_neighbor_tsp(
                     assigned_stores, vehicle.current_location
                 )
-                optimized_sequence = self.two_opt_improvement(initial_route)
+                optimized_sequence = self.two_opt_improvement(
+                    initial_route, vehicle.current_location
+                )
             else:
                 # Default to nearest neighbor
                 optimized_sequence = self.nearest_neighbor_tsp(
@@ -300,7 +409,7 @@ class RouteOptimizer:
 
             # Calculate route metrics
             route_metrics = self.calculate_route_metrics(
-                optimized_sequence, vehicle.current_location
+                optimized_sequence, start_location
             )
 
             # Create route object
@@ -434,7 +543,11 @@ class PerformanceMonitor:
     ) -> Dict[str, Any]:
         """Benchmark different optimization methods."""
         if methods is None:
-            methods = [OptimizationMethod.NEAREST_NEIGHBOR, OptimizationMethod.TWO_OPT]
+            methods = [
+                OptimizationMethod.NEAREST_NEIGHBOR,
+                OptimizationMethod.TWO_OPT,
+                OptimizationMethod.CLARKE_WRIGHT,
+            ]
 
         optimizer = RouteOptimizer()
         benchmark_results = {}
@@ -454,6 +567,7 @@ class PerformanceMonitor:
                 total_distance = sum(route.total_distance_km for route in routes)
                 total_duration = sum(route.estimated_duration_hours for route in routes)
                 total_routes = len(routes)
+                stores_routed = sum(len(route.stops) for route in routes)
 
                 benchmark_results[method.value] = {
                     "execution_time_seconds": execution_time,
@@ -464,6 +578,15 @@ class PerformanceMonitor:
                         total_distance / total_routes if total_routes > 0 else 0
                     ),
                     "stores_processed": len(stores),
+                    "stores_routed": stores_routed,
+                    "stores_unassigned": len(optimizer.unassigned_stores),
+                    # Comparable across methods that route different stores
+                    "distance_per_stop_km": (
+                        total_distance / stores_routed if stores_routed > 0 else 0
+                    ),
+                    "max_route_duration_hours": max(
+                        (route.estimated_duration_hours for route in routes), default=0
+                    ),
                     "vehicles_used": total_routes,
                 }
 
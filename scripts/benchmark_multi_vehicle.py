@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compare multi-vehicle routing methods on a synthetic fleet.
+
+Runs the best-fit assignment (nearest neighbor and 2-opt sequencing) and the
+Clarke-Wright savings solver on the same stores and vehicles and reports
+time, routed and unassigned stores, distance (in total and per routed stop,
+so methods that leave different stores unrouted compare fairly) and the
+longest route duration per method.
+
+Best-fit assignment only checks capacity and packages, while the savings
+solver also keeps each route within the driving hours. The default hours
+leave room for every store, so all methods route the whole instance; with
+too few fleet hours (service time alone for 5000 stores is about 550 h)
+savings reports the stores no vehicle can fit as unassigned.
+
+Usage:
+  python scripts/benchmark_multi_vehicle.py --stores 5000 --vehicles 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure project root on sys.path when running from scripts/
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(ROOT / "scripts") not in sys.path:
+    sys.path.insert(0, str(ROOT / "scripts"))
+
+from profile_routing import make_stores, make_vehicles, seed_all_from_env  # noqa: E402
+
+from routing_engine import OptimizationMethod, PerformanceMonitor  # noqa: E402
+
+METHODS = [
+    OptimizationMethod.NEAREST_NEIGHBOR,
+    OptimizationMethod.TWO_OPT,
+    OptimizationMethod.CLARKE_WRIGHT,
+]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark multi-vehicle routing")
+    parser.add_argument("--stores", type=int, default=5000, help="# of stores to generate")
+    parser.add_argument("--vehicles", type=int, default=50, help="# of vehicles")
+    parser.add_argument(
+        "--slack",
+        type=float,
+        default=1.2,
+        help="Fleet capacity as a multiple of the total demand",
+    )
+    parser.add_argument("--hours", type=float, default=14.0, help="Max driving hours per vehicle")
+    parser.add_argument("--json", action="store_true", help="Output JSON results")
+    args = parser.parse_args()
+
+    seed_all_from_env(default=0)
+
+    stores = make_stores(args.stores)
+    vehicles = make_vehicles(args.vehicles)
+    total_weight = sum(store.weight_kg for store in stores)
+    total_packages = sum(store.packages for store in stores)
+    for vehicle in vehicles:
+        vehicle.capacity_kg = total_weight * args.slack / args.vehicles
+        vehicle.max_packages = int(total_packages * args.slack / args.vehicles)
+        vehicle.max_driving_hours = args.hours
+
+    results = PerformanceMonitor().benchmark_optimization(stores, vehicles, METHODS)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Stores: {args.stores}, Vehicles: {args.vehicles}, Max hours: {args.hours}")
+    print(
+        f"{'method':<20}{'time (s)':>10}{'routes':>8}{'routed':>8}{'unassigned':>12}"
+        f"{'distance (km)':>15}{'km/stop':>9}{'longest (h)':>13}"
+    )
+    for method, result in results.items():
+        if "error" in result:
+            print(f"{method:<20} error: {result['error']}")
+            continue
+        print(
+            f"{method:<20}{result['execution_time_seconds']:>10.2f}"
+            f"{result['total_routes_generated']:>8}{result['stores_routed']:>8}"
+            f"{result['stores_unassigned']:>12}"
+            f"{result['total_distance_km']:>15.1f}{result['distance_per_stop_km']:>9.2f}"
+            f"{result['max_route_duration_hours']:>13.2f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -308,6 +308,115 @@ class TestAPIEndpoints:
         assert data["cluster_count"] == 2
         assert data["total_stores"] == 3
 
+    def test_api_pareto_front(self, client):
+        """Test API returns the whole Pareto front with objective vectors"""
+        test_data = {
+            "stores": [
+                {
+                    "name": f"Store {i}",
+                    "lat": 40.70 + (i * 7 % 5) * 0.01,
+                    "lon": -74.00 + (i * 3 % 4) * 0.01,
+                    "priority": i % 3 + 1,
+                }
+                for i in range(10)
+            ],
+            "mo_config": {
+                "objectives": "distance,priority",
+                "population_size": 20,
+                "generations": 15,
+            },
+        }
+
+        response = client.post("/api/v1/routes/optimize/pareto", json=test_data)
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["metadata"]["pareto_front_size"] == len(data["front"]) >= 1
+        assert data["metadata"]["hypervolume"] > 0
+        assert sum(entry["best_compromise"] for entry in data["front"]) == 1
+        for entry in data["front"]:
+            assert set(entry["objectives"]) == {"distance", "priority"}
+            assert len(entry["route"]) == 10
+
+        test_data["mo_config"]["objectives"] = "distance,happiness"
+        response = client.post("/api/v1/routes/optimize/pareto", json=test_data)
+        assert response.status_code == 400
+
+        test_data["mo_config"] = {"population_size": 100000, "generations": 15}
+        response = client.post("/api/v1/routes/optimize/pareto", json=test_data)
+        assert response.status_code == 400
+        assert "mo_population_size" in response.get_json()["error"]
+
+        test_data["mo_config"] = {"population_size": 20, "archive_size": 5000}
+        response = client.post("/api/v1/routes/optimize/pareto", json=test_data)
+        assert response.status_code == 400
+
+    def _post_optimizer_config(self, client, endpoint, key, config):
+        stores = [
+            {"name": f"Store {i}", "lat": 40.70 + i * 0.01, "lon": -74.00 + (i % 3) * 0.01}
+            for i in range(6)
+        ]
+        return client.post(
+            f"/api/v1/routes/optimize/{endpoint}", json={"stores": stores, key: config}
+        )
+
+    def test_api_genetic_config_is_bounded(self, client):
+        """Test genetic_config gets the ga_ bounds of /api/v1/routes"""
+
+        def post(config):
+            return self._post_optimizer_config(client, "genetic", "genetic_config", config)
+
+        assert post({"population_size": 20, "islands": 2}).status_code == 201
+        for config in ({"islands": 0}, {"islands": 500}, {"population_size": 1}):
+            response = post(config)
+            assert response.status_code == 400
+            assert "ga_" in response.get_json()["error"]
+        assert post({"generations": "many"}).status_code == 400
+        assert post([20]).status_code == 400
+
+    def test_api_annealing_config_is_bounded(self, client):
+        """Test sa_config gets the sa_ bounds of /api/v1/routes"""
+
+        def post(config):
+            return self._post_optimizer_config(client, "simulated_annealing", "sa_config", config)
+
+        assert post({"max_iterations": 500, "restarts": 2}).status_code == 201
+        for config in ({"restarts": 0}, {"restarts": 1000}, {"cooling_rate": "fast"}):
+            response = post(config)
+            assert response.status_code == 400
+            assert "sa_" in response.get_json()["error"]
+        # Within bounds, but rejected by SimulatedAnnealingConfig itself
+        response = post({"initial_temperature": 50, "final_temperature": 60})
+        assert response.status_code == 400
+        assert "temperature" in response.get_json()["error"]
+
+    def test_api_clusters_single_linkage_mode(self, client):
+        """Test API clusters endpoint chaining stores in single-linkage mode"""
+        test_data = {
+            "stores": [
+                {"name": "Store A", "latitude": 40.7000, "longitude": -74.0000},
+                {"name": "Store B", "latitude": 40.7080, "longitude": -74.0000},
+                {"name": "Store C", "latitude": 40.7160, "longitude": -74.0000},
+            ],
+            "radius_km": 1.0,
+            "mode": "single_linkage",
+        }
+
+        response = client.post("/api/v1/clusters", json=test_data)
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["mode"] == "single_linkage"
+        assert data["cluster_count"] == 1
+
+        test_data["mode"] = "seed"
+        response = client.post("/api/v1/clusters", json=test_data)
+        assert response.get_json()["cluster_count"] == 2
+
+        test_data["mode"] = "kmeans"
+        response = client.post("/api/v1/clusters", json=test_data)
+        assert response.status_code == 400
+
     def test_api_clusters_invalid_data(self, client):
         """Test API clusters with invalid data"""
         # Missing stores
@@ -1011,3 +1120,72 @@ class TestDatabaseIntegration:
             # Test with different limits
             history_10 = service.get_route_history(limit=10)
             assert isinstance(history_10, list)
+
+    def test_nearest_store_index_tracks_created_stores(self, app, client):
+        """Test stores are indexed on creation and served by the nearest endpoint"""
+        from app.models.database import db
+        from app.services.database_service import DatabaseService
+
+        db.create_all()
+        DatabaseService.bulk_create_stores(
+            [
+                {"name": "Downtown", "latitude": 40.7128, "longitude": -74.0060},
+                {"name": "Midtown", "latitude": 40.7549, "longitude": -73.9840},
+                {"name": "No Coordinates"},
+            ],
+            user_id=1,
+        )
+        DatabaseService.create_store("Brooklyn", latitude=40.6782, longitude=-73.9442, user_id=1)
+        DatabaseService.create_store("Other Tenant", latitude=40.7129, longitude=-74.0059, user_id=2)
+
+        response = client.get("/api/v1/stores/nearest?lat=40.7130&lon=-74.0055&k=5")
+        assert response.status_code == 401
+
+        with client.session_transaction() as session:
+            session["user_id"] = 1
+
+        response = client.get("/api/v1/stores/nearest?lat=40.7130&lon=-74.0055&k=5")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [s["name"] for s in data["data"]] == ["Downtown", "Midtown", "Brooklyn"]
+        assert data["data"][0]["distance_km"] < 0.1
+        assert data["metadata"]["indexed_stores"] == 3
+
+        response = client.get("/api/v1/stores/nearest?lat=40.7549&lon=-73.9840&radius_km=1")
+        assert [s["name"] for s in response.get_json()["data"]] == ["Midtown"]
+
+    def test_nearest_store_index_follows_store_updates(self, app, client):
+        """Test committed store updates move or drop stores in the index"""
+        from app.models.database import Store, db
+        from app.services.database_service import DatabaseService
+
+        db.create_all()
+        downtown = DatabaseService.create_store(
+            "Downtown", latitude=40.7128, longitude=-74.0060, user_id=1
+        )
+        midtown = DatabaseService.create_store(
+            "Midtown", latitude=40.7549, longitude=-73.9840, user_id=1
+        )
+        with client.session_transaction() as session:
+            session["user_id"] = 1
+
+        def nearest_names():
+            response = client.get("/api/v1/stores/nearest?lat=40.7130&lon=-74.0055&k=5")
+            return [s["name"] for s in response.get_json()["data"]]
+
+        assert nearest_names() == ["Downtown", "Midtown"]
+
+        downtown.is_active = False
+        db.session.commit()
+        assert nearest_names() == ["Midtown"]
+
+        Store.query.get(midtown.id).user_id = 2
+        db.session.rollback()
+        assert nearest_names() == ["Midtown"]
+
+        Store.query.get(midtown.id).user_id = 2
+        db.session.commit()
+        assert nearest_names() == []
+
+        response = client.get("/api/v1/stores/nearest?lat=95&lon=0")
+        assert response.status_code == 400
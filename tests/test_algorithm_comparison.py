@@ -0,0 +1,167 @@
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.optimization.genetic_algorithm import GeneticAlgorithm
+from app.optimization.multi_objective import MultiObjectiveOptimizer
+from app.optimization.shared_matrix import shared_matrix_executor
+from app.optimization.simulated_annealing import SimulatedAnnealingOptimizer
+from app.routes import dashboard as dashboard_routes
+from app.services import algorithm_comparison
+from app.services.algorithm_comparison import (
+    AlgorithmComparison,
+    ComparisonConfig,
+    create_algorithm_comparison,
+)
+
+
+def make_stores(count, seed=1):
+    rng = random.Random(seed)
+    return [
+        {"name": f"S{i}", "lat": 40.7 + rng.random() * 0.1, "lon": -74 + rng.random() * 0.1}
+        for i in range(count)
+    ]
+
+
+def test_algorithms_share_one_distance_matrix(monkeypatch):
+    def rebuild(self, stores):
+        raise AssertionError("distance matrix rebuilt")
+
+    for optimizer in (GeneticAlgorithm, SimulatedAnnealingOptimizer, MultiObjectiveOptimizer):
+        monkeypatch.setattr(optimizer, "_create_distance_matrix", rebuild)
+    streamed = []
+
+    comparison = AlgorithmComparison(ComparisonConfig(workers=1))
+    results = comparison.compare(make_stores(25), on_result=streamed.append)
+
+    keys = ["default", "genetic", "simulated_annealing", "multi_objective"]
+    assert [r["algorithm_key"] for r in results] == keys
+    assert all(r["success"] for r in results), results
+    assert [r["algorithm_key"] for r in streamed] == keys
+    assert all(r["route_length"] == 25 and r["total_distance"] > 0 for r in results)
+    # One distance per result, and the optimizers' own scores agree with it
+    for result in results:
+        assert result["final_distance"] == result["total_distance"]
+        if "final_distance" in result["metrics"]:
+            assert result["metrics"]["final_distance"] == pytest.approx(
+                result["total_distance"], abs=1e-3
+            )
+
+
+def test_process_pool_enforces_one_time_budget(monkeypatch):
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+    stores = make_stores(400)
+    streamed = []
+    comparison = create_algorithm_comparison(
+        ["default", "multi_objective"], time_budget_seconds=1.0
+    )
+
+    start = time.perf_counter()
+    results = comparison.compare(stores, on_result=streamed.append)
+    elapsed = time.perf_counter() - start
+
+    # The optimizer stops itself and returns its best route in time
+    assert elapsed < 2.0
+    default, multi_objective = results
+    assert default["success"] and streamed[0] is default
+    assert multi_objective["success"]
+    assert multi_objective["metrics"]["stopped_by_deadline"]
+
+    # Too little time to finish at all: the worker is stopped
+    comparison = create_algorithm_comparison(
+        ["default", "multi_objective"], time_budget_seconds=0.05
+    )
+    multi_objective = comparison.compare(stores)[1]
+    assert multi_objective["timed_out"] and not multi_objective["success"]
+
+    with pytest.raises(ValueError):
+        create_algorithm_comparison(["dijkstra"])
+
+
+@pytest.mark.parametrize("budget", [0, -1, float("nan"), float("inf"), 1e9])
+def test_time_budget_must_be_finite_and_bounded(budget):
+    with pytest.raises(ValueError):
+        create_algorithm_comparison(["default"], time_budget_seconds=budget)
+
+
+def test_repeated_algorithms_run_once_on_at_most_one_process_per_core(monkeypatch):
+    pools = []
+
+    def executor(matrix, workers):
+        pools.append(workers)
+        return shared_matrix_executor(matrix, workers)
+
+    monkeypatch.setattr(algorithm_comparison, "shared_matrix_executor", executor)
+    monkeypatch.setattr("os.cpu_count", lambda: 2)
+    comparison = create_algorithm_comparison(["default", "genetic"] * 250, time_budget_seconds=5)
+
+    results = comparison.compare(make_stores(10))
+
+    assert comparison.config.algorithms == ["default", "genetic"]
+    assert [r["algorithm_key"] for r in results] == ["default", "genetic"]
+    assert pools == [2]
+
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    create_algorithm_comparison(["default", "genetic"]).compare(make_stores(10))
+    assert pools[-1] == 1
+
+
+def test_compare_endpoint_streams_results(mock_flask_app, monkeypatch):
+    emitted, rooms = [], []
+
+    def emitter(comparison_id, room):
+        rooms.append(room)
+        return emitted.append if room else None
+
+    monkeypatch.setattr(dashboard_routes, "_result_emitter", emitter)
+    mock_flask_app.register_blueprint(dashboard_routes.dashboard_bp)
+    mock_flask_app.websocket_manager = SimpleNamespace(
+        active_connections={"sid-1": {"user_id": 7}, "sid-other": {"user_id": 8}}
+    )
+    client = mock_flask_app.test_client()
+    with client.session_transaction() as http_session:
+        http_session["user_id"] = 7
+
+    response = client.post(
+        "/dashboard/api/algorithms/compare",
+        json={
+            "stores": make_stores(12),
+            "algorithms": ["default", "genetic"],
+            "socket_id": "sid-1",
+        },
+    )
+
+    data = response.get_json()
+    assert response.status_code == 200 and data["comparison_id"]
+    assert [r["algorithm_key"] for r in data["results"]] == ["default", "genetic"]
+    assert sorted(r["algorithm_key"] for r in emitted) == ["default", "genetic"]
+    assert rooms == ["sid-1"]
+
+    # Another user's session falls back to the requester's own room
+    client.post(
+        "/dashboard/api/algorithms/compare",
+        json={"stores": make_stores(3), "algorithms": ["default"], "socket_id": "sid-other"},
+    )
+    assert rooms[-1] == "user_7"
+
+    # Anonymous requests are never streamed, whatever socket they name
+    with client.session_transaction() as http_session:
+        http_session.clear()
+    response = client.post(
+        "/dashboard/api/algorithms/compare",
+        json={"stores": make_stores(3), "algorithms": ["default"], "socket_id": "sid-1"},
+    )
+    assert response.status_code == 200 and rooms[-1] is None and len(emitted) == 3
+    assert dashboard_routes._result_emitter("c", None) is None
+    with mock_flask_app.app_context():
+        assert dashboard_routes._result_room(None, 7) == "user_7"
+        assert dashboard_routes._result_room("sid-2", 7) == "user_7"
+
+    for budget in (-1, "nan", "inf"):
+        response = client.post(
+            "/dashboard/api/algorithms/compare",
+            json={"stores": make_stores(3), "time_budget_seconds": budget},
+        )
+        assert response.status_code == 400
@@ -0,0 +1,88 @@
+import pytest
+
+from app.services.analytics_service import AnalyticsService
+from app.services.analytics_store import TimeBucketStore
+
+
+def test_store_memory_is_bounded_and_rolls_minutes_into_hours():
+    now = [0.0]
+    store = TimeBucketStore(
+        minute_retention=60, hour_retention=24, raw_events=10, clock=lambda: now[0]
+    )
+    for minute in range(48 * 60):
+        now[0] = minute * 60.0
+        store.record({"latency": 1.0}, {"kind": "a"}, event={"minute": minute})
+
+    assert store.bucket_count() <= 60 + 25
+    assert len(store.events) == 10 and store.events[-1]["minute"] == 48 * 60 - 1
+    assert store.query(3600).count == 61  # Cutoff minute inclusive
+    day = store.query(24 * 3600)
+    assert 24 * 60 <= day.count <= 25 * 60  # Far end at hourly resolution
+    assert day.tag("kind")["a"] == day.count
+    assert day.value("latency").sum == day.count
+
+
+def test_api_analytics_match_raw_statistics():
+    now = [1_000_000.0]
+    service = AnalyticsService(clock=lambda: now[0])
+    for i in range(200):
+        now[0] += 30
+        status = 500 if i % 10 == 0 else 200
+        agent = "Mozilla iPhone" if i % 4 == 0 else "curl"
+        service.track_api_usage(f"/e{i % 3}", "GET", 0.1 + i / 1000, status, agent)
+
+    report = service.get_api_analytics("24h")
+
+    assert report["total_requests"] == 200
+    assert report["mobile_requests"] == 50 and report["mobile_percentage"] == 25.0
+    assert report["error_rate"] == 10.0
+    assert report["status_codes"] == {200: 180, 500: 20}
+    assert report["endpoint_usage"] == {"/e0": 67, "/e1": 67, "/e2": 66}
+    performance = report["performance"]
+    assert performance["avg_response_time"] == pytest.approx(0.1995, abs=1e-3)
+    assert performance["median_response_time"] == pytest.approx(0.1995, rel=0.02)
+    assert performance["p95_response_time"] == pytest.approx(0.289, rel=0.02)
+    assert performance["max_response_time"] == pytest.approx(0.299)
+
+    assert service.get_api_analytics("1h")["total_requests"] == 122  # Whole minutes
+    now[0] += 2 * 24 * 3600
+    assert service.get_api_analytics("24h") == {"timeframe": "24h", "total_requests": 0}
+    assert service.get_api_analytics("7d")["total_requests"] == 200
+
+
+def test_route_and_driver_analytics_from_buckets():
+    now = [1_000_000.0]
+    service = AnalyticsService(clock=lambda: now[0])
+    for i, (algorithm, success) in enumerate(
+        [("genetic", True), ("genetic", False), ("two_opt", True), ("two_opt", True)]
+    ):
+        service.track_route_optimization(
+            {
+                "algorithm": algorithm,
+                "optimization_time": 1.0 + i,
+                "total_distance": 10.0,
+                "improvement_percentage": 0 if i == 0 else 20.0,
+                "success": success,
+                "traffic_aware": i == 3,
+            }
+        )
+    for driver, rating in (("d1", 5), ("d1", 4), ("d2", 3), ("d3", None)):
+        service.track_driver_performance(driver, {"customer_rating": rating})
+
+    routes = service.get_route_analytics("1h")
+    assert routes["total_routes"] == 4 and routes["success_rate"] == 75.0
+    assert routes["algorithm_usage"] == {"genetic": 2, "two_opt": 2}
+    assert routes["traffic_aware_routes"] == 1
+    assert routes["avg_optimization_time"] == 2.5
+    assert routes["avg_improvement"] == 20.0  # Zero improvements are unset
+    assert routes["performance_metrics"]["max_optimization_time"] == 4.0
+
+    drivers = service.get_driver_analytics("1h")
+    assert drivers["total_drivers"] == 3 and drivers["total_location_updates"] == 4
+    assert drivers["avg_customer_rating"] == 4.0
+    assert drivers["top_performers"] == [
+        {"driver_id": "d1", "avg_rating": 4.5, "total_updates": 2},
+        {"driver_id": "d2", "avg_rating": 3.0, "total_updates": 1},
+        {"driver_id": "d3", "avg_rating": 0, "total_updates": 1},
+    ]
+    assert service.get_system_health()["performance"]["avg_optimization_time"] == 2.5
@@ -0,0 +1,167 @@
+import random
+import time
+
+import pytest
+
+from app import create_app
+from app.optimization.anytime import Deadline
+from app.optimization.genetic_algorithm import GeneticAlgorithm, GeneticConfig
+from app.optimization.multi_objective import (
+    MultiObjectiveConfig,
+    MultiObjectiveOptimizer,
+)
+from app.optimization.simulated_annealing import (
+    SimulatedAnnealingConfig,
+    SimulatedAnnealingOptimizer,
+)
+from app.services.routing_service_unified import UnifiedRoutingService
+
+
+def _make_stores(n: int):
+    # Distinct random points, so searches do not converge within the budget
+    rng = random.Random(3)
+    return [
+        {"id": i, "lat": 40.0 + rng.random() * 0.5, "lon": -74.0 + rng.random() * 0.5}
+        for i in range(n)
+    ]
+
+
+def _long_runs(budget):
+    return {
+        "genetic": GeneticAlgorithm(GeneticConfig(generations=100000, time_budget_seconds=budget)),
+        "genetic_islands": GeneticAlgorithm(
+            GeneticConfig(
+                generations=100000,
+                islands=2,
+                migration_interval=5,
+                time_budget_seconds=budget,
+            )
+        ),
+        "simulated_annealing": SimulatedAnnealingOptimizer(
+            SimulatedAnnealingConfig(
+                final_temperature=1e-6,
+                cooling_rate=0.9999,
+                max_iterations=10**8,
+                time_budget_seconds=budget,
+            )
+        ),
+        "multi_objective": MultiObjectiveOptimizer(
+            MultiObjectiveConfig(generations=100000, time_budget_seconds=budget)
+        ),
+    }
+
+
+@pytest.mark.parametrize(
+    "name", ["genetic", "genetic_islands", "simulated_annealing", "multi_objective"]
+)
+def test_optimizers_stop_at_deadline_with_best_route(name):
+    stores = _make_stores(400)
+    optimizer = _long_runs(0.3)[name]
+    progress = []
+
+    start = time.perf_counter()
+    route, metrics = optimizer.optimize(stores, {}, progress_callback=progress.append)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert metrics["stopped_by_deadline"]
+    assert sorted(store["id"] for store in route) == list(range(400))
+    assert progress, "no progress reported"
+    distances = [report["best_distance"] for report in progress]
+    assert distances == sorted(distances, reverse=True)
+    assert sorted(progress[-1]["route"]) == list(range(400))
+
+
+def test_progress_callback_errors_do_not_stop_the_search():
+    def broken(progress):
+        raise RuntimeError("subscriber gone")
+
+    ga = GeneticAlgorithm(GeneticConfig(generations=20))
+    route, metrics = ga.optimize(_make_stores(10), {}, progress_callback=broken)
+
+    assert len(route) == 10 and not metrics["stopped_by_deadline"]
+    with pytest.raises(ValueError):
+        Deadline(0)
+    with pytest.raises(ValueError):
+        SimulatedAnnealingConfig(time_budget_seconds=-1)
+
+
+def test_generate_route_honours_deadline_and_streams_stops():
+    service = UnifiedRoutingService()
+    progress = []
+
+    start = time.perf_counter()
+    route = service.generate_route_from_stores(
+        _make_stores(400),
+        save_to_db=False,
+        algorithm="genetic",
+        algorithm_params={"generations": 100000},
+        deadline_ms=300,
+        progress_callback=progress.append,
+    )
+
+    assert time.perf_counter() - start < 1.5
+    assert len(route) == 400
+    assert service.get_metrics().algorithm_metrics["stopped_by_deadline"]
+    assert progress and sorted(progress[0]["stops"]) == list(range(400))
+    assert progress[0]["status"] == "improving" and 0 <= progress[0]["percentage"] <= 100
+    # Throttled reports may miss the last improvement; the final one never does
+    assert progress[-1]["status"] == "completed"
+    assert progress[-1]["stops"] == [store["id"] for store in route]
+    assert progress[-1]["best_distance"] == service.get_metrics().total_distance
+
+
+def test_multi_objective_route_honours_deadline():
+    service = UnifiedRoutingService()
+    progress = []
+
+    start = time.perf_counter()
+    route = service.generate_route_from_stores(
+        _make_stores(400),
+        save_to_db=False,
+        algorithm="multi_objective",
+        algorithm_params={"mo_generations": 100000},
+        deadline_ms=300,
+        progress_callback=progress.append,
+    )
+
+    assert time.perf_counter() - start < 1.5
+    assert len(route) == 400
+    assert service.get_metrics().algorithm_metrics["stopped_by_deadline"]
+    assert progress[-1]["status"] == "completed"
+
+
+def test_every_algorithm_accepts_a_deadline():
+    client = create_app("testing").test_client()
+    stores = [{"name": f"S{i}", "lat": 40.0 + i / 100, "lon": -74.0} for i in range(3)]
+
+    # Searches stop at the budget; constructive algorithms ignore it
+    for algorithm in ("default", "multi_objective", "vrptw"):
+        response = client.post(
+            "/api/v1/routes",
+            json={"stores": stores, "options": {"algorithm": algorithm, "deadline_ms": 500}},
+        )
+        assert response.status_code < 300, algorithm
+
+
+@pytest.mark.parametrize(
+    "endpoint, key, config",
+    [
+        ("genetic", "genetic_config", {"generations": 2000}),
+        ("simulated_annealing", "sa_config", {"max_iterations": 50000, "restarts": 8}),
+    ],
+)
+def test_optimizer_endpoints_forward_the_deadline(endpoint, key, config):
+    client = create_app("testing").test_client()
+    stores = [{"name": f"S{s['id']}", **s} for s in _make_stores(300)]
+
+    start = time.perf_counter()
+    response = client.post(
+        f"/api/v1/routes/optimize/{endpoint}",
+        json={"stores": stores, key: {**config, "deadline_ms": 300}},
+    )
+
+    assert response.status_code == 201
+    assert time.perf_counter() - start < 3.0
+    metrics = response.get_json()[f"{endpoint}_metrics"]
+    assert metrics["stopped_by_deadline"]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from app.services.distance_service import create_proximity_clusterer
+from app.utils.clustering import GridClusterer, cluster_by_proximity, is_within_radius
+
+
+def _pairwise_seed_clusters(stores, radius_km):
+    """Reference: the original pairwise greedy scan"""
+    clusters = []
+    unprocessed = list(stores)
+    while unprocessed:
+        seed = unprocessed.pop(0)
+        cluster = [seed]
+        i = 0
+        while i < len(unprocessed):
+            if is_within_radius(seed, unprocessed[i], radius_km):
+                cluster.append(unprocessed.pop(i))
+            else:
+                i += 1
+        clusters.append(cluster)
+    return clusters
+
+
+def _random_stores(n, seed, lat_range=(40.5, 40.9), lon_range=(-74.2, -73.8)):
+    rng = np.random.default_rng(seed)
+    return [
+        {"name": f"S{i}", "lat": float(lat), "lon": float(lon)}
+        for i, (lat, lon) in enumerate(zip(rng.uniform(*lat_range, n), rng.uniform(*lon_range, n)))
+    ]
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 2.0, 8.0])
+def test_seed_mode_matches_pairwise_scan(radius_km):
+    stores = _random_stores(400, seed=1)
+
+    assert cluster_by_proximity(stores, radius_km) == _pairwise_seed_clusters(stores, radius_km)
+
+
+def test_single_linkage_chains_stores():
+    # Each hop is about 0.9 km, the ends are 1.8 km apart
+    stores = [
+        {"name": "A", "lat": 40.700, "lon": -74.0},
+        {"name": "B", "lat": 40.708, "lon": -74.0},
+        {"name": "C", "lat": 40.716, "lon": -74.0},
+        {"name": "D", "lat": 41.000, "lon": -74.0},
+    ]
+
+    seed = cluster_by_proximity(stores, 1.0, mode="seed")
+    linked = cluster_by_proximity(stores, 1.0, mode="single_linkage")
+
+    assert [[s["name"] for s in c] for c in seed] == [["A", "B"], ["C"], ["D"]]
+    assert [[s["name"] for s in c] for c in linked] == [["A", "B", "C"], ["D"]]
+
+
+def test_single_linkage_matches_connected_components():
+    stores = _random_stores(300, seed=2)
+    clusters = create_proximity_clusterer().cluster_by_radius(stores, 2.0)
+
+    # Every store within radius of a cluster member belongs to that cluster
+    membership = {id(s): k for k, cluster in enumerate(clusters) for s in cluster}
+    for a in stores:
+        for b in stores:
+            if is_within_radius(a, b, 2.0):
+                assert membership[id(a)] == membership[id(b)]
+
+
+def test_clusters_across_antimeridian_and_southern_hemisphere():
+    stores = [
+        {"name": "W", "lat": -16.5, "lon": 179.999},
+        {"name": "E", "lat": -16.5, "lon": -179.999},
+    ]
+
+    assert len(GridClusterer(1.0).cluster(stores)) == 1
+
+
+def test_missing_coordinates_are_singletons():
+    stores = _random_stores(5, seed=3)
+    stores.insert(2, {"name": "nowhere"})
+
+    clusters = GridClusterer(100.0, mode="single_linkage").cluster(stores)
+    assert [len(c) for c in clusters] == [5, 1]
+
+
+def test_invalid_configuration_rejected():
+    with pytest.raises(ValueError):
+        GridClusterer(0)
+    with pytest.raises(ValueError):
+        GridClusterer(1.0, mode="kmeans")
@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+
+from app.services.distance_cache import DistanceMatrixCache
+from app.services.distance_service import DistanceMatrixEngine
+
+
+def _coords(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(40.0, 41.0, n), rng.uniform(-74.0, -73.0, n)]).round(6)
+
+
+def _engine(cache, method="haversine"):
+    return DistanceMatrixEngine(method, cache=cache)
+
+
+def test_reordered_and_subset_requests_hit_cache():
+    coords = _coords(120)
+    expected = DistanceMatrixEngine("haversine").build(coords)
+    cache = DistanceMatrixCache()
+    engine = _engine(cache)
+
+    assert np.allclose(engine.build(coords), expected)
+
+    order = np.random.default_rng(1).permutation(120)
+    assert np.allclose(engine.build(coords[order]), expected[np.ix_(order, order)])
+
+    subset = order[:40]
+    assert np.allclose(engine.build(coords[subset]), expected[np.ix_(subset, subset)])
+
+    stats = cache.stats.to_dict()
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["submatrix_hits"] == 1
+
+
+def test_results_are_private_copies():
+    cache = DistanceMatrixCache()
+    engine = _engine(cache)
+    coords = _coords(30)
+
+    first = engine.build(coords)
+    first[:] = 0.0
+    assert engine.build(coords)[0, 1] > 0.0
+
+
+def test_method_is_part_of_key():
+    cache = DistanceMatrixCache()
+    coords = _coords(30)
+
+    haversine = _engine(cache, "haversine").build(coords)
+    manhattan = _engine(cache, "manhattan").build(coords)
+    assert not np.allclose(haversine, manhattan)
+    assert cache.stats.misses == 2
+
+
+def test_missing_coordinates_and_duplicates():
+    coords = _coords(40)
+    coords[3] = coords[7]
+    coords[10] = np.nan
+    matrix = _engine(DistanceMatrixCache()).build(coords)
+
+    assert matrix[3, 7] == 0.0
+    assert np.isinf(matrix[10, :10]).all()
+    assert matrix[10, 10] == 0.0
+
+
+def test_lru_is_bounded_by_bytes():
+    matrix_bytes = 50 * 50 * 8 + 50 * 8
+    cache = DistanceMatrixCache(max_bytes=2 * matrix_bytes)
+    engine = _engine(cache)
+
+    for seed in range(3):
+        engine.build(_coords(50, seed))
+
+    assert cache.memory_bytes <= 2 * matrix_bytes
+    assert cache.stats.evictions == 1
+
+
+def test_disk_tier_is_shared_across_caches(tmp_path):
+    coords = _coords(80)
+    _engine(DistanceMatrixCache(cache_dir=str(tmp_path))).build(coords)
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    fresh = DistanceMatrixCache(cache_dir=str(tmp_path))
+    expected = DistanceMatrixEngine("haversine").build(coords)
+
+    assert np.allclose(_engine(fresh).build(coords), expected)
+    assert np.allclose(_engine(fresh).build(coords[:20]), expected[:20, :20])
+    assert fresh.stats.misses == 0
+    assert fresh.stats.disk_hits == 1
+
+
+def test_small_inputs_bypass_cache():
+    cache = DistanceMatrixCache(min_size=16)
+    _engine(cache).build(_coords(5))
+
+    assert cache.stats.misses == 0
+    assert cache.memory_bytes == 0
+
+
+def test_disk_tier_evicts_least_recently_used_files(tmp_path):
+    matrix_bytes = 50 * 50 * 8 + 50 * 8
+    cache = DistanceMatrixCache(cache_dir=str(tmp_path), max_disk_bytes=int(2.5 * matrix_bytes))
+    engine = _engine(cache)
+    first, second, third = (_coords(50, seed) for seed in range(3))
+
+    engine.build(first)
+    engine.build(second)
+    # Reading the first set from disk makes the second one the oldest
+    cache.clear()
+    for path in tmp_path.glob("*.npy"):
+        os.utime(path, (1, 1))
+    engine.build(first)
+    engine.build(third)
+
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.npy")) <= 2.5 * matrix_bytes
+    assert len(list(tmp_path.glob("*.npy"))) == 4
+    assert cache.stats.disk_evictions == 1
+
+    fresh = DistanceMatrixCache(cache_dir=str(tmp_path))
+    _engine(fresh).build(first)
+    _engine(fresh).build(second)
+    assert fresh.stats.disk_hits == 1
+    assert fresh.stats.misses == 1
@@ -0,0 +1,106 @@
+import math
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+from app.services.distance_service import (
+    DistanceMatrixEngine,
+    build_distance_matrix,
+    create_distance_calculator,
+    fast_geodesic_distances,
+    fast_geodesic_km,
+)
+
+
+def _make_stores():
+    return [
+        {"name": "A", "lat": 40.7128, "lon": -74.0060},
+        {"name": "B", "latitude": 40.7589, "longitude": -73.9851},
+        {"name": "C", "lat": 40.7505, "lng": -73.9934},
+        {"name": "D", "location": {"lat": 40.7282, "lon": -73.7949}},
+    ]
+
+
+def test_haversine_matrix_matches_scalar():
+    stores = _make_stores()
+    matrix = build_distance_matrix(stores, "haversine")
+
+    assert isinstance(matrix, np.ndarray)
+    assert matrix.shape == (4, 4)
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert np.allclose(matrix, matrix.T)
+    assert np.all(np.diag(matrix) == 0.0)
+
+    lat1, lon1, lat2, lon2 = map(math.radians, [40.7128, -74.0060, 40.7282, -73.7949])
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    expected = 2 * 6371.0 * math.asin(math.sqrt(a))
+    assert matrix[0, 3] == pytest.approx(expected, rel=1e-12)
+
+
+def test_equirectangular_close_to_haversine_for_short_hops():
+    stores = _make_stores()
+    hav = build_distance_matrix(stores, "haversine")
+    eq = build_distance_matrix(stores, "equirectangular")
+    assert np.allclose(hav, eq, rtol=1e-3)
+
+
+def test_missing_coordinates_are_infinite():
+    stores = _make_stores() + [{"name": "no coords"}]
+    matrix = build_distance_matrix(stores)
+
+    assert np.isinf(matrix[4, :4]).all()
+    assert np.isinf(matrix[:4, 4]).all()
+    assert matrix[4, 4] == 0.0
+
+
+def test_route_calculator_returns_ndarray():
+    calculator = create_distance_calculator("haversine")
+    matrix = calculator.calculate_distance_matrix(_make_stores())
+
+    assert isinstance(matrix, np.ndarray)
+    assert np.allclose(matrix, build_distance_matrix(_make_stores(), "haversine"))
+
+
+def test_unknown_method_rejected():
+    with pytest.raises(ValueError):
+        DistanceMatrixEngine("teleport")
+
+
+def test_fast_geodesic_matches_geopy_within_a_metre():
+    rng = np.random.default_rng(7)
+    lat1, lat2 = rng.uniform(-85, 85, (2, 500))
+    lon1, lon2 = rng.uniform(-180, 180, (2, 500))
+    # Store-scale hops as well as continental ones
+    lat2[:250] = lat1[:250] + rng.uniform(-0.2, 0.2, 250)
+    lon2[:250] = lon1[:250] + rng.uniform(-0.2, 0.2, 250)
+
+    expected = np.array([geodesic((a, b), (c, d)).km for a, b, c, d in zip(lat1, lon1, lat2, lon2)])
+    batch = fast_geodesic_distances(lat1, lon1, lat2, lon2)
+    assert np.max(np.abs(batch - expected)) < 1e-3
+
+    for i in range(0, 500, 50):
+        assert fast_geodesic_km(lat1[i], lon1[i], lat2[i], lon2[i]) == pytest.approx(
+            expected[i], abs=1e-3
+        )
+
+
+def test_fast_geodesic_matrix_and_edge_cases():
+    stores = _make_stores()
+    fast = build_distance_matrix(stores, "fast_geodesic")
+    exact = build_distance_matrix(stores, "geodesic")
+    assert np.allclose(fast, exact, atol=1e-3)
+
+    assert fast_geodesic_km(10.0, 20.0, 10.0, 20.0) == 0.0
+    # Nearly antipodal pairs fall back to geopy instead of failing
+    assert fast_geodesic_km(0.0, 0.0, 0.5, 179.7) == pytest.approx(
+        geodesic((0.0, 0.0), (0.5, 179.7)).km, abs=1e-3
+    )
+
+
+def test_default_calculator_uses_fast_geodesic():
+    calculator = create_distance_calculator()
+    assert calculator.distance_method == "fast_geodesic"
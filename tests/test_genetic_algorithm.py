@@ -0,0 +1,109 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.optimization.genetic_algorithm import GeneticAlgorithm, GeneticConfig
+
+
+def _make_stores(n: int):
+    return [
+        {"id": i, "lat": 40.0 + (i * 37 % 11) * 0.01, "lon": -74.0 + (i * 17 % 13) * 0.01}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", [2, 3, 8, 25])
+def test_order_crossover_and_mutation_keep_permutations(n):
+    ga = GeneticAlgorithm(GeneticConfig(mutation_rate=0.5))
+    rng = np.random.default_rng(n)
+    parent1 = np.array([rng.permutation(n) for _ in range(64)], dtype=np.int32)
+    parent2 = np.array([rng.permutation(n) for _ in range(64)], dtype=np.int32)
+
+    children = ga._order_crossover(parent1, parent2)
+    ga._mutate(children)
+
+    assert children.dtype == np.int32
+    assert (np.sort(children, axis=1) == np.arange(n)).all()
+
+
+def test_optimize_contract_and_matrix_fitness(monkeypatch):
+    monkeypatch.setenv("RFR_SEED", "7")
+    stores = _make_stores(20)
+    ga = GeneticAlgorithm(GeneticConfig(population_size=60, generations=80))
+
+    route, metrics = ga.optimize(stores, {})
+
+    assert sorted(s["id"] for s in route) == list(range(20))
+    assert metrics["algorithm"] == "genetic"
+    assert metrics["final_distance"] <= metrics["initial_distance"]
+    assert ga.population.shape == (60, 20)
+    assert ga.population.dtype == np.int32
+
+    order = np.array([s["id"] for s in route])
+    expected = ga.distance_matrix[order, np.roll(order, -1)].sum()
+    assert metrics["final_distance"] == pytest.approx(expected)
+
+
+def test_island_model_is_deterministic_in_pool_and_serially(monkeypatch):
+    monkeypatch.setenv("RFR_SEED", "11")
+    stores = _make_stores(30)
+    config = GeneticConfig(population_size=40, generations=60, islands=3, migration_interval=10)
+
+    pooled_route, pooled = GeneticAlgorithm(config).optimize(stores, {})
+    repeat_route, _ = GeneticAlgorithm(config).optimize(stores, {})
+
+    # A single available core runs every island in this process
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    serial_route, serial = GeneticAlgorithm(config).optimize(stores, {})
+
+    ids = [[s["id"] for s in route] for route in (pooled_route, repeat_route, serial_route)]
+    assert ids[0] == ids[1] == ids[2]
+    assert pooled["final_distance"] == serial["final_distance"]
+    assert pooled["islands"] == 3
+    assert pooled["migrations"] == 5
+    assert sorted(ids[0]) == list(range(30))
+
+
+def _crash_worker(*args):
+    os._exit(1)
+
+
+def test_island_model_falls_back_to_serial_when_pool_breaks(monkeypatch):
+    monkeypatch.setenv("RFR_SEED", "11")
+    stores = _make_stores(30)
+    config = GeneticConfig(population_size=40, generations=60, islands=3, migration_interval=10)
+    expected_route, expected = GeneticAlgorithm(config).optimize(stores, {})
+
+    monkeypatch.setattr("os.cpu_count", lambda: 3)
+    monkeypatch.setattr(
+        "app.optimization.genetic_algorithm._evolve_island_in_worker", _crash_worker
+    )
+    route, metrics = GeneticAlgorithm(config).optimize(stores, {})
+
+    assert [s["id"] for s in route] == [s["id"] for s in expected_route]
+    assert metrics["final_distance"] == expected["final_distance"]
+
+
+def test_migration_replaces_worst_routes_with_previous_island_elites():
+    ga = GeneticAlgorithm(GeneticConfig(population_size=4, migration_size=1))
+    islands = []
+    for offset in (0.0, 10.0):
+        population = np.arange(16, dtype=np.int32).reshape(4, 4) + int(offset)
+        distances = np.array([1.0, 2.0, 3.0, 4.0]) + offset
+        islands.append((population, distances, None))
+
+    ga._migrate(islands)
+
+    assert islands[1][1].tolist() == [1.0, 11.0, 12.0, 13.0]
+    assert islands[0][1].tolist() == [1.0, 2.0, 3.0, 11.0]
+    assert islands[1][0][0].tolist() == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [{"population_size": 1}, {"islands": 0}, {"mutation_rate": 1.5}, {"migration_interval": 0}],
+)
+def test_config_rejects_invalid_settings(settings):
+    with pytest.raises(ValueError):
+        GeneticConfig(**settings)
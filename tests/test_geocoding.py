@@ -0,0 +1,337 @@
+import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app.services.geocoding_service import (
+    GeocodingConfig,
+    JSONFileCache,
+    ModernGeocodingService,
+    NominatimGeocoder,
+    SQLiteCache,
+    TokenBucket,
+    create_geocoding_service,
+)
+from app.services.routing_service_unified import UnifiedRoutingService
+
+
+class _StubNominatim(BaseHTTPRequestHandler):
+    """Answers every query with coordinates derived from its length"""
+
+    queries = []
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)["q"][0]
+        cls = type(self)
+        with cls.lock:
+            cls.queries.append(query)
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        body = [] if "nowhere" in query else [{"lat": "40.0", "lon": str(len(query))}]
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubNominatim.queries = []
+    _StubNominatim.peak = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubNominatim)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/search"
+    server.shutdown()
+    server.server_close()
+
+
+def _service(tmp_path, base_url, delay_seconds=0.0, **config):
+    config = GeocodingConfig(
+        cache_file=str(tmp_path / "cache.json"),
+        base_url=base_url,
+        delay_seconds=delay_seconds,
+        max_retries=0,
+        **config,
+    )
+    return ModernGeocodingService(
+        JSONFileCache(config.cache_file), NominatimGeocoder(config), config
+    )
+
+
+def test_token_bucket_paces_after_burst():
+    now = [0.0]
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+    assert [bucket.acquire() for _ in range(4)] == [0.0, 0.0, 0.5, 0.5]
+
+    now[0] += 10.0  # Refill is capped at capacity
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_batch_dedupes_and_serves_cache_hits(tmp_path, stub_server):
+    service = _service(tmp_path, stub_server, max_concurrency=4)
+    addresses = ["1 Main St", " 1 MAIN st", "22 Oak Ave", "nowhere", "", "3 Elm Rd"]
+
+    result = service.get_coordinates_many(addresses)
+
+    assert sorted(_StubNominatim.queries) == ["1 Main St", "22 Oak Ave", "3 Elm Rd", "nowhere"]
+    assert result["1 Main St"] == result[" 1 MAIN st"] == (40.0, 9.0)
+    assert result["nowhere"] is None
+    assert "" not in result
+    assert _StubNominatim.peak > 1
+
+    # Found addresses are cached; only the failed lookup is retried
+    _StubNominatim.queries = []
+    again = service.get_coordinates_many(addresses)
+    assert _StubNominatim.queries == ["nowhere"]
+    assert again == result
+    assert service.get_cache_size() == 3
+
+
+def test_batch_respects_provider_rate(tmp_path, stub_server):
+    service = _service(tmp_path, stub_server, delay_seconds=0.05, max_concurrency=4)
+
+    start = time.monotonic()
+    service.get_coordinates_many([f"{i} Pine St" for i in range(6)])
+
+    # One call is free, the other five wait for a token each
+    assert time.monotonic() - start >= 5 * 0.05
+    assert len(_StubNominatim.queries) == 6
+
+
+def test_ensure_coordinates_geocodes_in_one_batch(tmp_path, stub_server):
+    geocoder = _service(tmp_path, stub_server)
+    calls = []
+    batch = geocoder.get_coordinates_many
+    geocoder.get_coordinates_many = lambda addresses: calls.append(addresses) or batch(addresses)
+    service = UnifiedRoutingService(geocoding_service=geocoder)
+
+    stores = [
+        {"name": "A", "address": "1 Main St"},
+        {"name": "B", "lat": 41.0, "lon": -73.0},
+        {"name": "C", "address": "1 Main St"},
+        {"name": "nowhere"},
+    ]
+    geocoded = service.ensure_coordinates(stores)
+
+    assert len(calls) == 1
+    assert [s["name"] for s in geocoded] == ["A", "B", "C"]
+    assert geocoded[2]["lat"] == 40.0
+
+
+def _write_keys(db_path, worker):
+    cache = SQLiteCache(db_path)
+    for start in range(0, 200, 20):
+        cache.set_many(
+            {f"{worker}-{i} Main St": (float(worker), float(i)) for i in range(start, start + 20)}
+        )
+
+
+def test_sqlite_cache_batches_and_normalizes_keys(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "geo.sqlite3"))
+    entries = {f"{i} Main St": (40.0, float(i)) for i in range(1200)}
+    cache.set_many(entries)
+    cache.set(" 5  MAIN st ", (1.0, 2.0))
+
+    found = cache.get_many(list(entries) + ["unknown"])
+    assert len(found) == 1200 and "unknown" not in found
+    assert found["5 Main St"] == (1.0, 2.0)
+    assert cache.size() == 1200
+
+    cache.clear()
+    assert cache.size() == 0 and cache.get("1 Main St") is None
+
+
+def test_sqlite_cache_migrates_json_once(tmp_path):
+    legacy = tmp_path / "geocoding_cache.json"
+    legacy.write_text(
+        json.dumps(
+            {
+                "1 main st": [40.0, -74.0],
+                "2_oak_ave": {"lat": 41.0, "lon": -73.0},
+                "broken": "n/a",
+            }
+        )
+    )
+    db_path = str(tmp_path / "geo.sqlite3")
+
+    cache = SQLiteCache(db_path, migrate_from=str(legacy))
+    assert cache.get("1 Main St") == (40.0, -74.0)
+    assert cache.get("2_oak_ave") == (41.0, -73.0)
+    assert cache.size() == 2
+
+    cache.set("1 Main St", (0.0, 0.0))
+    again = SQLiteCache(db_path, migrate_from=str(legacy))
+    assert again.migrate_json(str(legacy)) == 0
+    assert again.get("1 Main St") == (0.0, 0.0)
+
+    # Once migrated, construction only reads the marker and does not wait
+    # for a writer holding the lock
+    writer = sqlite3.connect(db_path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        locked = SQLiteCache(db_path, migrate_from=str(legacy), timeout=0.1)
+        assert locked.get("2_oak_ave") == (41.0, -73.0)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_sqlite_cache_concurrent_process_writers(tmp_path):
+    db_path = str(tmp_path / "geo.sqlite3")
+    SQLiteCache(db_path)
+
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_write_keys, args=(db_path, worker)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    cache = SQLiteCache(db_path)
+    assert cache.size() == 800
+    assert cache.get("3-199 Main St") == (3.0, 199.0)
+
+
+def test_factory_uses_sqlite_backend(tmp_path):
+    service = create_geocoding_service(
+        GeocodingConfig(
+            cache_file=str(tmp_path / "legacy.json"),
+            cache_db=str(tmp_path / "geo.sqlite3"),
+        )
+    )
+    assert isinstance(service.cache, SQLiteCache)
+
+
+class _FakeRedis:
+    """In-memory Redis stand-in that counts server round-trips"""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def ping(self):
+        self.round_trips += 1
+        return True
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    def scan_iter(self, match, count):
+        keys = [key for key in self.data if key.startswith(match.rstrip("*"))]
+        self.round_trips += max(1, -(-len(keys) // count))
+        return iter(keys)
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append(lambda: self.redis.data.__setitem__(key, value))
+
+    def unlink(self, *keys):
+        self.commands.append(lambda: [self.redis.data.pop(key, None) for key in keys])
+
+    def execute(self):
+        self.redis.round_trips += 1
+        for command in self.commands:
+            command()
+
+
+def test_two_tier_cache_bulk_lookup_uses_one_redis_round_trip(tmp_path):
+    from app.services.geocoding_cache import GeocodingCache
+
+    redis_client = _FakeRedis()
+    cache = GeocodingCache(cache_db=str(tmp_path / "geo.sqlite3"), redis_client=redis_client)
+    addresses = [f"{i} Main St, Springfield" for i in range(1000)]
+    cache.set_many({a: {"lat": 40.0, "lon": float(i)} for i, a in enumerate(addresses)})
+    assert redis_client.round_trips == 2  # ping + one pipeline
+
+    cache.memory.clear()
+    redis_client.round_trips = 0
+    found = cache.get_many(addresses + ["unknown"])
+    assert redis_client.round_trips == 1
+    assert len(found) == 1000 and found[addresses[7]] == {"lat": 40.0, "lon": 7.0}
+
+    # Now served from the in-process tier without touching Redis
+    assert cache.get(addresses[7]) == {"lat": 40.0, "lon": 7.0}
+    assert redis_client.round_trips == 1
+
+    stats = cache.get_stats()
+    assert stats["redis_entries"] == 1000 and stats["memory_entries"] == 1000
+    assert stats["redis_hits"] == 1000 and stats["memory_hits"] == 1
+
+    cache.clear_cache()
+    assert redis_client.data == {} and cache.get(addresses[7]) is None
+
+
+def test_two_tier_cache_falls_back_to_sqlite_without_redis(tmp_path):
+    from app.services.geocoding_cache import GeocodingCache, LRUTTLCache
+
+    class _DownRedis(_FakeRedis):
+        def ping(self):
+            raise ConnectionError("down")
+
+    cache = GeocodingCache(cache_db=str(tmp_path / "geo.sqlite3"), redis_client=_DownRedis())
+    cache.set("1 Main St", {"lat": 1.0, "lon": 2.0})
+    cache.memory.clear()
+    assert cache.get("1 Main St") == {"lat": 1.0, "lon": 2.0}
+    assert cache.get_stats()["file_hits"] == 1
+
+    now = [0.0]
+    lru = LRUTTLCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+    lru.set_many({"a": 1, "b": 2})
+    lru.get_many(["a"])
+    lru.set_many({"c": 3})
+    assert lru.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    now[0] = 10.0
+    assert lru.get_many(["a", "c"]) == {}
+
+
+def test_two_tier_cache_shares_keys_and_reads_legacy_entries(tmp_path):
+    from app.services.geocoding_cache import REDIS_KEY_PREFIX, GeocodingCache
+
+    db_path = str(tmp_path / "geo.sqlite3")
+    redis_client = _FakeRedis()
+    cache = GeocodingCache(cache_db=db_path, redis_client=redis_client)
+    cache.set("123 Main St", {"lat": 1.0, "lon": 2.0})
+
+    # Same key as ModernGeocodingService's SQLite tier
+    assert SQLiteCache(db_path).get("123  main st") == (1.0, 2.0)
+    assert REDIS_KEY_PREFIX + "123 main st" in redis_client.data
+
+    redis_client.data[REDIS_KEY_PREFIX + "9_elm_st__springfield"] = json.dumps([3.0, 4.0])
+    redis_client.round_trips = 0
+    assert cache.get("9 Elm St, Springfield") == {"lat": 3.0, "lon": 4.0}
+    assert redis_client.round_trips == 2  # One MGET, then the rewrite
+    assert REDIS_KEY_PREFIX + "9 elm st, springfield" in redis_client.data
@@ -0,0 +1,98 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.optimization.local_search import (
+    LocalSearchConfig,
+    LocalSearchOptimizer,
+    build_neighbor_lists,
+    polish_route,
+)
+
+
+def _euclidean_matrix(n, seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 100, (n, 2))
+    diff = points[:, None, :] - points[None, :, :]
+    return np.sqrt((diff**2).sum(axis=-1)), rng
+
+
+def _tour_length(tour, matrix):
+    return sum(matrix[a, b] for a, b in zip(tour, tour[1:] + tour[:1]))
+
+
+def _path_length(path, matrix):
+    return sum(matrix[a, b] for a, b in zip(path, path[1:]))
+
+
+def test_neighbor_lists_are_sorted_and_exclude_self():
+    matrix, _ = _euclidean_matrix(30, seed=0)
+    neighbors = build_neighbor_lists(matrix, 5)
+
+    for city, row in enumerate(neighbors):
+        assert len(row) == 5
+        assert city not in row
+        expected = [c for c in np.argsort(matrix[city]) if c != city][:5]
+        assert row == expected
+
+
+@pytest.mark.parametrize("n", [4, 5, 6, 7])
+def test_small_tours_reach_optimum(n):
+    matrix, rng = _euclidean_matrix(n, seed=n)
+    tour, metrics = LocalSearchOptimizer().improve(list(rng.permutation(n)), matrix)
+
+    best = min(
+        _tour_length([0] + list(rest), matrix) for rest in itertools.permutations(range(1, n))
+    )
+    assert sorted(tour) == list(range(n))
+    assert metrics["final_distance"] == pytest.approx(best)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        LocalSearchConfig(),
+        LocalSearchConfig(use_or_opt=False),
+        LocalSearchConfig(use_two_opt=False, or_opt_max_segment=1),
+    ],
+)
+def test_improve_returns_shorter_permutation(config):
+    matrix, rng = _euclidean_matrix(200, seed=3)
+    start = list(rng.permutation(200))
+    tour, metrics = LocalSearchOptimizer(config).improve(start, matrix)
+
+    assert sorted(tour) == list(range(200))
+    assert metrics["final_distance"] == pytest.approx(_tour_length(tour, matrix))
+    assert metrics["final_distance"] < 0.5 * metrics["initial_distance"]
+
+
+def test_improve_path_respects_fixed_endpoints():
+    matrix, rng = _euclidean_matrix(60, seed=5)
+    start = list(rng.permutation(60))
+    optimizer = LocalSearchOptimizer()
+
+    free, free_metrics = optimizer.improve_path(start, matrix)
+    assert free_metrics["final_distance"] == pytest.approx(_path_length(free, matrix))
+    assert free_metrics["final_distance"] < free_metrics["initial_distance"]
+
+    pinned, _ = optimizer.improve_path(start, matrix, fixed_start=True)
+    assert pinned[0] == start[0]
+
+    both, _ = optimizer.improve_path(start, matrix, fixed_start=True, fixed_end=True)
+    assert (both[0], both[-1]) == (start[0], start[-1])
+    assert sorted(both) == list(range(60))
+
+
+def test_polish_route_reorders_stores():
+    stores = [
+        {"name": "A", "lat": 40.70, "lon": -74.00},
+        {"name": "C", "lat": 40.72, "lon": -74.00},
+        {"name": "B", "lat": 40.71, "lon": -74.00},
+        {"name": "D", "lat": 40.73, "lon": -74.00},
+    ]
+    matrix = np.abs(np.subtract.outer([s["lat"] for s in stores], [s["lat"] for s in stores]))
+    route, metrics = polish_route(stores, matrix, fixed_start=True)
+
+    assert [s["name"] for s in route] == ["A", "B", "C", "D"]
+    assert metrics["final_distance"] < metrics["initial_distance"]
@@ -0,0 +1,115 @@
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import metrics_service
+from app.services.distance_service import (
+    Coordinates,
+    DistanceCalculator,
+    build_distance_matrix,
+)
+from app.services.metrics_service import (
+    MetricsCollector,
+    ServiceMetrics,
+    metrics_collector,
+    track_distance_calculation,
+)
+
+
+def test_counters_from_many_threads_aggregate_at_scrape():
+    collector = MetricsCollector()
+
+    def work():
+        for _ in range(5000):
+            collector.increment_counter("jobs_total", labels={"kind": "a"})
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    collector.increment_counter("jobs_total", 2, labels={"kind": "a"})
+
+    assert collector.counters == {"jobs_total[kind=a]": 40002.0}
+    assert 'jobs_total{kind="a"} 40002.0' in collector.get_prometheus_metrics()
+    assert collector.metrics["jobs_total[kind=a]"].metric_type == "counter"
+
+    collector.clear_metrics()
+    assert collector.counters == {} and collector.get_prometheus_metrics() == ""
+
+
+def test_histograms_export_cumulative_buckets():
+    collector = MetricsCollector()
+    collector.register_histogram("lookup_seconds", [0.1, 1.0])
+    for value in (0.05, 0.1, 0.5, 3.0):
+        collector.observe_histogram("lookup_seconds", value, {"tier": "memory"})
+
+    lines = collector.get_prometheus_metrics().splitlines()
+
+    assert "# TYPE lookup_seconds histogram" in lines
+    assert 'lookup_seconds_bucket{tier="memory",le="0.1"} 2' in lines
+    assert 'lookup_seconds_bucket{tier="memory",le="1.0"} 3' in lines
+    assert 'lookup_seconds_bucket{tier="memory",le="+Inf"} 4' in lines
+    assert 'lookup_seconds_sum{tier="memory"} 3.65' in lines
+    assert 'lookup_seconds_count{tier="memory"} 4' in lines
+
+
+def test_rolling_average_tracks_window():
+    service = ServiceMetrics(service_name="routing")
+    service.response_times = type(service.response_times)(maxlen=3)
+    for duration in (1.0, 2.0, 3.0, 10.0):
+        service.add_response_time(duration)
+
+    assert list(service.response_times) == [2.0, 3.0, 10.0]
+    assert service.avg_response_time == 5.0
+
+    collector = MetricsCollector()
+    collector.record_service_request("routing", 0.2)
+    collector.record_service_request("routing", 0.4, success=False)
+    summary = collector.get_metrics_summary()["services"]["routing"]
+    assert summary["avg_response_time"] == 0.3 and summary["error_rate"] == 50.0
+
+
+def test_distance_calls_are_all_counted_and_sampled_for_timing(monkeypatch):
+    monkeypatch.setattr(metrics_service, "DISTANCE_SAMPLE_EVERY", 10)
+    monkeypatch.setattr(metrics_service, "_distance_calls", threading.local())
+    metrics_collector.clear_metrics()
+    a, b = Coordinates(40.0, -74.0), Coordinates(40.5, -73.5)
+
+    for _ in range(25):
+        DistanceCalculator.haversine_distance(a, b)
+    build_distance_matrix(np.array([[40.0, -74.0], [40.1, -74.1], [40.2, -74.2]]), use_cache=False)
+
+    counters = metrics_collector.counters
+    histograms = metrics_collector.histograms
+    assert counters["distance_calculations_total[method=haversine_distance]"] == 25
+    assert histograms["distance_calculation_seconds[method=haversine_distance]"].count == 2
+    assert counters["distance_matrix_pairs_total[method=haversine]"] == 3
+    assert histograms["distance_matrix_build_seconds[method=haversine]"].count == 1
+
+    # A thread that never reaches a sample still reports its calls
+    worker = threading.Thread(
+        target=lambda: [DistanceCalculator.haversine_distance(a, b) for _ in range(3)]
+    )
+    worker.start()
+    worker.join()
+    counters = metrics_collector.counters
+    assert counters["distance_calculations_total[method=haversine_distance]"] == 28
+
+
+def test_distance_calculation_errors_are_counted(monkeypatch):
+    monkeypatch.setattr(metrics_service, "_distance_calls", threading.local())
+    metrics_collector.clear_metrics()
+
+    @track_distance_calculation
+    def broken_distance(a, b):
+        raise ValueError("no coordinates")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            broken_distance(None, None)
+
+    counters = metrics_collector.counters
+    assert counters["distance_calculations_total[method=broken_distance]"] == 3
+    assert counters["distance_calculation_errors_total[method=broken_distance]"] == 3
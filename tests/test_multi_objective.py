@@ -0,0 +1,156 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.optimization.multi_objective import (
+    MultiObjectiveConfig,
+    MultiObjectiveOptimizer,
+    ParetoArchive,
+    hypervolume,
+    non_dominated_sort,
+)
+
+
+def _make_stores(n: int):
+    rng = np.random.default_rng(n)
+    return [
+        {
+            "id": i,
+            "lat": float(40.0 + rng.random()),
+            "lon": float(-74.0 + rng.random()),
+            "priority": int(rng.integers(1, 5)),
+            "earliest_time": float(rng.uniform(8, 12)),
+            "latest_time": float(rng.uniform(12, 18)),
+        }
+        for i in range(n)
+    ]
+
+
+def _reference_fronts(values):
+    """Pairwise peeling of non-dominated fronts"""
+
+    def dominates(a, b):
+        return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+    remaining = set(range(len(values)))
+    fronts = []
+    while remaining:
+        front = {
+            i for i in remaining if not any(dominates(values[j], values[i]) for j in remaining)
+        }
+        fronts.append(sorted(front))
+        remaining -= front
+    return fronts
+
+
+@pytest.mark.parametrize("k", [2, 3, 4])
+def test_non_dominated_sort_matches_pairwise_reference(k):
+    rng = np.random.default_rng(k)
+    # Coarse integer values produce ties and duplicate points
+    values = rng.integers(0, 6, size=(120, k)).astype(float)
+    optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig())
+
+    fronts, ranks = optimizer._non_dominated_sort(values)
+
+    assert [front.tolist() for front in fronts] == _reference_fronts(values.tolist())
+    for rank, front in enumerate(fronts):
+        assert (ranks[front] == rank).all()
+
+
+def test_time_window_violations_match_stepwise_schedule():
+    stores = _make_stores(12)
+    optimizer = MultiObjectiveOptimizer(MultiObjectiveConfig())
+    optimizer.stores = stores
+    optimizer.distance_matrix = optimizer._create_distance_matrix(stores)
+    optimizer._load_store_attributes(stores)
+    routes = np.array([np.random.default_rng(s).permutation(12) for s in range(5)])
+
+    expected = []
+    for route in routes:
+        time, violations = 9.0, 0.0
+        for position, stop in enumerate(route):
+            if position:
+                time += optimizer.distance_matrix[route[position - 1], stop] / 50
+            store = stores[stop]
+            if time < store["earliest_time"]:
+                violations += store["earliest_time"] - time
+                time = store["earliest_time"]
+            elif time > store["latest_time"]:
+                violations += time - store["latest_time"]
+            time += 0.5
+        expected.append(violations)
+
+    assert optimizer._calculate_time_window_violations(routes) == pytest.approx(expected)
+
+
+def test_optimize_returns_permutation_and_is_seeded(monkeypatch):
+    monkeypatch.setenv("RFR_SEED", "5")
+    stores = _make_stores(30)
+    config = MultiObjectiveConfig(
+        population_size=40,
+        generations=30,
+        objectives=["distance", "priority", "delivery_windows"],
+    )
+
+    route1, metrics1 = MultiObjectiveOptimizer(config).optimize(stores)
+    route2, metrics2 = MultiObjectiveOptimizer(config).optimize(stores)
+
+    assert "error" not in metrics1
+    assert sorted(s["id"] for s in route1) == list(range(30))
+    assert [s["id"] for s in route1] == [s["id"] for s in route2]
+    assert metrics1["pareto_front_size"] >= 1
+
+
+def test_hypervolume_is_exact_for_overlapping_boxes():
+    # Two boxes of area 2 overlapping in a unit square
+    assert hypervolume([[0.0, 1.0], [1.0, 0.0]], [2.0, 2.0]) == pytest.approx(3.0)
+    # Dominated, duplicate and out-of-reference points add nothing
+    points = [[0.0, 1.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [3.0, 0.0]]
+    assert hypervolume(points, [2.0, 2.0]) == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("k", [3, 4])
+def test_hypervolume_matches_inclusion_exclusion(k):
+    rng = np.random.default_rng(k)
+    points = rng.random((6, k))
+    reference = np.full(k, 1.0)
+
+    expected = 0.0
+    for size in range(1, len(points) + 1):
+        for subset in itertools.combinations(points, size):
+            corner = np.max(subset, axis=0)
+            expected += (-1) ** (size + 1) * np.prod(reference - corner)
+
+    assert hypervolume(points, reference) == pytest.approx(expected)
+
+
+def test_archive_keeps_bounded_non_dominated_set():
+    archive = ParetoArchive(max_size=5)
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        routes = np.array([rng.permutation(6) for _ in range(20)])
+        archive.update(routes, rng.random((20, 2)))
+
+    assert 1 <= len(archive) <= 5
+    fronts, _ = non_dominated_sort(archive.objectives)
+    assert len(fronts) == 1
+    assert len(np.unique(archive.routes, axis=0)) == len(archive)
+
+
+def test_pareto_front_lists_archived_solutions(monkeypatch):
+    monkeypatch.setenv("RFR_SEED", "3")
+    stores = _make_stores(15)
+    optimizer = MultiObjectiveOptimizer(
+        MultiObjectiveConfig(
+            population_size=30, generations=20, objectives=["distance", "priority"]
+        )
+    )
+    route, metrics = optimizer.optimize(stores)
+    front = optimizer.get_pareto_front()
+
+    assert len(front) == metrics["pareto_front_size"]
+    distances = [entry["objectives"]["distance"] for entry in front]
+    assert distances == sorted(distances)
+    best = [entry for entry in front if entry["best_compromise"]]
+    assert len(best) == 1 and best[0]["route"] == route
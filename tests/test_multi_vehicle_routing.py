@@ -2,8 +2,10 @@ import os
 import sys
 from datetime import datetime
 
+import numpy as np
 import pytest
 
+from app.optimization.savings import ClarkeWrightSolver, RouteLimits, SavingsConfig
 from routing_engine import (
     OptimizationMethod,
     PerformanceMonitor,
@@ -368,6 +370,129 @@ class TestMultiVehicleRouting:
         assert len(routes[0].stops) == 1, "Route should have exactly one stop"
         assert routes[0].stops[0]["store_id"] == "SINGLE_001"
 
+    def test_clarke_wright_routes_respect_vehicle_limits(
+        self, large_store_dataset, sample_vehicles
+    ):
+        """Test savings routes stay within each vehicle's limits."""
+        optimizer = RouteOptimizer()
+
+        routes = optimizer.optimize_multi_vehicle_routes(
+            large_store_dataset, sample_vehicles, OptimizationMethod.CLARKE_WRIGHT
+        )
+
+        vehicles = {v.vehicle_id: v for v in sample_vehicles}
+        routed = [stop["store_id"] for route in routes for stop in route.stops]
+        assert sorted(routed) == sorted(s.store_id for s in large_store_dataset)
+        for route in routes:
+            vehicle = vehicles[route.vehicle_id]
+            assert vehicle.status == VehicleStatus.AVAILABLE
+            assert route.total_weight_kg <= vehicle.capacity_kg
+            assert route.total_packages <= vehicle.max_packages
+            assert route.estimated_duration_hours <= vehicle.max_driving_hours
+            assert route.optimization_method == "clarke_wright"
+            assert [s["sequence"] for s in route.stops] == list(range(1, len(route.stops) + 1))
+
+    def test_clarke_wright_keeps_clusters_together(self):
+        """Test savings routes group nearby stores that best-fit splits up."""
+        optimizer = RouteOptimizer()
+        stores = [
+            Store(
+                store_id=f"{area}_{i}",
+                name=f"{area} {i}",
+                address=f"{i} {area} Ave",
+                coordinates={"lat": lat + i * 0.002, "lng": lng + i * 0.002},
+                delivery_window="09:00-17:00",
+                priority=["high", "low"][i % 2],
+                estimated_service_time=10,
+                packages=2,
+                weight_kg=20,
+            )
+            for area, lat, lng in (("NORTH", 40.85, -73.90), ("SOUTH", 40.60, -74.05))
+            for i in range(6)
+        ]
+        vehicles = [Vehicle(f"VAN_{i}", 130, 12, 8, VehicleStatus.AVAILABLE) for i in range(2)]
+
+        savings = optimizer.optimize_multi_vehicle_routes(
+            stores, vehicles, OptimizationMethod.CLARKE_WRIGHT
+        )
+        best_fit = optimizer.optimize_multi_vehicle_routes(
+            stores, vehicles, OptimizationMethod.TWO_OPT
+        )
+
+        areas = [{stop["store_id"].split("_")[0] for stop in r.stops} for r in savings]
+        assert sorted(map(sorted, areas)) == [["NORTH"], ["SOUTH"]]
+        assert sum(r.total_distance_km for r in savings) < sum(
+            r.total_distance_km for r in best_fit
+        )
+
+    def test_clarke_wright_routes_every_store_the_fleet_can_carry(self):
+        """Test stores of a route too big for any free vehicle still get routed."""
+        stores = [
+            Store(
+                store_id=f"S{i}",
+                name=f"Store {i}",
+                address=f"{i} Main St",
+                coordinates={"lat": 40.6 + (i * 37 % 100) / 300, "lng": -74.1 + i / 300},
+                delivery_window="09:00-17:00",
+                priority="medium",
+                estimated_service_time=10,
+                packages=2,
+                weight_kg=20,
+            )
+            for i in range(54)
+        ]
+        # Savings routes are built for the truck; the second one outweighs a van
+        vehicles = [Vehicle("TRUCK", 600, 100, 8, VehicleStatus.AVAILABLE)]
+        vehicles += [Vehicle(f"VAN_{i}", 300, 100, 8, VehicleStatus.AVAILABLE) for i in range(2)]
+        optimizer = RouteOptimizer()
+
+        routes = optimizer.optimize_multi_vehicle_routes(
+            stores, vehicles, OptimizationMethod.CLARKE_WRIGHT
+        )
+
+        assert optimizer.unassigned_stores == []
+        assert sum(len(route.stops) for route in routes) == 54
+        limits = {v.vehicle_id: v for v in vehicles}
+        for route in routes:
+            vehicle = limits[route.vehicle_id]
+            assert route.total_weight_kg <= vehicle.capacity_kg
+            assert route.estimated_duration_hours <= vehicle.max_driving_hours
+
+    def test_clarke_wright_reports_unassigned_stores(self):
+        """Test stores left without a vehicle are listed, not silently dropped."""
+        stores = [
+            Store(
+                store_id=f"{area}_{i}",
+                name=f"{area} {i}",
+                address=f"{i} {area} Ave",
+                coordinates={"lat": lat + i * 0.002, "lng": lng + i * 0.002},
+                delivery_window="09:00-17:00",
+                priority="high",
+                estimated_service_time=10,
+                packages=2,
+                weight_kg=20,
+            )
+            for area, lat, lng in (("NORTH", 40.85, -73.90), ("SOUTH", 40.60, -74.05))
+            for i in range(6)
+        ]
+        vehicles = [Vehicle("VAN_1", 130, 12, 8, VehicleStatus.AVAILABLE)]
+        optimizer = RouteOptimizer()
+
+        routes = optimizer.optimize_multi_vehicle_routes(
+            stores, vehicles, OptimizationMethod.CLARKE_WRIGHT
+        )
+
+        routed = {stop["store_id"] for stop in routes[0].stops}
+        unassigned = {store.store_id for store in optimizer.unassigned_stores}
+        assert len(routed) == len(unassigned) == 6
+        assert routed | unassigned == {store.store_id for store in stores}
+
+        result = PerformanceMonitor().benchmark_optimization(
+            stores, vehicles, [OptimizationMethod.CLARKE_WRIGHT]
+        )["clarke_wright"]
+        assert result["stores_routed"] == result["stores_unassigned"] == 6
+        assert result["distance_per_stop_km"] == pytest.approx(result["total_distance_km"] / 6)
+
 
 class TestPerformanceMonitoring:
     """Test suite for performance monitoring and benchmarking."""
@@ -598,3 +723,77 @@ class TestPerformanceMonitoring:
 
             # Clean up
             del dataset, routes, optimizer
+
+
+class TestClarkeWrightSavings:
+    """Test suite for the savings solver."""
+
+    def _problem(self, n, seed=0):
+        rng = np.random.default_rng(seed)
+        coordinates = np.column_stack((40.6 + rng.random(n) * 0.3, -74.1 + rng.random(n) * 0.3))
+        return (
+            coordinates,
+            (40.75, -73.95),
+            rng.integers(5, 30, n),
+            rng.integers(1, 6, n),
+            rng.choice([10, 15, 20], n),
+        )
+
+    def test_routes_cover_feasible_stops_within_limits(self):
+        """Test every stop is routed once and no route breaks a limit."""
+        coordinates, depot, weights, packages, minutes = self._problem(300)
+        weights[7] = 500  # Too heavy for any route
+        limits = RouteLimits(capacity_kg=200, max_packages=40, max_driving_hours=6)
+        solver = ClarkeWrightSolver(SavingsConfig(neighbor_count=15))
+
+        routes, unassigned = solver.solve(coordinates, depot, weights, packages, minutes, limits)
+
+        assert unassigned == [7]
+        assert sorted(s for r in routes for s in r) == [i for i in range(300) if i != 7]
+        depot_point = {"lat": depot[0], "lng": depot[1]}
+        optimizer = RouteOptimizer(depot_point)
+        for route in routes:
+            assert weights[route].sum() <= 200 and packages[route].sum() <= 40
+            path = [depot_point]
+            path += [{"lat": coordinates[i, 0], "lng": coordinates[i, 1]} for i in route]
+            path += [depot_point]
+            distance = sum(optimizer.calculate_distance(a, b) for a, b in zip(path, path[1:]))
+            assert solver.route_hours(distance, minutes[route].sum()) <= 6 + 1e-6
+        assert solver.metrics["routes"] == len(routes) < 300
+
+    def test_routes_are_repaired_down_to_the_fleet_size(self):
+        """Test stops of surplus routes are reinserted within the limits."""
+        coordinates, depot, weights, packages, minutes = self._problem(300)
+        limits = RouteLimits(capacity_kg=600, max_packages=120, max_driving_hours=8)
+        solver = ClarkeWrightSolver(SavingsConfig(neighbor_count=2))
+
+        unlimited, _ = solver.solve(coordinates, depot, weights, packages, minutes, limits)
+        routes, unassigned = solver.solve(
+            coordinates, depot, weights, packages, minutes, limits, max_routes=10
+        )
+
+        assert len(unlimited) > 10 and len(routes) == 10 and unassigned == []
+        assert sorted(s for r in routes for s in r) == list(range(300))
+        assert all(weights[r].sum() <= 600 and packages[r].sum() <= 120 for r in routes)
+        assert solver.metrics["dissolved_routes"] == len(unlimited) - 10
+
+        # Eight routes cannot carry the total weight; what is left is reported
+        routes, unassigned = solver.solve(
+            coordinates, depot, weights, packages, minutes, limits, max_routes=8
+        )
+        assert weights.sum() > 8 * 600
+        assert len(routes) == 8 and unassigned
+        assert sorted(unassigned + [s for r in routes for s in r]) == list(range(300))
+
+    def test_neighbor_limited_savings_match_full_list_closely(self):
+        """Test the KD-tree candidate list loses little against all pairs."""
+        problem = self._problem(150, seed=2)
+        limits = RouteLimits(capacity_kg=300, max_packages=60)
+
+        full = ClarkeWrightSolver(SavingsConfig(neighbor_count=149))
+        limited = ClarkeWrightSolver(SavingsConfig(neighbor_count=20))
+        full.solve(*problem, limits)
+        limited.solve(*problem, limits)
+
+        assert full.metrics["candidate_savings"] > limited.metrics["candidate_savings"]
+        assert limited.metrics["total_distance"] <= full.metrics["total_distance"] * 1.05
@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+import pytest
+
+from app.middleware import analytics as analytics_middleware
+from app.middleware.analytics import init_analytics_middleware
+from app.performance_monitor import PerformanceMonitor
+from app.services.analytics_service import AnalyticsService
+from app.utils.quantile_sketch import QuantileSketch
+
+
+def test_sketch_quantiles_within_relative_error():
+    values = np.random.default_rng(0).lognormal(mean=-3, sigma=1.0, size=20000)
+    sketch = QuantileSketch(alpha=0.01)
+    for value in values:
+        sketch.add(float(value))
+
+    for q in (0.5, 0.95, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+    assert sketch.count == 20000 and sketch.max == values.max()
+    assert len(sketch.buckets) < 600
+
+    halves = QuantileSketch(), QuantileSketch()
+    for i, value in enumerate(values):
+        halves[i % 2].add(float(value))
+    merged = QuantileSketch.merged(halves)
+    assert merged.buckets == sketch.buckets
+    assert merged.quantile(0.99) == sketch.quantile(0.99)
+    assert QuantileSketch().summary()["p50"] is None
+
+
+def test_percentiles_per_endpoint_and_algorithm():
+    monitor = PerformanceMonitor()
+    for i in range(100):
+        monitor.record_request("api.generate_route", "POST", 0.1 + i / 1000)
+    monitor.record_request("api.health", "GET", 0.002)
+    monitor.record_algorithm_run("genetic", 1.5)
+
+    latency = monitor.get_latency_percentiles()
+
+    route = latency["endpoints"]["POST api.generate_route"]
+    assert route["count"] == 100
+    assert route["p50"] == pytest.approx(149, rel=0.02)
+    assert route["p99"] == pytest.approx(198, rel=0.02)
+    assert latency["endpoints"]["GET api.health"]["p95"] == pytest.approx(2, rel=0.02)
+    assert latency["algorithms"]["genetic"]["max"] == 1500
+    assert latency["overall"]["count"] == 101
+
+
+def test_application_metrics_use_the_last_full_minute():
+    now = [6000.0]
+    monitor = PerformanceMonitor(clock=lambda: now[0])
+    for status in (200, 200, 200, 500):
+        monitor.record_request("analytics.report", "GET", 0.25, status)
+
+    monitor._collect_application_metrics()
+    assert "api_response_time" not in monitor.get_current_metrics()  # Minute not over
+
+    now[0] += 60
+    monitor._collect_application_metrics()
+    current = monitor.get_current_metrics()
+    assert current["api_response_time"]["value"] == pytest.approx(250, rel=0.02)
+    assert current["error_rate"]["value"] == 25.0
+    assert current["analytics_requests"]["value"] == 4
+    assert "active_routes" not in current
+
+    now[0] += 60 * 20
+    assert monitor.get_latency_percentiles()["overall"]["count"] == 0
+
+
+def test_system_metrics_do_not_block():
+    monitor = PerformanceMonitor()
+    start = time.perf_counter()
+    monitor._collect_system_metrics()
+    assert time.perf_counter() - start < 0.5
+    assert "cpu_usage" in monitor.get_current_metrics()
+
+
+def test_middleware_records_request_latency(mock_flask_app, monkeypatch):
+    monitor = PerformanceMonitor()
+    monkeypatch.setattr(analytics_middleware, "get_performance_monitor", lambda: monitor)
+    init_analytics_middleware(mock_flask_app, AnalyticsService())
+
+    @mock_flask_app.route("/ping")
+    def ping():
+        return "pong"
+
+    client = mock_flask_app.test_client()
+    for _ in range(3):
+        client.get("/ping")
+
+    endpoints = monitor.get_latency_percentiles()["endpoints"]
+    assert endpoints["GET ping"]["count"] == 3
@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.optimization.simulated_annealing import (
+    SimulatedAnnealingConfig,
+    SimulatedAnnealingOptimizer,
+)
+
+
+def _optimizer_with_matrix(n: int, seed: int = 0) -> SimulatedAnnealingOptimizer:
+    rng = np.random.default_rng(seed)
+    points = rng.random((n, 2))
+    matrix = np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+
+    sa = SimulatedAnnealingOptimizer(SimulatedAnnealingConfig())
+    sa.distance_matrix = matrix
+    sa._distance_rows = matrix.tolist()
+    return sa
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 7, 12])
+@pytest.mark.parametrize("operator", ["swap", "insert", "reverse"])
+def test_move_delta_matches_full_recomputation(n, operator):
+    sa = _optimizer_with_matrix(n)
+    propose = sa.neighborhood_operators[operator]
+    random.seed(n)
+
+    for _ in range(300):
+        route = list(range(n))
+        random.shuffle(route)
+        before = sa._calculate_route_distance(route)
+
+        delta, move = propose(route)
+        sa._apply_move(route, move)
+
+        assert sorted(route) == list(range(n))
+        assert sa._calculate_route_distance(route) - before == pytest.approx(delta, abs=1e-9)
+
+
+def test_optimize_reports_exact_final_distance():
+    stores = [
+        {"id": i, "lat": 40.0 + (i * 37 % 11) * 0.01, "lon": -74.0 + (i * 17 % 13) * 0.01}
+        for i in range(25)
+    ]
+    cfg = SimulatedAnnealingConfig(
+        neighborhood_operator="mixed", max_iterations=3000, iterations_per_temp=50
+    )
+    sa = SimulatedAnnealingOptimizer(cfg)
+    route, metrics = sa.optimize(stores)
+
+    assert sorted(s["id"] for s in route) == list(range(25))
+    assert metrics["final_distance"] <= metrics["initial_distance"]
+    order = [s["id"] for s in route]
+    assert metrics["final_distance"] == pytest.approx(sa._calculate_route_distance(order), abs=1e-9)
+
+
+def test_restarts_are_deterministic_in_pool_and_serially(monkeypatch):
+    stores = [
+        {"id": i, "lat": 40.0 + (i * 37 % 11) * 0.01, "lon": -74.0 + (i * 17 % 13) * 0.01}
+        for i in range(20)
+    ]
+    cfg = SimulatedAnnealingConfig(
+        neighborhood_operator="mixed",
+        max_iterations=1500,
+        iterations_per_temp=50,
+        restarts=3,
+        workers=3,
+    )
+    monkeypatch.setenv("RFR_SEED", "7")
+
+    pooled_route, pooled = SimulatedAnnealingOptimizer(cfg).optimize(stores)
+    monkeypatch.setattr("os.cpu_count", lambda: 1)
+    serial_route, serial = SimulatedAnnealingOptimizer(cfg).optimize(stores)
+
+    assert [s["id"] for s in pooled_route] == [s["id"] for s in serial_route]
+    assert [c["final_distance"] for c in pooled["chains"]] == [
+        c["final_distance"] for c in serial["chains"]
+    ]
+    assert len(pooled["chains"]) == 3
+    assert pooled["final_distance"] == min(c["final_distance"] for c in pooled["chains"])
+
+
+def test_invalid_restart_settings_are_rejected():
+    with pytest.raises(ValueError):
+        SimulatedAnnealingConfig(restarts=0)
+    with pytest.raises(ValueError):
+        SimulatedAnnealingConfig(workers=0)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from app.services.distance_service import (
+    CoordinateExtractor,
+    create_distance_calculator,
+    haversine_matrix,
+)
+from app.services.route_core import GreedyNearestNeighborOptimizer, RouteConstraints
+from app.utils.spatial_index import (
+    GeoPointIndex,
+    NearestUnvisitedIndex,
+    nearest_neighbor_order,
+)
+
+
+def _brute_force_order(coords, start):
+    matrix = haversine_matrix(coords)
+    order = [start]
+    remaining = set(range(len(coords))) - {start}
+    while remaining:
+        candidates = np.fromiter(remaining, dtype=int)
+        nxt = int(candidates[np.argmin(matrix[order[-1], candidates])])
+        order.append(nxt)
+        remaining.remove(nxt)
+    return order
+
+
+def test_nearest_neighbor_order_matches_haversine_scan():
+    rng = np.random.default_rng(11)
+    coords = np.column_stack([rng.uniform(40.0, 41.0, 1500), rng.uniform(-74.5, -73.5, 1500)])
+
+    assert nearest_neighbor_order(coords, 7).tolist() == _brute_force_order(coords, 7)
+
+
+def test_index_skips_removed_and_missing_points():
+    coords = np.array([[0.0, 0.0], [0.0, 0.1], [np.nan, np.nan], [0.0, 0.3]])
+    index = NearestUnvisitedIndex(coords)
+
+    assert len(index) == 3
+    assert 2 not in index
+    index.remove(0)
+    assert index.nearest(0) == 1
+    index.remove(1)
+    assert index.pop_nearest(0) == 3
+    assert index.nearest(0) is None
+
+
+def test_missing_coordinates_go_last_in_input_order():
+    coords = np.array([[0.0, 0.0], [np.nan, np.nan], [0.0, 0.2], [np.nan, 1.0], [0.0, 0.1]])
+
+    assert nearest_neighbor_order(coords, 0).tolist() == [0, 4, 2, 1, 3]
+
+
+def test_start_without_coordinates_continues_from_first_located_point():
+    coords = np.array([[np.nan, np.nan], [0.0, 0.3], [0.0, 0.0], [np.nan, 1.0], [0.0, 0.1]])
+
+    assert nearest_neighbor_order(coords, 0).tolist() == [0, 1, 4, 2, 3]
+    assert nearest_neighbor_order(coords, 3).tolist() == [3, 1, 4, 2, 0]
+
+
+def test_greedy_optimizer_uses_index_order():
+    rng = np.random.default_rng(3)
+    stores = [
+        {"name": f"S{i}", "chain": "A" if i == 5 else "B", "lat": lat, "lon": lon}
+        for i, (lat, lon) in enumerate(
+            zip(rng.uniform(40.0, 40.5, 300), rng.uniform(-74.0, -73.5, 300))
+        )
+    ]
+    optimizer = GreedyNearestNeighborOptimizer(create_distance_calculator())
+    route = optimizer.optimize(stores, RouteConstraints(priority_weights={"A": 10}))
+
+    coords = CoordinateExtractor.extract_coordinate_array(stores)
+    expected = _brute_force_order(coords, 5)
+    assert [store["name"] for store in route] == [f"S{i}" for i in expected]
+
+
+def test_geo_point_index_matches_brute_force_under_updates():
+    rng = np.random.default_rng(5)
+    coords = np.column_stack([rng.uniform(40.0, 41.0, 600), rng.uniform(-74.5, -73.5, 600)])
+    index = GeoPointIndex((i, lat, lon) for i, (lat, lon) in enumerate(coords[:500]))
+
+    # Incremental inserts, removals and moves on top of the built tree
+    index.add_many((i, lat, lon) for i, (lat, lon) in enumerate(coords[500:], start=500))
+    for key in range(0, 600, 3):
+        index.remove(key)
+    coords[1] = coords[2] = [40.5, -74.0]
+    index.add(1, 40.5, -74.0)
+    index.add(2, 40.5, -74.0)
+    index.add(4, np.nan, np.nan)
+    live = np.array([i for i in range(600) if i % 3 and i != 4])
+    assert len(index) == len(live) and 4 not in index
+
+    for lat, lon in rng.uniform([40.0, -74.5], [41.0, -73.5], (20, 2)):
+        distances = haversine_matrix(np.vstack([[lat, lon], coords[live]]))[0, 1:]
+        order = live[np.argsort(distances, kind="stable")]
+
+        nearest = index.nearest(lat, lon, k=5)
+        assert [key for key, _ in nearest] == order[:5].tolist()
+        assert nearest[0][1] == pytest.approx(distances.min(), rel=1e-6)
+
+        within = index.within_radius(lat, lon, 10.0)
+        assert sorted(key for key, _ in within) == sorted(live[distances <= 10.0].tolist())
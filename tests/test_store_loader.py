@@ -0,0 +1,190 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from werkzeug.datastructures import FileStorage
+
+from app.services.file_service import FileService
+from app.services.routing_service_unified import UnifiedRoutingService
+from routing.loader import iter_store_chunks, load_stores
+
+
+def _csv_rows(n):
+    lines = ["Store Name,Address,Chain"]
+    lines += [f"Store {i},{i} Main St,{'AB'[i % 2]}" for i in range(n)]
+    return "\n".join(lines) + "\n"
+
+
+def _xlsx_bytes(n):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Store Name", "Address", "Zip"])
+    for i in range(n):
+        sheet.append([f"Store {i}", f"{i} Main St", f"0{i:04d}"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def test_csv_chunks_stream_gzip_and_match_full_load(tmp_path):
+    path = tmp_path / "stores.csv.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(_csv_rows(25))
+
+    chunks = list(iter_store_chunks(str(path), chunksize=10))
+
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert chunks[2][4] == {"name": "Store 24", "address": "24 Main St", "chain": "A"}
+    assert [s for chunk in chunks for s in chunk] == load_stores(str(path))
+
+
+def test_csv_chunks_keep_column_types_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "stores.csv"
+    path.write_text(
+        "Store Name,Address,Zip,Lat\n"
+        "A,1 Main St,07030,40.5\n"
+        "B,2 Main St,10001,40.6\n"
+        "C,3 Main St,K1A 0B1,\n"
+    )
+
+    chunks = list(iter_store_chunks(str(path), chunksize=1))
+
+    assert [chunk[0]["zip"] for chunk in chunks] == ["07030", "10001", "K1A 0B1"]
+    assert [chunk[0]["lat"] for chunk in chunks[:2]] == [40.5, 40.6]
+    assert pd.isna(chunks[2][0]["lat"])
+    assert [s for chunk in chunks for s in chunk][:2] == load_stores(str(path))[:2]
+
+
+def test_csv_chunks_return_numeric_store_fields_as_numbers(tmp_path):
+    path = tmp_path / "stores.csv"
+    path.write_text(
+        "Store Name,Address,Priority,Sales,Earliest_Time\n"
+        "A,1 Main St,3,1000.5,8\n"
+        "B,2 Main St,1,250,09:30\n"
+    )
+
+    stores = load_stores(str(path), chunksize=1)
+
+    assert [s["priority"] for s in stores] == [3, 1]
+    assert [s["sales"] for s in stores] == [1000.5, 250]
+    assert isinstance(stores[0]["priority"], int)
+    # A time window given as clock time stays text for the time-window parser
+    assert [s["earliest_time"] for s in stores] == [8, "09:30"]
+
+
+def test_chunk_validation_reports_file_row_numbers(tmp_path):
+    path = tmp_path / "stores.csv"
+    path.write_text(_csv_rows(12).replace("11 Main St", ""))
+
+    chunks = iter_store_chunks(str(path), chunksize=5)
+    assert len(next(chunks)) == 5  # Earlier chunks are usable before the error
+    with pytest.raises(ValueError, match="row 12"):
+        list(chunks)
+
+    path.write_text("Name,Street\nA,1 Main St\n")
+    with pytest.raises(ValueError, match="store name, address"):
+        load_stores(str(path))
+
+
+def test_xlsx_chunks_use_read_only_rows(tmp_path):
+    path = tmp_path / "stores.xlsx"
+    path.write_bytes(_xlsx_bytes(7))
+
+    chunks = list(iter_store_chunks(str(path), chunksize=3))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert chunks[0][1] == {"name": "Store 1", "address": "1 Main St", "zip": "00001"}
+
+
+def test_upload_streams_csv_and_xlsx_in_chunks():
+    service = FileService()
+    upload = FileStorage(io.BytesIO(_csv_rows(11).encode()), filename="stores.csv")
+
+    chunks = list(service.iter_stores_file(upload, chunk_size=4))
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 3]
+    assert chunks[0][0] == {"Store Name": "Store 0", "Address": "0 Main St", "Chain": "A"}
+    assert not upload.stream.closed and upload.stream.tell() == 0
+    assert len(service.process_stores_file(upload)) == 11
+
+    upload = FileStorage(io.BytesIO(_xlsx_bytes(5)), filename="stores.xlsx")
+    assert [len(c) for c in service.iter_stores_file(upload, chunk_size=2)] == [2, 2, 1]
+
+    with pytest.raises(ValueError, match="Invalid file type"):
+        service.process_stores_file(FileStorage(io.BytesIO(b"x"), filename="stores.txt"))
+
+
+class _RecordingGeocoder:
+    def __init__(self, events):
+        self.events = events
+
+    def get_coordinates_many(self, addresses):
+        self.events.append(("geocode", len(addresses)))
+        return {address: (40.0, -74.0) for address in addresses}
+
+
+def test_ingest_geocodes_each_chunk_before_parsing_the_next():
+    events = []
+
+    def chunks():
+        for i in range(3):
+            events.append(("parse", i))
+            yield [{"name": f"S{i}{j}", "address": f"{i}{j} Main St"} for j in range(2)]
+
+    service = UnifiedRoutingService(geocoding_service=_RecordingGeocoder(events))
+    ingested = list(service.ingest_store_chunks(chunks(), save_to_db=False))
+
+    assert events == [
+        ("parse", 0),
+        ("geocode", 2),
+        ("parse", 1),
+        ("geocode", 2),
+        ("parse", 2),
+        ("geocode", 2),
+    ]
+    assert all(store["lat"] == 40.0 for chunk in ingested for store in chunk)
+
+
+def test_ingest_only_saves_stores_for_a_signed_in_user():
+    class Database:
+        saved = []
+
+        def bulk_create_stores(self, stores, user_id=None):
+            self.saved.append((len(stores), user_id))
+
+    chunk = [{"name": "S", "address": "1 Main St"}]
+    for user_id in (None, 7):
+        service = UnifiedRoutingService(user_id=user_id, geocoding_service=_RecordingGeocoder([]))
+        service.database_service = Database()
+        list(service.ingest_store_chunks([chunk]))
+        list(service.ingest_store_chunks([chunk], save_to_db=False))
+
+    assert Database.saved == [(1, 7)]
+
+
+def test_export_upload_ingests_the_file_in_chunks(mock_flask_app, monkeypatch):
+    from app.routes import main_enhanced
+
+    ingested = []
+    original = UnifiedRoutingService.ingest_store_chunks
+
+    def recording(self, chunks, save_to_db=True):
+        for chunk in original(self, chunks, save_to_db=save_to_db):
+            ingested.append(len(chunk))
+            yield chunk
+
+    monkeypatch.setattr(UnifiedRoutingService, "ingest_store_chunks", recording)
+    mock_flask_app.register_blueprint(main_enhanced.main_bp)
+    rows = ["name,lat,lon"] + [f"S{i},{40 + i / 100},{-74 + i / 100}" for i in range(7)]
+
+    response = mock_flask_app.test_client().post(
+        "/export",
+        data={"file": (io.BytesIO("\n".join(rows).encode()), "stores.csv")},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 200 and response.mimetype == "text/csv"
+    assert ingested == [7]
+    assert len(response.get_data(as_text=True).strip().splitlines()) == 8
@@ -0,0 +1,93 @@
+import json
+
+import numpy as np
+import pytest
+
+from app.models.store_table import StoreTable
+from app.optimization.genetic_algorithm import GeneticAlgorithm, GeneticConfig
+from app.optimization.multi_objective import (
+    MultiObjectiveConfig,
+    MultiObjectiveOptimizer,
+)
+from app.optimization.simulated_annealing import (
+    SimulatedAnnealingConfig,
+    SimulatedAnnealingOptimizer,
+)
+from app.services.distance_service import CoordinateExtractor
+from app.services.route_core import GreedyNearestNeighborOptimizer, RouteConstraints
+
+
+def _stores(n):
+    rng = np.random.default_rng(n)
+    return [
+        {"name": f"S{i}", "lat": 40 + rng.random(), "lon": -74 + rng.random(), "chain": "AB"[i % 2]}
+        for i in range(n)
+    ]
+
+
+def test_columns_follow_store_key_conventions():
+    table = StoreTable(
+        [
+            {"lat": 1.0, "lng": 2.0, "priority": "3", "chain": "B", "earliest_time": 9},
+            {"latitude": "4", "longitude": 5, "priority": "high", "demand": 7},
+            {"location": {"lat": 6, "lon": 7}, "chain": "A", "window_end": 17},
+            {"name": "no coordinates", "chain": "B", "service_time": None},
+        ]
+    )
+
+    np.testing.assert_array_equal(table.coordinates, [[1, 2], [4, 5], [6, 7], [np.nan, np.nan]])
+    np.testing.assert_array_equal(table.column("priority"), [3, np.nan, np.nan, np.nan])
+    np.testing.assert_array_equal(table.column("priority", 1), [3, 1, 1, 1])
+    np.testing.assert_array_equal(table.column("demand", 0), [0, 7, 0, 0])
+    np.testing.assert_array_equal(table.column("window_start", 8), [9, 8, 8, 8])
+    np.testing.assert_array_equal(table.column("window_end", 18), [18, 18, 17, 18])
+    assert table.chains == ("B", "A")
+    assert table.chain_id.tolist() == [0, -1, 1, 0]
+
+
+def test_table_is_the_list_of_original_dicts():
+    stores = _stores(5)
+    table = StoreTable(stores)
+
+    assert isinstance(table, list) and table == stores
+    assert all(a is b for a, b in zip(table, stores))
+    assert json.loads(json.dumps(table)) == stores
+    assert table.take([3, 1]) == [stores[3], stores[1]]
+    with pytest.raises(ValueError):
+        table.coordinates[0, 0] = 0.0
+
+    copy = table.copy()
+    assert isinstance(copy, StoreTable) and copy.coordinates is table.coordinates
+
+    copy.append({"lat": 0.0, "lon": 0.0})
+    assert len(copy.coordinates) == 6 and len(table.coordinates) == 5
+    assert StoreTable.ensure(table) is table
+
+
+def test_optimizers_extract_each_store_once(monkeypatch):
+    stores = _stores(20)
+    table = StoreTable(stores)
+
+    calls = []
+    extract = CoordinateExtractor.extract_coordinates
+    monkeypatch.setattr(
+        CoordinateExtractor,
+        "extract_coordinates",
+        staticmethod(lambda store: calls.append(store) or extract(store)),
+    )
+    table.coordinates  # One pass over the stores
+    assert len(calls) == 20
+
+    ga_route, _ = GeneticAlgorithm(GeneticConfig(population_size=20, generations=5)).optimize(table)
+    sa_route, _ = SimulatedAnnealingOptimizer(
+        SimulatedAnnealingConfig(max_iterations=200)
+    ).optimize(table)
+    mo_route, metrics = MultiObjectiveOptimizer(
+        MultiObjectiveConfig(population_size=10, generations=3, objectives=["distance", "priority"])
+    ).optimize(table)
+    nn_route = GreedyNearestNeighborOptimizer(None).optimize(table, RouteConstraints())
+
+    assert len(calls) == 20
+    assert "error" not in metrics
+    for route in (ga_route, sa_route, mo_route, nn_route):
+        assert sorted(id(store) for store in route) == sorted(id(store) for store in stores)
@@ -0,0 +1,190 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from app.optimization.vrptw import (
+    VRPTWConfig,
+    VRPTWOptimizer,
+    parse_hours,
+    parse_time_window,
+)
+from app.services.routing_service_unified import UnifiedRoutingService
+
+
+def _stores(n, seed=0):
+    rng = np.random.default_rng(seed)
+    stores = []
+    for i in range(n):
+        earliest = float(rng.uniform(8, 14))
+        stores.append(
+            {
+                "name": f"S{i}",
+                "lat": 40.6 + rng.random() * 0.3,
+                "lon": -74.1 + rng.random() * 0.3,
+                "earliest_time": earliest,
+                "latest_time": earliest + float(rng.uniform(1, 3)),
+                "service_time": 0.25,
+            }
+        )
+    return stores
+
+
+def _replay(optimizer, route):
+    """Recompute a route's schedule stop by stop"""
+    clock, starts = optimizer.config.start_time, []
+    for k, stop in enumerate(route):
+        if k:
+            clock += optimizer._travel[route[k - 1], stop]
+        clock = max(clock, optimizer._earliest[stop])
+        starts.append(clock)
+        clock += optimizer._service[stop]
+    return starts
+
+
+def test_parse_time_formats():
+    assert parse_hours("09:30") == 9.5
+    assert parse_hours(14) == 14.0
+    assert np.isnan(parse_hours("noon"))
+    assert parse_time_window("08:00-12:15") == (8.0, 12.25)
+    assert parse_time_window({"start": "9", "end": "17:00"}) == (9.0, 17.0)
+    assert parse_time_window((7, 11)) == (7.0, 11.0)
+    assert parse_time_window("anytime") is None
+
+    with pytest.raises(ValueError):
+        VRPTWConfig(speed_kmh=0)
+
+
+def test_every_stop_is_served_within_its_window():
+    stores = _stores(60)
+    optimizer = VRPTWOptimizer(VRPTWConfig(speed_kmh=40, start_time=8.0))
+
+    route, metrics = optimizer.optimize(stores)
+
+    assert metrics["scheduled_stops"] + metrics["unscheduled_stops"] == 60
+    assert sorted(s["name"] for s in route) == sorted(
+        s["name"] for s in stores if s["name"] not in metrics["unscheduled_stores"]
+    )
+    assert metrics["total_distance"] <= metrics["initial_distance"] + 1e-9
+    for stop in route:
+        assert stop["earliest_time"] - 1e-3 <= stop["service_start"] <= stop["latest_time"] + 1e-3
+        assert stop["arrival_time"] <= stop["service_start"] + 1e-3
+    for route_index in range(metrics["routes"]):
+        stops = [s for s in route if s["route_index"] == route_index]
+        starts = [s["service_start"] for s in stops]
+        assert starts == sorted(starts)
+
+
+def test_slack_check_matches_full_recompute():
+    stores = _stores(12, seed=3)
+    optimizer = VRPTWOptimizer(VRPTWConfig(local_search=False))
+    optimizer.optimize(stores)
+
+    for route in optimizer.routes:
+        others = np.array([s for s in range(12) if s not in route], dtype=np.intp)
+        if not len(others):
+            continue
+        cost = optimizer._insertion_costs(route, others)
+        for row, stop in enumerate(others):
+            for position in range(len(route) + 1):
+                candidate = route[:position] + [int(stop)] + route[position:]
+                starts = _replay(optimizer, candidate)
+                feasible = all(
+                    start <= optimizer._latest[s] + 1e-9 for s, start in zip(candidate, starts)
+                )
+                assert np.isfinite(cost[row, position]) == feasible
+
+
+def test_impossible_windows_are_reported_unscheduled():
+    stores = _stores(5)
+    stores.append({"name": "Closed", "lat": 40.7, "lon": -74.0, "latest_time": "07:00"})
+    stores.append({"name": "Nowhere", "earliest_time": 9, "latest_time": 17})
+
+    route, metrics = VRPTWOptimizer(VRPTWConfig(start_time=8.0)).optimize(stores)
+
+    assert sorted(metrics["unscheduled_stores"]) == ["Closed", "Nowhere"]
+    assert len(route) == 5
+
+
+def test_chain_windows_and_route_limit():
+    stores = [
+        {
+            "name": f"S{i}",
+            "lat": 40.7 + i * 0.01,
+            "lon": -74.0,
+            "chain": "Late" if i % 2 else "Early",
+        }
+        for i in range(6)
+    ]
+    constraints = {
+        "time_windows": {
+            "Early": {"start": "09:00", "end": "10:00"},
+            "Late": {"start": "13:00", "end": "15:00"},
+        }
+    }
+
+    route, metrics = VRPTWOptimizer(VRPTWConfig(service_time=0.2)).optimize(stores, constraints)
+
+    assert metrics["unscheduled_stops"] == 0 and metrics["routes"] == 1
+    assert [s["chain"] for s in route] == ["Early"] * 3 + ["Late"] * 3
+    assert all(s["service_start"] >= 13 for s in route[3:])
+
+    _, metrics = VRPTWOptimizer(VRPTWConfig(max_routes=1)).optimize(
+        [
+            {"name": n, "lat": 40.7, "lon": lon, "delivery_window": "09:00-09:30"}
+            for n, lon in (("A", -74.0), ("B", -73.0))
+        ]
+    )
+    assert metrics["routes"] == 1 and metrics["unscheduled_stops"] == 1
+
+
+def test_relocation_never_beats_brute_force_on_one_route():
+    stores = [
+        {"name": f"S{i}", "lat": 40.7 + lat, "lon": -74.0 + lon}
+        for i, (lat, lon) in enumerate(
+            [(0, 0), (0.05, 0.02), (0.01, 0.04), (0.03, 0.01), (0.02, 0.05)]
+        )
+    ]
+    optimizer = VRPTWOptimizer()
+    _, metrics = optimizer.optimize(stores)
+
+    d = optimizer._distance
+    best = min(
+        sum(d[a, b] for a, b in zip(order, order[1:])) for order in itertools.permutations(range(5))
+    )
+    assert metrics["routes"] == 1
+    assert metrics["total_distance"] >= best - 1e-9
+
+
+def test_unified_service_runs_vrptw():
+    stores = _stores(20)
+    service = UnifiedRoutingService()
+
+    route = service.generate_route_from_stores(
+        stores, algorithm="vrptw", algorithm_params={"vrptw_speed_kmh": 40, "start_time": "8"}
+    )
+
+    assert route and all("route_index" in s for s in route)
+    metrics = service.get_metrics().algorithm_metrics
+    assert metrics["algorithm"] == "vrptw"
+    assert metrics["scheduled_stops"] == len(route)
+
+
+def test_unified_service_measures_each_vrptw_route_separately():
+    # A and B share a vehicle; C is too far to reach in its window after them
+    stores = [
+        {"name": "A", "lat": 40.70, "lon": -74.00, "delivery_window": "09:00-09:10"},
+        {"name": "B", "lat": 40.71, "lon": -74.00, "delivery_window": "09:00-11:00"},
+        {"name": "C", "lat": 40.70, "lon": -73.40, "delivery_window": "09:00-09:10"},
+    ]
+    service = UnifiedRoutingService()
+
+    route = service.generate_route_from_stores(stores, save_to_db=False, algorithm="vrptw")
+
+    metrics = service.get_metrics()
+    assert len({stop["route_index"] for stop in route}) == 2
+    flat = service.distance_calculator.calculate_route_distance(route)
+    assert metrics.total_distance == pytest.approx(
+        metrics.algorithm_metrics["total_distance"], rel=0.01
+    )
+    assert metrics.total_distance < flat / 10